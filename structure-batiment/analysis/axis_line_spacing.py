@@ -22,7 +22,7 @@ import numpy as np
 from sklearn.cluster import DBSCAN
 
 from structure_aligner.config import AlignmentConfig
-from structure_aligner.etl.extractor import extract_vertices
+from structure_aligner.etl.extraction_cache import load_vertex_table
 
 
 BEFORE = Path("data/input/before.3dm")
@@ -111,13 +111,13 @@ def coverage(label: str, after_lines: np.ndarray, predicted: np.ndarray, tol: fl
 
 
 def main():
-    before = extract_vertices(BEFORE).vertices
-    after = extract_vertices(AFTER).vertices
+    before = load_vertex_table(BEFORE)
+    after = load_vertex_table(AFTER)
 
-    before_x = np.array([v.x for v in before])
-    before_y = np.array([v.y for v in before])
-    after_x = np.array([v.x for v in after])
-    after_y = np.array([v.y for v in after])
+    before_x = before.x
+    before_y = before.y
+    after_x = after.x
+    after_y = after.y
 
     after_x_lines = unique_sorted(after_x)
     after_y_lines = unique_sorted(after_y)
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Compare vertices between two Rhino .3dm files.
 
-Loads both files with rhino3dm (via structure_aligner.etl.extractor),
+Loads both files through the extraction cache (structure_aligner.etl.extraction_cache),
 matches vertices by object name + vertex_index, and prints displacement
 statistics to help understand the transformation from one file to another.
 """
@@ -12,11 +12,12 @@ import argparse
 from collections import Counter, defaultdict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Tuple
+from typing import Tuple
 
 import numpy as np
 
-from structure_aligner.etl.extractor import ExtractionResult, RawVertex, extract_vertices
+from structure_aligner.etl.extraction_cache import load_vertex_table
+from structure_aligner.etl.extractor import VertexTable
 
 
 @dataclass(frozen=True)
@@ -26,27 +27,29 @@ class VertexKey:
     vertex_index: int
 
 
-def load_vertices(path: Path) -> ExtractionResult:
-    result = extract_vertices(path)
+def load_vertices(path: Path) -> VertexTable:
+    table = load_vertex_table(path)
     print(
-        f"[load] {path.name}: {len(result.vertices)} vertices, "
-        f"{len({v.element_name for v in result.vertices})} named objects, "
-        f"{result.total_objects} total objects"
+        f"[load] {path.name}: {len(table)} vertices, "
+        f"{len(set(table.name_codes.tolist()))} named objects, "
+        f"{table.total_objects} total objects"
     )
-    if result.skipped_objects:
-        print(f"[load]   skipped {len(result.skipped_objects)} unsupported/unnamed objects")
-    return result
-
-
-def build_index(vertices: Iterable[RawVertex]) -> tuple[dict[VertexKey, RawVertex], dict[VertexKey, list[RawVertex]]]:
-    index: dict[VertexKey, RawVertex] = {}
-    collisions: defaultdict[VertexKey, list[RawVertex]] = defaultdict(list)
-    for v in vertices:
-        key = VertexKey(v.element_name, v.vertex_index)
+    if table.skipped_objects:
+        print(f"[load]   skipped {len(table.skipped_objects)} unsupported/unnamed objects")
+    return table
+
+
+def build_index(table: VertexTable) -> tuple[dict[VertexKey, int], dict[VertexKey, list[int]]]:
+    """Map (name, vertex_index) keys to table rows; later duplicates go to collisions."""
+    index: dict[VertexKey, int] = {}
+    collisions: defaultdict[VertexKey, list[int]] = defaultdict(list)
+    names = table.names
+    for row, (code, vi) in enumerate(zip(table.name_codes.tolist(), table.vertex_index.tolist())):
+        key = VertexKey(names[code], vi)
         if key in index:
-            collisions[key].append(v)
+            collisions[key].append(row)
         else:
-            index[key] = v
+            index[key] = row
     return index, collisions
 
 
@@ -90,8 +93,8 @@ def main() -> None:
     before = load_vertices(args.before)
     after = load_vertices(args.after)
 
-    idx_before, collisions_before = build_index(before.vertices)
-    idx_after, collisions_after = build_index(after.vertices)
+    idx_before, collisions_before = build_index(before)
+    idx_after, collisions_after = build_index(after)
 
     if collisions_before:
         print(f"[warn] {len(collisions_before)} duplicate keys in BEFORE (name + vertex_index)")
@@ -116,12 +119,13 @@ def main() -> None:
         sample = ", ".join(f"{k.name}[{k.vertex_index}]" for k in only_after[:10])
         print(f"        sample AFTER-only:  {sample}")
 
-    deltas = []
-    for key in common:
-        b = idx_before[key]
-        a = idx_after[key]
-        deltas.append([a.x - b.x, a.y - b.y, a.z - b.z])
-    deltas_np = np.array(deltas)
+    rows_before = np.array([idx_before[key] for key in common], dtype=np.int64)
+    rows_after = np.array([idx_after[key] for key in common], dtype=np.int64)
+    deltas_np = np.column_stack((
+        after.x[rows_after] - before.x[rows_before],
+        after.y[rows_after] - before.y[rows_before],
+        after.z[rows_after] - before.z[rows_before],
+    ))
 
     print("[delta] displacement statistics (signed, meters):")
     print(displacement_summary(deltas_np))
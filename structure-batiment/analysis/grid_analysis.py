@@ -20,7 +20,8 @@ from pathlib import Path
 
 import numpy as np
 
-from structure_aligner.etl.extractor import ExtractionResult, RawVertex, extract_vertices
+from structure_aligner.etl.extraction_cache import load_vertex_table
+from structure_aligner.etl.extractor import VertexTable
 
 BEFORE_PATH = Path("data/input/before.3dm")
 AFTER_PATH = Path("data/input/after.3dm")
@@ -29,20 +30,21 @@ GRID_SIZES_MM = [1, 5, 10, 25, 50, 100, 250, 500, 1000]
 AXES = ["X", "Y", "Z"]
 
 
-def load_and_index(path: Path):
-    result = extract_vertices(path)
-    print(f"[load] {path.name}: {len(result.vertices)} vertices, "
-          f"{len({v.element_name for v in result.vertices})} named objects, "
-          f"{result.total_objects} total objects")
-    index = {}
-    for v in result.vertices:
-        key = (v.element_name, v.vertex_index)
-        index[key] = v
-    return result, index
+def load_and_index(path: Path) -> tuple[VertexTable, dict[tuple[str, int], int]]:
+    """Extract a VertexTable and index its rows by (name, vertex_index)."""
+    table = load_vertex_table(path)
+    print(f"[load] {path.name}: {len(table)} vertices, "
+          f"{len(set(table.name_codes.tolist()))} named objects, "
+          f"{table.total_objects} total objects")
+    names = table.names
+    keys = zip((names[c] for c in table.name_codes.tolist()), table.vertex_index.tolist())
+    index = {key: row for row, key in enumerate(keys)}
+    return table, index
 
 
-def coord(v: RawVertex, axis: int) -> float:
-    return [v.x, v.y, v.z][axis]
+def coords(table: VertexTable, rows: np.ndarray) -> np.ndarray:
+    """(n, 3) coordinate array for the given table rows."""
+    return np.column_stack((table.x[rows], table.y[rows], table.z[rows]))
 
 
 def is_multiple(value_m: float, grid_mm: float, tol_mm: float = 0.01) -> bool:
@@ -70,8 +72,8 @@ def main():
     print("  DEEP GRID ANALYSIS: before.3dm vs after.3dm")
     print("=" * 80)
 
-    before_result, before_idx = load_and_index(BEFORE_PATH)
-    after_result, after_idx = load_and_index(AFTER_PATH)
+    before_table, before_idx = load_and_index(BEFORE_PATH)
+    after_table, after_idx = load_and_index(AFTER_PATH)
 
     keys_before = set(before_idx.keys())
     keys_after = set(after_idx.keys())
@@ -84,12 +86,14 @@ def main():
     print(f"[match] Only in after:  {len(only_after)}")
 
     # Build matched arrays
-    before_coords = np.array([[coord(before_idx[k], a) for a in range(3)] for k in common_keys])
-    after_coords = np.array([[coord(after_idx[k], a) for a in range(3)] for k in common_keys])
+    before_rows = np.array([before_idx[k] for k in common_keys], dtype=np.int64)
+    after_rows = np.array([after_idx[k] for k in common_keys], dtype=np.int64)
+    before_coords = coords(before_table, before_rows)
+    after_coords = coords(after_table, after_rows)
     deltas = after_coords - before_coords
 
-    categories = [before_idx[k].category for k in common_keys]
-    geom_types = [before_idx[k].geometry_type for k in common_keys]
+    categories = before_table.category_array()[before_rows].tolist()
+    geom_types = before_table.geometry_type_array()[before_rows].tolist()
     names = [k[0] for k in common_keys]
 
     n = len(common_keys)
@@ -383,12 +387,12 @@ def main():
     print("-" * 160)
     for idx in moved_indices:
         k = common_keys[idx]
-        b = before_idx[k]
-        a = after_idx[k]
+        b = before_coords[idx]
+        a = after_coords[idx]
         d = deltas[idx]
-        print(f"{k[0]:<30} {k[1]:>4} {b.category:<10} "
-              f"{b.x:>10.4f} {b.y:>10.4f} {b.z:>10.4f} "
-              f"{a.x:>10.4f} {a.y:>10.4f} {a.z:>10.4f} "
+        print(f"{k[0]:<30} {k[1]:>4} {categories[idx]:<10} "
+              f"{b[0]:>10.4f} {b[1]:>10.4f} {b[2]:>10.4f} "
+              f"{a[0]:>10.4f} {a[1]:>10.4f} {a[2]:>10.4f} "
               f"{d[0]:>10.4f} {d[1]:>10.4f} {d[2]:>10.4f}")
 
     print("\n" + "=" * 80)
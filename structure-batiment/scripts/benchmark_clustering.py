@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Benchmark V1 thread clustering engines on synthetic 1-D coordinates.
+
+Draws values around evenly spread thread positions (20 values per thread
+on average, 1 cm noise), runs analysis.clustering.cluster_axis() with
+each engine and prints the timings and whether the clusters match.
+
+Usage:
+    python scripts/benchmark_clustering.py [--values 100000 1000000] [--alpha 0.05]
+"""
+import argparse
+import sys
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from structure_aligner.analysis.clustering import CLUSTER_ENGINES, cluster_axis  # noqa: E402
+from structure_aligner.config import AlignmentConfig  # noqa: E402
+
+VALUES_PER_THREAD = 20
+
+
+def build_values(n_values: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    n_threads = max(1, n_values // VALUES_PER_THREAD)
+    # ~0.4 m between threads, as on a dense structural grid
+    threads = np.round(rng.uniform(0, n_threads * 0.4, n_threads), 2)
+    return rng.choice(threads, n_values) + rng.normal(0, 0.01, n_values)
+
+
+def same_clusters(a: list[dict], b: list[dict]) -> bool:
+    return len(a) == len(b) and all(
+        np.array_equal(x["indices"], y["indices"]) and x["mean"] == y["mean"] and x["std"] == y["std"]
+        for x, y in zip(a, b)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--values", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--alpha", type=float, default=0.05)
+    parser.add_argument("--engines", nargs="+", choices=CLUSTER_ENGINES, default=list(CLUSTER_ENGINES))
+    args = parser.parse_args()
+
+    config = AlignmentConfig(alpha=args.alpha)
+    for n in args.values:
+        values = build_values(n)
+        timings, results = {}, {}
+        for engine in args.engines:
+            start = time.perf_counter()
+            results[engine] = cluster_axis(values, replace(config, cluster_engine=engine))
+            timings[engine] = time.perf_counter() - start
+
+        line = f"{n:>10,} values:"
+        for engine in args.engines:
+            line += f"  {engine} {timings[engine]:.2f}s"
+        if len(results) > 1:
+            first, *others = results.values()
+            base, *rest = timings.values()
+            speedup = ", ".join(f"x{t / base:.1f}" for t in rest)
+            line += f"  (speedup {speedup}, identical: {all(same_clusters(first, o) for o in others)})"
+        print(line + f"  clusters: {len(next(iter(results.values())))}")
+
+
+if __name__ == "__main__":
+    main()
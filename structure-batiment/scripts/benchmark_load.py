@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""Benchmark etl.loader.load() on a synthetic columnar vertex set.
+
+Builds a structural source .db and a TransformResult with VertexColumns of
+the requested size (default 1M vertices, 8 per element), loads it into a
+fresh PRD database and prints the timing.
+
+Usage:
+    python scripts/benchmark_load.py [--vertices 1000000] [--chunk-size 100000]
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from structure_aligner.etl.loader import DEFAULT_CHUNK_SIZE, load  # noqa: E402
+from structure_aligner.etl.transformer import Element, TransformResult, VertexColumns  # noqa: E402
+
+VERTICES_PER_ELEMENT = 8
+# (source table, source type, PRD type); cycled so every PRD type is present
+KINDS = [
+    ("filaire", "POTEAU", "poteau"),
+    ("filaire", "POUTRE", "poutre"),
+    ("shell", "VOILE", "voile"),
+    ("shell", "DALLE", "dalle"),
+    ("support", None, "appui"),
+]
+
+
+def build_inputs(directory: Path, n_vertices: int) -> tuple[Path, TransformResult]:
+    n_elements = max(1, n_vertices // VERTICES_PER_ELEMENT)
+    source_db = directory / "source.db"
+    conn = sqlite3.connect(str(source_db))
+    conn.executescript("""
+        CREATE TABLE filaire (id INTEGER PRIMARY KEY, type TEXT, name TEXT);
+        CREATE TABLE shell (id INTEGER PRIMARY KEY, type TEXT, name TEXT);
+        CREATE TABLE support (id INTEGER PRIMARY KEY, name TEXT);
+    """)
+    elements = []
+    for i in range(n_elements):
+        table, source_type, prd_type = KINDS[i % len(KINDS)]
+        name = f"Element_{i}"
+        if source_type is None:
+            conn.execute(f"INSERT INTO {table} VALUES (?, ?)", (i, name))
+        else:
+            conn.execute(f"INSERT INTO {table} VALUES (?, ?, ?)", (i, source_type, name))
+        elements.append(Element(i, prd_type, name, "brep"))
+    conn.commit()
+    conn.close()
+
+    rng = np.random.default_rng(0)
+    element_id = np.repeat(np.arange(n_elements, dtype=np.int64), VERTICES_PER_ELEMENT)[:n_vertices]
+    columns = VertexColumns(
+        element_id=element_id,
+        x=np.round(rng.uniform(0, 100, n_vertices), 4),
+        y=np.round(rng.uniform(0, 100, n_vertices), 4),
+        z=np.round(rng.uniform(0, 30, n_vertices), 4),
+        vertex_index=(np.arange(n_vertices) % VERTICES_PER_ELEMENT).astype(np.int32),
+    )
+    result = TransformResult(
+        elements=elements, vertices=columns,
+        matched_count=n_elements, total_count=n_elements,
+    )
+    return source_db, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vertices", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        source_db, result = build_inputs(directory, args.vertices)
+        output = directory / "prd.db"
+
+        start = time.perf_counter()
+        report = load(result, source_db, output, chunk_size=args.chunk_size)
+        total = time.perf_counter() - start
+
+        print(f"vertices:          {report.vertices_inserted:,}")
+        print(f"elements:          {report.elements_inserted:,}")
+        print(f"insert + index:    {report.load_time_s:.2f}s ({report.vertices_per_second:,.0f} vertices/s)")
+        print(f"load() total:      {total:.2f}s (copy, validation and report included)")
+        print(f"validation passed: {report.validation_passed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""Columnar alignment output.
+
+AlignedVertexTable holds what a list of AlignedVertex holds, as parallel
+contiguous arrays: aligned_axis becomes a 3-bit code (X=1, Y=2, Z=4) and
+the fil_*_id strings become int32 indexes into one shared thread_ids
+tuple (-1 for None). Writers and reports read the arrays directly;
+iterating yields AlignedVertex records for code that still expects them.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterator
+
+import numpy as np
+
+from structure_aligner.config import AlignedVertex
+
+# aligned_axis label for each axis code
+AXIS_LABELS = ("none", "X", "Y", "XY", "Z", "XZ", "YZ", "XYZ")
+_AXIS_CODES = {label: code for code, label in enumerate(AXIS_LABELS)}
+
+# Rows converted to Python objects at a time when iterating
+_ROW_CHUNK = 65536
+
+
+@dataclass(eq=False)
+class AlignedVertexTable:
+    """Aligned vertices as parallel arrays, one row per vertex."""
+    id: np.ndarray            # int64
+    element_id: np.ndarray    # int64
+    vertex_index: np.ndarray  # int32
+    x: np.ndarray             # float64, aligned
+    y: np.ndarray
+    z: np.ndarray
+    x_original: np.ndarray    # float64
+    y_original: np.ndarray
+    z_original: np.ndarray
+    axis_code: np.ndarray     # uint8, bit mask of snapped axes
+    fil_x: np.ndarray         # int32 index into thread_ids, -1 for None
+    fil_y: np.ndarray
+    fil_z: np.ndarray
+    displacement: np.ndarray  # float64, displacement_total
+    thread_ids: tuple[str, ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def __iter__(self) -> Iterator[AlignedVertex]:
+        for start in range(0, len(self), _ROW_CHUNK):
+            rows = slice(start, start + _ROW_CHUNK)
+            for row in zip(
+                self.id[rows].tolist(), self.element_id[rows].tolist(),
+                self.x[rows].tolist(), self.y[rows].tolist(), self.z[rows].tolist(),
+                self.vertex_index[rows].tolist(),
+                self.x_original[rows].tolist(), self.y_original[rows].tolist(),
+                self.z_original[rows].tolist(),
+                self.aligned_axis(rows),
+                self.fil_ids("X", rows), self.fil_ids("Y", rows), self.fil_ids("Z", rows),
+                self.displacement[rows].tolist(),
+            ):
+                yield AlignedVertex(*row)
+
+    def to_aligned_vertices(self) -> list[AlignedVertex]:
+        return list(self)
+
+    @property
+    def aligned_mask(self) -> np.ndarray:
+        """True for rows snapped on at least one axis."""
+        return self.axis_code != 0
+
+    def aligned_count(self) -> int:
+        return int(np.count_nonzero(self.axis_code))
+
+    @property
+    def moved_mask(self) -> np.ndarray:
+        """True for rows whose coordinates differ from the originals."""
+        return (self.x != self.x_original) | (self.y != self.y_original) | (self.z != self.z_original)
+
+    def take(self, rows: slice | np.ndarray) -> AlignedVertexTable:
+        """The selected rows (slice, index or boolean array); thread_ids is shared."""
+        return AlignedVertexTable(
+            id=self.id[rows], element_id=self.element_id[rows], vertex_index=self.vertex_index[rows],
+            x=self.x[rows], y=self.y[rows], z=self.z[rows],
+            x_original=self.x_original[rows], y_original=self.y_original[rows],
+            z_original=self.z_original[rows],
+            axis_code=self.axis_code[rows],
+            fil_x=self.fil_x[rows], fil_y=self.fil_y[rows], fil_z=self.fil_z[rows],
+            displacement=self.displacement[rows],
+            thread_ids=self.thread_ids,
+        )
+
+    def aligned_axis(self, rows: slice | np.ndarray = slice(None)) -> list[str]:
+        """aligned_axis labels ("X", "XY", ..., "none") for the selected rows."""
+        return [AXIS_LABELS[c] for c in self.axis_code[rows].tolist()]
+
+    def fil_ids(self, axis: str, rows: slice | np.ndarray = slice(None)) -> list[str | None]:
+        """fil_<axis>_id values for the selected rows."""
+        lookup = self.thread_ids + (None,)   # code -1 picks the trailing None
+        codes = {"X": self.fil_x, "Y": self.fil_y, "Z": self.fil_z}[axis]
+        return [lookup[c] for c in codes[rows].tolist()]
+
+    def sqlite_rows(self) -> Iterator[tuple]:
+        """Rows for the aligned-vertex UPDATE in db.writer, converted chunk by chunk.
+
+        Column order: x, y, z, x_original, y_original, z_original,
+        aligned_axis, fil_x_id, fil_y_id, fil_z_id, displacement_total, id.
+        """
+        for start in range(0, len(self), _ROW_CHUNK):
+            rows = slice(start, start + _ROW_CHUNK)
+            yield from zip(
+                self.x[rows].tolist(), self.y[rows].tolist(), self.z[rows].tolist(),
+                self.x_original[rows].tolist(), self.y_original[rows].tolist(),
+                self.z_original[rows].tolist(),
+                self.aligned_axis(rows),
+                self.fil_ids("X", rows), self.fil_ids("Y", rows), self.fil_ids("Z", rows),
+                self.displacement[rows].tolist(), self.id[rows].tolist(),
+            )
+
+    @classmethod
+    def from_aligned_vertices(cls, aligned: list[AlignedVertex]) -> AlignedVertexTable:
+        """Build from AlignedVertex records (kept in the given order).
+
+        None coordinates become NaN, which SQLite stores as NULL.
+
+        Raises:
+            ValueError: If an aligned_axis label is not in AXIS_LABELS.
+        """
+        thread_codes: dict[str, int] = {}
+
+        def fil(value: str | None) -> int:
+            return -1 if value is None else thread_codes.setdefault(value, len(thread_codes))
+
+        def coords(name: str) -> np.ndarray:
+            return np.array([getattr(v, name) for v in aligned], dtype=np.float64)
+
+        try:
+            axis_code = np.array([_AXIS_CODES[v.aligned_axis] for v in aligned], dtype=np.uint8)
+        except KeyError as e:
+            raise ValueError(f"Unknown aligned_axis {e.args[0]!r}") from None
+        return cls(
+            id=np.array([v.id for v in aligned], dtype=np.int64),
+            element_id=np.array([v.element_id for v in aligned], dtype=np.int64),
+            vertex_index=np.array([v.vertex_index for v in aligned], dtype=np.int32),
+            x=coords("x"), y=coords("y"), z=coords("z"),
+            x_original=coords("x_original"), y_original=coords("y_original"),
+            z_original=coords("z_original"),
+            axis_code=axis_code,
+            fil_x=np.array([fil(v.fil_x_id) for v in aligned], dtype=np.int32),
+            fil_y=np.array([fil(v.fil_y_id) for v in aligned], dtype=np.int32),
+            fil_z=np.array([fil(v.fil_z_id) for v in aligned], dtype=np.int32),
+            displacement=coords("displacement_total"),
+            thread_ids=tuple(thread_codes),
+        )
+
+    @classmethod
+    def concat(cls, tables: list[AlignedVertexTable]) -> AlignedVertexTable:
+        """Rows of every table in order; thread ids are merged."""
+        if not tables:
+            return cls.from_aligned_vertices([])
+        thread_codes: dict[str, int] = {}
+        fils: dict[str, list[np.ndarray]] = {"fil_x": [], "fil_y": [], "fil_z": []}
+        for t in tables:
+            # Trailing -1 so that code -1 (None) maps to itself
+            remap = np.array(
+                [thread_codes.setdefault(tid, len(thread_codes)) for tid in t.thread_ids] + [-1],
+                dtype=np.int32,
+            )
+            for name, parts in fils.items():
+                parts.append(remap[getattr(t, name)])
+
+        def cat(name: str) -> np.ndarray:
+            return np.concatenate([getattr(t, name) for t in tables])
+
+        return cls(
+            id=cat("id"), element_id=cat("element_id"), vertex_index=cat("vertex_index"),
+            x=cat("x"), y=cat("y"), z=cat("z"),
+            x_original=cat("x_original"), y_original=cat("y_original"), z_original=cat("z_original"),
+            axis_code=cat("axis_code"),
+            **{name: np.concatenate(parts) for name, parts in fils.items()},
+            displacement=cat("displacement"),
+            thread_ids=tuple(thread_codes),
+        )
+
+
+def as_aligned_table(aligned: list[AlignedVertex] | AlignedVertexTable) -> AlignedVertexTable:
+    """Return aligned as an AlignedVertexTable, converting a list if needed."""
+    if isinstance(aligned, AlignedVertexTable):
+        return aligned
+    return AlignedVertexTable.from_aligned_vertices(aligned)
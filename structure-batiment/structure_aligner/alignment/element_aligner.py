@@ -9,6 +9,9 @@ from __future__ import annotations
 
 import logging
 from collections import defaultdict
+from dataclasses import dataclass
+
+import numpy as np
 
 from structure_aligner.config import (
     AlignedVertex,
@@ -16,23 +19,84 @@ from structure_aligner.config import (
     ElementInfo,
     PipelineConfig,
 )
-from structure_aligner.db.reader import InputVertex
+from structure_aligner.db.reader import InputVertex, VertexArrays
+from structure_aligner.alignment.aligned_table import AlignedVertexTable
 from structure_aligner.alignment.geometry import (
+    AxisLineIndex,
+    as_axis_index,
     assign_vertex_to_endpoint,
     euclidean_displacement,
     find_nearest_axis_line,
     identify_element_endpoints,
 )
+from structure_aligner.utils.numeric import (
+    round_like_python,
+    segment_sums_like_python,
+    square_like_python,
+)
 
 logger = logging.getLogger(__name__)
 
+ALIGN_ENGINES = ("python", "numpy")
+
+# Element types that are not snapped (removed/consolidated in Phase 4)
+SKIP_TYPES = frozenset({"dalle"})
+
+# Point-like element types: one endpoint per axis
+POINT_TYPES = frozenset({"poteau", "appui"})
+
+
+@dataclass
+class AlignedArrays:
+    """Columnar result of the numpy snap engine.
+
+    Row i describes input vertex order[i]; rows follow align_elements'
+    output order (elements by first appearance, then input order).
+    """
+    order: np.ndarray          # int64 index into the input vertices
+    x: np.ndarray              # float64 aligned coordinates
+    y: np.ndarray
+    z: np.ndarray
+    snapped_x: np.ndarray      # bool
+    snapped_y: np.ndarray
+    displacement: np.ndarray   # float64, rounded to 6 digits
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def aligned_axis(self) -> list[str]:
+        """aligned_axis strings ("X", "Y", "XY" or "none") per row."""
+        labels = ("none", "X", "Y", "XY")
+        codes = self.snapped_x.astype(np.int8) + 2 * self.snapped_y.astype(np.int8)
+        return [labels[c] for c in codes.tolist()]
+
+    def to_table(self, vertices: VertexArrays) -> AlignedVertexTable:
+        """Columnar output with the input ids and original coordinates attached."""
+        order = self.order
+        no_thread = np.full(len(order), -1, dtype=np.int32)
+        return AlignedVertexTable(
+            id=vertices.id[order], element_id=vertices.element_id[order],
+            vertex_index=vertices.vertex_index[order],
+            x=self.x, y=self.y, z=self.z,
+            x_original=vertices.x[order], y_original=vertices.y[order], z_original=vertices.z[order],
+            axis_code=(self.snapped_x.astype(np.uint8) | (self.snapped_y.astype(np.uint8) << 1)),
+            fil_x=no_thread, fil_y=no_thread, fil_z=no_thread,
+            displacement=self.displacement,
+        )
+
+    def to_aligned_vertices(self, vertices: VertexArrays) -> list[AlignedVertex]:
+        """Materialize AlignedVertex records (the python engine's output)."""
+        return self.to_table(vertices).to_aligned_vertices()
+
 
 def align_elements(
-    vertices: list[InputVertex],
+    vertices: list[InputVertex] | VertexArrays,
     elements: dict[int, ElementInfo],
-    axis_lines_x: list[AxisLine],
-    axis_lines_y: list[AxisLine],
+    axis_lines_x: list[AxisLine] | AxisLineIndex,
+    axis_lines_y: list[AxisLine] | AxisLineIndex,
     config: PipelineConfig,
+    engine: str = "numpy",
+    workers: int = 1,
 ) -> list[AlignedVertex]:
     """Per-element-endpoint snap algorithm.
 
@@ -45,15 +109,79 @@ def align_elements(
     5. NEVER modify Z coordinates
 
     Args:
-        vertices: All input vertices.
+        vertices: All input vertices (InputVertex records or VertexArrays).
         elements: Element metadata keyed by element_id.
-        axis_lines_x: Sorted X axis lines from discovery.
-        axis_lines_y: Sorted Y axis lines from discovery.
+        axis_lines_x: X axis lines from discovery, or their AxisLineIndex.
+        axis_lines_y: Y axis lines from discovery, or their AxisLineIndex.
         config: Pipeline configuration.
+        engine: "numpy" (align_elements_arrays) or "python" (per-element
+            loop). Results are identical.
+        workers: Worker processes. Above 1, elements are split into shards
+            of similar vertex count that are aligned in parallel; the
+            output is the same for any worker count.
 
     Returns:
         List of AlignedVertex with original and aligned coordinates.
+
+    Raises:
+        ValueError: If engine is not one of ALIGN_ENGINES or workers < 1.
+    """
+    if engine == "python" and workers == 1:
+        return _align_elements_python(
+            vertices, elements, as_axis_index(axis_lines_x), as_axis_index(axis_lines_y), config,
+        )
+    return align_elements_table(
+        vertices, elements, axis_lines_x, axis_lines_y, config, engine=engine, workers=workers,
+    ).to_aligned_vertices()
+
+
+def align_elements_table(
+    vertices: list[InputVertex] | VertexArrays,
+    elements: dict[int, ElementInfo],
+    axis_lines_x: list[AxisLine] | AxisLineIndex,
+    axis_lines_y: list[AxisLine] | AxisLineIndex,
+    config: PipelineConfig,
+    engine: str = "numpy",
+    workers: int = 1,
+) -> AlignedVertexTable:
+    """align_elements() returning an AlignedVertexTable.
+
+    With the numpy engine no AlignedVertex record is created, which keeps
+    the memory of large runs to a few arrays. Parallel shards are returned
+    from the workers as tables too.
+
+    Raises:
+        ValueError: If engine is not one of ALIGN_ENGINES or workers < 1.
     """
+    if engine not in ALIGN_ENGINES:
+        raise ValueError(f"Unknown align engine {engine!r}; expected one of {ALIGN_ENGINES}")
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    # Indexed once here; every endpoint query below reuses them
+    index_x = as_axis_index(axis_lines_x)
+    index_y = as_axis_index(axis_lines_y)
+
+    if workers > 1 and len(vertices) > 0:
+        return _align_elements_parallel(
+            vertices, elements, index_x, index_y, config, engine, workers,
+        )
+    if engine == "numpy":
+        if not isinstance(vertices, VertexArrays):
+            vertices = VertexArrays.from_vertices(vertices)
+        return align_elements_arrays(vertices, elements, index_x, index_y, config).to_table(vertices)
+    return AlignedVertexTable.from_aligned_vertices(
+        _align_elements_python(vertices, elements, index_x, index_y, config)
+    )
+
+
+def _align_elements_python(
+    vertices: list[InputVertex] | VertexArrays,
+    elements: dict[int, ElementInfo],
+    index_x: AxisLineIndex,
+    index_y: AxisLineIndex,
+    config: PipelineConfig,
+) -> list[AlignedVertex]:
+    """The per-element loop behind engine="python"."""
     ndigits = config.rounding_ndigits
 
     # Group vertices by element_id
@@ -64,15 +192,12 @@ def align_elements(
     aligned: list[AlignedVertex] = []
     aligned_count = 0
 
-    # Element types that should be skipped (not snapped)
-    skip_types = {"dalle"}
-
     for element_id, elem_verts in by_element.items():
         elem_info = elements.get(element_id)
         elem_type = elem_info.type if elem_info else None
 
         # Skip dalles – they are removed/consolidated in Phase 4
-        if elem_type in skip_types:
+        if elem_type in SKIP_TYPES:
             for v in elem_verts:
                 aligned.append(AlignedVertex(
                     id=v.id, element_id=v.element_id,
@@ -88,14 +213,14 @@ def align_elements(
         # Cap endpoints by element type:
         #   poteau/appui -> max 1 endpoint per axis (point-like)
         #   voile/poutre -> max 2 endpoints per axis (span)
-        max_ep = 1 if elem_type in ("poteau", "appui") else 2
+        max_ep = 1 if elem_type in POINT_TYPES else 2
 
         # Compute endpoint snap targets for this element
         x_snap_map = _compute_endpoint_snaps(
-            elem_verts, "X", axis_lines_x, config, max_endpoints=max_ep
+            elem_verts, "X", index_x, config, max_endpoints=max_ep
         )
         y_snap_map = _compute_endpoint_snaps(
-            elem_verts, "Y", axis_lines_y, config, max_endpoints=max_ep
+            elem_verts, "Y", index_y, config, max_endpoints=max_ep
         )
 
         for v in elem_verts:
@@ -150,10 +275,244 @@ def align_elements(
     return aligned
 
 
+def align_elements_arrays(
+    vertices: VertexArrays,
+    elements: dict[int, ElementInfo],
+    axis_lines_x: list[AxisLine] | AxisLineIndex,
+    axis_lines_y: list[AxisLine] | AxisLineIndex,
+    config: PipelineConfig,
+) -> AlignedArrays:
+    """Array version of align_elements, with bit-identical results.
+
+    Vertices are ordered by element once; endpoint clusters come from a
+    segmented sort and scan, endpoints are snapped with batched
+    AxisLineIndex queries, and the per-vertex snap, rounding and
+    displacement are element-wise. Sums, rounding and squares go through
+    utils.numeric so they reproduce the scalar code's floating point.
+    """
+    n = len(vertices)
+    if n == 0:
+        empty = np.empty(0)
+        no = np.zeros(0, dtype=bool)
+        return AlignedArrays(np.empty(0, dtype=np.int64), empty, empty, empty, no, no, empty)
+
+    # Elements in order of first appearance, as the defaultdict grouping
+    element_ids, first, element_of = np.unique(
+        vertices.element_id, return_index=True, return_inverse=True,
+    )
+    by_appearance = np.argsort(first, kind="stable")
+    rank = np.empty(len(element_ids), dtype=np.int64)
+    rank[by_appearance] = np.arange(len(element_ids))
+    order = np.argsort(rank[element_of], kind="stable")
+    row_element = rank[element_of][order]
+
+    types = [
+        elements[eid].type if eid in elements else None
+        for eid in element_ids[by_appearance].tolist()
+    ]
+    skip = np.array([t in SKIP_TYPES for t in types], dtype=bool)
+    point_like = np.array([t in POINT_TYPES for t in types], dtype=bool)
+
+    x = vertices.x[order]
+    y = vertices.y[order]
+    z = vertices.z[order]
+    new_x, snapped_x = _snap_axis_arrays(x, row_element, point_like, as_axis_index(axis_lines_x), config)
+    new_y, snapped_y = _snap_axis_arrays(y, row_element, point_like, as_axis_index(axis_lines_y), config)
+    new_x = round_like_python(new_x, config.rounding_ndigits)
+    new_y = round_like_python(new_y, config.rounding_ndigits)
+
+    displacement = round_like_python(
+        np.sqrt(square_like_python(new_x - x) + square_like_python(new_y - y) + square_like_python(z - z)),
+        6,
+    )
+
+    # Dalles keep their coordinates untouched (not even rounded)
+    skipped = skip[row_element]
+    new_x[skipped] = x[skipped]
+    new_y[skipped] = y[skipped]
+    snapped_x &= ~skipped
+    snapped_y &= ~skipped
+    displacement[skipped] = 0.0
+
+    result = AlignedArrays(order, new_x, new_y, z, snapped_x, snapped_y, displacement)
+    aligned_count = int(np.count_nonzero(snapped_x | snapped_y))
+    logger.info(
+        "Aligned %d/%d vertices (%.1f%%)",
+        aligned_count, n, aligned_count / n * 100,
+    )
+    return result
+
+
+def shard_elements(element_ids: np.ndarray, shards: int) -> list[np.ndarray]:
+    """
+    Split vertex rows into shards of whole elements with similar vertex counts.
+
+    Elements are taken in order of first appearance and cut into
+    contiguous runs, so concatenating per-shard align_elements() output
+    reproduces the unsharded order.
+
+    Args:
+        element_ids: element_id per vertex row.
+        shards: Desired number of shards.
+
+    Returns:
+        Row-index arrays, one per non-empty shard.
+    """
+    if len(element_ids) == 0:
+        return []
+    _, first, element_of, sizes = np.unique(
+        element_ids, return_index=True, return_inverse=True, return_counts=True,
+    )
+    by_appearance = np.argsort(first, kind="stable")
+    rank = np.empty(len(first), dtype=np.int64)
+    rank[by_appearance] = np.arange(len(first))
+    rows = np.argsort(rank[element_of], kind="stable")
+
+    # Cut at the element boundary nearest to each k/shards of the vertices
+    cumulative = np.cumsum(sizes[by_appearance])
+    targets = cumulative[-1] * np.arange(1, shards) / shards
+    hi = np.searchsorted(cumulative, targets, side="left")
+    lo = np.maximum(hi - 1, 0)
+    nearest = np.where(targets - cumulative[lo] <= cumulative[hi] - targets, lo, hi)
+    bounds = np.unique(np.concatenate([[0], cumulative[nearest], [cumulative[-1]]]))
+    return [rows[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def _align_elements_parallel(
+    vertices: list[InputVertex] | VertexArrays,
+    elements: dict[int, ElementInfo],
+    index_x: AxisLineIndex,
+    index_y: AxisLineIndex,
+    config: PipelineConfig,
+    engine: str,
+    workers: int,
+) -> AlignedVertexTable:
+    """Run align_elements_table over element shards in a process pool."""
+    from concurrent.futures import ProcessPoolExecutor
+
+    if not isinstance(vertices, VertexArrays):
+        vertices = VertexArrays.from_vertices(vertices)
+    shards = shard_elements(vertices.element_id, workers)
+
+    # Axis indexes and config go to each worker once; tasks carry only
+    # their own vertices and element metadata.
+    with ProcessPoolExecutor(
+        max_workers=len(shards),
+        initializer=_init_align_worker,
+        initargs=(index_x, index_y, config, engine),
+    ) as pool:
+        futures = []
+        for rows in shards:
+            shard = vertices.take(rows)
+            shard_elements_info = {
+                eid: elements[eid] for eid in np.unique(shard.element_id).tolist() if eid in elements
+            }
+            futures.append(pool.submit(_align_shard, shard, shard_elements_info))
+        parts = [f.result() for f in futures]
+
+    aligned = AlignedVertexTable.concat(parts)
+    aligned_count = aligned.aligned_count()
+    logger.info(
+        "Aligned %d/%d vertices (%.1f%%) in %d shards",
+        aligned_count, len(aligned), aligned_count / len(aligned) * 100, len(shards),
+    )
+    return aligned
+
+
+_worker_axes: tuple | None = None
+
+
+def _init_align_worker(index_x, index_y, config, engine) -> None:
+    global _worker_axes
+    _worker_axes = (index_x, index_y, config, engine)
+    # Shard-level "Aligned N/M" lines would repeat the parent's summary
+    logger.setLevel(logging.WARNING)
+
+
+def _align_shard(shard: VertexArrays, elements: dict[int, ElementInfo]) -> AlignedVertexTable:
+    index_x, index_y, config, engine = _worker_axes
+    return align_elements_table(shard, elements, index_x, index_y, config, engine=engine)
+
+
+def _snap_axis_arrays(
+    coords: np.ndarray,
+    row_element: np.ndarray,
+    point_like: np.ndarray,
+    axis_index: AxisLineIndex,
+    config: PipelineConfig,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Snap one axis for rows grouped by element (row_element is non-decreasing).
+
+    Mirrors _compute_endpoint_snaps + _snap_vertex_coord: returns the
+    unrounded new coordinates and the snapped mask.
+    """
+    radius = config.cluster_radius
+    ep0, ep1, two = element_endpoints(coords, row_element, point_like, radius)
+    target0, found0 = _nearest_axis_positions(ep0, axis_index, config)
+    target1, found1 = _nearest_axis_positions(ep1, axis_index, config)
+
+    # assign_vertex_to_endpoint: the second endpoint only if strictly nearer
+    e = row_element
+    use1 = two[e] & (np.abs(coords - ep1[e]) < np.abs(coords - ep0[e]))
+    ep = np.where(use1, ep1[e], ep0[e])
+    target = np.where(use1, target1[e], target0[e])
+    found = np.where(use1, found1[e], found0[e])
+
+    snapped = np.where(np.abs(coords - ep) <= radius, target, coords + (target - ep))
+    return np.where(found, snapped, coords), found
+
+
+def element_endpoints(
+    coords: np.ndarray,
+    row_element: np.ndarray,
+    point_like: np.ndarray,
+    radius: float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """First and last endpoint of every element on one axis (identify_element_endpoints).
+
+    Returns (ep0, ep1, two) indexed by element rank; two marks elements
+    with more than one endpoint cluster (more than two are capped).
+    """
+    # Sort each element's coordinates, split where the gap exceeds
+    # cluster_radius (never, for point-like elements)
+    perm = np.lexsort((coords, row_element))
+    sorted_coords = coords[perm]
+    sorted_element = row_element[perm]
+    element_start = np.diff(sorted_element, prepend=-1) != 0
+    gap_break = ~(np.diff(sorted_coords, prepend=sorted_coords[0]) <= radius)
+    breaks = element_start | (gap_break & ~point_like[sorted_element])
+    cluster_starts = np.flatnonzero(breaks)
+    cluster_sizes = np.diff(np.append(cluster_starts, len(coords)))
+    means = segment_sums_like_python(sorted_coords, cluster_starts) / cluster_sizes
+
+    cluster_element = sorted_element[cluster_starts]
+    first_cluster = np.flatnonzero(np.diff(cluster_element, prepend=-1) != 0)
+    last_cluster = np.append(first_cluster[1:], len(cluster_starts)) - 1
+    return means[first_cluster], means[last_cluster], last_cluster > first_cluster
+
+
+def _nearest_axis_positions(
+    coords: np.ndarray,
+    axis_index: AxisLineIndex,
+    config: PipelineConfig,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Batched endpoint lookup for both tolerance tiers.
+
+    The outlier tier only widens the tolerance, and both tiers pick the
+    nearest line, so one query decides both. Returns (target position,
+    found mask).
+    """
+    idx, dist = axis_index.nearest_many(coords)
+    found = (dist <= config.max_snap_distance) | (dist <= config.outlier_snap_distance)
+    target = np.zeros(len(coords))
+    target[found] = axis_index.positions[idx[found]]
+    return target, found
+
+
 def _compute_endpoint_snaps(
     elem_verts: list[InputVertex],
     axis: str,
-    axis_lines: list[AxisLine],
+    axis_index: AxisLineIndex,
     config: PipelineConfig,
     max_endpoints: int = 2,
 ) -> list[tuple[float, float | None]]:
@@ -180,11 +539,11 @@ def _compute_endpoint_snaps(
     result: list[tuple[float, float | None]] = []
     for ep in endpoints:
         # Try normal snap distance first
-        target_line = find_nearest_axis_line(ep, axis_lines, config.max_snap_distance)
+        target_line = find_nearest_axis_line(ep, axis_index, config.max_snap_distance)
         if target_line is None:
             # Try outlier distance
             target_line = find_nearest_axis_line(
-                ep, axis_lines, config.outlier_snap_distance
+                ep, axis_index, config.outlier_snap_distance
             )
         target = target_line.position if target_line else None
         result.append((ep, target))
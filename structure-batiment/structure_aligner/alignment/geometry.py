@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import bisect
 import math
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Iterable
+
+import numpy as np
 
 if TYPE_CHECKING:
     from structure_aligner.config import AxisLine, Thread
@@ -44,43 +46,147 @@ def find_matching_thread(coord: float, threads: list[Thread], alpha: float) -> T
     return best_thread
 
 
+def match_threads(coords: np.ndarray, threads: list[Thread], alpha: float) -> np.ndarray:
+    """
+    Batched find_matching_thread(): the matching thread of every coordinate.
+
+    Thread references are sorted once and each coordinate is compared with
+    the nearest reference on either side (searchsorted); the match is the
+    closer of the two when within alpha. As in the scalar scan, ties go to
+    the thread listed first.
+
+    Args:
+        coords: 1D array of coordinate values.
+        threads: List of Thread objects for this axis.
+        alpha: Maximum allowed per-axis displacement.
+
+    Returns:
+        int64 array of indexes into threads, -1 where no thread matches.
+    """
+    coords = np.asarray(coords, dtype=np.float64)
+    result = np.full(len(coords), -1, dtype=np.int64)
+    if not threads or len(coords) == 0:
+        return result
+
+    # Equal references: only the first listed can ever win the scan
+    references, first = np.unique(np.array([t.reference for t in threads], dtype=np.float64), return_index=True)
+    above = np.searchsorted(references, coords)
+    left = np.clip(above - 1, 0, len(references) - 1)
+    right = np.clip(above, 0, len(references) - 1)
+    d_left = np.abs(coords - references[left])
+    d_right = np.abs(coords - references[right])
+    take_right = (d_right < d_left) | ((d_right == d_left) & (first[right] < first[left]))
+    best = np.where(take_right, right, left)
+    matched = np.where(take_right, d_right, d_left) <= alpha
+    result[matched] = first[best[matched]]
+    return result
+
+
 # =========================================================================
 # V2 geometry helpers for per-element snap
 # =========================================================================
 
 
+class AxisLineIndex:
+    """Axis lines of one axis, sorted once for nearest-line queries.
+
+    Build it once per axis and share it between callers; queries are
+    binary searches over the sorted positions. When a coordinate is
+    equidistant from two lines, the lower one wins.
+
+    Args:
+        axis_lines: Axis lines in any order.
+    """
+
+    __slots__ = ("lines", "positions", "_position_list")
+
+    def __init__(self, axis_lines: Iterable[AxisLine] = ()):
+        self.lines: tuple[AxisLine, ...] = tuple(sorted(axis_lines, key=lambda al: al.position))
+        self._position_list = [al.position for al in self.lines]
+        self.positions = np.array(self._position_list, dtype=np.float64)
+        self.positions.flags.writeable = False
+
+    @classmethod
+    def from_positions(cls, positions: Iterable[float], axis: str = "") -> AxisLineIndex:
+        """Index bare positions (e.g. reference axis positions)."""
+        from structure_aligner.config import AxisLine
+        return cls(AxisLine(axis, p, 0, 0) for p in positions)
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def nearest(self, coord: float, max_distance: float = math.inf) -> tuple[int, float] | None:
+        """
+        Nearest line to one coordinate.
+
+        Returns:
+            (index into lines, distance), or None if no line is within
+            max_distance.
+        """
+        positions = self._position_list
+        idx = bisect.bisect_left(positions, coord)
+        best: tuple[int, float] | None = None
+        for i in (idx - 1, idx):
+            if 0 <= i < len(positions):
+                dist = abs(coord - positions[i])
+                if dist <= max_distance and (best is None or dist < best[1]):
+                    best = (i, dist)
+        return best
+
+    def nearest_many(
+        self, coords: np.ndarray, max_distance: float = math.inf,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Batched nearest(): one searchsorted over all coordinates.
+
+        Returns:
+            (indices, distances). indices is -1 where no line is within
+            max_distance; distances is the distance to the nearest line
+            regardless (inf when the index is empty).
+        """
+        coords = np.asarray(coords, dtype=np.float64)
+        positions = self.positions
+        if len(positions) == 0:
+            return np.full(len(coords), -1, dtype=np.int64), np.full(len(coords), np.inf)
+
+        idx = np.searchsorted(positions, coords, side="left")
+        lo = np.maximum(idx - 1, 0)
+        hi = np.minimum(idx, len(positions) - 1)
+        d_lo = np.where(idx > 0, np.abs(coords - positions[lo]), np.inf)
+        d_hi = np.where(idx < len(positions), np.abs(coords - positions[hi]), np.inf)
+        pick_hi = d_hi < d_lo
+        nearest = np.where(pick_hi, hi, lo)
+        dist = np.where(pick_hi, d_hi, d_lo)
+        return np.where(dist <= max_distance, nearest, -1), dist
+
+
+def as_axis_index(axis_lines: list[AxisLine] | AxisLineIndex) -> AxisLineIndex:
+    """Return axis_lines as an AxisLineIndex, building one only if needed."""
+    if isinstance(axis_lines, AxisLineIndex):
+        return axis_lines
+    return AxisLineIndex(axis_lines)
+
+
 def find_nearest_axis_line(
     coord: float,
-    axis_lines: list[AxisLine],
+    axis_lines: list[AxisLine] | AxisLineIndex,
     max_distance: float,
 ) -> AxisLine | None:
     """Find nearest axis line within max_distance using binary search.
 
     Args:
         coord: The coordinate value to match.
-        axis_lines: Sorted list of AxisLine objects for this axis.
+        axis_lines: AxisLineIndex for this axis. A plain list is indexed
+            on every call, so callers querying repeatedly should build the
+            index once.
         max_distance: Maximum allowed distance.
 
     Returns:
         The nearest AxisLine, or None if none within max_distance.
     """
-    if not axis_lines:
-        return None
-
-    positions = [al.position for al in axis_lines]
-    idx = bisect.bisect_left(positions, coord)
-
-    best: AxisLine | None = None
-    best_dist = float("inf")
-
-    for i in (idx - 1, idx):
-        if 0 <= i < len(axis_lines):
-            dist = abs(coord - axis_lines[i].position)
-            if dist <= max_distance and dist < best_dist:
-                best = axis_lines[i]
-                best_dist = dist
-
-    return best
+    index = as_axis_index(axis_lines)
+    hit = index.nearest(coord, max_distance)
+    return index.lines[hit[0]] if hit is not None else None
 
 
 def identify_element_endpoints(
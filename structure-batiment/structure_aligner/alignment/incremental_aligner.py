@@ -0,0 +1,246 @@
+"""Incremental re-alignment for axis-line what-if edits.
+
+Adding, removing or moving one axis line only changes the snap of
+element endpoints within snap reach of it: an endpoint snaps to its
+nearest line, and only when that line is at most
+max(max_snap_distance, outlier_snap_distance) away. IncrementalAligner
+keeps a sorted index of every element's endpoints (they depend on the
+vertices and cluster_radius, not on the axis lines), looks up the
+endpoints within reach of each changed line, and re-snaps only the
+elements they belong to. The patched result equals a full
+align_elements_table() run against the new axis lines; verify() checks
+exactly that.
+
+Axis-line deltas are AxisLineDelta objects, as produced by
+IncrementalAxisDiscovery.apply(); a moved line is one removal plus one
+addition.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from structure_aligner.alignment.aligned_table import AlignedVertexTable, as_aligned_table
+from structure_aligner.alignment.element_aligner import (
+    POINT_TYPES,
+    SKIP_TYPES,
+    align_elements_arrays,
+    align_elements_table,
+    element_endpoints,
+)
+from structure_aligner.alignment.geometry import AxisLineIndex, as_axis_index
+from structure_aligner.analysis.incremental_axes import AxisLineDelta
+from structure_aligner.config import AlignedVertex, AxisLine, ElementInfo, PipelineConfig
+from structure_aligner.db.reader import VertexArrays
+
+logger = logging.getLogger(__name__)
+
+# Endpoint lookups are widened by this much so that rounding in
+# p - reach / p + reach never drops an endpoint at exactly reach;
+# re-snapping an extra element is harmless.
+_REACH_MARGIN = 1e-6
+
+
+@dataclass
+class RealignResult:
+    """Outcome of one IncrementalAligner.apply() call."""
+    aligned: AlignedVertexTable
+    changed_elements: list[int] = field(default_factory=list)  # output differs
+    resnapped_elements: int = 0  # candidates re-aligned
+
+
+class IncrementalAligner:
+    """An alignment result kept up to date under axis-line edits.
+
+    Args:
+        aligned: Previous align_elements() / align_elements_table() result.
+            It is copied; apply() patches the copy in place.
+        elements: Element metadata keyed by element_id.
+        axis_lines_x: X axis lines the result was aligned against.
+        axis_lines_y: Y axis lines the result was aligned against.
+        config: The configuration the result was aligned with.
+    """
+
+    def __init__(
+        self,
+        aligned: list[AlignedVertex] | AlignedVertexTable,
+        elements: dict[int, ElementInfo],
+        axis_lines_x: list[AxisLine] | AxisLineIndex,
+        axis_lines_y: list[AxisLine] | AxisLineIndex,
+        config: PipelineConfig,
+    ):
+        table = as_aligned_table(aligned)
+        self.elements = elements
+        self.config = config
+        self.index_x = as_axis_index(axis_lines_x)
+        self.index_y = as_axis_index(axis_lines_y)
+        self.reach = max(config.max_snap_distance, config.outlier_snap_distance)
+
+        # Columns apply() rewrites are copied; the rest are shared
+        self.aligned = AlignedVertexTable(
+            id=table.id, element_id=table.element_id, vertex_index=table.vertex_index,
+            x=table.x.copy(), y=table.y.copy(), z=table.z,
+            x_original=table.x_original, y_original=table.y_original, z_original=table.z_original,
+            axis_code=table.axis_code.copy(),
+            fil_x=table.fil_x, fil_y=table.fil_y, fil_z=table.fil_z,
+            displacement=table.displacement.copy(),
+            thread_ids=table.thread_ids,
+        )
+        # The input vertices, in result row order
+        self._vertices = VertexArrays(
+            id=table.id, element_id=table.element_id,
+            x=table.x_original, y=table.y_original, z=table.z_original,
+            vertex_index=table.vertex_index,
+        )
+
+        # Rows of each element: element k owns _element_rows[_starts[k]:_starts[k + 1]]
+        self._element_ids, element_of = np.unique(table.element_id, return_inverse=True)
+        self._element_rows = np.argsort(element_of, kind="stable")
+        self._starts = np.searchsorted(element_of[self._element_rows], np.arange(len(self._element_ids) + 1))
+
+        types = [elements[eid].type if eid in elements else None for eid in self._element_ids.tolist()]
+        skip = np.array([t in SKIP_TYPES for t in types], dtype=bool)
+        point_like = np.array([t in POINT_TYPES for t in types], dtype=bool)
+        self._endpoints_x = _EndpointIndex(table.x_original, element_of, point_like, skip, config)
+        self._endpoints_y = _EndpointIndex(table.y_original, element_of, point_like, skip, config)
+
+    @property
+    def axis_lines(self) -> tuple[list[AxisLine], list[AxisLine]]:
+        """Current (axis_lines_x, axis_lines_y), sorted by position."""
+        return list(self.index_x.lines), list(self.index_y.lines)
+
+    def apply(
+        self,
+        delta_x: AxisLineDelta | None = None,
+        delta_y: AxisLineDelta | None = None,
+    ) -> RealignResult:
+        """
+        Apply axis-line changes and re-snap the elements they can affect.
+
+        Returns:
+            RealignResult with the patched table (self.aligned) and the
+            element_ids whose aligned coordinates changed.
+
+        Raises:
+            ValueError: If a delta is for the wrong axis or removes a line
+                that is not part of the current axis lines. Nothing is
+                changed in that case.
+        """
+        index_x = _apply_delta(self.index_x, delta_x, "X")
+        index_y = _apply_delta(self.index_y, delta_y, "Y")
+        self.index_x, self.index_y = index_x, index_y
+
+        candidates = np.union1d(
+            self._endpoints_x.elements_near(_moved_positions(delta_x), self.reach),
+            self._endpoints_y.elements_near(_moved_positions(delta_y), self.reach),
+        )
+        if len(candidates) == 0:
+            return RealignResult(self.aligned)
+
+        rows = np.concatenate([
+            self._element_rows[self._starts[k]:self._starts[k + 1]] for k in candidates.tolist()
+        ])
+        subset = self._vertices.take(rows)
+        subset_elements = {
+            eid: self.elements[eid]
+            for eid in self._element_ids[candidates].tolist() if eid in self.elements
+        }
+        update = align_elements_arrays(subset, subset_elements, index_x, index_y, self.config)
+
+        table = self.aligned
+        target = rows[update.order]
+        new_code = update.snapped_x.astype(np.uint8) | (update.snapped_y.astype(np.uint8) << 1)
+        differs = (
+            (table.x[target] != update.x) | (table.y[target] != update.y)
+            | (table.axis_code[target] != new_code)
+        )
+        table.x[target] = update.x
+        table.y[target] = update.y
+        table.axis_code[target] = new_code
+        table.displacement[target] = update.displacement
+
+        changed = np.unique(table.element_id[target[differs]]).tolist()
+        logger.debug(
+            "Re-snapped %d elements (%d vertices), %d changed",
+            len(candidates), len(rows), len(changed),
+        )
+        return RealignResult(table, changed, len(candidates))
+
+    def verify(self) -> None:
+        """
+        Compare the maintained result with a full re-alignment.
+
+        Raises:
+            RuntimeError: If the two disagree.
+        """
+        full = align_elements_table(
+            self._vertices, self.elements, self.index_x, self.index_y, self.config,
+        )
+        # Re-aligning the result's own rows reproduces its row order
+        current = self.aligned
+        for name in ("id", "x", "y", "axis_code", "displacement"):
+            if not np.array_equal(getattr(full, name), getattr(current, name)):
+                raise RuntimeError(f"Incremental alignment diverged from a full re-alignment ({name})")
+
+
+# =========================================================================
+# Internal helpers
+# =========================================================================
+
+
+class _EndpointIndex:
+    """Sorted endpoint positions of one axis, each tagged with its element."""
+
+    def __init__(self, coords, element_of, point_like, skip, config: PipelineConfig):
+        if len(coords) == 0:
+            self.positions = np.zeros(0)
+            self.elements = np.zeros(0, dtype=np.int64)
+            return
+        ep0, ep1, two = element_endpoints(coords, element_of, point_like, config.cluster_radius)
+        # Dalles are never snapped, so they are never candidates
+        ranks = np.arange(len(ep0))
+        keep0 = ~skip
+        keep1 = two & ~skip
+        positions = np.concatenate([ep0[keep0], ep1[keep1]])
+        elements = np.concatenate([ranks[keep0], ranks[keep1]])
+        order = np.argsort(positions, kind="stable")
+        self.positions = positions[order]
+        self.elements = elements[order]
+
+    def elements_near(self, positions: list[float], reach: float) -> np.ndarray:
+        """Element ranks with an endpoint within reach of any of positions."""
+        if not positions:
+            return np.zeros(0, dtype=np.int64)
+        centers = np.asarray(positions, dtype=np.float64)
+        lo = np.searchsorted(self.positions, centers - reach - _REACH_MARGIN, side="left")
+        hi = np.searchsorted(self.positions, centers + reach + _REACH_MARGIN, side="right")
+        if not (hi > lo).any():
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate([self.elements[a:b] for a, b in zip(lo.tolist(), hi.tolist())]))
+
+
+def _apply_delta(index: AxisLineIndex, delta: AxisLineDelta | None, axis: str) -> AxisLineIndex:
+    if delta is None or delta.is_empty:
+        return index
+    if delta.axis != axis:
+        raise ValueError(f"Expected a {axis} axis-line delta, got {delta.axis}")
+    lines = list(index.lines)
+    for line in delta.removed:
+        try:
+            lines.remove(line)
+        except ValueError:
+            raise ValueError(f"Axis line {line} is not part of the current {axis} axis lines") from None
+    return AxisLineIndex(lines + list(delta.added))
+
+
+def _moved_positions(delta: AxisLineDelta | None) -> list[float]:
+    """Positions gained or lost; a line re-added at the same position is unchanged."""
+    if delta is None:
+        return []
+    removed = Counter(line.position for line in delta.removed)
+    added = Counter(line.position for line in delta.added)
+    return list((removed - added) + (added - removed))
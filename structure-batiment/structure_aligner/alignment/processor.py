@@ -3,19 +3,25 @@
 # See pipeline-v2 for the recommended entry point.
 
 import logging
+import numpy as np
 from structure_aligner.config import AlignmentConfig, Thread, AlignedVertex
-from structure_aligner.db.reader import InputVertex
-from structure_aligner.alignment.geometry import euclidean_displacement, find_matching_thread
+from structure_aligner.db.reader import InputVertex, VertexArrays
+from structure_aligner.alignment.aligned_table import AlignedVertexTable
+from structure_aligner.alignment.geometry import euclidean_displacement, find_matching_thread, match_threads
+from structure_aligner.utils.numeric import round_like_python, square_like_python
 
 logger = logging.getLogger(__name__)
 
+ALIGN_ENGINES = ("python", "numpy")
+
 
 def align_vertices(
-    vertices: list[InputVertex],
+    vertices: list[InputVertex] | VertexArrays,
     threads_x: list[Thread],
     threads_y: list[Thread],
     threads_z: list[Thread],
     config: AlignmentConfig,
+    engine: str = "numpy",
 ) -> list[AlignedVertex]:
     """
     Align all vertices to their nearest threads.
@@ -30,15 +36,26 @@ def align_vertices(
     within alpha. The 3D Euclidean displacement is computed for reporting only.
 
     Args:
-        vertices: Input vertices to align.
+        vertices: Input vertices to align (InputVertex records or VertexArrays).
         threads_x: Detected threads for X axis.
         threads_y: Detected threads for Y axis.
         threads_z: Detected threads for Z axis.
         config: Alignment configuration.
+        engine: "numpy" (all vertices matched per axis at once, see
+            align_vertices_table) or "python" (find_matching_thread per
+            vertex and axis). Results are identical.
 
     Returns:
         List of AlignedVertex with original and aligned coordinates.
+
+    Raises:
+        ValueError: If engine is not one of ALIGN_ENGINES.
     """
+    if engine not in ALIGN_ENGINES:
+        raise ValueError(f"Unknown align engine {engine!r}; expected one of {ALIGN_ENGINES}")
+    if engine == "numpy":
+        return align_vertices_table(vertices, threads_x, threads_y, threads_z, config).to_aligned_vertices()
+
     ndigits = config.rounding_ndigits
     aligned = []
     for v in vertices:
@@ -83,3 +100,61 @@ def align_vertices(
                 aligned_count / len(aligned) * 100 if aligned else 0)
 
     return aligned
+
+
+def align_vertices_table(
+    vertices: list[InputVertex] | VertexArrays,
+    threads_x: list[Thread],
+    threads_y: list[Thread],
+    threads_z: list[Thread],
+    config: AlignmentConfig,
+) -> AlignedVertexTable:
+    """align_vertices() for all vertices at once, returning an AlignedVertexTable.
+
+    Each axis is matched in one match_threads() call (sorted references
+    and searchsorted instead of a scan of every thread per vertex), so the
+    cost is O((V + T) log T) rather than O(V * T). Rounding and the
+    displacement follow round() and euclidean_displacement() exactly.
+    """
+    if not isinstance(vertices, VertexArrays):
+        vertices = VertexArrays.from_vertices(list(vertices))
+    ndigits = config.rounding_ndigits
+    n = len(vertices)
+
+    axis_code = np.zeros(n, dtype=np.uint8)
+    thread_ids: list[str] = []
+    snapped: dict[str, np.ndarray] = {}
+    fils: dict[str, np.ndarray] = {}
+    for bit, axis, coords, threads in (
+        (1, "x", vertices.x, threads_x), (2, "y", vertices.y, threads_y), (4, "z", vertices.z, threads_z),
+    ):
+        match = match_threads(coords, threads, config.alpha)
+        matched = match >= 0
+        references = np.array([t.reference for t in threads] + [np.nan], dtype=np.float64)
+        snapped[axis] = np.where(matched, references[match], coords)
+        fils[axis] = np.where(matched, match + len(thread_ids), -1).astype(np.int32)
+        axis_code[matched] |= bit
+        thread_ids += [t.fil_id for t in threads]
+
+    # euclidean_displacement(): sqrt((x2 - x1)**2 + (y2 - y1)**2 + (z2 - z1)**2)
+    displacement = np.sqrt(
+        square_like_python(snapped["x"] - vertices.x)
+        + square_like_python(snapped["y"] - vertices.y)
+        + square_like_python(snapped["z"] - vertices.z)
+    )
+    table = AlignedVertexTable(
+        id=vertices.id, element_id=vertices.element_id, vertex_index=vertices.vertex_index,
+        x=round_like_python(snapped["x"], ndigits),
+        y=round_like_python(snapped["y"], ndigits),
+        z=round_like_python(snapped["z"], ndigits),
+        x_original=vertices.x, y_original=vertices.y, z_original=vertices.z,
+        axis_code=axis_code,
+        fil_x=fils["x"], fil_y=fils["y"], fil_z=fils["z"],
+        displacement=round_like_python(displacement, 6),
+        thread_ids=tuple(thread_ids),
+    )
+
+    aligned_count = table.aligned_count()
+    logger.info("Aligned %d/%d vertices (%.1f%%)", aligned_count, n,
+                aligned_count / n * 100 if n else 0)
+    return table
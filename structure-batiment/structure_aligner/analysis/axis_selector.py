@@ -10,16 +10,26 @@ from __future__ import annotations
 import logging
 import math
 from collections import defaultdict
+from dataclasses import dataclass
+
+import numpy as np
 
 from structure_aligner.config import AxisLine, PipelineConfig
-from structure_aligner.db.reader import InputVertex
+from structure_aligner.db.reader import InputVertex, VertexArrays
+from structure_aligner.utils.numeric import round_like_python
 
 logger = logging.getLogger(__name__)
 
+AXIS_ENGINES = ("python", "numpy")
+
+# Distinct floors per group are tracked as bits of a uint64 when they fit
+_MASK_BITS = 64
+
 
 def discover_axis_lines(
-    vertices: list[InputVertex],
+    vertices: list[InputVertex] | VertexArrays,
     config: PipelineConfig,
+    engine: str = "numpy",
 ) -> tuple[list[AxisLine], list[AxisLine]]:
     """Discover canonical axis line positions from vertex data.
 
@@ -32,19 +42,42 @@ def discover_axis_lines(
     4. Return sorted (axis_lines_x, axis_lines_y)
 
     Args:
-        vertices: All vertices from the before file.
+        vertices: All vertices from the before file, as InputVertex
+            records or columnar VertexArrays.
         config: Pipeline configuration.
+        engine: "numpy" (sort/searchsorted/segment reductions over arrays)
+            or "python" (per-vertex dict/set pass). Results are identical.
 
     Returns:
         Tuple of (x_axis_lines, y_axis_lines), each sorted by position.
+
+    Raises:
+        ValueError: If engine is not one of AXIS_ENGINES.
     """
-    # Collect (coordinate, z) pairs for each axis
-    x_pairs: list[tuple[float, float]] = []
-    y_pairs: list[tuple[float, float]] = []
+    if engine not in AXIS_ENGINES:
+        raise ValueError(f"Unknown axis engine {engine!r}; expected one of {AXIS_ENGINES}")
+
+    if engine == "numpy":
+        groups_x, groups_y = group_axis_positions(vertices, config)
+        axis_x = groups_x.axis_lines(config.cluster_radius, config.min_floors)
+        axis_y = groups_y.axis_lines(config.cluster_radius, config.min_floors)
+        logger.info(
+            "Discovered %d X axis lines and %d Y axis lines (min_floors=%d)",
+            len(axis_x), len(axis_y), config.min_floors,
+        )
+        return axis_x, axis_y
 
-    for v in vertices:
-        x_pairs.append((v.x, v.z))
-        y_pairs.append((v.y, v.z))
+    # Collect (coordinate, z) pairs for each axis
+    if isinstance(vertices, VertexArrays):
+        zs = vertices.z.tolist()
+        x_pairs = list(zip(vertices.x.tolist(), zs))
+        y_pairs = list(zip(vertices.y.tolist(), zs))
+    else:
+        x_pairs: list[tuple[float, float]] = []
+        y_pairs: list[tuple[float, float]] = []
+        for v in vertices:
+            x_pairs.append((v.x, v.z))
+            y_pairs.append((v.y, v.z))
 
     axis_x = _discover_for_axis(
         "X", x_pairs, config.cluster_radius, config.min_floors,
@@ -83,13 +116,13 @@ def _discover_for_axis(
     4. For each group, count distinct Z-levels (using floor matching).
     5. Filter: keep positions with floor_count >= min_floors.
     """
-    ndigits = _precision_ndigits(rounding_precision)
+    ndigits = precision_ndigits(rounding_precision)
 
     # Step 1-2: Group by rounded coordinate
     groups: dict[float, dict] = defaultdict(lambda: {"z_set": set(), "count": 0})
     for coord, z in coord_z_pairs:
         rounded = round(coord, ndigits)
-        groups[rounded]["z_set"].add(_match_floor(z, floor_z_levels, floor_match_tolerance))
+        groups[rounded]["z_set"].add(match_floor(z, floor_z_levels, floor_match_tolerance))
         groups[rounded]["count"] += 1
 
     # Step 3: Merge nearby groups within cluster_radius
@@ -114,7 +147,7 @@ def _discover_for_axis(
     return result
 
 
-def _match_floor(
+def match_floor(
     z: float, floor_z_levels: tuple[float, ...], tolerance: float = 0.02
 ) -> float | None:
     """Match a Z value to the nearest floor level within tolerance."""
@@ -176,6 +209,321 @@ def _merge_nearby(
     return merged
 
 
-def _precision_ndigits(precision: float) -> int:
+# =========================================================================
+# NumPy engine
+# =========================================================================
+
+
+@dataclass(frozen=True)
+class AxisGroups:
+    """One axis's vertices grouped by rounded coordinate (steps 1-2).
+
+    Depends only on rounding_precision and the floor settings, so a single
+    instance answers axis_lines() for any cluster_radius and min_floors.
+
+    Attributes:
+        axis: "X" or "Y".
+        positions: Sorted distinct rounded coordinates (each keeps the
+            bits of its first occurrence, e.g. -0.0 vs 0.0).
+        counts: Vertices per position.
+        floor_masks: Per position, a uint64 with bit f set when floor code
+            f occurs there; None when there are more than 64 floor codes.
+        floor_pairs: Distinct (position index, floor code) rows, used
+            instead of floor_masks when there are too many floors.
+    """
+    axis: str
+    positions: np.ndarray
+    counts: np.ndarray
+    floor_masks: np.ndarray | None = None
+    floor_pairs: np.ndarray | None = None
+
+    def axis_lines(self, cluster_radius: float, min_floors: int) -> list[AxisLine]:
+        """Merge positions within cluster_radius and keep those on >= min_floors floors."""
+        if len(self.positions) == 0:
+            return []
+
+        # Step 3: fixed windows anchored at the first position of each window
+        window_of_group = _merge_windows(self.positions, cluster_radius)
+        starts = np.flatnonzero(np.diff(window_of_group, prepend=-1))
+        window_counts = np.add.reduceat(self.counts, starts)
+
+        # Representative = first position with the window's highest count
+        window_max = np.maximum.reduceat(self.counts, starts)
+        first_max = np.flatnonzero(self.counts == window_max[window_of_group])
+        _, first_in_window = np.unique(window_of_group[first_max], return_index=True)
+        best_positions = self.positions[first_max[first_in_window]]
+
+        # Step 4: distinct matched floors per window
+        if self.floor_masks is not None:
+            floor_counts = _popcount(np.bitwise_or.reduceat(self.floor_masks, starts))
+        else:
+            floor_counts = _count_distinct_pairs(
+                window_of_group[self.floor_pairs[:, 0]], self.floor_pairs[:, 1], len(starts),
+            )
+
+        # Step 5: filter (windows are already in position order)
+        keep = np.flatnonzero(floor_counts >= min_floors)
+        return [
+            AxisLine(axis=self.axis, position=pos, floor_count=fc, vertex_count=vc)
+            for pos, fc, vc in zip(
+                best_positions[keep].tolist(),
+                floor_counts[keep].tolist(),
+                window_counts[keep].tolist(),
+            )
+        ]
+
+
+def group_axis_positions(
+    vertices: list[InputVertex] | VertexArrays,
+    config: PipelineConfig,
+) -> tuple[AxisGroups, AxisGroups]:
+    """Run the configuration-independent half of the numpy engine.
+
+    Rounds X and Y to config.rounding_precision and matches Z to
+    config.floor_z_levels once. Callers that evaluate several
+    cluster_radius / min_floors values (e.g. a parameter sweep) reuse the
+    result instead of rescanning the vertices.
+
+    Returns:
+        (groups_x, groups_y).
+    """
+    if isinstance(vertices, VertexArrays):
+        xs, ys, zs = vertices.x, vertices.y, vertices.z
+    else:
+        xs = np.array([v.x for v in vertices], dtype=np.float64)
+        ys = np.array([v.y for v in vertices], dtype=np.float64)
+        zs = np.array([v.z for v in vertices], dtype=np.float64)
+    floors = match_floors(zs, config.floor_z_levels, config.floor_match_tolerance)
+    ndigits = precision_ndigits(config.rounding_precision)
+    return (
+        _group_axis("X", xs, floors, ndigits),
+        _group_axis("Y", ys, floors, ndigits),
+    )
+
+
+class AxisGroupAccumulator:
+    """group_axis_positions() over vertices fed in chunks.
+
+    Each chunk is reduced to its distinct rounded positions (with vertex
+    counts) and distinct (position, floor) pairs; reduced chunks are
+    merged into the running state once they outgrow it, so memory follows
+    the number of distinct positions rather than the number of vertices.
+    Feeding the chunks of an id-ordered scan gives the same groups as one
+    group_axis_positions() call on the whole vertex set.
+
+    Args:
+        config: Pipeline configuration (rounding and floor matching are used).
+    """
+
+    def __init__(self, config: PipelineConfig):
+        self.config = config
+        self.vertex_count = 0
+        self._ndigits = precision_ndigits(config.rounding_precision)
+        # Floor value -> code, shared by every chunk
+        self._floor_codes: dict[float, int] = {}
+        # Per axis: merged state first, then reduced chunks not merged yet
+        self._parts: dict[str, list[tuple]] = {"X": [], "Y": []}
+
+    def add(self, vertices: VertexArrays) -> None:
+        """Fold one chunk of vertices into the groups."""
+        if len(vertices) == 0:
+            return
+        floors = self._floor_codes_of(vertices.z)
+        for axis, coords in (("X", vertices.x), ("Y", vertices.y)):
+            parts = self._parts[axis]
+            parts.append(_reduce_axis_chunk(round_like_python(coords, self._ndigits), floors))
+            # Merging only when the pending chunks outgrow the state keeps
+            # the total merge cost proportional to the final state size
+            if sum(len(part[0]) for part in parts[1:]) >= len(parts[0][0]):
+                self._parts[axis] = [self._merged(axis)]
+        self.vertex_count += len(vertices)
+
+    def groups(self) -> tuple[AxisGroups, AxisGroups]:
+        """(groups_x, groups_y) for every vertex added so far."""
+        result = []
+        for axis in ("X", "Y"):
+            self._parts[axis] = [self._merged(axis)]
+            positions, counts, pairs = self._parts[axis][0]
+            result.append(_build_axis_groups(axis, positions, counts, pairs[:, 0], pairs[:, 1]))
+        return result[0], result[1]
+
+    def _merged(self, axis: str) -> tuple:
+        parts = self._parts[axis]
+        if not parts:
+            return np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.int64), np.zeros((0, 2), dtype=np.int64)
+        if len(parts) == 1:
+            return parts[0]
+        return _merge_axis_parts(parts, len(self._floor_codes))
+
+    def _floor_codes_of(self, zs: np.ndarray) -> np.ndarray:
+        """match_floors() codes translated to codes stable across chunks."""
+        levels = self.config.floor_z_levels
+        local = match_floors(zs, levels, self.config.floor_match_tolerance)
+        if levels:
+            values = np.unique(np.asarray(levels, dtype=np.float64))
+        else:
+            values = np.unique(round_like_python(zs, 1))
+        # Trailing -1 so that local code -1 (no floor) maps to itself
+        lookup = np.array(
+            [self._floor_codes.setdefault(v, len(self._floor_codes)) for v in values.tolist()] + [-1],
+            dtype=np.int64,
+        )
+        return lookup[local]
+
+
+def _reduce_axis_chunk(rounded: np.ndarray, floors: np.ndarray) -> tuple:
+    """(positions, counts, distinct (position index, floor code) pairs) of one chunk."""
+    _, first, group_of, counts = np.unique(
+        rounded, return_index=True, return_inverse=True, return_counts=True,
+    )
+    matched = floors >= 0
+    return rounded[first], counts, _unique_pairs(group_of[matched], floors[matched], int(floors.max()) + 1)
+
+
+def _merge_axis_parts(parts: list[tuple], n_codes: int) -> tuple:
+    """Merge reduced chunks, given in vertex order, into one reduced chunk."""
+    # Earlier parts come first, so on -0.0 vs 0.0 the first occurrence's bits are kept
+    combined = np.concatenate([part[0] for part in parts])
+    _, first, merged_of = np.unique(combined, return_index=True, return_inverse=True)
+    counts = np.zeros(len(first), dtype=np.int64)
+    np.add.at(counts, merged_of, np.concatenate([part[1] for part in parts]))
+
+    groups, codes, offset = [], [], 0
+    for positions, _, pairs in parts:
+        groups.append(merged_of[offset:offset + len(positions)][pairs[:, 0]])
+        codes.append(pairs[:, 1])
+        offset += len(positions)
+    pairs = _unique_pairs(np.concatenate(groups), np.concatenate(codes), n_codes)
+    return combined[first], counts, pairs
+
+
+def _unique_pairs(groups: np.ndarray, codes: np.ndarray, n_codes: int) -> np.ndarray:
+    """Distinct (group, code) rows, sorted; codes must be in [0, n_codes)."""
+    keys = np.unique(groups.astype(np.int64) * max(n_codes, 1) + codes)
+    return np.stack([keys // max(n_codes, 1), keys % max(n_codes, 1)], axis=1)
+
+
+def _group_axis(axis_name: str, coords: np.ndarray, floors: np.ndarray, ndigits: int) -> AxisGroups:
+    """Steps 1-2 for one axis, given per-vertex floor codes from match_floors."""
+    # Like the dict keys of the python engine, a group's value is its first
+    # occurrence (this matters for -0.0 vs 0.0).
+    rounded = round_like_python(coords, ndigits)
+    _, first, group_of, counts = np.unique(
+        rounded, return_index=True, return_inverse=True, return_counts=True,
+    )
+    positions = rounded[first]
+
+    matched = floors >= 0
+    return _build_axis_groups(axis_name, positions, counts, group_of[matched], floors[matched])
+
+
+def _build_axis_groups(
+    axis_name: str,
+    positions: np.ndarray,
+    counts: np.ndarray,
+    groups: np.ndarray,
+    codes: np.ndarray,
+) -> AxisGroups:
+    """AxisGroups from per-position counts and (position index, floor code) occurrences."""
+    if len(codes) == 0 or int(codes.max()) < _MASK_BITS:
+        masks = np.zeros(len(positions), dtype=np.uint64)
+        np.bitwise_or.at(masks, groups, np.left_shift(np.uint64(1), codes.astype(np.uint64)))
+        return AxisGroups(axis_name, positions, counts, floor_masks=masks)
+
+    # Too many floors for a bitmask: keep the distinct (group, floor) pairs
+    pairs = np.unique(np.stack([groups, codes], axis=1), axis=0)
+    return AxisGroups(axis_name, positions, counts, floor_pairs=pairs)
+
+
+def match_floors(
+    zs: np.ndarray,
+    floor_z_levels: tuple[float, ...],
+    tolerance: float,
+) -> np.ndarray:
+    """Vectorized match_floor returning a floor code per vertex (-1 = no match).
+
+    Codes identify distinct floor values: equal levels share a code, and
+    with no floor levels the code is that of round(z, 1).
+    """
+    zs = np.asarray(zs, dtype=np.float64)
+    if not floor_z_levels:
+        _, codes = np.unique(round_like_python(zs, 1), return_inverse=True)
+        return codes.astype(np.int64)
+
+    # Codes index the distinct level values in ascending order
+    unique_levels = np.unique(np.asarray(floor_z_levels, dtype=np.float64))
+    n = len(unique_levels)
+
+    # Nearest candidates on either side; |z - level| is monotone on each side
+    hi = np.clip(np.searchsorted(unique_levels, zs), 0, n - 1)
+    lo = np.clip(hi - 1, 0, n - 1)
+    d_lo = np.abs(zs - unique_levels[lo])
+    d_hi = np.abs(zs - unique_levels[hi])
+    best = np.where(d_hi < d_lo, hi, lo)
+    d_best = np.minimum(d_lo, d_hi)
+
+    # Rows whose minimum distance is shared by several levels: min() picks the
+    # earliest in tuple order, so resolve them against the original tuple.
+    tied = (d_lo == d_hi) & (lo != hi)
+    lo2 = np.clip(lo - 1, 0, n - 1)
+    hi2 = np.clip(hi + 1, 0, n - 1)
+    tied |= (lo2 != lo) & (np.abs(zs - unique_levels[lo2]) == d_best)
+    tied |= (hi2 != hi) & (np.abs(zs - unique_levels[hi2]) == d_best)
+    for i in np.flatnonzero(tied).tolist():
+        z = float(zs[i])
+        match = min(floor_z_levels, key=lambda fz: abs(z - fz))
+        best[i] = np.searchsorted(unique_levels, match)
+
+    codes = best.astype(np.int64)
+    codes[~(np.abs(zs - unique_levels[best]) <= tolerance)] = -1
+    return codes
+
+
+def _merge_windows(positions: np.ndarray, cluster_radius: float) -> np.ndarray:
+    """Window id per sorted position, as in _merge_nearby.
+
+    A window starts at an anchor and takes every following position p with
+    p - anchor <= cluster_radius; the next position starts a new window.
+    """
+    n = len(positions)
+    # First index j with positions[j] - positions[i] > radius, via searchsorted
+    # then corrected with the exact subtraction the scalar loop uses.
+    nxt = np.searchsorted(positions, positions + cluster_radius, side="right")
+    idx = np.arange(n)
+    while True:
+        back = (nxt - 1 > idx) & ~(positions[nxt - 1] - positions <= cluster_radius)
+        if not back.any():
+            break
+        nxt[back] -= 1
+    while True:
+        fwd = (nxt < n) & (positions[np.minimum(nxt, n - 1)] - positions <= cluster_radius)
+        if not fwd.any():
+            break
+        nxt[fwd] += 1
+
+    window_of = np.empty(n, dtype=np.int64)
+    anchor, window = 0, 0
+    nxt_list = nxt.tolist()
+    while anchor < n:
+        stop = nxt_list[anchor]
+        window_of[anchor:stop] = window
+        anchor, window = stop, window + 1
+    return window_of
+
+
+def _count_distinct_pairs(windows: np.ndarray, codes: np.ndarray, n_windows: int) -> np.ndarray:
+    """Number of distinct floor codes per window, from (window, code) rows."""
+    pairs = np.unique(np.stack([windows, codes], axis=1), axis=0)
+    return np.bincount(pairs[:, 0], minlength=n_windows).astype(np.int64)
+
+
+def _popcount(masks: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(masks).astype(np.int64)
+    bits = np.unpackbits(masks.view(np.uint8).reshape(-1, 8), axis=1)
+    return bits.sum(axis=1).astype(np.int64)
+
+
+def precision_ndigits(precision: float) -> int:
     """Convert precision to number of decimal digits."""
     return max(0, math.ceil(-math.log10(precision)))
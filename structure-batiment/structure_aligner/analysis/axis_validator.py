@@ -2,15 +2,16 @@
 
 from __future__ import annotations
 
-import bisect
 import logging
 import math
 from collections import defaultdict
 from pathlib import Path
 
-import rhino3dm
+import numpy as np
 
+from structure_aligner.alignment.geometry import AxisLineIndex, as_axis_index
 from structure_aligner.config import AxisLine
+from structure_aligner.etl.extraction_cache import load_vertex_table
 
 logger = logging.getLogger(__name__)
 
@@ -39,54 +40,59 @@ def validate_against_reference(
     Returns:
         Dict with comparison metrics.
     """
-    reference_positions = _extract_axis_positions(
+    reference_positions = extract_axis_positions(
         reference_3dm_path, axis, tolerance, min_vertex_count,
     )
-    discovered_positions = sorted(a.position for a in discovered)
-
-    matched_ref = 0
-    unmatched_reference = []
-    for ref_pos in reference_positions:
-        if _has_match(ref_pos, discovered_positions, tolerance):
-            matched_ref += 1
-        else:
-            unmatched_reference.append(ref_pos)
-
-    matched_disc = 0
-    unmatched_discovered = []
-    ref_sorted = sorted(reference_positions)
-    for disc_pos in discovered_positions:
-        if _has_match(disc_pos, ref_sorted, tolerance):
-            matched_disc += 1
-        else:
-            unmatched_discovered.append(disc_pos)
+    result = compare_axis_positions(discovered, reference_positions, axis, tolerance)
+
+    logger.info(
+        "%s axis: %d discovered, %d reference, %d matched (recall=%.1f%%, precision=%.1f%%)",
+        axis, result["discovered_count"], result["reference_count"], result["matched"],
+        result["recall"] * 100, result["precision"] * 100,
+    )
+
+    return result
+
+
+def compare_axis_positions(
+    discovered: list[AxisLine] | AxisLineIndex,
+    reference_positions: list[float],
+    axis: str,
+    tolerance: float = 0.005,
+) -> dict:
+    """Match discovered axis lines against already-extracted reference positions.
+
+    Same metrics as validate_against_reference(), for callers that compare
+    many discovery results against one reference (see extract_axis_positions).
+    """
+    discovered_index = as_axis_index(discovered)
+    reference_index = AxisLineIndex.from_positions(reference_positions, axis)
+    discovered_positions = discovered_index.positions
+
+    ref_hit, _ = discovered_index.nearest_many(reference_positions, tolerance)
+    matched_ref = int(np.count_nonzero(ref_hit >= 0))
+    unmatched_reference = [p for p, i in zip(reference_positions, ref_hit.tolist()) if i < 0]
+
+    disc_hit, _ = reference_index.nearest_many(discovered_positions, tolerance)
+    matched_disc = int(np.count_nonzero(disc_hit >= 0))
+    unmatched_discovered = discovered_positions[disc_hit < 0].tolist()
 
     ref_count = len(reference_positions)
     disc_count = len(discovered_positions)
 
-    recall = matched_ref / ref_count if ref_count > 0 else 0.0
-    precision = matched_disc / disc_count if disc_count > 0 else 0.0
-
-    result = {
+    return {
         "axis": axis,
         "discovered_count": disc_count,
         "reference_count": ref_count,
         "matched": matched_ref,
-        "recall": recall,
-        "precision": precision,
+        "recall": matched_ref / ref_count if ref_count > 0 else 0.0,
+        "precision": matched_disc / disc_count if disc_count > 0 else 0.0,
         "unmatched_reference": unmatched_reference,
         "unmatched_discovered": unmatched_discovered,
     }
 
-    logger.info(
-        "%s axis: %d discovered, %d reference, %d matched (recall=%.1f%%, precision=%.1f%%)",
-        axis, disc_count, ref_count, matched_ref, recall * 100, precision * 100,
-    )
-
-    return result
-
 
-def _extract_axis_positions(
+def extract_axis_positions(
     path_3dm: Path,
     axis: str,
     dedup_tolerance: float = 0.005,
@@ -97,24 +103,18 @@ def _extract_axis_positions(
     An axis-line position is one where many vertices sit (>= min_vertex_count).
     Positions with few vertices are typically from added geometry (consolidated
     dalles, simplified voiles) and not structural axis lines.
+
+    Vertices come from the extraction cache, so repeated validations against
+    the same reference file do not decode it again.
     """
-    model = rhino3dm.File3dm.Read(str(path_3dm))
-    if model is None:
-        raise RuntimeError(f"Failed to read 3dm file: {path_3dm}")
+    table = load_vertex_table(path_3dm)
+    coords = table.x if axis == "X" else table.y
 
     # Count vertices at each position
     ndigits = max(0, math.ceil(-math.log10(dedup_tolerance)))
     position_counts: dict[float, int] = defaultdict(int)
-
-    for obj in model.Objects:
-        name = obj.Attributes.Name
-        if not name:
-            continue
-        geom = obj.Geometry
-        coords = _extract_coords(geom, axis)
-        for c in coords:
-            rounded = round(c, ndigits)
-            position_counts[rounded] += 1
+    for c in coords.tolist():
+        position_counts[round(c, ndigits)] += 1
 
     # Filter by minimum vertex count
     axis_positions = sorted(
@@ -126,37 +126,6 @@ def _extract_axis_positions(
     return _dedup_positions(axis_positions, dedup_tolerance)
 
 
-def _extract_coords(geom, axis: str) -> list[float]:
-    """Extract X or Y coordinates from a geometry object."""
-    points = []
-
-    if isinstance(geom, rhino3dm.Brep):
-        for vi in range(len(geom.Vertices)):
-            v = geom.Vertices[vi]
-            loc = v.Location
-            points.append(loc.X if axis == "X" else loc.Y)
-
-    elif isinstance(geom, rhino3dm.LineCurve):
-        for p in [geom.PointAtStart, geom.PointAtEnd]:
-            points.append(p.X if axis == "X" else p.Y)
-
-    elif isinstance(geom, rhino3dm.PolylineCurve):
-        for pi in range(geom.PointCount):
-            p = geom.Point(pi)
-            points.append(p.X if axis == "X" else p.Y)
-
-    elif isinstance(geom, rhino3dm.NurbsCurve):
-        for pi in range(len(geom.Points)):
-            p = geom.Points[pi]
-            points.append(p.X if axis == "X" else p.Y)
-
-    elif isinstance(geom, rhino3dm.Point):
-        loc = geom.Location
-        points.append(loc.X if axis == "X" else loc.Y)
-
-    return points
-
-
 def _dedup_positions(sorted_positions: list[float], tolerance: float) -> list[float]:
     """Remove duplicate positions within tolerance, keeping the first."""
     if not sorted_positions:
@@ -167,15 +136,3 @@ def _dedup_positions(sorted_positions: list[float], tolerance: float) -> list[fl
         if pos - result[-1] > tolerance:
             result.append(pos)
     return result
-
-
-def _has_match(value: float, sorted_list: list[float], tolerance: float) -> bool:
-    """Check if value has a match in sorted_list within tolerance."""
-    if not sorted_list:
-        return False
-    idx = bisect.bisect_left(sorted_list, value - tolerance)
-    if idx < len(sorted_list) and abs(sorted_list[idx] - value) <= tolerance:
-        return True
-    if idx > 0 and abs(sorted_list[idx - 1] - value) <= tolerance:
-        return True
-    return False
@@ -4,16 +4,28 @@
 
 import logging
 import numpy as np
-from sklearn.cluster import DBSCAN
 from structure_aligner.config import AlignmentConfig
 
 logger = logging.getLogger(__name__)
 
+# "sorted_gap": native 1-D DBSCAN (sort + neighbourhood bounds + scans).
+# "dbscan": scikit-learn DBSCAN, kept as a fallback. Labels are identical.
+CLUSTER_ENGINES = ("sorted_gap", "dbscan")
+
+# scikit-learn's DBSCAN computes brute-force distances below this many
+# values (its 5 neighbours reach half the data) and uses a KD-tree from
+# there on. The two round differently for pairs exactly eps apart;
+# sorted_gap reproduces the KD-tree test, so smaller inputs go to
+# scikit-learn, where they cost next to nothing.
+_BRUTE_FORCE_BELOW = 12
+
 
 def cluster_axis(values: np.ndarray, config: AlignmentConfig) -> list[dict]:
     """
     Run DBSCAN clustering on a single axis's coordinate values, then
     validate that all cluster points are within alpha of the cluster centroid.
+    config.cluster_engine selects how the DBSCAN labels are computed (see
+    CLUSTER_ENGINES); the clusters are the same either way.
 
     DBSCAN with eps=alpha guarantees density-reachability, but NOT that all
     points in a cluster are within alpha of the centroid (chaining effect).
@@ -31,18 +43,22 @@ def cluster_axis(values: np.ndarray, config: AlignmentConfig) -> list[dict]:
           - "mean": mean value of the cluster (centroid)
           - "std": standard deviation of the cluster
         All returned cluster points are guaranteed within alpha of their centroid.
+
+    Raises:
+        ValueError: If config.cluster_engine is not one of CLUSTER_ENGINES,
+            alpha is not positive, or values are not finite.
     """
-    # DBSCAN needs 2D input
-    X = values.reshape(-1, 1)
-    db = DBSCAN(eps=config.alpha, min_samples=config.min_cluster_size).fit(X)
+    labels = dbscan_labels(values, config.alpha, config.min_cluster_size, config.cluster_engine)
 
+    # Indices of each cluster in ascending order, as np.where(labels == label) gives
+    order = np.argsort(labels, kind="stable")
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
     clusters = []
-    for label in sorted(set(db.labels_)):
+    for cluster_indices in np.split(order, bounds):
+        label = int(labels[cluster_indices[0]]) if len(cluster_indices) else -1
         if label == -1:
             continue  # Noise points (isolated vertices)
-        mask = db.labels_ == label
-        cluster_values = values[mask]
-        cluster_indices = np.where(mask)[0]
+        cluster_values = values[cluster_indices]
 
         # Post-clustering validation: prune points > alpha from centroid
         centroid = float(np.mean(cluster_values))
@@ -57,9 +73,10 @@ def cluster_axis(values: np.ndarray, config: AlignmentConfig) -> list[dict]:
                 label, pruned_count, len(cluster_values), config.alpha, centroid,
             )
 
-        # Recompute centroid after pruning
+        # Recompute centroid after pruning (unchanged if nothing was pruned)
         if len(valid_values) >= config.min_cluster_size:
-            centroid = float(np.mean(valid_values))
+            if pruned_count > 0:
+                centroid = float(np.mean(valid_values))
             clusters.append({
                 "indices": valid_indices,
                 "values": valid_values,
@@ -73,3 +90,128 @@ def cluster_axis(values: np.ndarray, config: AlignmentConfig) -> list[dict]:
             )
 
     return clusters
+
+
+def dbscan_labels(
+    values: np.ndarray,
+    eps: float,
+    min_samples: int,
+    engine: str = "sorted_gap",
+) -> np.ndarray:
+    """
+    DBSCAN cluster labels of 1-D values (-1 for noise).
+
+    Args:
+        values: 1D array of coordinate values.
+        eps: Neighbourhood radius (inclusive).
+        min_samples: Neighbours, the point included, that make a core point.
+        engine: One of CLUSTER_ENGINES.
+
+    Returns:
+        int64 label per value. Labels are numbered in scikit-learn's
+        discovery order (by the lowest index of each cluster's core points).
+
+    Raises:
+        ValueError: If engine is unknown, eps is not positive or values are
+            not finite.
+    """
+    if engine not in CLUSTER_ENGINES:
+        raise ValueError(f"Unknown cluster engine {engine!r}; expected one of {CLUSTER_ENGINES}")
+    values = np.asarray(values, dtype=np.float64)
+    if engine == "sorted_gap":
+        if not eps > 0:
+            raise ValueError(f"eps must be positive, got {eps}")
+        if not np.isfinite(values).all():
+            raise ValueError("Input contains NaN or infinity")
+        if not 0 < len(values) < _BRUTE_FORCE_BELOW:
+            return _sorted_gap_labels(values, eps, min_samples)
+
+    from sklearn.cluster import DBSCAN
+
+    # DBSCAN needs 2D input
+    db = DBSCAN(eps=eps, min_samples=min_samples).fit(values.reshape(-1, 1))
+    return db.labels_.astype(np.int64)
+
+
+def _sorted_gap_labels(values: np.ndarray, eps: float, min_samples: int) -> np.ndarray:
+    """DBSCAN on sorted 1-D values.
+
+    Two values are neighbours when (a - b) ** 2 <= eps ** 2 in float64,
+    the test scikit-learn's KD-tree applies. The test is monotone along
+    the sorted values, so each neighbourhood is a contiguous range
+    [lo, hi): searchsorted gives it up to rounding, and the ends are then
+    corrected with the exact test. Core points whose sorted neighbours are
+    within eps form one cluster; a border point joins the earliest
+    discovered cluster among those of its nearest core on either side.
+    """
+    n = len(values)
+    labels = np.full(n, -1, dtype=np.int64)
+    if n == 0:
+        return labels
+    r = eps * eps
+    order = np.argsort(values, kind="stable")
+    s = values[order]
+    rows = np.arange(n)
+
+    hi = np.searchsorted(s, s + eps, side="right")
+    lo = np.searchsorted(s, s - eps, side="left")
+    _correct_bound(s, rows, hi, r, upper=True)
+    _correct_bound(s, rows, lo, r, upper=False)
+    core = (hi - lo) >= min_samples
+    core_rows = np.flatnonzero(core)
+    if len(core_rows) == 0:
+        return labels
+
+    # Connected core runs; clusters are numbered in the order DBSCAN
+    # discovers them, i.e. by the lowest original index of their cores
+    breaks = ~_within(s[core_rows[1:]], s[core_rows[:-1]], r)
+    component = np.concatenate([[0], np.cumsum(breaks)])
+    starts = np.flatnonzero(np.concatenate([[True], breaks]))
+    first_index = np.minimum.reduceat(order[core_rows], starts)
+    label_of = np.empty(len(starts), dtype=np.int64)
+    label_of[np.argsort(first_index, kind="stable")] = np.arange(len(starts))
+
+    sorted_labels = np.full(n, -1, dtype=np.int64)
+    sorted_labels[core_rows] = label_of[component]
+
+    border = np.flatnonzero(~core)
+    right = np.searchsorted(core_rows, border)
+    left = right - 1
+    no_label = np.iinfo(np.int64).max
+    candidates = np.full((2, len(border)), no_label, dtype=np.int64)
+    for side, nearest in enumerate((left, right)):
+        valid = (nearest >= 0) & (nearest < len(core_rows))
+        valid[valid] = _within(s[core_rows[nearest[valid]]], s[border[valid]], r)
+        candidates[side, valid] = label_of[component[nearest[valid]]]
+    best = candidates.min(axis=0)
+    sorted_labels[border] = np.where(best == no_label, -1, best)
+
+    labels[order] = sorted_labels
+    return labels
+
+
+def _within(a: np.ndarray, b: np.ndarray, r: float) -> np.ndarray:
+    d = a - b
+    return d * d <= r
+
+
+def _correct_bound(s: np.ndarray, rows: np.ndarray, bound: np.ndarray, r: float, upper: bool) -> None:
+    """Move approximate neighbourhood ends, in place, to where the exact test flips.
+
+    With upper=True bound is the exclusive end of each row's range (its
+    last neighbour is s[bound - 1]); otherwise it is the inclusive start.
+    """
+    step, outward, edge = (1, 0, -1) if upper else (-1, -1, 0)
+    # Extend while the next value outward is still a neighbour
+    todo = rows
+    while len(todo):
+        nxt = bound[todo] + outward
+        todo = todo[(nxt >= 0) & (nxt < len(s))]
+        todo = todo[_within(s[bound[todo] + outward], s[todo], r)]
+        bound[todo] += step
+    # Retract while the outermost value is not a neighbour (a value always
+    # neighbours itself, so this stops at the row itself)
+    todo = rows
+    while len(todo):
+        todo = todo[~_within(s[bound[todo] + edge], s[todo], r)]
+        bound[todo] -= step
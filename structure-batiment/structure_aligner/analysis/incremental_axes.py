@@ -0,0 +1,327 @@
+"""Incremental axis-line discovery for edit-align loops.
+
+discover_axis_lines() rescans every vertex. When only a few elements are
+edited, IncrementalAxisDiscovery keeps the aggregated state the scan
+produces (vertex count and floor multiset per rounded position, and the
+merged cluster_radius windows) and applies vertex deltas to it:
+
+- Only the rounded positions touched by the delta are updated.
+- Windows are rebuilt from the window that holds each touched position.
+  Because windows are anchored at their first position (see
+  axis_selector._merge_nearby), an insertion or removal can shift the
+  anchors that follow it. The rebuild stops as soon as a window starts on
+  an anchor of the previous state, since every window after it is
+  unchanged.
+
+The resulting axis lines equal a full discover_axis_lines() run on the
+current vertex set. verify() checks exactly that, and validate=True
+runs the check after every update.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from structure_aligner.analysis.axis_selector import match_floor, match_floors, precision_ndigits
+from structure_aligner.config import AxisLine, PipelineConfig
+from structure_aligner.db.reader import InputVertex, VertexArrays
+from structure_aligner.utils.numeric import round_like_python
+
+logger = logging.getLogger(__name__)
+
+# Above this many new positions, re-sorting beats repeated insort
+_INSORT_LIMIT = 1000
+
+
+@dataclass
+class AxisLineDelta:
+    """Axis lines of one axis that disappeared or appeared in an update.
+
+    A line whose position is unchanged but whose floor or vertex count
+    changed is listed in both (old entry removed, new entry added).
+    """
+    axis: str
+    removed: list[AxisLine] = field(default_factory=list)
+    added: list[AxisLine] = field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.removed and not self.added
+
+
+class IncrementalAxisDiscovery:
+    """Axis lines maintained under vertex additions and removals.
+
+    Args:
+        config: Pipeline configuration (rounding, floor matching,
+            cluster_radius and min_floors are used).
+        vertices: Initial vertex set.
+        validate: Check against a full recompute after every apply()
+            (slow; meant for tests and debugging).
+    """
+
+    def __init__(
+        self,
+        config: PipelineConfig,
+        vertices: list[InputVertex] | VertexArrays = (),
+        validate: bool = False,
+    ):
+        self.config = config
+        self.validate = validate
+        self._ndigits = precision_ndigits(config.rounding_precision)
+        self._x = _AxisState("X", config.cluster_radius, config.min_floors)
+        self._y = _AxisState("Y", config.cluster_radius, config.min_floors)
+        if not isinstance(vertices, VertexArrays):
+            vertices = VertexArrays.from_vertices(list(vertices))
+        self.apply(added=vertices)
+
+    @property
+    def axis_lines(self) -> tuple[list[AxisLine], list[AxisLine]]:
+        """Current (axis_lines_x, axis_lines_y), sorted by position."""
+        return self._x.visible_lines(), self._y.visible_lines()
+
+    def apply(
+        self,
+        added: list[InputVertex] | VertexArrays = (),
+        removed: list[InputVertex] | VertexArrays = (),
+    ) -> tuple[AxisLineDelta, AxisLineDelta]:
+        """
+        Add and remove vertices, updating only the affected axis lines.
+
+        Removed vertices must carry the coordinates they were added with
+        (e.g. an edited element's previous vertices).
+
+        Returns:
+            (delta_x, delta_y).
+
+        Raises:
+            ValueError: If a removed vertex is not part of the current state.
+            RuntimeError: In validate mode, if the result differs from a
+                full recompute.
+        """
+        changes_x: dict[float, list] = {}
+        changes_y: dict[float, list] = {}
+        for sign, vertices in ((1, added), (-1, removed)):
+            if isinstance(vertices, VertexArrays):
+                self._accumulate_arrays(changes_x, changes_y, vertices, sign)
+                continue
+            for v in vertices:
+                floor = match_floor(v.z, self.config.floor_z_levels, self.config.floor_match_tolerance)
+                _accumulate(changes_x, round(v.x, self._ndigits), sign, floor)
+                _accumulate(changes_y, round(v.y, self._ndigits), sign, floor)
+
+        delta_x = self._x.update(changes_x)
+        delta_y = self._y.update(changes_y)
+        if not (delta_x.is_empty and delta_y.is_empty):
+            logger.debug(
+                "Axis lines updated: X -%d/+%d, Y -%d/+%d",
+                len(delta_x.removed), len(delta_x.added),
+                len(delta_y.removed), len(delta_y.added),
+            )
+        if self.validate:
+            self.verify()
+        return delta_x, delta_y
+
+    def _accumulate_arrays(self, changes_x: dict, changes_y: dict, vertices: VertexArrays, sign: int) -> None:
+        """Array version of the per-vertex accumulation (used for bulk loads).
+
+        Rounding and floor matching go through the numpy discovery engine's
+        helpers, which reproduce round() and match_floor() exactly.
+        """
+        levels = self.config.floor_z_levels
+        codes = match_floors(vertices.z, levels, self.config.floor_match_tolerance)
+        if levels:
+            floor_values = np.unique(np.asarray(levels, dtype=np.float64)).tolist()
+        else:
+            floor_values = np.unique(round_like_python(vertices.z, 1)).tolist()
+
+        for changes, coords in ((changes_x, vertices.x), (changes_y, vertices.y)):
+            rounded = round_like_python(coords, self._ndigits)
+            _, first, group_of, counts = np.unique(
+                rounded, return_index=True, return_inverse=True, return_counts=True,
+            )
+            positions = rounded[first].tolist()
+            for pos, count in zip(positions, counts.tolist()):
+                entry = changes.setdefault(pos, [0, Counter()])
+                entry[0] += sign * count
+
+            matched = codes >= 0
+            pairs, pair_counts = np.unique(
+                np.stack([group_of[matched], codes[matched]], axis=1), axis=0, return_counts=True,
+            )
+            for (group, code), count in zip(pairs.tolist(), pair_counts.tolist()):
+                changes[positions[group]][1][floor_values[code]] += sign * count
+
+    def verify(self, vertices: list[InputVertex] | VertexArrays | None = None) -> None:
+        """
+        Compare the maintained axis lines with a full recompute.
+
+        Args:
+            vertices: The current vertex set. When given, the reference is
+                discover_axis_lines() on it; otherwise the windows are
+                rebuilt from scratch over the aggregated positions.
+
+        Raises:
+            RuntimeError: If the two disagree.
+        """
+        current = self.axis_lines
+        if vertices is not None:
+            from structure_aligner.analysis.axis_selector import discover_axis_lines
+            expected = discover_axis_lines(vertices, self.config)
+        else:
+            expected = (self._x.recompute(), self._y.recompute())
+
+        for axis, got, want in zip("XY", current, expected):
+            if got != want:
+                raise RuntimeError(
+                    f"Incremental {axis} axis lines diverged from a full recompute "
+                    f"({len(got)} vs {len(want)} lines)"
+                )
+
+
+# =========================================================================
+# Internal helpers
+# =========================================================================
+
+
+def _accumulate(changes: dict[float, list], position: float, sign: int, floor: float | None) -> None:
+    entry = changes.setdefault(position, [0, Counter()])
+    entry[0] += sign
+    if floor is not None:
+        entry[1][floor] += sign
+
+
+class _AxisState:
+    """Per-position aggregates and merged windows for one axis."""
+
+    def __init__(self, axis: str, cluster_radius: float, min_floors: int):
+        self.axis = axis
+        self.cluster_radius = cluster_radius
+        self.min_floors = min_floors
+        self.counts: dict[float, int] = {}
+        self.floors: dict[float, Counter] = {}
+        self.positions: list[float] = []   # sorted keys of counts
+        self.anchors: list[float] = []     # first position of each window
+        self.lines: list[AxisLine] = []    # one per window, before min_floors filtering
+
+    def visible_lines(self) -> list[AxisLine]:
+        return [line for line in self.lines if line.floor_count >= self.min_floors]
+
+    def update(self, changes: dict[float, list]) -> AxisLineDelta:
+        # Check the whole delta before touching any state
+        updated = {}
+        for pos, (dcount, dfloors) in changes.items():
+            count = self.counts.get(pos, 0) + dcount
+            floors = Counter(self.floors.get(pos, ()))
+            floors.update(dfloors)
+            if count < 0 or any(n < 0 for n in floors.values()) or (count == 0 and +floors):
+                raise ValueError(f"Removing vertices that were never added at {self.axis}={pos}")
+            if count != self.counts.get(pos, 0) or +floors != self.floors.get(pos, Counter()):
+                updated[pos] = (count, +floors)
+
+        new_positions = [pos for pos in updated if pos not in self.counts]
+        for pos, (count, floors) in updated.items():
+            if count == 0:
+                del self.counts[pos], self.floors[pos]
+                del self.positions[bisect.bisect_left(self.positions, pos)]
+            else:
+                self.counts[pos] = count
+                self.floors[pos] = floors
+        if len(new_positions) > _INSORT_LIMIT:
+            self.positions = sorted(self.counts)
+        else:
+            for pos in new_positions:
+                bisect.insort(self.positions, pos)
+        dirty = sorted(updated)
+
+        delta = AxisLineDelta(self.axis)
+        i = 0
+        while i < len(dirty):
+            i = self._rebuild_from(dirty, i, delta)
+        _cancel_unchanged(delta)
+        return delta
+
+    def recompute(self) -> list[AxisLine]:
+        _, lines, _ = self._scan(0, stop_at=None)
+        return [line for line in lines if line.floor_count >= self.min_floors]
+
+    def _rebuild_from(self, dirty: list[float], i: int, delta: AxisLineDelta) -> int:
+        """Rebuild the windows from the one holding dirty[i]; return the next dirty index."""
+        first = bisect.bisect_right(self.anchors, dirty[i]) - 1
+        if first < 0:
+            # New positions before the first window: rebuild from the start
+            first, start = 0, 0
+        else:
+            start = bisect.bisect_left(self.positions, self.anchors[first])
+
+        def stop_at(anchor: float) -> bool:
+            # Resynchronised once past every dirty position seen so far and
+            # back on an anchor of the previous state.
+            nonlocal i
+            while i < len(dirty) and dirty[i] < anchor:
+                i += 1
+            k = bisect.bisect_left(self.anchors, anchor)
+            return k < len(self.anchors) and self.anchors[k] == anchor
+
+        new_anchors, new_lines, end = self._scan(start, stop_at)
+        if end == len(self.positions):
+            last, i = len(self.anchors), len(dirty)
+        else:
+            last = bisect.bisect_left(self.anchors, self.positions[end])
+
+        delta.removed.extend(l for l in self.lines[first:last] if l.floor_count >= self.min_floors)
+        delta.added.extend(l for l in new_lines if l.floor_count >= self.min_floors)
+        self.anchors[first:last] = new_anchors
+        self.lines[first:last] = new_lines
+        return i
+
+    def _scan(self, start: int, stop_at) -> tuple[list[float], list[AxisLine], int]:
+        """Build windows from positions[start] on, as _merge_nearby does.
+
+        Stops before a window whose anchor satisfies stop_at(anchor) and
+        returns (anchors, lines, index of the first position not scanned).
+        """
+        positions, counts, floors = self.positions, self.counts, self.floors
+        anchors: list[float] = []
+        lines: list[AxisLine] = []
+        j, n = start, len(positions)
+        while j < n:
+            anchor = positions[j]
+            if anchors and stop_at is not None and stop_at(anchor):
+                break
+            best_pos, best_count = anchor, counts[anchor]
+            total = best_count
+            floor_set = set(floors[anchor])
+            j += 1
+            while j < n and positions[j] - anchor <= self.cluster_radius:
+                pos = positions[j]
+                total += counts[pos]
+                floor_set.update(floors[pos])
+                if counts[pos] > best_count:
+                    best_pos, best_count = pos, counts[pos]
+                j += 1
+            anchors.append(anchor)
+            lines.append(AxisLine(self.axis, best_pos, len(floor_set), total))
+        return anchors, lines, j
+
+
+def _cancel_unchanged(delta: AxisLineDelta) -> None:
+    """Drop lines that were removed and re-added identically."""
+    added = Counter((l.position, l.floor_count, l.vertex_count) for l in delta.added)
+    removed = Counter((l.position, l.floor_count, l.vertex_count) for l in delta.removed)
+    same = added & removed
+    for name in ("added", "removed"):
+        pending = Counter(same)
+        kept = []
+        for line in getattr(delta, name):
+            key = (line.position, line.floor_count, line.vertex_count)
+            if pending[key]:
+                pending[key] -= 1
+            else:
+                kept.append(line)
+        setattr(delta, name, kept)
@@ -0,0 +1,382 @@
+"""Batch runner: ETL or V2 pipeline over many buildings with a process pool.
+
+A manifest lists one job per building as (input_3dm, input_db, output)
+triples, either as CSV with a header row or as JSON (a list of objects,
+or an object with a "jobs" list). Relative paths are resolved against the
+manifest's directory. An optional "name" column labels the job in logs
+and in the summary (default: the output file or directory name).
+
+Jobs run in a ProcessPoolExecutor whose workers are reused across jobs, so
+the interpreter start-up and rhino3dm/numpy imports are paid once per
+worker rather than once per building. Each job is isolated: an exception
+is caught in the worker and recorded, its log records also go to a
+per-job log file next to its output, and a worker that dies takes down
+only the jobs that were running when the pool broke (ProcessPoolExecutor
+stops every worker once one dies). Jobs still queued at that point never
+started: they are resubmitted to a new pool without using an attempt.
+Failed jobs are retried up to ``retries`` times; before a retry, an ETL
+output left behind by the failed attempt is removed unless it existed
+before the batch started. The consolidated summary (per-job status,
+attempts, timings and key counts) is written as JSON.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+BATCH_MODES = ("etl", "pipeline-v2")
+
+MANIFEST_COLUMNS = ("input_3dm", "input_db", "output")
+
+
+@dataclass
+class BatchJob:
+    """One building to process."""
+    input_3dm: Path
+    input_db: Path
+    output: Path
+    name: str = ""
+
+    def __post_init__(self):
+        if not self.name:
+            self.name = self.output.name
+
+
+@dataclass
+class JobResult:
+    """Outcome of one batch job (after all attempts)."""
+    name: str
+    input_3dm: str
+    input_db: str
+    output: str
+    status: str = "pending"   # "ok" or "failed"
+    attempts: int = 0
+    elapsed_s: float = 0.0    # wall time of the last attempt
+    attempt_times_s: list[float] = field(default_factory=list)
+    error: str | None = None
+    details: dict = field(default_factory=dict)
+
+
+@dataclass
+class BatchSummary:
+    """Consolidated report for a batch run."""
+    mode: str
+    workers: int
+    retries: int
+    total_jobs: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    wall_time_s: float = 0.0
+    jobs: list[JobResult] = field(default_factory=list)
+
+
+def load_manifest(path: Path) -> list[BatchJob]:
+    """
+    Read a CSV or JSON batch manifest.
+
+    Args:
+        path: Manifest file (.csv or .json).
+
+    Returns:
+        Jobs in manifest order.
+
+    Raises:
+        FileNotFoundError: If the manifest does not exist.
+        ValueError: If the format is unknown, a required column is missing,
+            or two jobs share an output path.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Manifest not found: {path}")
+
+    suffix = path.suffix.lower()
+    if suffix == ".csv":
+        with open(path, newline="") as f:
+            rows = list(csv.DictReader(f))
+    elif suffix == ".json":
+        data = json.loads(path.read_text())
+        rows = data["jobs"] if isinstance(data, dict) else data
+    else:
+        raise ValueError(f"Unsupported manifest format '{path.suffix}' (expected .csv or .json)")
+
+    base = path.parent
+    jobs = []
+    for i, row in enumerate(rows, start=1):
+        missing = [c for c in MANIFEST_COLUMNS if not row.get(c)]
+        if missing:
+            raise ValueError(f"Manifest {path} entry {i} is missing {', '.join(missing)}")
+        jobs.append(BatchJob(
+            input_3dm=base / row["input_3dm"],
+            input_db=base / row["input_db"],
+            output=base / row["output"],
+            name=row.get("name") or "",
+        ))
+
+    outputs = [job.output.resolve() for job in jobs]
+    if len(set(outputs)) != len(outputs):
+        raise ValueError(f"Manifest {path} lists the same output for several jobs")
+    return jobs
+
+
+def run_batch(
+    jobs: list[BatchJob],
+    mode: str = "etl",
+    workers: int = 1,
+    retries: int = 1,
+    summary_path: Path | None = None,
+    log_level: str = "INFO",
+) -> BatchSummary:
+    """
+    Run jobs over a process pool, retrying failures.
+
+    Args:
+        jobs: Jobs from load_manifest().
+        mode: "etl" (output is the PRD .db) or "pipeline-v2" (output is a
+            directory; the PRD database must already exist, as for the
+            pipeline-v2 command).
+        workers: Worker processes.
+        retries: Extra attempts for a failed job.
+        summary_path: Where to write the JSON summary (not written if None).
+        log_level: Logging level inside the workers.
+
+    Returns:
+        BatchSummary with one JobResult per job, in manifest order.
+
+    Raises:
+        ValueError: If mode is unknown or workers/retries are out of range.
+    """
+    if mode not in BATCH_MODES:
+        raise ValueError(f"Unknown batch mode {mode!r}; expected one of {BATCH_MODES}")
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    if retries < 0:
+        raise ValueError(f"retries must be non-negative, got {retries}")
+
+    start_time = time.time()
+    results = [
+        JobResult(name=j.name, input_3dm=str(j.input_3dm), input_db=str(j.input_db), output=str(j.output))
+        for j in jobs
+    ]
+    # Outputs a failed attempt may leave behind are only removed if the
+    # batch created them
+    preexisting = [job.output.exists() for job in jobs]
+    pending = list(range(len(jobs)))
+
+    for attempt in range(1, retries + 2):
+        if not pending:
+            break
+        if attempt > 1:
+            logger.info("Retrying %d failed job(s) (attempt %d/%d)", len(pending), attempt, retries + 1)
+            if mode == "etl":
+                for i in pending:
+                    if not preexisting[i]:
+                        _remove_partial_output(jobs[i].output)
+
+        failed = []
+        queued = pending
+        while queued:
+            outcomes, queued = _run_round(jobs, queued, mode, workers, log_level)
+            if queued:
+                logger.warning(
+                    "Worker pool broke; resubmitting %d job(s) that had not started", len(queued),
+                )
+            for i, (elapsed, details, error) in outcomes.items():
+                result = results[i]
+                result.attempts = attempt
+                result.elapsed_s = round(elapsed, 3)
+                result.attempt_times_s.append(result.elapsed_s)
+                if error is None:
+                    result.status, result.error, result.details = "ok", None, details
+                    logger.info("[%s] done in %.1fs", result.name, elapsed)
+                else:
+                    result.status, result.error = "failed", error
+                    failed.append(i)
+                    logger.error("[%s] attempt %d failed: %s", result.name, attempt, error)
+        pending = sorted(failed)
+
+    summary = BatchSummary(
+        mode=mode,
+        workers=workers,
+        retries=retries,
+        total_jobs=len(jobs),
+        succeeded=sum(1 for r in results if r.status == "ok"),
+        failed=sum(1 for r in results if r.status != "ok"),
+        wall_time_s=round(time.time() - start_time, 3),
+        jobs=results,
+    )
+    logger.info("Batch complete: %d/%d jobs succeeded in %.1fs",
+                summary.succeeded, summary.total_jobs, summary.wall_time_s)
+    if summary_path is not None:
+        _write_summary(summary, summary_path)
+    return summary
+
+
+# =========================================================================
+# Internal helpers
+# =========================================================================
+
+
+def _run_round(
+    jobs: list[BatchJob], indices: list[int], mode: str, workers: int, log_level: str,
+) -> tuple[dict[int, tuple[float, dict, str | None]], list[int]]:
+    """Run jobs[indices] in one pool.
+
+    Returns:
+        (outcomes, not_started): (elapsed, details, error) per finished or
+        failed job, and the jobs the pool never started because it broke.
+    """
+    # Workers report each job index as they start it, so a broken pool can
+    # tell the jobs it was running from those still queued
+    started_queue = multiprocessing.SimpleQueue()
+    outcomes: dict[int, tuple[float, dict, str | None]] = {}
+    broken: list[int] = []
+    with ProcessPoolExecutor(
+        max_workers=min(workers, len(indices)),
+        initializer=_init_worker, initargs=(started_queue,),
+    ) as pool:
+        futures = {pool.submit(_run_job, jobs[i], mode, log_level, i): i for i in indices}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                elapsed, details = future.result()
+            except BrokenProcessPool as e:
+                outcomes[i] = (0.0, {}, f"worker process died: {e}")
+                broken.append(i)
+            except Exception as e:
+                outcomes[i] = (getattr(e, "elapsed_s", 0.0), {}, f"{type(e).__name__}: {e}")
+            else:
+                outcomes[i] = (elapsed, details, None)
+
+    started = set()
+    while not started_queue.empty():
+        started.add(started_queue.get())
+    not_started = sorted(i for i in broken if i not in started)
+    if len(not_started) == len(broken):
+        # The pool broke before any of them ran (e.g. a worker failing at
+        # start-up); charge them all rather than resubmitting forever
+        return outcomes, []
+    for i in not_started:
+        del outcomes[i]
+    return outcomes, not_started
+
+
+def _remove_partial_output(output: Path) -> None:
+    """Delete an ETL output database (and SQLite side files) left by a failed attempt."""
+    for path in (output, output.with_name(output.name + "-journal"), output.with_name(output.name + "-wal"),
+                 output.with_name(output.name + "-shm")):
+        if path.exists():
+            path.unlink()
+            logger.info("Removed %s left by the failed attempt", path)
+
+
+# Set in each worker by _init_worker
+_started_queue = None
+
+
+def _init_worker(started_queue) -> None:
+    global _started_queue
+    _started_queue = started_queue
+
+
+class _JobError(RuntimeError):
+    """Job failure carrying the attempt's wall time back to the parent."""
+
+    def __init__(self, message: str, elapsed_s: float):
+        super().__init__(message)
+        self.elapsed_s = elapsed_s
+
+    def __reduce__(self):
+        return (_JobError, (str(self), self.elapsed_s))
+
+
+def _run_job(job: BatchJob, mode: str, log_level: str, index: int = -1) -> tuple[float, dict]:
+    """Worker entry point: run one job with its own log file."""
+    from structure_aligner.utils.logger import setup_logging
+
+    if _started_queue is not None:
+        _started_queue.put(index)
+
+    setup_logging(log_level)
+    log_path = _job_log_path(job, mode)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    handler = logging.FileHandler(log_path, mode="a")
+    handler.setFormatter(logging.Formatter("[%(asctime)s] [%(levelname)s] [%(name)s:%(lineno)d] %(message)s"))
+    root = logging.getLogger()
+    root.addHandler(handler)
+
+    start = time.time()
+    try:
+        logger.info("[%s] starting %s (%s, %s)", job.name, mode, job.input_3dm, job.input_db)
+        if mode == "etl":
+            details = _run_etl_job(job)
+        else:
+            details = _run_pipeline_v2_job(job)
+        return time.time() - start, details
+    except Exception as e:
+        logger.error("[%s] failed:\n%s", job.name, traceback.format_exc())
+        raise _JobError(f"{type(e).__name__}: {e}", time.time() - start) from None
+    finally:
+        root.removeHandler(handler)
+        handler.close()
+
+
+def _run_etl_job(job: BatchJob) -> dict:
+    from structure_aligner.etl.extraction_cache import load_vertex_table
+    from structure_aligner.etl.loader import load
+    from structure_aligner.etl.transformer import transform
+
+    table = load_vertex_table(job.input_3dm)
+    result = transform(table, job.input_db)
+    report = load(result, job.input_db, job.output)
+    return {
+        "elements": report.elements_inserted,
+        "vertices": report.vertices_inserted,
+        "matched_elements": result.matched_count,
+        "unmatched_elements": len(result.unmatched),
+        "validation_passed": report.validation_passed,
+    }
+
+
+def _run_pipeline_v2_job(job: BatchJob) -> dict:
+    from structure_aligner.pipeline_v2 import run_pipeline_v2
+
+    report = run_pipeline_v2(job.input_3dm, job.input_db, job.output)
+    if report.errors:
+        raise RuntimeError("; ".join(report.errors))
+    return {
+        "total_vertices": report.total_vertices,
+        "aligned_vertices": report.aligned_vertices,
+        "alignment_rate_pct": report.alignment_rate_pct,
+        "final_object_count": report.final_object_count,
+        "execution_time_s": report.execution_time_s,
+    }
+
+
+def _job_log_path(job: BatchJob, mode: str) -> Path:
+    if mode == "etl":
+        return job.output.with_name(f"{job.output.stem}.batch.log")
+    return job.output / "batch.log"
+
+
+def _write_summary(summary: BatchSummary, path: Path) -> None:
+    data = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "pipeline": "batch",
+        },
+        **asdict(summary),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+    logger.info("Batch summary written to %s", path)
@@ -0,0 +1,215 @@
+"""Resumable step checkpoints for pipeline-v2.
+
+run_pipeline_v2() persists what its expensive steps compute under
+``<output_dir>/checkpoints/`` (one uncompressed .npz per step):
+
+    load      1  vertices and elements read from the PRD database
+    axes      2  discovered X/Y axis lines
+    align     3  aligned vertex table
+    extract   4  dalle footprints and multi-face voile extents
+    columns   6  column centers the supports are placed at
+
+Each entry records a key: a hash of the step's inputs (file digests or
+the upstream step's key) and of the PipelineConfig fields the step reads.
+A later run with resume enabled reuses an entry only when its key
+matches, so changing e.g. max_snap_distance recomputes alignment while
+changing roof_z_threshold (read only by the object rules) reuses every
+entry. Steps 5, 7 and 8 edit or write the 3dm model and always run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import zipfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+from structure_aligner.alignment.aligned_table import AlignedVertexTable
+from structure_aligner.config import AxisLine, ElementInfo, PipelineConfig
+from structure_aligner.db.reader import VertexArrays
+from structure_aligner.etl.extraction_cache import atomic_write
+from structure_aligner.transform.dalle_consolidator import RemovedDalleInfo
+from structure_aligner.transform.voile_simplifier import VoileExtent
+
+logger = logging.getLogger(__name__)
+
+# Bump when a checkpointed step computes something different for the same inputs
+CHECKPOINT_VERSION = 1
+
+# Checkpointed steps and the pipeline step number each belongs to
+STEP_NUMBERS = {"load": 1, "axes": 2, "align": 3, "extract": 4, "columns": 6}
+
+# PipelineConfig fields each step reads
+STEP_CONFIG_FIELDS = {
+    "load": (),
+    "axes": ("min_floors", "cluster_radius", "rounding_precision", "floor_match_tolerance", "floor_z_levels"),
+    "align": ("max_snap_distance", "outlier_snap_distance", "cluster_radius", "rounding_precision", "z_enabled"),
+    "extract": (),
+    "columns": (),
+}
+
+_VERTEX_FIELDS = ("id", "element_id", "x", "y", "z", "vertex_index")
+_ALIGNED_FIELDS = (
+    "id", "element_id", "vertex_index", "x", "y", "z", "x_original", "y_original", "z_original",
+    "axis_code", "fil_x", "fil_y", "fil_z", "displacement",
+)
+
+
+class CheckpointStore:
+    """Step checkpoints under one directory.
+
+    Args:
+        root: Checkpoint directory (created on first write).
+        resume: Reuse entries whose key matches. Entries are written
+            either way.
+        from_step: Never reuse entries of this pipeline step or later
+            ones (implies resume for the earlier steps).
+    """
+
+    def __init__(self, root: Path, resume: bool = False, from_step: int | None = None):
+        self.root = root
+        self.resume = resume or from_step is not None
+        self.from_step = from_step
+        self.reused: list[str] = []
+
+    def key(self, step: str, config: PipelineConfig, *inputs: str) -> str:
+        """Key of step for the given input digests/upstream keys and config."""
+        fields = {name: getattr(config, name) for name in STEP_CONFIG_FIELDS[step]}
+        payload = json.dumps([CHECKPOINT_VERSION, step, list(inputs), fields], sort_keys=True)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def cached(self, step: str, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the checkpointed result of step for key, else compute() and store it."""
+        encode, decode = _CODECS[step]
+        if self._reusable(step):
+            entry = self._read(step, key)
+            if entry is not None:
+                logger.info("  Reusing %s checkpoint", step)
+                self.reused.append(step)
+                return decode(*entry)
+
+        result = compute()
+        self._write(step, key, *encode(result))
+        return result
+
+    def path(self, step: str) -> Path:
+        return self.root / f"{step}.npz"
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _reusable(self, step: str) -> bool:
+        if not self.resume:
+            return False
+        return self.from_step is None or STEP_NUMBERS[step] < self.from_step
+
+    def _read(self, step: str, key: str) -> tuple[dict, dict[str, np.ndarray]] | None:
+        entry = self.path(step)
+        if not entry.exists():
+            return None
+        try:
+            with np.load(entry, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                if meta.get("key") != key:
+                    logger.info("  %s checkpoint is stale; recomputing", step)
+                    return None
+                arrays = {name: data[name] for name in data.files if name != "meta"}
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            logger.warning("Discarding corrupt checkpoint %s: %s", entry, e)
+            entry.unlink(missing_ok=True)
+            return None
+        return meta, arrays
+
+    def _write(self, step: str, key: str, meta: dict, arrays: dict[str, np.ndarray]) -> None:
+        entry = self.path(step)
+        meta = {"key": key, "version": CHECKPOINT_VERSION, **meta}
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            atomic_write(entry, lambda f: np.savez(f, meta=np.array(json.dumps(meta)), **arrays))
+        except OSError as e:
+            logger.warning("Could not write checkpoint %s: %s", entry, e)
+
+
+# =========================================================================
+# Step codecs: result -> (meta, arrays) and back
+# =========================================================================
+
+
+def _encode_load(result: tuple[VertexArrays, dict[int, ElementInfo]]):
+    vertices, elements = result
+    infos = list(elements.values())
+    arrays = {name: getattr(vertices, name) for name in _VERTEX_FIELDS}
+    # Elements as columns: a JSON list of 500k+ records is slow to decode
+    arrays["element_ids"] = np.array([e.id for e in infos], dtype=np.int64)
+    arrays["element_names"] = np.array([e.name for e in infos], dtype=str)
+    arrays["element_types"] = np.array([e.type for e in infos], dtype=str)
+    arrays["element_geometry_types"] = np.array([e.geometry_type or "" for e in infos], dtype=str)
+    arrays["element_has_geometry_type"] = np.array([e.geometry_type is not None for e in infos], dtype=bool)
+    return {}, arrays
+
+
+def _decode_load(meta, arrays):
+    vertices = VertexArrays(**{name: arrays[name] for name in _VERTEX_FIELDS})
+    geometry_types = [
+        g if has else None
+        for g, has in zip(arrays["element_geometry_types"].tolist(), arrays["element_has_geometry_type"].tolist())
+    ]
+    elements = {
+        eid: ElementInfo(eid, name, type_, geometry_type)
+        for eid, name, type_, geometry_type in zip(
+            arrays["element_ids"].tolist(), arrays["element_names"].tolist(),
+            arrays["element_types"].tolist(), geometry_types,
+        )
+    }
+    return vertices, elements
+
+
+def _encode_axes(result: tuple[list[AxisLine], list[AxisLine]]):
+    axis_x, axis_y = result
+    return {"x": [asdict(a) for a in axis_x], "y": [asdict(a) for a in axis_y]}, {}
+
+
+def _decode_axes(meta, arrays):
+    return [AxisLine(**a) for a in meta["x"]], [AxisLine(**a) for a in meta["y"]]
+
+
+def _encode_align(table: AlignedVertexTable):
+    return {"thread_ids": list(table.thread_ids)}, {name: getattr(table, name) for name in _ALIGNED_FIELDS}
+
+
+def _decode_align(meta, arrays):
+    return AlignedVertexTable(
+        **{name: arrays[name] for name in _ALIGNED_FIELDS}, thread_ids=tuple(meta["thread_ids"]),
+    )
+
+
+def _encode_extract(result: tuple[list[RemovedDalleInfo], list[VoileExtent]]):
+    dalle_infos, voile_extents = result
+    return {"dalle_infos": [asdict(d) for d in dalle_infos], "voile_extents": [asdict(v) for v in voile_extents]}, {}
+
+
+def _decode_extract(meta, arrays):
+    return [RemovedDalleInfo(**d) for d in meta["dalle_infos"]], [VoileExtent(**v) for v in meta["voile_extents"]]
+
+
+def _encode_columns(positions: dict[tuple[float, float], bool]):
+    return {}, {"positions": np.array(list(positions), dtype=np.float64).reshape(-1, 2)}
+
+
+def _decode_columns(meta, arrays):
+    return {(x, y): True for x, y in arrays["positions"].tolist()}
+
+
+_CODECS = {
+    "load": (_encode_load, _decode_load),
+    "axes": (_encode_axes, _decode_axes),
+    "align": (_encode_align, _decode_align),
+    "extract": (_encode_extract, _decode_extract),
+    "columns": (_encode_columns, _decode_columns),
+}
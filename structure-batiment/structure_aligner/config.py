@@ -95,6 +95,7 @@ class AlignmentConfig:
     min_cluster_size: int = 3     # Min vertices per thread (PRD F-04)
     rounding_precision: float = 0.01  # Centimeter precision
     merge_threshold_factor: float = 2.0  # Merge threads closer than factor * alpha
+    cluster_engine: str = "sorted_gap"   # Thread clustering backend (analysis.clustering.CLUSTER_ENGINES)
 
     @property
     def rounding_ndigits(self) -> int:
@@ -155,6 +156,6 @@ class AxisStatistics:
 class AlignmentResult:
     """Complete result of the alignment pipeline."""
     threads: list[Thread]
-    aligned_vertices: list[AlignedVertex]
+    aligned_vertices: list[AlignedVertex]  # or an alignment.aligned_table.AlignedVertexTable
     statistics: list[AxisStatistics]  # One per axis (X, Y, Z)
     config: AlignmentConfig
@@ -1,8 +1,12 @@
 import sqlite3
+from itertools import islice
 from pathlib import Path
 from dataclasses import dataclass
+from typing import Iterator
 import logging
 
+import numpy as np
+
 from structure_aligner.config import ElementInfo
 
 logger = logging.getLogger(__name__)
@@ -19,6 +23,73 @@ class InputVertex:
     vertex_index: int
 
 
+@dataclass
+class VertexArrays:
+    """Columnar vertices: parallel contiguous arrays, one row per vertex, ordered by id.
+
+    Iterating yields InputVertex records (same values as load_vertices()),
+    so code written against list[InputVertex] runs on it unchanged.
+    """
+    id: np.ndarray            # int64
+    element_id: np.ndarray    # int64
+    x: np.ndarray             # float64
+    y: np.ndarray             # float64
+    z: np.ndarray             # float64
+    vertex_index: np.ndarray  # int32
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    def __iter__(self) -> Iterator[InputVertex]:
+        for row in zip(
+            self.id.tolist(), self.element_id.tolist(), self.x.tolist(),
+            self.y.tolist(), self.z.tolist(), self.vertex_index.tolist(),
+        ):
+            yield InputVertex(*row)
+
+    def take(self, mask_or_rows: np.ndarray) -> "VertexArrays":
+        """Subset of rows selected by a boolean mask or an index array."""
+        return VertexArrays(
+            id=self.id[mask_or_rows],
+            element_id=self.element_id[mask_or_rows],
+            x=self.x[mask_or_rows],
+            y=self.y[mask_or_rows],
+            z=self.z[mask_or_rows],
+            vertex_index=self.vertex_index[mask_or_rows],
+        )
+
+    @classmethod
+    def empty(cls) -> "VertexArrays":
+        return cls(
+            id=np.zeros(0, dtype=np.int64),
+            element_id=np.zeros(0, dtype=np.int64),
+            x=np.zeros(0, dtype=np.float64),
+            y=np.zeros(0, dtype=np.float64),
+            z=np.zeros(0, dtype=np.float64),
+            vertex_index=np.zeros(0, dtype=np.int32),
+        )
+
+    @classmethod
+    def from_vertices(cls, vertices: list[InputVertex]) -> "VertexArrays":
+        """Build from InputVertex records (kept in the given order)."""
+        return cls(
+            id=np.array([v.id for v in vertices], dtype=np.int64),
+            element_id=np.array([v.element_id for v in vertices], dtype=np.int64),
+            x=np.array([v.x for v in vertices], dtype=np.float64),
+            y=np.array([v.y for v in vertices], dtype=np.float64),
+            z=np.array([v.z for v in vertices], dtype=np.float64),
+            vertex_index=np.array([v.vertex_index for v in vertices], dtype=np.int32),
+        )
+
+
+# Row layout of "SELECT id, element_id, x, y, z, vertex_index FROM vertices"
+_VERTEX_ROW_DTYPE = np.dtype([
+    ("id", np.int64), ("element_id", np.int64),
+    ("x", np.float64), ("y", np.float64), ("z", np.float64),
+    ("vertex_index", np.int32),
+])
+
+
 def load_vertices(db_path: Path) -> list[InputVertex]:
     """
     Load all vertices from a PRD-compliant database.
@@ -126,3 +197,186 @@ def load_vertices_with_elements(
         return vertices, elements
     finally:
         conn.close()
+
+
+def load_vertex_arrays(
+    db_path: Path,
+    with_elements: bool = True,
+    chunk_size: int = 100_000,
+) -> tuple[VertexArrays, dict[int, ElementInfo]]:
+    """Columnar counterpart of load_vertices_with_elements().
+
+    Rows are streamed from the cursor with np.fromiter, chunk_size at a
+    time, straight into preallocated arrays; no list of rows or
+    InputVertex objects is built.
+
+    Args:
+        db_path: Path to the PRD-compliant .db file.
+        with_elements: Also load (and require) the elements table. When
+            False, an empty dict is returned and only 'vertices' is needed.
+        chunk_size: Rows converted per np.fromiter call.
+
+    Returns:
+        Tuple of (VertexArrays ordered by id, elements_dict).
+
+    Raises:
+        FileNotFoundError: If db_path does not exist.
+        ValueError: If the database lacks required tables.
+    """
+    if not db_path.exists():
+        raise FileNotFoundError(f"Database not found: {db_path}")
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        cursor = conn.cursor()
+
+        _require_tables(cursor, db_path, ("vertices", "elements") if with_elements else ("vertices",))
+        elements = _read_elements(cursor) if with_elements else {}
+
+        count = cursor.execute("SELECT COUNT(*) FROM vertices").fetchone()[0]
+        arrays = VertexArrays(
+            id=np.empty(count, dtype=np.int64),
+            element_id=np.empty(count, dtype=np.int64),
+            x=np.empty(count, dtype=np.float64),
+            y=np.empty(count, dtype=np.float64),
+            z=np.empty(count, dtype=np.float64),
+            vertex_index=np.empty(count, dtype=np.int32),
+        )
+        cursor.execute(
+            "SELECT id, element_id, x, y, z, vertex_index FROM vertices ORDER BY id"
+        )
+        for start in range(0, count, chunk_size):
+            stop = min(start + chunk_size, count)
+            chunk = _fetch_rows(cursor, stop - start)
+            for name in _VERTEX_ROW_DTYPE.names:
+                getattr(arrays, name)[start:stop] = chunk[name]
+
+        logger.info(
+            "Loaded %d vertices and %d elements from %s",
+            len(arrays),
+            len(elements),
+            db_path,
+        )
+        return arrays, elements
+    finally:
+        conn.close()
+
+
+def load_elements(
+    db_path: Path,
+    id_range: tuple[int, int] | None = None,
+) -> dict[int, ElementInfo]:
+    """
+    Load element metadata only.
+
+    Args:
+        db_path: Path to the PRD-compliant .db file.
+        id_range: Only load elements with first <= id <= last.
+
+    Returns:
+        Dict mapping element_id -> ElementInfo.
+
+    Raises:
+        FileNotFoundError: If db_path does not exist.
+        ValueError: If the database lacks an 'elements' table.
+    """
+    if not db_path.exists():
+        raise FileNotFoundError(f"Database not found: {db_path}")
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        cursor = conn.cursor()
+        _require_tables(cursor, db_path, ("elements",))
+        return _read_elements(cursor, id_range)
+    finally:
+        conn.close()
+
+
+def iter_vertex_chunks(
+    db_path: Path,
+    chunk_size: int = 100_000,
+    by_element: bool = False,
+) -> Iterator[VertexArrays]:
+    """Stream the vertices table as VertexArrays chunks from one cursor.
+
+    Only one chunk (plus, with by_element, the rows of one element) is
+    held at a time, whatever the size of the table.
+
+    Args:
+        db_path: Path to the PRD-compliant .db file.
+        chunk_size: Rows fetched per chunk.
+        by_element: Order rows by (element_id, id) instead of id, and
+            never split an element across chunks: a chunk ends at the
+            last complete element, and an element larger than chunk_size
+            is yielded whole in a chunk of its own size.
+
+    Yields:
+        Non-empty VertexArrays.
+
+    Raises:
+        FileNotFoundError: If db_path does not exist.
+        ValueError: If the database lacks a 'vertices' table or chunk_size
+            is not positive.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+    if not db_path.exists():
+        raise FileNotFoundError(f"Database not found: {db_path}")
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        cursor = conn.cursor()
+        _require_tables(cursor, db_path, ("vertices",))
+        order = "element_id, id" if by_element else "id"
+        cursor.execute(f"SELECT id, element_id, x, y, z, vertex_index FROM vertices ORDER BY {order}")
+
+        carry = np.zeros(0, dtype=_VERTEX_ROW_DTYPE)
+        while True:
+            rows = _fetch_rows(cursor, chunk_size)
+            if len(rows) < chunk_size:
+                # Last fetch: whatever is carried over is complete now
+                rows = np.concatenate([carry, rows])
+                if len(rows):
+                    yield _vertex_arrays_from_rows(rows)
+                return
+            if not by_element:
+                yield _vertex_arrays_from_rows(rows)
+                continue
+            rows = np.concatenate([carry, rows])
+            # Rows of the last element may continue in the next fetch
+            cut = int(np.searchsorted(rows["element_id"], rows["element_id"][-1], side="left"))
+            carry = rows[cut:]
+            if cut:
+                yield _vertex_arrays_from_rows(rows[:cut])
+    finally:
+        conn.close()
+
+
+def _require_tables(cursor: sqlite3.Cursor, db_path: Path, tables: tuple[str, ...]) -> None:
+    for table in tables:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+            (table,),
+        )
+        if cursor.fetchone() is None:
+            raise ValueError(f"Database {db_path} does not contain a '{table}' table")
+
+
+def _read_elements(cursor: sqlite3.Cursor, id_range: tuple[int, int] | None = None) -> dict[int, ElementInfo]:
+    if id_range is None:
+        cursor.execute("SELECT id, type, nom, geometry_type FROM elements")
+    else:
+        cursor.execute("SELECT id, type, nom, geometry_type FROM elements WHERE id BETWEEN ? AND ?", id_range)
+    return {
+        row[0]: ElementInfo(id=row[0], name=row[2], type=row[1], geometry_type=row[3])
+        for row in cursor.fetchall()
+    }
+
+
+def _fetch_rows(cursor: sqlite3.Cursor, n: int) -> np.ndarray:
+    """Up to n vertex rows from the cursor as a _VERTEX_ROW_DTYPE array."""
+    return np.fromiter(islice(cursor, n), dtype=_VERTEX_ROW_DTYPE)
+
+
+def _vertex_arrays_from_rows(rows: np.ndarray) -> VertexArrays:
+    return VertexArrays(**{name: np.ascontiguousarray(rows[name]) for name in _VERTEX_ROW_DTYPE.names})
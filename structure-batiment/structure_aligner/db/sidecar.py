@@ -0,0 +1,142 @@
+"""Sidecar PRD databases that reference the structural source DB instead of copying it.
+
+A sidecar holds only the tables the pipeline writes (``elements``,
+``vertices``, fingerprints, ...) plus a ``prd_meta`` table recording the
+absolute path, size and mtime of the source database it was built from.
+Readers that only need the PRD tables (db.reader, etl.reverse_reader)
+open a sidecar like any other PRD database. open_prd_db() additionally
+ATTACHes the source read-only and exposes each of its tables through a
+TEMP view, so code querying e.g. ``filaire`` or ``shell`` sees one
+database either way.
+
+Copying a sidecar (as db.writer does for the aligned output) copies only
+the PRD tables; the copy still points at the same source.
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# Schema name the source database is attached under
+SOURCE_SCHEMA = "source"
+
+CREATE_META_SQL = """
+CREATE TABLE IF NOT EXISTS prd_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def create_sidecar(source_db: Path, output_path: Path) -> None:
+    """
+    Create an empty sidecar database referencing source_db.
+
+    Args:
+        source_db: Structural source database (left untouched).
+        output_path: Path of the sidecar to create.
+
+    Raises:
+        FileNotFoundError: If source_db does not exist.
+        FileExistsError: If output_path already exists.
+    """
+    if not source_db.exists():
+        raise FileNotFoundError(f"Source database not found: {source_db}")
+    if output_path.exists():
+        raise FileExistsError(f"Output file already exists: {output_path}")
+
+    source = source_db.resolve()
+    stat = source.stat()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(output_path))
+    try:
+        conn.execute(CREATE_META_SQL)
+        conn.executemany(
+            "INSERT INTO prd_meta (key, value) VALUES (?, ?)",
+            [
+                ("format", "sidecar"),
+                ("source_db", str(source)),
+                ("source_size", str(stat.st_size)),
+                ("source_mtime_ns", str(stat.st_mtime_ns)),
+            ],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+    logger.info("Created sidecar %s referencing %s", output_path, source)
+
+
+def sidecar_source(db_path: Path) -> Path | None:
+    """Source database a sidecar references, or None for a self-contained PRD database."""
+    conn = sqlite3.connect(str(db_path))
+    try:
+        meta = _read_meta(conn)
+    finally:
+        conn.close()
+    return Path(meta["source_db"]) if meta.get("format") == "sidecar" else None
+
+
+def open_prd_db(db_path: Path) -> sqlite3.Connection:
+    """
+    Open a PRD database, attaching its source read-only if it is a sidecar.
+
+    For a sidecar, the source is attached as ``source`` (SOURCE_SCHEMA) in
+    read-only mode and every source table not shadowed by a sidecar table
+    gets a TEMP view of the same name. A warning is logged if the source
+    changed size or mtime since the sidecar was created. Self-contained
+    databases are returned as a plain connection.
+
+    Args:
+        db_path: PRD database or sidecar.
+
+    Returns:
+        Open sqlite3 connection; the caller closes it.
+
+    Raises:
+        FileNotFoundError: If db_path or a sidecar's source does not exist.
+    """
+    if not db_path.exists():
+        raise FileNotFoundError(f"Database not found: {db_path}")
+
+    conn = sqlite3.connect(str(db_path), uri=True)
+    try:
+        meta = _read_meta(conn)
+        if meta.get("format") != "sidecar":
+            return conn
+
+        source = Path(meta["source_db"])
+        if not source.exists():
+            raise FileNotFoundError(f"Sidecar {db_path} references a missing source database: {source}")
+        stat = source.stat()
+        if (str(stat.st_size), str(stat.st_mtime_ns)) != (meta.get("source_size"), meta.get("source_mtime_ns")):
+            logger.warning("Source database %s changed since sidecar %s was created", source, db_path)
+
+        conn.execute(f"ATTACH DATABASE ? AS {SOURCE_SCHEMA}", (f"{source.as_uri()}?mode=ro",))
+        local = {row[0] for row in conn.execute("SELECT name FROM main.sqlite_master WHERE type IN ('table', 'view')")}
+        source_tables = [
+            row[0]
+            for row in conn.execute(
+                f"SELECT name FROM {SOURCE_SCHEMA}.sqlite_master "
+                "WHERE type IN ('table', 'view') AND name NOT LIKE 'sqlite_%'"
+            )
+        ]
+        for name in source_tables:
+            if name not in local:
+                quoted = name.replace('"', '""')
+                conn.execute(f'CREATE TEMP VIEW "{quoted}" AS SELECT * FROM {SOURCE_SCHEMA}."{quoted}"')
+        logger.debug("Attached %s with %d source tables to %s", source, len(source_tables), db_path)
+        return conn
+    except Exception:
+        conn.close()
+        raise
+
+
+def _read_meta(conn: sqlite3.Connection) -> dict[str, str]:
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='prd_meta'"
+    ).fetchone()
+    if exists is None:
+        return {}
+    return dict(conn.execute("SELECT key, value FROM prd_meta").fetchall())
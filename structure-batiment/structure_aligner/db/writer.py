@@ -1,8 +1,13 @@
 import logging
 import shutil
 import sqlite3
+import time
 from pathlib import Path
+from typing import Iterable, Iterator
 
+import numpy as np
+
+from structure_aligner.alignment.aligned_table import AXIS_LABELS, AlignedVertexTable, as_aligned_table
 from structure_aligner.config import AlignedVertex
 
 logger = logging.getLogger(__name__)
@@ -24,70 +29,315 @@ CREATE_INDEXES_SQL = [
     "CREATE INDEX IF NOT EXISTS idx_vertices_displacement ON vertices(displacement_total);",
 ]
 
+# How write_aligned_db() stores the aligned values: "rebuild" stages them
+# and rebuilds the vertices table in one INSERT ... SELECT; "update" runs
+# one UPDATE per vertex.
+WRITE_METHODS = ("rebuild", "update")
+
+# Columns the aligned results overwrite
+ALIGNED_COLUMNS = ("x", "y", "z") + tuple(name for name, _ in ALTER_TABLE_COLUMNS)
+
+# Staging tables for method="rebuild". aligned_axis and fil_*_id are staged
+# as integer codes (binding ints is much cheaper than strings) and resolved
+# through the two lookup tables when vertices is rebuilt. The id key makes
+# a later duplicate replace the earlier one, as successive UPDATEs would.
+CREATE_STAGE_SQL = [
+    """CREATE TEMP TABLE aligned_stage (
+        id INTEGER PRIMARY KEY,
+        x REAL, y REAL, z REAL,
+        x_original REAL, y_original REAL, z_original REAL,
+        axis_code INTEGER, fil_x INTEGER, fil_y INTEGER, fil_z INTEGER,
+        displacement_total REAL
+    );""",
+    "CREATE TEMP TABLE aligned_axis_labels (code INTEGER PRIMARY KEY, label TEXT NOT NULL);",
+    "CREATE TEMP TABLE aligned_thread_ids (code INTEGER PRIMARY KEY, fil_id TEXT NOT NULL);",
+]
+
+INSERT_STAGE_SQL = "INSERT OR REPLACE INTO aligned_stage VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+
+# Value of the coded aligned columns in the rebuilt table, for staged rows
+# (the others are read from aligned_stage under their own name)
+STAGED_VALUES = {
+    "aligned_axis": "l.label",
+    "fil_x_id": "fx.fil_id",
+    "fil_y_id": "fy.fil_id",
+    "fil_z_id": "fz.fil_id",
+}
+
+# Rows converted to Python objects at a time when staging or writing a delta
+STAGE_CHUNK = 65536
+
+UPDATE_VERTEX_SQL = """UPDATE vertices
+   SET x = ?, y = ?, z = ?,
+       x_original = ?, y_original = ?, z_original = ?,
+       aligned_axis = ?, fil_x_id = ?, fil_y_id = ?, fil_z_id = ?,
+       displacement_total = ?
+   WHERE id = ?"""
+
+# Delta layout: vertices keeps the original coordinates and only the rows
+# the alignment touched (moved or snapped) are recorded here. Every other
+# vertex reads as unaligned: same coordinates, 'none', no fil ids, 0.0.
+CREATE_ALIGNMENT_DELTA_SQL = """
+CREATE TABLE alignment_delta (
+    vertex_id INTEGER PRIMARY KEY REFERENCES vertices(id),
+    x REAL NOT NULL,
+    y REAL NOT NULL,
+    z REAL NOT NULL,
+    aligned_axis VARCHAR(10) NOT NULL DEFAULT 'none',
+    fil_x_id VARCHAR(20),
+    fil_y_id VARCHAR(20),
+    fil_z_id VARCHAR(20),
+    displacement_total REAL NOT NULL DEFAULT 0.0
+);
+"""
+
+# The delta overlaid on vertices, with the columns of the full layout
+CREATE_ALIGNED_VIEW_SQL = """
+CREATE VIEW aligned_vertices AS
+SELECT v.id, v.element_id,
+       COALESCE(d.x, v.x) AS x, COALESCE(d.y, v.y) AS y, COALESCE(d.z, v.z) AS z,
+       v.vertex_index,
+       v.x AS x_original, v.y AS y_original, v.z AS z_original,
+       COALESCE(d.aligned_axis, 'none') AS aligned_axis,
+       d.fil_x_id, d.fil_y_id, d.fil_z_id,
+       COALESCE(d.displacement_total, 0.0) AS displacement_total
+FROM vertices v LEFT JOIN alignment_delta d ON d.vertex_id = v.id;
+"""
+
+INSERT_DELTA_SQL = """INSERT OR REPLACE INTO alignment_delta
+   (vertex_id, x, y, z, aligned_axis, fil_x_id, fil_y_id, fil_z_id, displacement_total)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+# The output is a fresh copy that is deleted on failure, so the rebuild
+# can skip durability; WAL is restored once it is committed
+REBUILD_PRAGMAS = [
+    "PRAGMA synchronous=OFF;",
+    "PRAGMA journal_mode=MEMORY;",
+    "PRAGMA cache_size=-262144;",  # 256 MiB
+]
+
 
 def write_aligned_db(
     input_db: Path,
     output_path: Path,
-    aligned_vertices: list[AlignedVertex],
+    aligned_vertices: list[AlignedVertex] | AlignedVertexTable,
+    method: str = "rebuild",
 ) -> Path:
     """
     Create output database with enriched vertices table.
 
-    Copies the input database, then uses ALTER TABLE to add enrichment
-    columns to the existing vertices table. This preserves the table name
-    (PRD F-08 compliance), all existing FK constraints, and indexes.
+    Copies the input database and adds the enrichment columns to its
+    vertices table, keeping the table name (PRD F-08 compliance).
 
-    Then updates each vertex row with aligned coordinates and metadata.
+    With the default method="rebuild", vertices is then dropped and
+    recreated from its own schema SQL, filled with the old rows merged
+    with the aligned values; its indexes, triggers and AUTOINCREMENT
+    counter are recreated, and foreign key enforcement is off during the
+    swap (ids and element_ids are copied unchanged, so relations still
+    hold, but they are not re-checked). method="update" instead updates
+    each aligned row in place with foreign keys enforced.
+
+    If input_db is a sidecar (see db.sidecar), only the sidecar is copied;
+    the output references the same structural source database.
 
     Args:
         input_db: Path to the input PRD-compliant database.
         output_path: Path for the output database.
-        aligned_vertices: List of aligned vertices to write.
+        aligned_vertices: Aligned vertices to write (a list is converted to
+            an AlignedVertexTable first).
+        method: One of WRITE_METHODS. Both produce the same database.
 
     Returns:
         Path to the created output database.
     """
+    return write_aligned_db_batches(
+        input_db, output_path, [as_aligned_table(aligned_vertices)], method=method,
+    )
+
+
+def write_aligned_db_batches(
+    input_db: Path,
+    output_path: Path,
+    batches: Iterable[AlignedVertexTable],
+    method: str = "rebuild",
+) -> Path:
+    """
+    write_aligned_db() for results produced batch by batch.
+
+    Each batch is written as it arrives (batches may be a generator), so
+    only one batch is held at a time. All updates are committed together;
+    if producing or writing a batch fails, the output is removed.
+
+    With method="rebuild" the batches go to a TEMP staging table and the
+    vertices table is then rebuilt from a LEFT JOIN of the old rows and
+    the staged ones (see _rebuild_vertices), instead of one indexed UPDATE
+    per vertex. Vertices without an aligned row keep their coordinates and
+    get the column defaults, exactly as with method="update".
+
+    Args:
+        input_db: Path to the input PRD-compliant database.
+        output_path: Path for the output database.
+        batches: Aligned vertices, one AlignedVertexTable per batch.
+        method: One of WRITE_METHODS.
+
+    Returns:
+        Path to the created output database.
+
+    Raises:
+        ValueError: If method is unknown.
+        FileExistsError: If output_path already exists.
+    """
+    if method not in WRITE_METHODS:
+        raise ValueError(f"Unknown write method {method!r}; expected one of {WRITE_METHODS}")
     if output_path.exists():
         raise FileExistsError(f"Output already exists: {output_path}")
 
+    start_time = time.perf_counter()
     output_path.parent.mkdir(parents=True, exist_ok=True)
     shutil.copy2(str(input_db), str(output_path))
 
-    conn = sqlite3.connect(str(output_path))
+    # Transactions are explicit: the rebuild drops and recreates vertices,
+    # which must happen with foreign key enforcement off (it cannot be
+    # switched inside a transaction) and commit as one unit.
+    conn = sqlite3.connect(str(output_path), isolation_level=None)
     try:
-        conn.execute("PRAGMA journal_mode=WAL;")
-        conn.execute("PRAGMA foreign_keys=ON;")
+        if method == "rebuild":
+            for pragma in REBUILD_PRAGMAS:
+                conn.execute(pragma)
+            conn.execute("PRAGMA foreign_keys=OFF;")
+        else:
+            conn.execute("PRAGMA journal_mode=WAL;")
+            conn.execute("PRAGMA foreign_keys=ON;")
         cursor = conn.cursor()
+        cursor.execute("BEGIN")
 
         # Add new columns to existing vertices table
         # Note: col_name/col_type come from ALTER_TABLE_COLUMNS constant, not user input
         for col_name, col_type in ALTER_TABLE_COLUMNS:
             cursor.execute(f"ALTER TABLE vertices ADD COLUMN {col_name} {col_type};")
 
-        # Update each vertex with aligned data
-        cursor.executemany(
-            """UPDATE vertices
-               SET x = ?, y = ?, z = ?,
-                   x_original = ?, y_original = ?, z_original = ?,
-                   aligned_axis = ?, fil_x_id = ?, fil_y_id = ?, fil_z_id = ?,
-                   displacement_total = ?
-               WHERE id = ?""",
-            [
-                (v.x, v.y, v.z,
-                 v.x_original, v.y_original, v.z_original,
-                 v.aligned_axis, v.fil_x_id, v.fil_y_id, v.fil_z_id,
-                 v.displacement_total,
-                 v.id)
-                for v in aligned_vertices
-            ],
-        )
+        written = 0
+        if method == "update":
+            for table in batches:
+                cursor.executemany(UPDATE_VERTEX_SQL, table.sqlite_rows())
+                written += len(table)
+        else:
+            for sql in CREATE_STAGE_SQL:
+                cursor.execute(sql)
+            thread_codes: dict[str, int] = {}
+            for table in batches:
+                cursor.executemany(INSERT_STAGE_SQL, _stage_rows(table, thread_codes))
+                written += len(table)
+            cursor.executemany(
+                "INSERT INTO aligned_axis_labels VALUES (?, ?)", enumerate(AXIS_LABELS),
+            )
+            cursor.executemany(
+                "INSERT INTO aligned_thread_ids VALUES (?, ?)",
+                ((code, fil_id) for fil_id, code in thread_codes.items()),
+            )
+            _rebuild_vertices(cursor)
 
         # Create new indexes
         for sql in CREATE_INDEXES_SQL:
             cursor.execute(sql)
 
+        cursor.execute("COMMIT")
+        if method == "rebuild":
+            conn.execute("PRAGMA journal_mode=WAL;")
+        elapsed = time.perf_counter() - start_time
+        logger.info(
+            "Written %d aligned vertices to %s in %.2fs (%.0f vertices/s, method=%s)",
+            written, output_path, elapsed, written / elapsed if elapsed > 0 else 0.0, method,
+        )
+
+    except Exception:
+        if conn.in_transaction:
+            conn.rollback()
+        output_path.unlink(missing_ok=True)
+        raise
+    finally:
+        conn.close()
+
+    return output_path
+
+
+def write_alignment_delta(
+    input_db: Path,
+    output_path: Path,
+    aligned_vertices: list[AlignedVertex] | AlignedVertexTable,
+) -> Path:
+    """
+    Create an output database holding only the vertices alignment touched.
+
+    The input database is copied unchanged and the aligned rows that moved
+    or snapped on an axis are written to an alignment_delta table keyed by
+    vertex id. The aligned_vertices view overlays the delta on vertices
+    and reads like the enriched vertices table of write_aligned_db(), with
+    x_original/y_original/z_original taken from the stored coordinates.
+    Writes and output size grow with the number of touched vertices
+    rather than the model size.
+
+    Args:
+        input_db: Path to the input PRD-compliant database.
+        output_path: Path for the output database.
+        aligned_vertices: Aligned vertices (a list is converted to an
+            AlignedVertexTable first).
+
+    Returns:
+        Path to the created output database.
+    """
+    return write_alignment_delta_batches(input_db, output_path, [as_aligned_table(aligned_vertices)])
+
+
+def write_alignment_delta_batches(
+    input_db: Path,
+    output_path: Path,
+    batches: Iterable[AlignedVertexTable],
+) -> Path:
+    """
+    write_alignment_delta() for results produced batch by batch.
+
+    Batches are consumed as in write_aligned_db_batches(): one at a time,
+    committed together, and the output is removed if any of them fails.
+
+    Args:
+        input_db: Path to the input PRD-compliant database.
+        output_path: Path for the output database.
+        batches: Aligned vertices, one AlignedVertexTable per batch.
+
+    Returns:
+        Path to the created output database.
+
+    Raises:
+        FileExistsError: If output_path already exists.
+    """
+    if output_path.exists():
+        raise FileExistsError(f"Output already exists: {output_path}")
+
+    start_time = time.perf_counter()
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copy2(str(input_db), str(output_path))
+
+    conn = sqlite3.connect(str(output_path))
+    try:
+        conn.execute("PRAGMA journal_mode=WAL;")
+        cursor = conn.cursor()
+        cursor.execute(CREATE_ALIGNMENT_DELTA_SQL)
+        cursor.execute(CREATE_ALIGNED_VIEW_SQL)
+
+        total = recorded = 0
+        for table in batches:
+            touched = table.take(table.moved_mask | table.aligned_mask)
+            cursor.executemany(INSERT_DELTA_SQL, _delta_rows(touched))
+            total += len(table)
+            recorded += len(touched)
+
         conn.commit()
-        logger.info("Written %d aligned vertices to %s", len(aligned_vertices), output_path)
+        elapsed = time.perf_counter() - start_time
+        logger.info(
+            "Written alignment delta of %d/%d vertices to %s in %.2fs",
+            recorded, total, output_path, elapsed,
+        )
 
     except Exception:
         conn.rollback()
@@ -97,3 +347,102 @@ def write_aligned_db(
         conn.close()
 
     return output_path
+
+
+def _delta_rows(table: AlignedVertexTable) -> Iterator[tuple]:
+    """alignment_delta rows of table, in INSERT_DELTA_SQL column order."""
+    for start in range(0, len(table), STAGE_CHUNK):
+        rows = slice(start, start + STAGE_CHUNK)
+        yield from zip(
+            table.id[rows].tolist(),
+            table.x[rows].tolist(), table.y[rows].tolist(), table.z[rows].tolist(),
+            table.aligned_axis(rows),
+            table.fil_ids("X", rows), table.fil_ids("Y", rows), table.fil_ids("Z", rows),
+            table.displacement[rows].tolist(),
+        )
+
+
+def _stage_rows(table: AlignedVertexTable, thread_codes: dict[str, int]) -> Iterator[tuple]:
+    """aligned_stage rows of one batch, with fil ids coded through thread_codes.
+
+    Codes are shared by all batches; new thread ids are added to
+    thread_codes as they appear. -1 (None) stays -1.
+    """
+    remap = np.array(
+        [thread_codes.setdefault(t, len(thread_codes)) for t in table.thread_ids] + [-1],
+        dtype=np.int64,
+    )
+    for start in range(0, len(table), STAGE_CHUNK):
+        rows = slice(start, start + STAGE_CHUNK)
+        yield from zip(
+            table.id[rows].tolist(),
+            table.x[rows].tolist(), table.y[rows].tolist(), table.z[rows].tolist(),
+            table.x_original[rows].tolist(), table.y_original[rows].tolist(),
+            table.z_original[rows].tolist(),
+            table.axis_code[rows].tolist(),
+            remap[table.fil_x[rows]].tolist(), remap[table.fil_y[rows]].tolist(),
+            remap[table.fil_z[rows]].tolist(),
+            table.displacement[rows].tolist(),
+        )
+
+
+def _rebuild_vertices(cursor: sqlite3.Cursor) -> None:
+    """
+    Replace vertices (already ALTERed) with its rows merged with aligned_stage.
+
+    The merged rows are built in a TEMP table, then vertices is dropped and
+    recreated from its own schema SQL (so column order, constraints, FKs
+    and AUTOINCREMENT are unchanged), refilled in id order, and its
+    indexes and triggers are recreated. id and element_id are copied
+    unchanged, so foreign key relations hold as before. Building the rows
+    outside the main database lets the new table reuse the pages freed by
+    the old one.
+    """
+    schema = cursor.execute(
+        "SELECT sql FROM main.sqlite_master WHERE type = 'table' AND name = 'vertices'"
+    ).fetchone()[0]
+    dependents = [row[0] for row in cursor.execute(
+        "SELECT sql FROM main.sqlite_master "
+        "WHERE tbl_name = 'vertices' AND type IN ('index', 'trigger') AND sql IS NOT NULL"
+    )]
+    sequence = cursor.execute(
+        "SELECT seq FROM main.sqlite_sequence WHERE name = 'vertices'"
+    ).fetchone() if _has_sqlite_sequence(cursor) else None
+
+    columns = [row[1] for row in cursor.execute("PRAGMA main.table_info(vertices)")]
+    select = ", ".join(
+        f'CASE WHEN s.id IS NULL THEN v."{name}" ELSE {STAGED_VALUES.get(name, f"s.{name}")} END'
+        if name in ALIGNED_COLUMNS else f'v."{name}"'
+        for name in columns
+    )
+    cursor.execute(
+        f"CREATE TEMP TABLE vertices_rebuilt AS SELECT {select} "
+        "FROM main.vertices v "
+        "LEFT JOIN temp.aligned_stage s ON s.id = v.id "
+        "LEFT JOIN temp.aligned_axis_labels l ON l.code = s.axis_code "
+        "LEFT JOIN temp.aligned_thread_ids fx ON fx.code = s.fil_x "
+        "LEFT JOIN temp.aligned_thread_ids fy ON fy.code = s.fil_y "
+        "LEFT JOIN temp.aligned_thread_ids fz ON fz.code = s.fil_z "
+        "ORDER BY v.id"
+    )
+    for name in ("aligned_stage", "aligned_axis_labels", "aligned_thread_ids"):
+        cursor.execute(f"DROP TABLE temp.{name}")
+    cursor.execute("DROP TABLE main.vertices")
+    cursor.execute(schema)
+    cursor.execute("INSERT INTO main.vertices SELECT * FROM temp.vertices_rebuilt")
+    cursor.execute("DROP TABLE temp.vertices_rebuilt")
+    for sql in dependents:
+        cursor.execute(sql)
+    if sequence is not None:
+        # Dropping the table reset its counter; keep ids freed before the
+        # rebuild from being handed out again
+        cursor.execute(
+            "UPDATE main.sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'vertices'",
+            sequence,
+        )
+
+
+def _has_sqlite_sequence(cursor: sqlite3.Cursor) -> bool:
+    return cursor.execute(
+        "SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = 'sqlite_sequence'"
+    ).fetchone() is not None
@@ -0,0 +1,208 @@
+"""On-disk cache of .3dm extraction results.
+
+Decoding a .3dm with rhino3dm and walking its objects dominates every
+entry point that only needs vertex coordinates. The columnar VertexTable
+produced by extract_vertex_table() is persisted as an uncompressed .npz
+under the cache directory and reused as long as the file content and the
+extractor version are unchanged.
+
+Cache layout (``STRUCTURE_ALIGNER_CACHE_DIR`` or ``~/.cache/structure_aligner``):
+    extraction/<sha256>-v<EXTRACTOR_VERSION>.npz   one entry per file content
+    extraction/index-<path hash>.json              [path, size, mtime_ns, sha256]
+
+The index lets an unchanged file (same size and mtime) skip re-hashing;
+any change in size or mtime forces a re-hash, and a different hash is a
+different entry. Each source path has its own index file, replaced
+atomically, so concurrent processes (e.g. batch workers) never lose each
+other's updates.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+from structure_aligner.etl.extractor import (
+    EXTRACTOR_VERSION,
+    VertexTable,
+    extract_vertex_table,
+)
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV = "STRUCTURE_ALIGNER_CACHE_DIR"
+DISABLE_ENV = "STRUCTURE_ALIGNER_NO_CACHE"
+
+_ARRAY_FIELDS = (
+    "x", "y", "z", "vertex_index", "name_codes",
+    "category_codes", "geometry_type_codes", "object_offsets", "object_name_codes",
+    "skipped_positions",
+)
+
+
+def default_cache_dir() -> Path:
+    """Cache root from STRUCTURE_ALIGNER_CACHE_DIR, else ~/.cache/structure_aligner."""
+    env = os.environ.get(CACHE_DIR_ENV)
+    if env:
+        return Path(env)
+    return Path.home() / ".cache" / "structure_aligner"
+
+
+def load_vertex_table(
+    path: Path,
+    workers: int = 1,
+    cache_dir: Path | None = None,
+    use_cache: bool = True,
+) -> VertexTable:
+    """Return the VertexTable for a .3dm file, from cache when possible.
+
+    On a miss the file is extracted with extract_vertex_table() and the
+    result stored. Cache I/O problems are logged and never fail the caller.
+    Setting STRUCTURE_ALIGNER_NO_CACHE=1 disables the cache globally.
+
+    Raises:
+        FileNotFoundError: If the .3dm file does not exist.
+        RuntimeError: If the .3dm file cannot be read.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"3DM file not found: {path}")
+
+    if not use_cache or os.environ.get(DISABLE_ENV) == "1":
+        return extract_vertex_table(path, workers=workers)
+
+    root = (cache_dir or default_cache_dir()) / "extraction"
+    digest = _content_digest(path, root)
+    entry = root / f"{digest}-v{EXTRACTOR_VERSION}.npz"
+
+    table = _read_entry(entry)
+    if table is not None:
+        logger.info("Extraction cache hit for %s (%d vertices)", path.name, len(table))
+        return table
+
+    logger.info("Extraction cache miss for %s; extracting", path.name)
+    table = extract_vertex_table(path, workers=workers)
+    _write_entry(entry, table, path)
+    return table
+
+
+def clear_cache(cache_dir: Path | None = None) -> int:
+    """Delete all cached extraction entries. Returns the number of files removed."""
+    root = (cache_dir or default_cache_dir()) / "extraction"
+    removed = 0
+    if root.is_dir():
+        for f in root.iterdir():
+            if f.suffix in (".npz", ".json"):
+                f.unlink(missing_ok=True)
+                removed += 1
+    return removed
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 hex digest of a file's content."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def atomic_write(target: Path, write) -> None:
+    """Write target via a temp file in the same directory, then os.replace().
+
+    write(f) receives the temp file opened in binary mode. Readers never
+    see a partially written target; on failure the temp file is removed.
+    """
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+# =========================================================================
+# Internal helpers
+# =========================================================================
+
+
+def _content_digest(path: Path, root: Path) -> str:
+    """Content hash of path, reusing the indexed hash if size and mtime match."""
+    stat = path.stat()
+    key = str(path.resolve())
+    index_path = root / f"index-{hashlib.sha256(key.encode()).hexdigest()[:16]}.json"
+
+    cached = _read_index(index_path)
+    if cached is not None and cached[:3] == [key, stat.st_size, stat.st_mtime_ns]:
+        return cached[3]
+
+    digest = file_digest(path)
+    record = [key, stat.st_size, stat.st_mtime_ns, digest]
+    try:
+        root.mkdir(parents=True, exist_ok=True)
+        atomic_write(index_path, lambda f: f.write(json.dumps(record).encode()))
+    except OSError as e:
+        logger.warning("Could not update extraction cache index %s: %s", index_path, e)
+    return digest
+
+
+def _read_index(index_path: Path) -> list | None:
+    try:
+        record = json.loads(index_path.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable extraction cache index %s: %s", index_path, e)
+        return None
+    return record if isinstance(record, list) and len(record) == 4 else None
+
+
+def _read_entry(entry: Path) -> VertexTable | None:
+    if not entry.exists():
+        return None
+    try:
+        with np.load(entry, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("extractor_version") != EXTRACTOR_VERSION:
+                return None
+            arrays = {name: data[name] for name in _ARRAY_FIELDS}
+            w = data["w"] if "w" in data.files else None
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        logger.warning("Discarding corrupt extraction cache entry %s: %s", entry, e)
+        entry.unlink(missing_ok=True)
+        return None
+
+    return VertexTable(
+        names=meta["names"],
+        total_objects=meta["total_objects"],
+        skipped_objects=meta["skipped_objects"],
+        w=w,
+        **arrays,
+    )
+
+
+def _write_entry(entry: Path, table: VertexTable, source: Path) -> None:
+    meta = {
+        "extractor_version": EXTRACTOR_VERSION,
+        "source": str(source),
+        "names": table.names,
+        "total_objects": table.total_objects,
+        "skipped_objects": table.skipped_objects,
+    }
+    arrays = {name: getattr(table, name) for name in _ARRAY_FIELDS}
+    if table.w is not None:
+        arrays["w"] = table.w
+    try:
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(entry, lambda f: np.savez(f, meta=np.array(json.dumps(meta)), **arrays))
+    except OSError as e:
+        logger.warning("Could not write extraction cache entry %s: %s", entry, e)
+
@@ -1,10 +1,29 @@
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Iterator
 import logging
+
+import numpy as np
 import rhino3dm
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever extraction output changes (traversal order, geometry handling,
+# vocabularies) so persisted extraction caches are invalidated.
+EXTRACTOR_VERSION = 3
+
+# Prefix of skipped_objects entries for objects without a name
+UNNAMED_PREFIX = "unnamed-object-layer-"
+
+# Categorical vocabularies for VertexTable code columns
+CATEGORIES = ("poteau", "poutre", "voile", "dalle", "appui", "unknown")
+GEOMETRY_TYPES = ("brep", "line_curve", "polyline_curve", "nurbs_curve", "point")
+
+_CATEGORY_CODES = {name: code for code, name in enumerate(CATEGORIES)}
+_GEOMETRY_TYPE_CODES = {name: code for code, name in enumerate(GEOMETRY_TYPES)}
+
 
 @dataclass
 class RawVertex:
@@ -27,7 +46,122 @@ class ExtractionResult:
     skipped_objects: list[str] = field(default_factory=list)
 
 
-def extract_vertices(path: Path) -> ExtractionResult:
+@dataclass
+class VertexTable:
+    """Columnar extraction result: parallel arrays with one row per vertex.
+
+    Element names, categories and geometry types are stored as integer codes
+    into ``names``, ``CATEGORIES`` and ``GEOMETRY_TYPES``. Vertices of one
+    object are contiguous; ``object_offsets[i]:object_offsets[i + 1]`` is the
+    row range of the i-th extracted object and ``object_name_codes[i]`` its
+    name (also for objects without vertices). ``skipped_positions[j]`` is
+    the number of extracted objects that precede ``skipped_objects[j]`` in
+    the file, so the two lists can be merged back into object order.
+
+    Coordinates are stored as read: NURBS control points are homogeneous
+    (weighted), so when the file holds a rational curve ``w`` carries the
+    per-vertex weights (1.0 for every other vertex) and ``x / w`` is the
+    Euclidean position. ``w`` is None when all weights are 1.
+    """
+    x: np.ndarray                    # float64
+    y: np.ndarray                    # float64
+    z: np.ndarray                    # float64
+    vertex_index: np.ndarray         # int32
+    name_codes: np.ndarray           # int32, index into names
+    category_codes: np.ndarray       # int8, index into CATEGORIES
+    geometry_type_codes: np.ndarray  # int8, index into GEOMETRY_TYPES
+    names: list[str] = field(default_factory=list)
+    object_offsets: np.ndarray = field(default_factory=lambda: np.zeros(1, dtype=np.int64))
+    object_name_codes: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int32))
+    total_objects: int = 0
+    skipped_objects: list[str] = field(default_factory=list)
+    w: np.ndarray | None = None      # float64, NURBS control-point weights
+    skipped_positions: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    @property
+    def total_vertices(self) -> int:
+        return len(self.x)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the array columns (excludes the names list)."""
+        return sum(
+            a.nbytes for a in (
+                self.x, self.y, self.z, self.vertex_index, self.name_codes,
+                self.category_codes, self.geometry_type_codes, self.object_offsets,
+                self.object_name_codes, self.skipped_positions,
+            )
+        ) + (self.w.nbytes if self.w is not None else 0)
+
+    @classmethod
+    def empty(cls) -> "VertexTable":
+        return cls(
+            x=np.empty(0, dtype=np.float64),
+            y=np.empty(0, dtype=np.float64),
+            z=np.empty(0, dtype=np.float64),
+            vertex_index=np.empty(0, dtype=np.int32),
+            name_codes=np.empty(0, dtype=np.int32),
+            category_codes=np.empty(0, dtype=np.int8),
+            geometry_type_codes=np.empty(0, dtype=np.int8),
+        )
+
+    @classmethod
+    def from_extraction(cls, extraction: ExtractionResult) -> "VertexTable":
+        """Build a table from a list-based ExtractionResult.
+
+        Object boundaries are inferred from runs of the same element name.
+        The result does not record where skipped objects were, so they are
+        placed after every extracted object.
+        """
+        builder = _TableBuilder()
+        current = None
+        points: list[tuple[float, float, float, int]] = []
+        for v in extraction.vertices:
+            key = (v.element_name, v.category, v.geometry_type)
+            if key != current or (points and v.vertex_index <= points[-1][3]):
+                if current is not None:
+                    builder.add_object(current[0], current[1], current[2], points)
+                current = key
+                points = []
+            points.append((v.x, v.y, v.z, v.vertex_index))
+        if current is not None:
+            builder.add_object(current[0], current[1], current[2], points)
+        return builder.build(extraction.total_objects, list(extraction.skipped_objects))
+
+    def iter_raw_vertices(self) -> Iterator[RawVertex]:
+        """Yield RawVertex records (for code that still expects objects)."""
+        names = self.names
+        for x, y, z, vi, nc, cc, gc in zip(
+            self.x.tolist(), self.y.tolist(), self.z.tolist(),
+            self.vertex_index.tolist(), self.name_codes.tolist(),
+            self.category_codes.tolist(), self.geometry_type_codes.tolist(),
+        ):
+            yield RawVertex(names[nc], x, y, z, vi, CATEGORIES[cc], GEOMETRY_TYPES[gc])
+
+    def to_extraction_result(self) -> ExtractionResult:
+        vertices = list(self.iter_raw_vertices())
+        return ExtractionResult(
+            vertices=vertices,
+            total_objects=self.total_objects,
+            total_vertices=len(vertices),
+            skipped_objects=list(self.skipped_objects),
+        )
+
+    def element_name_array(self) -> np.ndarray:
+        """Per-vertex element names as an object array (decodes name_codes)."""
+        return np.asarray(self.names, dtype=object)[self.name_codes]
+
+    def category_array(self) -> np.ndarray:
+        return np.asarray(CATEGORIES, dtype=object)[self.category_codes]
+
+    def geometry_type_array(self) -> np.ndarray:
+        return np.asarray(GEOMETRY_TYPES, dtype=object)[self.geometry_type_codes]
+
+
+def extract_vertices(path: Path, workers: int = 1) -> ExtractionResult:
     """
     Extract all vertices from a .3dm Rhino file.
 
@@ -36,6 +170,10 @@ def extract_vertices(path: Path) -> ExtractionResult:
 
     Args:
         path: Path to the .3dm file.
+        workers: Number of worker processes. With more than one, each
+            worker reads the file and extracts a contiguous object-index
+            range; shards are merged in object order, so the result is
+            identical to a serial extraction.
 
     Returns:
         ExtractionResult with all raw vertices and metadata.
@@ -44,40 +182,283 @@ def extract_vertices(path: Path) -> ExtractionResult:
         FileNotFoundError: If the .3dm file does not exist.
         RuntimeError: If the .3dm file cannot be read.
     """
+    if workers > 1:
+        return extract_vertex_table(path, workers=workers).to_extraction_result()
+
+    model = _read_model(path)
+    result = ExtractionResult(total_objects=len(model.Objects))
+
+    for name, category, geometry_type, points, _ in _walk_objects(model, result.skipped_objects):
+        result.vertices.extend(
+            RawVertex(name, x, y, z, vi, category, geometry_type)
+            for x, y, z, vi in points
+        )
+
+    result.total_vertices = len(result.vertices)
+    return result
+
+
+def extract_vertex_table(path: Path, workers: int = 1) -> VertexTable:
+    """
+    Extract all vertices from a .3dm Rhino file into a columnar VertexTable.
+
+    Same traversal and vertex order as extract_vertices(), but coordinates
+    are accumulated into typed arrays and names/categories/geometry types
+    are dictionary-encoded, so no per-vertex Python object is retained.
+
+    Args:
+        path: Path to the .3dm file.
+        workers: Number of worker processes (see extract_vertices()).
+
+    Raises:
+        FileNotFoundError: If the .3dm file does not exist.
+        RuntimeError: If the .3dm file cannot be read.
+    """
+    if workers <= 1:
+        return _extract_shard(path, 0, 1)
+
+    if not path.exists():
+        raise FileNotFoundError(f"3DM file not found: {path}")
+
+    # Workers size their own object range from the model they read, so the
+    # parent never has to decode the file.
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        shards = list(pool.map(_extract_shard, [path] * workers, range(workers), [workers] * workers))
+
+    table = merge_vertex_tables(shards)
+    logger.debug(
+        "Merged %d extraction shards: %d objects, %d vertices",
+        len(shards), table.total_objects, table.total_vertices,
+    )
+    return table
+
+
+def iter_vertices(path: Path, batch_size: int = 50_000) -> Iterator[VertexTable]:
+    """
+    Stream the vertices of a .3dm Rhino file as VertexTable batches.
+
+    Same traversal and vertex order as extract_vertex_table(). A batch is
+    closed at the first object boundary at or after batch_size vertices, so
+    an object is never split across batches. Each batch carries its own
+    name dictionary, the file's total_objects, and the objects skipped
+    since the previous batch.
+
+    Raises:
+        FileNotFoundError: If the .3dm file does not exist.
+        RuntimeError: If the .3dm file cannot be read.
+        ValueError: If batch_size is not positive.
+    """
+    if batch_size <= 0:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+    model = _read_model(path)
+    total = len(model.Objects)
+    skipped: list[str] = []
+    builder = _TableBuilder()
+    for name, category, geometry_type, points, weights in _walk_objects(model, skipped):
+        builder.add_object(name, category, geometry_type, points, weights, len(skipped))
+        if len(builder.x) >= batch_size:
+            # _walk_objects keeps appending to this list, so hand out a copy
+            yield builder.build(total, list(skipped))
+            skipped.clear()
+            builder = _TableBuilder()
+
+    if len(builder.x) or skipped:
+        yield builder.build(total, skipped)
+
+
+def merge_vertex_tables(shards: list[VertexTable]) -> VertexTable:
+    """Concatenate VertexTables in order, re-encoding element names.
+
+    total_objects is taken from the first shard: shards of one file all
+    report the file's object count.
+    """
+    if not shards:
+        return VertexTable.empty()
+
+    w = None
+    if any(s.w is not None for s in shards):
+        w = np.concatenate([s.w if s.w is not None else np.ones(len(s)) for s in shards])
+
+    names: dict[str, int] = {}
+    name_codes = []
+    object_name_codes = []
+    offsets = [np.zeros(1, dtype=np.int64)]
+    skipped: list[str] = []
+    skipped_positions = []
+    row_base = 0
+    object_base = 0
+    for shard in shards:
+        remap = np.array(
+            [names.setdefault(name, len(names)) for name in shard.names], dtype=np.int32,
+        )
+        name_codes.append(remap[shard.name_codes] if len(remap) else shard.name_codes)
+        object_name_codes.append(remap[shard.object_name_codes] if len(remap) else shard.object_name_codes)
+        offsets.append(shard.object_offsets[1:] + row_base)
+        row_base += len(shard)
+        skipped.extend(shard.skipped_objects)
+        skipped_positions.append(shard.skipped_positions + object_base)
+        object_base += len(shard.object_name_codes)
+
+    return VertexTable(
+        x=np.concatenate([s.x for s in shards]),
+        y=np.concatenate([s.y for s in shards]),
+        z=np.concatenate([s.z for s in shards]),
+        vertex_index=np.concatenate([s.vertex_index for s in shards]),
+        name_codes=np.concatenate(name_codes),
+        category_codes=np.concatenate([s.category_codes for s in shards]),
+        geometry_type_codes=np.concatenate([s.geometry_type_codes for s in shards]),
+        names=list(names),
+        object_offsets=np.concatenate(offsets),
+        object_name_codes=np.concatenate(object_name_codes),
+        total_objects=shards[0].total_objects,
+        skipped_objects=skipped,
+        w=w,
+        skipped_positions=np.concatenate(skipped_positions),
+    )
+
+
+def _extract_shard(path: Path, shard: int, shard_count: int) -> VertexTable:
+    """Extract the shard-th of shard_count contiguous object ranges of a file.
+
+    Top-level so it can be pickled into worker processes.
+    """
+    model = _read_model(path)
+    total = len(model.Objects)
+    start = total * shard // shard_count
+    stop = total * (shard + 1) // shard_count
+
+    skipped: list[str] = []
+    builder = _TableBuilder()
+    for name, category, geometry_type, points, weights in _walk_objects(model, skipped, start, stop):
+        builder.add_object(name, category, geometry_type, points, weights, len(skipped))
+    return builder.build(total, skipped)
+
+
+class _TableBuilder:
+    """Accumulates per-object points into VertexTable columns."""
+
+    def __init__(self) -> None:
+        self.x = array("d")
+        self.y = array("d")
+        self.z = array("d")
+        self.vertex_index = array("i")
+        self.w = array("d")
+        self.rational = False
+        self.name_codes: dict[str, int] = {}
+        self.object_name_codes = array("i")
+        self.object_category_codes = array("b")
+        self.object_geometry_codes = array("b")
+        self.object_offsets = array("q", [0])
+        self.skipped_positions = array("q")
+
+    def add_object(
+        self,
+        name: str,
+        category: str,
+        geometry_type: str,
+        points: list[tuple[float, float, float, int]],
+        weights: list[float] | None = None,
+        skipped_count: int = 0,
+    ) -> None:
+        """Append one object; skipped_count is the length of the skipped
+        list so far, so newly skipped objects are placed before this one."""
+        self._place_skipped(skipped_count)
+        for x, y, z, vi in points:
+            self.x.append(x)
+            self.y.append(y)
+            self.z.append(z)
+            self.vertex_index.append(vi)
+        if weights is None:
+            self.w.extend([1.0] * len(points))
+        else:
+            self.w.extend(weights)
+            self.rational = self.rational or any(w != 1.0 for w in weights)
+        code = self.name_codes.setdefault(name, len(self.name_codes))
+        self.object_name_codes.append(code)
+        self.object_category_codes.append(
+            _CATEGORY_CODES.get(category, _CATEGORY_CODES["unknown"])
+        )
+        self.object_geometry_codes.append(_GEOMETRY_TYPE_CODES[geometry_type])
+        self.object_offsets.append(len(self.x))
+
+    def _place_skipped(self, skipped_count: int) -> None:
+        while len(self.skipped_positions) < skipped_count:
+            self.skipped_positions.append(len(self.object_name_codes))
+
+    def build(self, total_objects: int, skipped_objects: list[str]) -> VertexTable:
+        self._place_skipped(len(skipped_objects))
+        offsets = np.frombuffer(self.object_offsets, dtype=np.int64).copy()
+        counts = np.diff(offsets)
+        object_name_codes = np.frombuffer(self.object_name_codes, dtype=np.int32).copy()
+        return VertexTable(
+            x=np.frombuffer(self.x, dtype=np.float64).copy(),
+            y=np.frombuffer(self.y, dtype=np.float64).copy(),
+            z=np.frombuffer(self.z, dtype=np.float64).copy(),
+            vertex_index=np.frombuffer(self.vertex_index, dtype=np.int32).copy(),
+            name_codes=np.repeat(object_name_codes, counts),
+            category_codes=np.repeat(np.frombuffer(self.object_category_codes, dtype=np.int8), counts),
+            geometry_type_codes=np.repeat(np.frombuffer(self.object_geometry_codes, dtype=np.int8), counts),
+            names=list(self.name_codes),
+            object_offsets=offsets,
+            object_name_codes=object_name_codes,
+            total_objects=total_objects,
+            skipped_objects=skipped_objects,
+            w=np.frombuffer(self.w, dtype=np.float64).copy() if self.rational else None,
+            skipped_positions=np.frombuffer(self.skipped_positions, dtype=np.int64).copy(),
+        )
+
+
+def _read_model(path: Path) -> rhino3dm.File3dm:
     if not path.exists():
         raise FileNotFoundError(f"3DM file not found: {path}")
 
     model = rhino3dm.File3dm.Read(str(path))
     if model is None:
         raise RuntimeError(f"Failed to read 3DM file: {path}")
+    return model
 
+
+def _walk_objects(
+    model: rhino3dm.File3dm,
+    skipped_objects: list[str],
+    start: int = 0,
+    stop: int | None = None,
+) -> Iterator[tuple[str, str, str, list[tuple[float, float, float, int]], list[float] | None]]:
+    """Yield (name, category, geometry_type, points, weights) for supported objects.
+
+    Walks model.Objects[start:stop]. Unnamed and unsupported objects are
+    appended to skipped_objects. weights are the NURBS control-point
+    weights (None for other geometry).
+    """
     # Build layer lookup for category resolution
     layer_by_id = {}
     for layer in model.Layers:
         layer_by_id[str(layer.Id)] = layer
 
-    result = ExtractionResult(total_objects=len(model.Objects))
+    objects = model.Objects
+    if stop is None:
+        stop = len(objects)
 
-    for obj in model.Objects:
+    for i in range(start, stop):
+        obj = objects[i]
         name = obj.Attributes.Name
         if not name:
-            result.skipped_objects.append(f"unnamed-object-layer-{obj.Attributes.LayerIndex}")
+            skipped_objects.append(f"{UNNAMED_PREFIX}{obj.Attributes.LayerIndex}")
             continue
 
         geom = obj.Geometry
-        layer = model.Layers[obj.Attributes.LayerIndex]
-        category = _resolve_category(layer, layer_by_id)
-
-        extracted = _extract_from_geometry(name, geom, category)
+        extracted = _geometry_points(geom)
         if extracted is None:
-            result.skipped_objects.append(name)
+            skipped_objects.append(name)
             logger.debug("Skipped unsupported geometry type %s for %s", type(geom).__name__, name)
             continue
 
-        result.vertices.extend(extracted)
-
-    result.total_vertices = len(result.vertices)
-    return result
+        layer = model.Layers[obj.Attributes.LayerIndex]
+        category = _resolve_category(layer, layer_by_id)
+        geometry_type, points = extracted
+        weights = _control_point_weights(geom) if geometry_type == "nurbs_curve" else None
+        yield name, category, geometry_type, points, weights
 
 
 def _resolve_category(layer: rhino3dm.Layer, layer_by_id: dict) -> str:
@@ -103,35 +484,57 @@ def _resolve_category(layer: rhino3dm.Layer, layer_by_id: dict) -> str:
     return category_map.get(current.Name, "unknown")
 
 
-def _extract_from_geometry(
-    name: str, geom: rhino3dm.GeometryBase, category: str
-) -> list[RawVertex] | None:
-    """Extract vertices from a single geometry object."""
-    vertices = []
-
+def _geometry_points(
+    geom: rhino3dm.GeometryBase,
+) -> tuple[str, list[tuple[float, float, float, int]]] | None:
+    """Return (geometry_type, [(x, y, z, vertex_index), ...]) or None if unsupported."""
     if isinstance(geom, rhino3dm.Brep):
+        points = []
         for vi in range(len(geom.Vertices)):
-            v = geom.Vertices[vi]
-            vertices.append(RawVertex(name, v.Location.X, v.Location.Y, v.Location.Z, vi, category, "brep"))
+            loc = geom.Vertices[vi].Location
+            points.append((loc.X, loc.Y, loc.Z, vi))
+        return "brep", points
 
-    elif isinstance(geom, rhino3dm.LineCurve):
-        vertices.append(RawVertex(name, geom.PointAtStart.X, geom.PointAtStart.Y, geom.PointAtStart.Z, 0, category, "line_curve"))
-        vertices.append(RawVertex(name, geom.PointAtEnd.X, geom.PointAtEnd.Y, geom.PointAtEnd.Z, 1, category, "line_curve"))
+    if isinstance(geom, rhino3dm.LineCurve):
+        start, end = geom.PointAtStart, geom.PointAtEnd
+        return "line_curve", [(start.X, start.Y, start.Z, 0), (end.X, end.Y, end.Z, 1)]
 
-    elif isinstance(geom, rhino3dm.PolylineCurve):
+    if isinstance(geom, rhino3dm.PolylineCurve):
+        points = []
         for pi in range(geom.PointCount):
             p = geom.Point(pi)
-            vertices.append(RawVertex(name, p.X, p.Y, p.Z, pi, category, "polyline_curve"))
+            points.append((p.X, p.Y, p.Z, pi))
+        return "polyline_curve", points
 
-    elif isinstance(geom, rhino3dm.NurbsCurve):
+    if isinstance(geom, rhino3dm.NurbsCurve):
+        points = []
         for pi in range(len(geom.Points)):
             p = geom.Points[pi]
-            vertices.append(RawVertex(name, p.X, p.Y, p.Z, pi, category, "nurbs_curve"))
+            points.append((p.X, p.Y, p.Z, pi))
+        return "nurbs_curve", points
 
-    elif isinstance(geom, rhino3dm.Point):
-        vertices.append(RawVertex(name, geom.Location.X, geom.Location.Y, geom.Location.Z, 0, category, "point"))
+    if isinstance(geom, rhino3dm.Point):
+        loc = geom.Location
+        return "point", [(loc.X, loc.Y, loc.Z, 0)]
 
-    else:
-        return None
+    return None
 
-    return vertices
+
+def _control_point_weights(geom: rhino3dm.NurbsCurve) -> list[float]:
+    """Weights of a NURBS curve's control points (0 is read as 1)."""
+    weights = []
+    for pi in range(len(geom.Points)):
+        w = geom.Points[pi].W
+        weights.append(w if w != 0 else 1.0)
+    return weights
+
+
+def _extract_from_geometry(
+    name: str, geom: rhino3dm.GeometryBase, category: str
+) -> list[RawVertex] | None:
+    """Extract vertices from a single geometry object."""
+    extracted = _geometry_points(geom)
+    if extracted is None:
+        return None
+    geometry_type, points = extracted
+    return [RawVertex(name, x, y, z, vi, category, geometry_type) for x, y, z, vi in points]
@@ -0,0 +1,336 @@
+"""Incremental ETL: refresh an existing PRD database from a re-saved .3dm.
+
+Each element's vertices are summarised by a fingerprint (element name,
+geometry type, vertex count and a BLAKE2b digest of its packed
+(x, y, z, vertex_index) records in vertex order), stored in the
+``element_fingerprints`` table of the PRD database. An update transforms
+the new file as usual, fingerprints the result, and rewrites the
+``vertices`` rows of added, removed and changed elements only; rows of
+unchanged elements keep their ids and are not touched.
+
+Rewritten elements receive new vertex ids (appended), so after an update
+the id order no longer groups elements by name the way a fresh load does.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import struct
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from structure_aligner.etl.transformer import (
+    StreamedVertices,
+    TransformResult,
+    Vertex,
+    VertexColumns,
+)
+
+logger = logging.getLogger(__name__)
+
+CREATE_FINGERPRINTS_SQL = """
+CREATE TABLE IF NOT EXISTS element_fingerprints (
+    element_id INTEGER PRIMARY KEY,
+    nom VARCHAR(100) NOT NULL,
+    geometry_type VARCHAR(30),
+    vertex_count INTEGER NOT NULL,
+    digest CHAR(32) NOT NULL
+);
+"""
+
+# Packed per-vertex record hashed into the digest (little-endian)
+_RECORD = struct.Struct("<dddq")
+_RECORD_DTYPE = np.dtype([("x", "<f8"), ("y", "<f8"), ("z", "<f8"), ("vertex_index", "<i8")])
+
+
+@dataclass(frozen=True)
+class ElementFingerprint:
+    """Geometry fingerprint of one element's vertices."""
+    element_id: int
+    nom: str
+    geometry_type: str | None
+    vertex_count: int
+    digest: str
+
+
+@dataclass
+class UpdateReport:
+    """Summary of an incremental update."""
+    prd_db: str
+    elements_added: list[int] = field(default_factory=list)
+    elements_removed: list[int] = field(default_factory=list)
+    elements_changed: list[int] = field(default_factory=list)
+    elements_unchanged: int = 0
+    element_rows_updated: int = 0
+    vertices_deleted: int = 0
+    vertices_inserted: int = 0
+    fingerprints_rebuilt: bool = False
+    execution_time_s: float = 0.0
+
+    @property
+    def touched_elements(self) -> int:
+        return len(self.elements_added) + len(self.elements_removed) + len(self.elements_changed)
+
+
+def fingerprints_from_columns(
+    columns: VertexColumns,
+    names: dict[int, str],
+    geometry_types: dict[int, str | None],
+) -> dict[int, ElementFingerprint]:
+    """Fingerprint every element present in a VertexColumns block.
+
+    Vertices of an element are taken in row order, which matches the
+    ``ORDER BY element_id, id`` order of a loaded database.
+    """
+    n = len(columns)
+    if n == 0:
+        return {}
+
+    order = np.argsort(columns.element_id, kind="stable")
+    ids = columns.element_id[order]
+    records = np.empty(n, dtype=_RECORD_DTYPE)
+    records["x"] = columns.x[order]
+    records["y"] = columns.y[order]
+    records["z"] = columns.z[order]
+    records["vertex_index"] = columns.vertex_index[order]
+
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(ids)) + 1))
+    stops = np.concatenate((starts[1:], [n]))
+    buffer = memoryview(records.tobytes())
+    size = _RECORD_DTYPE.itemsize
+    fingerprints = {}
+    for eid, start, stop in zip(ids[starts].tolist(), starts.tolist(), stops.tolist()):
+        h = _new_digest(geometry_types.get(eid))
+        h.update(buffer[start * size:stop * size])
+        fingerprints[eid] = ElementFingerprint(
+            eid, names[eid], geometry_types.get(eid), stop - start, h.hexdigest(),
+        )
+    return fingerprints
+
+
+def fingerprints_from_db(conn: sqlite3.Connection, chunk_size: int = 50_000) -> dict[int, ElementFingerprint]:
+    """Fingerprint the elements of a PRD database from its vertices rows."""
+    elements = {
+        row[0]: (row[1], row[2])
+        for row in conn.execute("SELECT id, nom, geometry_type FROM elements")
+    }
+    fingerprints: dict[int, ElementFingerprint] = {}
+    current = None
+    h = None
+    count = 0
+
+    def finish():
+        nom, geometry_type = elements.get(current, ("", None))
+        fingerprints[current] = ElementFingerprint(current, nom, geometry_type, count, h.hexdigest())
+
+    cursor = conn.execute("SELECT element_id, x, y, z, vertex_index FROM vertices ORDER BY element_id, id")
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            break
+        for eid, x, y, z, vi in rows:
+            if eid != current:
+                if current is not None:
+                    finish()
+                current = eid
+                h = _new_digest(elements.get(eid, ("", None))[1])
+                count = 0
+            h.update(_RECORD.pack(x, y, z, vi))
+            count += 1
+    if current is not None:
+        finish()
+    return fingerprints
+
+
+def read_fingerprints(conn: sqlite3.Connection) -> dict[int, ElementFingerprint] | None:
+    """Stored fingerprints, or None if the database has no fingerprint table."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='element_fingerprints'"
+    ).fetchone()
+    if exists is None:
+        return None
+    return {
+        row[0]: ElementFingerprint(*row)
+        for row in conn.execute(
+            "SELECT element_id, nom, geometry_type, vertex_count, digest FROM element_fingerprints"
+        )
+    }
+
+
+def write_fingerprints(cursor: sqlite3.Cursor, fingerprints: dict[int, ElementFingerprint]) -> None:
+    """Create the fingerprint table if needed and upsert the given rows."""
+    cursor.execute(CREATE_FINGERPRINTS_SQL)
+    cursor.executemany(
+        "INSERT OR REPLACE INTO element_fingerprints (element_id, nom, geometry_type, vertex_count, digest) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [(f.element_id, f.nom, f.geometry_type, f.vertex_count, f.digest) for f in fingerprints.values()],
+    )
+
+
+def update(result: TransformResult, prd_db: Path) -> UpdateReport:
+    """
+    Apply a transformed .3dm to an existing PRD database incrementally.
+
+    Compares fingerprints of the new vertices against those stored in
+    prd_db (rebuilt from its vertices if the table is missing) and, in one
+    transaction, deletes and re-inserts the vertices of changed elements,
+    inserts added elements, removes dropped ones and updates element rows
+    whose type, name or geometry type changed.
+
+    Args:
+        result: TransformResult from transform() (not a streamed one).
+        prd_db: PRD database produced by load(); modified in place.
+
+    Returns:
+        UpdateReport describing what was rewritten. A JSON copy is written
+        next to the database as ``<name>.etl_update_report.json``.
+
+    Raises:
+        FileNotFoundError: If prd_db does not exist.
+        ValueError: If result.vertices is a stream.
+        sqlite3.Error: If database operations fail (transaction is rolled back).
+    """
+    if not prd_db.exists():
+        raise FileNotFoundError(f"PRD database not found: {prd_db}")
+    if isinstance(result.vertices, StreamedVertices):
+        raise ValueError("Incremental update needs in-memory vertices, not a stream")
+
+    start_time = time.time()
+    columns = _as_columns(result.vertices)
+    new_elements = {e.id: e for e in result.elements}
+    new_fp = fingerprints_from_columns(
+        columns,
+        {e.id: e.nom for e in result.elements},
+        {e.id: e.geometry_type for e in result.elements},
+    )
+
+    report = UpdateReport(prd_db=str(prd_db))
+    conn = sqlite3.connect(str(prd_db))
+    try:
+        conn.execute("PRAGMA foreign_keys=ON;")
+        old_fp = read_fingerprints(conn)
+        if old_fp is None:
+            logger.info("No element_fingerprints table in %s; computing from vertices", prd_db)
+            old_fp = fingerprints_from_db(conn)
+            report.fingerprints_rebuilt = True
+
+        old_elements = {
+            row[0]: row[1:]
+            for row in conn.execute("SELECT id, type, nom, geometry_type FROM elements")
+        }
+
+        report.elements_added = sorted(set(new_fp) - set(old_fp))
+        report.elements_removed = sorted(set(old_fp) - set(new_fp))
+        report.elements_changed = sorted(
+            eid for eid in set(new_fp) & set(old_fp) if new_fp[eid] != old_fp[eid]
+        )
+        report.elements_unchanged = len(set(new_fp) & set(old_fp)) - len(report.elements_changed)
+        rewrite = report.elements_added + report.elements_changed
+        drop = report.elements_removed + report.elements_changed
+
+        cursor = conn.cursor()
+        cursor.execute(CREATE_FINGERPRINTS_SQL)
+
+        # Element rows first so new vertices can reference them
+        for eid, e in new_elements.items():
+            row = (e.type, e.nom, e.geometry_type)
+            if eid not in old_elements:
+                cursor.execute(
+                    "INSERT INTO elements (id, type, nom, geometry_type) VALUES (?, ?, ?, ?)",
+                    (eid, *row),
+                )
+                report.element_rows_updated += 1
+            elif tuple(old_elements[eid]) != row:
+                cursor.execute(
+                    "UPDATE elements SET type = ?, nom = ?, geometry_type = ? WHERE id = ?",
+                    (*row, eid),
+                )
+                report.element_rows_updated += 1
+
+        # Vertices of removed and changed elements
+        if drop:
+            cursor.executemany("DELETE FROM vertices WHERE element_id = ?", [(eid,) for eid in drop])
+            report.vertices_deleted = sum(old_fp[eid].vertex_count for eid in drop)
+            cursor.executemany("DELETE FROM element_fingerprints WHERE element_id = ?", [(eid,) for eid in drop])
+
+        # Elements no longer in the source database
+        gone = sorted(set(old_elements) - set(new_elements))
+        if gone:
+            cursor.executemany("DELETE FROM vertices WHERE element_id = ?", [(eid,) for eid in gone])
+            cursor.executemany("DELETE FROM elements WHERE id = ?", [(eid,) for eid in gone])
+            report.element_rows_updated += len(gone)
+
+        # Vertices of added and changed elements, in transform order
+        if rewrite:
+            rows = np.flatnonzero(np.isin(columns.element_id, np.array(rewrite, dtype=np.int64)))
+            subset = columns.take(rows)
+            cursor.executemany(
+                "INSERT INTO vertices (element_id, x, y, z, vertex_index) VALUES (?, ?, ?, ?, ?)",
+                subset.rows(),
+            )
+            report.vertices_inserted = len(subset)
+
+        if report.fingerprints_rebuilt:
+            write_fingerprints(cursor, new_fp)
+        else:
+            write_fingerprints(cursor, {eid: new_fp[eid] for eid in rewrite})
+
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+    report.execution_time_s = round(time.time() - start_time, 3)
+    logger.info(
+        "Incremental update: %d added, %d removed, %d changed, %d unchanged elements "
+        "(%d vertices deleted, %d inserted) in %.3fs",
+        len(report.elements_added), len(report.elements_removed), len(report.elements_changed),
+        report.elements_unchanged, report.vertices_deleted, report.vertices_inserted,
+        report.execution_time_s,
+    )
+    _write_report(report, prd_db.with_suffix(".etl_update_report.json"))
+    return report
+
+
+# =========================================================================
+# Internal helpers
+# =========================================================================
+
+
+def _new_digest(geometry_type: str | None) -> "hashlib._Hash":
+    h = hashlib.blake2b(digest_size=16)
+    h.update((geometry_type or "").encode() + b"\0")
+    return h
+
+
+def _as_columns(vertices: list[Vertex] | VertexColumns) -> VertexColumns:
+    if isinstance(vertices, VertexColumns):
+        return vertices
+    return VertexColumns(
+        element_id=np.array([v.element_id for v in vertices], dtype=np.int64),
+        x=np.array([v.x for v in vertices], dtype=np.float64),
+        y=np.array([v.y for v in vertices], dtype=np.float64),
+        z=np.array([v.z for v in vertices], dtype=np.float64),
+        vertex_index=np.array([v.vertex_index for v in vertices], dtype=np.int32),
+    )
+
+
+def _write_report(report: UpdateReport, path: Path) -> None:
+    data = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "pipeline": "etl-update",
+        },
+        **asdict(report),
+    }
+    path.write_text(json.dumps(data, indent=2, ensure_ascii=False))
+    logger.info("Update report written to %s", path)
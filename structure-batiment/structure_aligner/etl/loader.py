@@ -4,9 +4,16 @@ import json
 import logging
 import shutil
 import sqlite3
+import time
 from datetime import datetime, timezone
 
-from structure_aligner.etl.transformer import TransformResult
+from structure_aligner.db.sidecar import create_sidecar
+from structure_aligner.etl.incremental import (
+    fingerprints_from_columns,
+    fingerprints_from_db,
+    write_fingerprints,
+)
+from structure_aligner.etl.transformer import StreamedVertices, TransformResult, VertexColumns
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +25,8 @@ class LoadReport:
     elements_inserted: int
     vertices_inserted: int
     validation_passed: bool
+    load_time_s: float = 0.0
+    vertices_per_second: float = 0.0
 
 
 # SQL for PRD-compliant tables
@@ -49,47 +58,113 @@ CREATE_INDEXES_SQL = [
     "CREATE INDEX IF NOT EXISTS idx_vertices_z ON vertices(z);",
 ]
 
+INSERT_VERTEX_SQL = "INSERT INTO vertices (element_id, x, y, z, vertex_index) VALUES (?, ?, ?, ?, ?)"
 
-def load(result: TransformResult, source_db: Path, output_path: Path) -> LoadReport:
+# Rows per executemany() call when inserting columnar vertices
+DEFAULT_CHUNK_SIZE = 100_000
+
+# Fast-load settings applied while the output database is populated. The
+# rollback journal stays (in memory), so a failed load is still rolled back;
+# only durability against a crash mid-load is given up, and the copied file
+# is deleted on failure anyway. WAL mode is restored once the load commits.
+BULK_LOAD_PRAGMAS = [
+    "PRAGMA synchronous=OFF;",
+    "PRAGMA journal_mode=MEMORY;",
+    "PRAGMA cache_size=-262144;",  # 256 MiB
+]
+
+# Staging table for streamed vertices; rowid preserves arrival order
+CREATE_VERTEX_STAGE_SQL = """
+CREATE TEMP TABLE vertex_stage (
+    rank INTEGER NOT NULL,
+    element_id INTEGER NOT NULL,
+    x REAL NOT NULL,
+    y REAL NOT NULL,
+    z REAL NOT NULL,
+    vertex_index INTEGER NOT NULL
+);
+"""
+
+
+def load(
+    result: TransformResult,
+    source_db: Path,
+    output_path: Path,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    sidecar: bool = False,
+) -> LoadReport:
     """
     Copy source database and add PRD-compliant elements + vertices tables.
 
     The source database is copied to output_path first (preserving all
     original tables), then elements and vertices tables are created and
-    populated in a single atomic transaction.
+    populated in a single atomic transaction, together with the
+    element_fingerprints table used by incremental updates.
+
+    With sidecar=True the source is not copied: output_path is created as a
+    small sidecar database holding only the PRD tables and a reference to
+    source_db (see db.sidecar). Open it with open_prd_db() to see the
+    source tables as well.
+
+    The load runs with BULK_LOAD_PRAGMAS. Columnar vertices are inserted
+    chunk_size rows at a time straight from their arrays, the vertices
+    foreign key is verified with one foreign_key_check pass instead of per
+    row, and the vertex indexes are only built once every row is in, so
+    SQLite sorts each index once instead of updating it row by row.
+
+    Streamed vertices (from transform() over iter_vertices()) are inserted
+    chunk by chunk into a temporary staging table and copied into
+    ``vertices`` with one INSERT ... SELECT ordered by element rank, so
+    Python memory stays bounded by the batch size while the rows, ids and
+    element geometry types match a non-streamed load.
 
     Args:
         result: TransformResult from the transform step.
         source_db: Path to the original .db file.
         output_path: Path for the output .db file.
+        chunk_size: Rows per executemany() call for columnar vertices.
+        sidecar: Reference source_db instead of copying it.
 
     Returns:
-        LoadReport with insertion counts and validation status.
+        LoadReport with insertion counts, throughput and validation status.
 
     Raises:
         FileExistsError: If output_path already exists.
+        ValueError: If chunk_size is not positive.
         sqlite3.Error: If database operations fail (transaction is rolled back).
     """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size must be positive, got {chunk_size}")
     if output_path.exists():
         raise FileExistsError(f"Output file already exists: {output_path}. Remove it first or choose a different path.")
 
-    # Step 1: Copy source database
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(str(source_db), str(output_path))
-    logger.info("Copied source database to %s", output_path)
+    # Step 1: Copy source database (or reference it from a sidecar)
+    if sidecar:
+        create_sidecar(source_db, output_path)
+    else:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(str(source_db), str(output_path))
+        logger.info("Copied source database to %s", output_path)
 
     # Step 2: Create tables and insert data in a single transaction
     conn = sqlite3.connect(str(output_path))
     try:
-        conn.execute("PRAGMA journal_mode=WAL;")
-        conn.execute("PRAGMA foreign_keys=ON;")
+        for pragma in BULK_LOAD_PRAGMAS:
+            conn.execute(pragma)
 
+        start_time = time.perf_counter()
         cursor = conn.cursor()
 
         # Create tables
         cursor.execute(CREATE_ELEMENTS_SQL)
         cursor.execute(CREATE_VERTICES_SQL)
 
+        # Streamed vertices are staged first: element geometry types are
+        # only known once the stream has been consumed.
+        streamed = isinstance(result.vertices, StreamedVertices)
+        if streamed:
+            _stage_streamed_vertices(cursor, result.vertices)
+
         # Insert elements
         cursor.executemany(
             "INSERT INTO elements (id, type, nom, geometry_type) VALUES (?, ?, ?, ?)",
@@ -98,18 +173,51 @@ def load(result: TransformResult, source_db: Path, output_path: Path) -> LoadRep
         elements_inserted = len(result.elements)
 
         # Insert vertices
-        cursor.executemany(
-            "INSERT INTO vertices (element_id, x, y, z, vertex_index) VALUES (?, ?, ?, ?, ?)",
-            [(v.element_id, v.x, v.y, v.z, v.vertex_index) for v in result.vertices],
-        )
+        if streamed:
+            cursor.execute(
+                "INSERT INTO vertices (element_id, x, y, z, vertex_index) "
+                "SELECT element_id, x, y, z, vertex_index FROM vertex_stage ORDER BY rank, rowid"
+            )
+            cursor.execute("DROP TABLE vertex_stage")
+        elif isinstance(result.vertices, VertexColumns):
+            _insert_vertex_columns(cursor, result.vertices, chunk_size)
+        else:
+            cursor.executemany(
+                INSERT_VERTEX_SQL,
+                ((v.element_id, v.x, v.y, v.z, v.vertex_index) for v in result.vertices),
+            )
         vertices_inserted = len(result.vertices)
 
-        # Create indexes
+        # Foreign keys are checked once for the whole table rather than per row
+        orphans = cursor.execute("PRAGMA foreign_key_check(vertices)").fetchall()
+        if orphans:
+            raise sqlite3.IntegrityError(
+                f"{len(orphans)} vertices reference unknown elements (first rowid {orphans[0][1]})"
+            )
+
+        # Per-element geometry fingerprints for later incremental updates
+        if isinstance(result.vertices, VertexColumns):
+            fingerprints = fingerprints_from_columns(
+                result.vertices,
+                {e.id: e.nom for e in result.elements},
+                {e.id: e.geometry_type for e in result.elements},
+            )
+        else:
+            fingerprints = fingerprints_from_db(conn)
+        write_fingerprints(cursor, fingerprints)
+
+        # Create indexes once all rows are in
         for sql in CREATE_INDEXES_SQL:
             cursor.execute(sql)
 
         conn.commit()
-        logger.info("Inserted %d elements, %d vertices", elements_inserted, vertices_inserted)
+        load_time = time.perf_counter() - start_time
+        conn.execute("PRAGMA journal_mode=WAL;")
+        vertices_per_second = vertices_inserted / load_time if load_time > 0 else 0.0
+        logger.info(
+            "Inserted %d elements, %d vertices in %.2fs (%.0f vertices/s)",
+            elements_inserted, vertices_inserted, load_time, vertices_per_second,
+        )
 
     except Exception:
         conn.rollback()
@@ -127,11 +235,32 @@ def load(result: TransformResult, source_db: Path, output_path: Path) -> LoadRep
     report = _generate_report(
         report_path, output_path, result,
         elements_inserted, vertices_inserted, validation_passed,
+        load_time, vertices_per_second,
     )
 
     return report
 
 
+def _insert_vertex_columns(cursor: sqlite3.Cursor, columns: VertexColumns, chunk_size: int) -> None:
+    """Insert columnar vertices chunk_size rows at a time."""
+    for start in range(0, len(columns), chunk_size):
+        cursor.executemany(INSERT_VERTEX_SQL, columns.take(slice(start, start + chunk_size)).rows())
+
+
+def _stage_streamed_vertices(cursor: sqlite3.Cursor, stream: StreamedVertices) -> None:
+    """Consume a vertex stream into the temporary staging table, one chunk at a time."""
+    cursor.execute(CREATE_VERTEX_STAGE_SQL)
+    for rank, columns in stream:
+        cursor.executemany(
+            "INSERT INTO vertex_stage (rank, element_id, x, y, z, vertex_index) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (r, *row)
+                for r, row in zip(rank.tolist(), columns.rows())
+            ),
+        )
+        logger.debug("Staged %d vertices (%d total)", len(columns), stream.count)
+
+
 def _validate_output(output_path: Path, result: TransformResult) -> bool:
     """Run post-load validation checks."""
     conn = sqlite3.connect(str(output_path))
@@ -197,14 +326,22 @@ def _generate_report(
     elements_inserted: int,
     vertices_inserted: int,
     validation_passed: bool,
+    load_time: float = 0.0,
+    vertices_per_second: float = 0.0,
 ) -> LoadReport:
     """Write a JSON validation report."""
     from collections import Counter
 
     type_counts = Counter(e.type for e in result.elements)
-    xs = [v.x for v in result.vertices]
-    ys = [v.y for v in result.vertices]
-    zs = [v.z for v in result.vertices]
+    if isinstance(result.vertices, StreamedVertices):
+        ranges = result.vertices.ranges
+        xs, ys, zs = (ranges[axis] if axis in ranges else () for axis in ("x", "y", "z"))
+    elif isinstance(result.vertices, VertexColumns):
+        xs, ys, zs = result.vertices.x, result.vertices.y, result.vertices.z
+    else:
+        xs = [v.x for v in result.vertices]
+        ys = [v.y for v in result.vertices]
+        zs = [v.z for v in result.vertices]
 
     report_data = {
         "metadata": {
@@ -224,10 +361,14 @@ def _generate_report(
                 for name, source in result.unmatched
             ],
         },
+        "performance": {
+            "load_time_s": round(load_time, 3),
+            "vertices_per_second": round(vertices_per_second),
+        },
         "coordinate_ranges": {
-            "x": {"min": min(xs), "max": max(xs)} if xs else None,
-            "y": {"min": min(ys), "max": max(ys)} if ys else None,
-            "z": {"min": min(zs), "max": max(zs)} if zs else None,
+            "x": {"min": float(min(xs)), "max": float(max(xs))} if len(xs) else None,
+            "y": {"min": float(min(ys)), "max": float(max(ys))} if len(ys) else None,
+            "z": {"min": float(min(zs)), "max": float(max(zs))} if len(zs) else None,
         },
         "template_fingerprint": {
             "object_count": result.template_object_count,
@@ -253,4 +394,6 @@ def _generate_report(
         elements_inserted=elements_inserted,
         vertices_inserted=vertices_inserted,
         validation_passed=validation_passed,
+        load_time_s=round(load_time, 3),
+        vertices_per_second=vertices_per_second,
     )
@@ -26,7 +26,9 @@ def read_aligned_elements(db_path: Path) -> dict[str, AlignedElement]:
     """Read aligned DB, return dict keyed by element name (nom).
 
     Works with both aligned DBs (has x_original columns) and
-    PRD-compliant DBs (no alignment columns).
+    PRD-compliant DBs (no alignment columns). In a delta-layout aligned DB
+    (db.writer.write_alignment_delta) the alignment_delta coordinates are
+    overlaid on the stored ones.
 
     Raises:
         FileNotFoundError: If db_path does not exist.
@@ -79,12 +81,23 @@ def read_aligned_elements(db_path: Path) -> dict[str, AlignedElement]:
                 f"Duplicate element names detected: {', '.join(dup_details)}"
             )
 
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='alignment_delta'")
+        has_delta = cursor.fetchone() is not None
+
         # Read vertices grouped by element_id, ordered by vertex_index
-        cursor.execute("""
-            SELECT element_id, vertex_index, x, y, z
-            FROM vertices
-            ORDER BY element_id, vertex_index
-        """)
+        if has_delta:
+            cursor.execute("""
+                SELECT v.element_id, v.vertex_index,
+                       COALESCE(d.x, v.x), COALESCE(d.y, v.y), COALESCE(d.z, v.z)
+                FROM vertices v LEFT JOIN alignment_delta d ON d.vertex_id = v.id
+                ORDER BY v.element_id, v.vertex_index
+            """)
+        else:
+            cursor.execute("""
+                SELECT element_id, vertex_index, x, y, z
+                FROM vertices
+                ORDER BY element_id, vertex_index
+            """)
 
         for row in cursor.fetchall():
             eid = row[0]
@@ -1,10 +1,13 @@
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Iterable, Iterator
 import hashlib
 import logging
 import sqlite3
 
-from structure_aligner.etl.extractor import ExtractionResult, RawVertex
+import numpy as np
+
+from structure_aligner.etl.extractor import GEOMETRY_TYPES, ExtractionResult, RawVertex, VertexTable
 
 logger = logging.getLogger(__name__)
 
@@ -28,11 +31,45 @@ class Vertex:
     vertex_index: int
 
 
+@dataclass
+class VertexColumns:
+    """Columnar counterpart of list[Vertex]: parallel arrays, one row per vertex."""
+    element_id: np.ndarray    # int64
+    x: np.ndarray             # float64
+    y: np.ndarray             # float64
+    z: np.ndarray             # float64
+    vertex_index: np.ndarray  # int32
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def __iter__(self) -> Iterator[Vertex]:
+        for eid, x, y, z, vi in self.rows():
+            yield Vertex(element_id=eid, x=x, y=y, z=z, vertex_index=vi)
+
+    def rows(self) -> Iterator[tuple[int, float, float, float, int]]:
+        """Yield (element_id, x, y, z, vertex_index) tuples for executemany."""
+        return zip(
+            self.element_id.tolist(), self.x.tolist(), self.y.tolist(),
+            self.z.tolist(), self.vertex_index.tolist(),
+        )
+
+    def take(self, mask_or_rows: np.ndarray) -> "VertexColumns":
+        """Subset of rows selected by a boolean mask or an index array."""
+        return VertexColumns(
+            element_id=self.element_id[mask_or_rows],
+            x=self.x[mask_or_rows],
+            y=self.y[mask_or_rows],
+            z=self.z[mask_or_rows],
+            vertex_index=self.vertex_index[mask_or_rows],
+        )
+
+
 @dataclass
 class TransformResult:
     """Result of the transform step."""
     elements: list[Element] = field(default_factory=list)
-    vertices: list[Vertex] = field(default_factory=list)
+    vertices: "list[Vertex] | VertexColumns | StreamedVertices" = field(default_factory=list)
     matched_count: int = 0
     total_count: int = 0
     unmatched: list[tuple[str, str]] = field(default_factory=list)  # (name, source)
@@ -40,7 +77,14 @@ class TransformResult:
     template_names_hash: str = ""
 
 
-def transform(extraction: ExtractionResult, db_path: Path) -> TransformResult:
+TRANSFORM_ENGINES = ("numpy", "pandas")
+
+
+def transform(
+    extraction: ExtractionResult | VertexTable | Iterable[VertexTable],
+    db_path: Path,
+    engine: str = "numpy",
+) -> TransformResult:
     """
     Link extracted vertices to database elements by name matching.
 
@@ -49,12 +93,32 @@ def transform(extraction: ExtractionResult, db_path: Path) -> TransformResult:
     Unmatched items are logged and skipped.
 
     Args:
-        extraction: Result from extract_vertices().
+        extraction: Result from extract_vertices() or extract_vertex_table(),
+            or the batch iterator from iter_vertices(). A VertexTable is
+            transformed column-wise and yields VertexColumns; a batch
+            iterator yields StreamedVertices, which load() consumes in
+            bounded memory (counts and unmatched names are filled in
+            once the stream is exhausted).
         db_path: Path to the source .db file.
+        engine: Columnar engine for a VertexTable: "numpy" (per-name-code
+            lookup arrays) or "pandas" (one merge of the vertex frame
+            against the element frame). Both give identical results.
 
     Returns:
         TransformResult with PRD-compliant elements and vertices.
+
+    Raises:
+        ValueError: If engine is not one of TRANSFORM_ENGINES.
     """
+    if engine not in TRANSFORM_ENGINES:
+        raise ValueError(f"Unknown transform engine {engine!r}; expected one of {TRANSFORM_ENGINES}")
+    if isinstance(extraction, VertexTable):
+        if engine == "pandas":
+            return _transform_table_pandas(extraction, db_path)
+        return _transform_table(extraction, db_path)
+    if not isinstance(extraction, ExtractionResult):
+        return _transform_stream(extraction, db_path)
+
     result = TransformResult()
 
     # Load name->id mapping from database
@@ -129,6 +193,276 @@ def transform(extraction: ExtractionResult, db_path: Path) -> TransformResult:
     return result
 
 
+def _transform_table(table: VertexTable, db_path: Path) -> TransformResult:
+    """Columnar transform: same matching and ordering as the list path."""
+    result = TransformResult()
+
+    db_elements = _load_db_elements(db_path)
+    db_name_to_element = {e.nom: e for e in db_elements}
+    db_names = set(db_name_to_element.keys())
+
+    # Only names that own at least one vertex take part in matching
+    present_codes = np.unique(table.name_codes)
+    threedm_names = {table.names[c] for c in present_codes.tolist()}
+    matched_names = threedm_names & db_names
+    _record_matching(result, threedm_names, db_names)
+
+    result.elements.extend(db_elements)
+
+    # Per-name-code lookup: rank in sorted matched names (-1 = unmatched) and element id
+    rank_by_name = {name: r for r, name in enumerate(sorted(matched_names))}
+    rank, code_element_id = _code_lookup(table.names, rank_by_name, db_name_to_element)
+
+    # Geometry type of an element = geometry type of its first vertex
+    _record_geometry_types(table, matched_names, db_name_to_element, seen=set())
+
+    # Order rows by matched-name rank, keeping file order within a name
+    vertex_rank = rank[table.name_codes]
+    rows = np.flatnonzero(vertex_rank >= 0)
+    rows = rows[np.argsort(vertex_rank[rows], kind="stable")]
+
+    columns = VertexColumns(
+        element_id=code_element_id[table.name_codes[rows]],
+        x=table.x[rows],
+        y=table.y[rows],
+        z=table.z[rows],
+        vertex_index=table.vertex_index[rows],
+    )
+
+    null_mask = _check_coordinates(columns)
+    invalid_count = int(null_mask.sum())
+    if invalid_count > 0:
+        logger.warning("Rejected %d vertices with NULL coordinates", invalid_count)
+        columns = columns.take(~null_mask)
+    result.vertices = columns
+
+    result.template_object_count = table.total_objects
+    result.template_names_hash = _names_hash(threedm_names)
+
+    return result
+
+
+def _transform_table_pandas(table: VertexTable, db_path: Path) -> TransformResult:
+    """Columnar transform as one pandas merge; same output as _transform_table."""
+    import pandas as pd
+
+    result = TransformResult()
+
+    db_elements = _load_db_elements(db_path)
+    result.elements.extend(db_elements)
+
+    # Last element wins on duplicate names, as in the name->element dicts above.
+    # Elements are keyed by the table's name code; sorted DB names give the
+    # same relative order as sorted matched names.
+    element_frame = pd.DataFrame({
+        "name": [e.nom for e in db_elements],
+        "element_id": np.array([e.id for e in db_elements], dtype=np.int64),
+        "position": np.arange(len(db_elements)),
+    }).drop_duplicates("name", keep="last")
+    element_frame["code"] = pd.Index(table.names).get_indexer(element_frame["name"])
+    element_frame["rank"] = element_frame["name"].rank(method="first").astype(np.int64)
+
+    vertex_frame = pd.DataFrame({
+        "code": table.name_codes.astype(np.int64),
+        "row": np.arange(len(table), dtype=np.int64),
+    })
+    joined = vertex_frame.merge(
+        element_frame[element_frame["code"] >= 0], on="code", how="inner", sort=False,
+    )
+
+    present_codes = np.unique(table.name_codes)
+    threedm_names = {table.names[c] for c in present_codes.tolist()}
+    _record_matching(result, threedm_names, set(element_frame["name"]))
+
+    # Matched-name order, file order within a name
+    joined = joined.sort_values(["rank", "row"], kind="stable")
+    rows = joined["row"].to_numpy()
+
+    # Geometry type of an element = geometry type of its first vertex
+    first = joined.drop_duplicates("code", keep="first")
+    for position, row in zip(first["position"].tolist(), first["row"].tolist()):
+        db_elements[position].geometry_type = GEOMETRY_TYPES[int(table.geometry_type_codes[row])]
+
+    columns = VertexColumns(
+        element_id=joined["element_id"].to_numpy(dtype=np.int64),
+        x=table.x[rows],
+        y=table.y[rows],
+        z=table.z[rows],
+        vertex_index=table.vertex_index[rows],
+    )
+
+    null_mask = _check_coordinates(columns)
+    invalid_count = int(null_mask.sum())
+    if invalid_count > 0:
+        logger.warning("Rejected %d vertices with NULL coordinates", invalid_count)
+        columns = columns.take(~null_mask)
+    result.vertices = columns
+
+    result.template_object_count = table.total_objects
+    result.template_names_hash = _names_hash(threedm_names)
+
+    return result
+
+
+class StreamedVertices:
+    """Single-pass stream of transformed vertices, produced batch by batch.
+
+    Iterating yields (rank, VertexColumns) chunks in file order; rank is the
+    element's position in the sorted matched names, so ordering all rows by
+    (rank, arrival order) reproduces the vertex order of the in-memory
+    transform. len(), the coordinate ranges and the owning TransformResult's
+    matching summary are only final once the stream is exhausted.
+    """
+
+    def __init__(self, batches: Iterator[VertexTable], db_elements: list[Element], result: TransformResult):
+        self._batches = batches
+        self._db_name_to_element = {e.nom: e for e in db_elements}
+        self._result = result
+        self._started = False
+        self.exhausted = False
+        self.count = 0
+        self.ranges: dict[str, tuple[float, float]] = {}
+
+    def __len__(self) -> int:
+        if not self.exhausted:
+            # TypeError (not RuntimeError) so list() and friends treat it as "no length hint"
+            raise TypeError("Vertex stream has not been consumed yet")
+        return self.count
+
+    def __iter__(self) -> Iterator[tuple[np.ndarray, VertexColumns]]:
+        if self._started:
+            raise RuntimeError("Vertex stream can only be consumed once")
+        self._started = True
+
+        db_name_to_element = self._db_name_to_element
+        db_names = set(db_name_to_element)
+        # Sorted DB names give the same relative order as sorted matched names
+        rank_by_name = {name: r for r, name in enumerate(sorted(db_names))}
+        threedm_names: set[str] = set()
+        seen: set[str] = set()
+        invalid_count = 0
+        total_objects = 0
+
+        for batch in self._batches:
+            total_objects = batch.total_objects
+            present_codes = np.unique(batch.name_codes)
+            threedm_names.update(batch.names[c] for c in present_codes.tolist())
+
+            rank, code_element_id = _code_lookup(batch.names, rank_by_name, db_name_to_element)
+            _record_geometry_types(batch, db_names, db_name_to_element, seen)
+
+            vertex_rank = rank[batch.name_codes]
+            rows = np.flatnonzero(vertex_rank >= 0)
+            columns = VertexColumns(
+                element_id=code_element_id[batch.name_codes[rows]],
+                x=batch.x[rows],
+                y=batch.y[rows],
+                z=batch.z[rows],
+                vertex_index=batch.vertex_index[rows],
+            )
+            chunk_rank = vertex_rank[rows]
+
+            null_mask = _check_coordinates(columns)
+            if null_mask.any():
+                invalid_count += int(null_mask.sum())
+                columns = columns.take(~null_mask)
+                chunk_rank = chunk_rank[~null_mask]
+            if len(columns) == 0:
+                continue
+
+            self.count += len(columns)
+            for axis in ("x", "y", "z"):
+                values = getattr(columns, axis)
+                lo, hi = float(values.min()), float(values.max())
+                if axis in self.ranges:
+                    lo = min(lo, self.ranges[axis][0])
+                    hi = max(hi, self.ranges[axis][1])
+                self.ranges[axis] = (lo, hi)
+
+            yield chunk_rank, columns
+
+        if invalid_count > 0:
+            logger.warning("Rejected %d vertices with NULL coordinates", invalid_count)
+
+        result = self._result
+        _record_matching(result, threedm_names, db_names)
+        result.template_object_count = total_objects
+        result.template_names_hash = _names_hash(threedm_names)
+        self.exhausted = True
+
+
+def _transform_stream(batches: Iterable[VertexTable], db_path: Path) -> TransformResult:
+    """Streaming transform: vertices are matched lazily while load() consumes them."""
+    result = TransformResult()
+    db_elements = _load_db_elements(db_path)
+    result.elements.extend(db_elements)
+    result.vertices = StreamedVertices(iter(batches), db_elements, result)
+    return result
+
+
+def _record_matching(result: TransformResult, threedm_names: set[str], db_names: set[str]) -> None:
+    """Fill matched/total counts and the sorted unmatched list, logging each unmatched name."""
+    result.total_count = len(threedm_names | db_names)
+    result.matched_count = len(threedm_names & db_names)
+
+    for name in sorted(threedm_names - db_names):
+        result.unmatched.append((name, "3dm_only"))
+        logger.warning("Element '%s' exists in .3dm but not in .db — skipping vertices", name)
+
+    for name in sorted(db_names - threedm_names):
+        result.unmatched.append((name, "db_only"))
+        logger.warning("Element '%s' exists in .db but not in .3dm — included without vertices", name)
+
+
+def _code_lookup(
+    names: list[str],
+    rank_by_name: dict[str, int],
+    db_name_to_element: dict[str, Element],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Per-name-code (rank, element_id) arrays; rank is -1 for unmatched names."""
+    rank = np.full(len(names), -1, dtype=np.int64)
+    code_element_id = np.zeros(len(names), dtype=np.int64)
+    for code, name in enumerate(names):
+        r = rank_by_name.get(name)
+        if r is not None:
+            rank[code] = r
+            code_element_id[code] = db_name_to_element[name].id
+    return rank, code_element_id
+
+
+def _record_geometry_types(
+    table: VertexTable,
+    matched_names: set[str],
+    db_name_to_element: dict[str, Element],
+    seen: set[str],
+) -> None:
+    """Set each matched element's geometry type from its first vertex not yet seen."""
+    _, first_rows = np.unique(table.name_codes, return_index=True)
+    for row in np.sort(first_rows).tolist():
+        name = table.names[int(table.name_codes[row])]
+        if name in matched_names and name not in seen:
+            seen.add(name)
+            db_name_to_element[name].geometry_type = GEOMETRY_TYPES[int(table.geometry_type_codes[row])]
+
+
+def _check_coordinates(columns: VertexColumns) -> np.ndarray:
+    """Log NULL (NaN) and out-of-range coordinates; return the NULL mask."""
+    null_mask = np.isnan(columns.x) | np.isnan(columns.y) | np.isnan(columns.z)
+    for eid in columns.element_id[null_mask].tolist():
+        logger.warning("Vertex with NULL coordinate for element_id=%d — skipped", eid)
+    out_of_range = ~null_mask & (
+        (np.abs(columns.x) > 10000) | (np.abs(columns.y) > 10000) | (np.abs(columns.z) > 10000)
+    )
+    for i in np.flatnonzero(out_of_range).tolist():
+        logger.warning("Vertex with out-of-range coordinate (%.2f, %.2f, %.2f) for element_id=%d",
+                       columns.x[i], columns.y[i], columns.z[i], columns.element_id[i])
+    return null_mask
+
+
+def _names_hash(names: set[str]) -> str:
+    return hashlib.sha256("\n".join(sorted(names)).encode()).hexdigest()
+
+
 def _load_db_elements(db_path: Path) -> list[Element]:
     """Load all elements from filaire, shell, and support tables."""
     elements = []
@@ -19,47 +19,133 @@ def cli():
 @cli.command()
 @click.option("--input-3dm", required=True, type=click.Path(exists=True), help="Path to .3dm Rhino file")
 @click.option("--input-db", required=True, type=click.Path(exists=True), help="Path to source .db file")
-@click.option("--output", required=True, type=click.Path(), help="Path to output .db file")
+@click.option("--output", type=click.Path(), default=None,
+              help="Path to output .db file (with --update: optional, defaults to updating in place)")
+@click.option("--update", "update_db", type=click.Path(exists=True), default=None,
+              help="Existing PRD .db to update incrementally (only changed elements are rewritten)")
+@click.option("--workers", type=click.IntRange(min=1), default=1,
+              help="Worker processes for .3dm extraction (default: 1, serial)")
+@click.option("--no-cache", is_flag=True, default=False,
+              help="Bypass the on-disk extraction cache")
+@click.option("--batch-size", type=click.IntRange(min=1), default=None,
+              help="Stream vertices in batches of about N (bounded memory; disables --workers and the cache)")
+@click.option("--sidecar", is_flag=True, default=False,
+              help="Write only the PRD tables to --output and reference --input-db instead of copying it")
+@click.option("--transform-engine", type=click.Choice(["numpy", "pandas"]), default="numpy",
+              help="Engine for the columnar name join (default: numpy)")
 @click.option("--log-level", default="INFO", type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]))
-def etl(input_3dm: str, input_db: str, output: str, log_level: str):
+def etl(input_3dm: str, input_db: str, output: str | None, update_db: str | None, workers: int,
+        no_cache: bool, batch_size: int | None, sidecar: bool, transform_engine: str, log_level: str):
     """Extract vertices from .3dm, link to .db metadata, produce PRD-compliant database."""
     setup_logging(log_level)
     logger = logging.getLogger(__name__)
 
+    if batch_size is not None and workers > 1:
+        raise click.UsageError("--batch-size streams in one process; it cannot be combined with --workers")
+    if update_db is None and output is None:
+        raise click.UsageError("--output is required unless --update is given")
+    if update_db is not None and batch_size is not None:
+        raise click.UsageError("--update needs in-memory vertices; it cannot be combined with --batch-size")
+    if update_db is not None and sidecar:
+        raise click.UsageError("--update keeps the layout of the existing database; --sidecar does not apply")
+
     input_3dm_path = Path(input_3dm)
     input_db_path = Path(input_db)
-    output_path = Path(output)
+    output_path = Path(output) if output else Path(update_db)
+
+    if update_db is not None:
+        _etl_update(input_3dm_path, input_db_path, Path(update_db), output_path,
+                    workers, no_cache, transform_engine, logger)
+        return
 
-    from structure_aligner.etl.extractor import extract_vertices
+    from structure_aligner.etl.extraction_cache import load_vertex_table
+    from structure_aligner.etl.extractor import iter_vertices
     from structure_aligner.etl.transformer import transform
     from structure_aligner.etl.loader import load
 
     logger.info("Starting ETL pipeline")
     logger.info("  Input 3DM: %s", input_3dm_path)
     logger.info("  Input DB:  %s", input_db_path)
-    logger.info("  Output:    %s", output_path)
+    logger.info("  Output:    %s%s", output_path, " (sidecar)" if sidecar else "")
 
     # Extract
-    logger.info("Phase 1/3: Extracting vertices from .3dm")
-    raw_vertices = extract_vertices(input_3dm_path)
-    logger.info("  Extracted %d raw vertices from %d objects", raw_vertices.total_vertices, raw_vertices.total_objects)
+    if batch_size is not None:
+        logger.info("Phase 1/3: Streaming vertices from .3dm (batch size %d)", batch_size)
+        raw_vertices = iter_vertices(input_3dm_path, batch_size=batch_size)
+    else:
+        logger.info("Phase 1/3: Extracting vertices from .3dm (workers=%d)", workers)
+        raw_vertices = load_vertex_table(input_3dm_path, workers=workers, use_cache=not no_cache)
+        logger.info("  Extracted %d raw vertices from %d objects",
+                    raw_vertices.total_vertices, raw_vertices.total_objects)
 
-    # Transform
+    # Transform (a streamed transform runs lazily inside load)
     logger.info("Phase 2/3: Transforming and linking to database")
-    result = transform(raw_vertices, input_db_path)
-    logger.info("  Matched %d/%d elements", result.matched_count, result.total_count)
-    logger.info("  Total vertices: %d", len(result.vertices))
-    for name, count in result.unmatched:
-        logger.warning("  Unmatched: %s (skipped)", name)
+    result = transform(raw_vertices, input_db_path, engine=transform_engine)
+    if batch_size is None:
+        _log_transform_summary(logger, result)
 
     # Load
     logger.info("Phase 3/3: Loading into output database")
-    report = load(result, input_db_path, output_path)
+    report = load(result, input_db_path, output_path, sidecar=sidecar)
+    if batch_size is not None:
+        _log_transform_summary(logger, result)
     logger.info("  Output written to: %s", output_path)
     logger.info("  Validation report: %s", report.report_path)
     logger.info("ETL complete")
 
 
+def _etl_update(
+    input_3dm_path: Path,
+    input_db_path: Path,
+    update_path: Path,
+    output_path: Path,
+    workers: int,
+    no_cache: bool,
+    transform_engine: str,
+    logger: logging.Logger,
+) -> None:
+    """Incremental ETL: rewrite only elements whose geometry changed."""
+    import shutil
+
+    from structure_aligner.etl.extraction_cache import load_vertex_table
+    from structure_aligner.etl.incremental import update
+    from structure_aligner.etl.transformer import transform
+
+    logger.info("Starting incremental ETL")
+    logger.info("  Input 3DM: %s", input_3dm_path)
+    logger.info("  Input DB:  %s", input_db_path)
+    logger.info("  Update:    %s", update_path)
+
+    copy = output_path.resolve() != update_path.resolve()
+    if copy and output_path.exists():
+        raise click.UsageError(f"Output file already exists: {output_path}")
+
+    raw_vertices = load_vertex_table(input_3dm_path, workers=workers, use_cache=not no_cache)
+    result = transform(raw_vertices, input_db_path, engine=transform_engine)
+    _log_transform_summary(logger, result)
+
+    # Copy only once the transform succeeded, and drop the copy if the
+    # update fails, so a re-run does not trip over a half-written output
+    if copy:
+        shutil.copy2(str(update_path), str(output_path))
+        logger.info("  Output:    %s (copied from %s)", output_path, update_path.name)
+    try:
+        report = update(result, output_path)
+    except BaseException:
+        if copy:
+            output_path.unlink(missing_ok=True)
+        raise
+    logger.info("  Rewrote %d elements (%d unchanged)", report.touched_elements, report.elements_unchanged)
+    logger.info("Incremental ETL complete")
+
+
+def _log_transform_summary(logger: logging.Logger, result) -> None:
+    logger.info("  Matched %d/%d elements", result.matched_count, result.total_count)
+    logger.info("  Total vertices: %d", len(result.vertices))
+    for name, count in result.unmatched:
+        logger.warning("  Unmatched: %s (skipped)", name)
+
+
 @cli.command()
 @click.option("--input", "input_db", required=True, type=click.Path(exists=True),
               help="Path to PRD-compliant input database")
@@ -69,23 +155,26 @@ def etl(input_3dm: str, input_db: str, output: str, log_level: str):
               help="Tolerance in meters (default: 0.05)")
 @click.option("--min-cluster-size", type=int, default=3,
               help="Minimum vertices per thread (default: 3)")
+@click.option("--cluster-engine", type=click.Choice(["sorted_gap", "dbscan"]), default="sorted_gap",
+              help="Thread clustering backend; both give the same threads (default: sorted_gap)")
 @click.option("--report", type=click.Path(), default=None,
               help="Path for JSON report (auto-generated if omitted)")
 @click.option("--dry-run", is_flag=True, default=False,
               help="Simulation mode: produce report only, no output DB")
+@click.option("--delta", is_flag=True, default=False,
+              help="Record only moved or snapped vertices in an alignment_delta table")
 @click.option("--log-level", default="INFO",
               type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]))
-def align(input_db, output, alpha, min_cluster_size, report, dry_run, log_level):
+def align(input_db, output, alpha, min_cluster_size, cluster_engine, report, dry_run, delta, log_level):
     """Align vertices to detected threads within tolerance."""
     import time
-    import numpy as np
     from datetime import datetime
 
     setup_logging(log_level)
     logger = logging.getLogger(__name__)
 
     input_path = Path(input_db)
-    config = AlignmentConfig(alpha=alpha, min_cluster_size=min_cluster_size)
+    config = AlignmentConfig(alpha=alpha, min_cluster_size=min_cluster_size, cluster_engine=cluster_engine)
 
     # Auto-generate output path if not provided
     if output is None and not dry_run:
@@ -114,15 +203,13 @@ def align(input_db, output, alpha, min_cluster_size, report, dry_run, log_level)
     logger.info("  Mode:   %s", "dry-run" if dry_run else "full")
 
     # Step 1: Load vertices
-    from structure_aligner.db.reader import load_vertices
-    vertices = load_vertices(input_path)
+    from structure_aligner.db.reader import load_vertex_arrays
+    vertices, _ = load_vertex_arrays(input_path, with_elements=False)
     logger.info("Loaded %d vertices", len(vertices))
 
     # Step 2: Compute statistics
     from structure_aligner.analysis.statistics import compute_axis_statistics
-    xs = np.array([v.x for v in vertices])
-    ys = np.array([v.y for v in vertices])
-    zs = np.array([v.z for v in vertices])
+    xs, ys, zs = vertices.x, vertices.y, vertices.z
 
     stats = [
         compute_axis_statistics(xs, "X"),
@@ -142,8 +229,8 @@ def align(input_db, output, alpha, min_cluster_size, report, dry_run, log_level)
                 len(all_threads), len(threads_x), len(threads_y), len(threads_z))
 
     # Step 4: Align vertices
-    from structure_aligner.alignment.processor import align_vertices
-    aligned = align_vertices(vertices, threads_x, threads_y, threads_z, config)
+    from structure_aligner.alignment.processor import align_vertices_table
+    aligned = align_vertices_table(vertices, threads_x, threads_y, threads_z, config)
 
     # Step 5: Validate
     from structure_aligner.output.validator import validate_alignment
@@ -160,8 +247,11 @@ def align(input_db, output, alpha, min_cluster_size, report, dry_run, log_level)
 
     # Step 7: Write output DB (unless dry-run)
     if not dry_run and output_path:
-        from structure_aligner.db.writer import write_aligned_db
-        write_aligned_db(input_path, output_path, aligned)
+        from structure_aligner.db.writer import write_aligned_db, write_alignment_delta
+        if delta:
+            write_alignment_delta(input_path, output_path, aligned)
+        else:
+            write_aligned_db(input_path, output_path, aligned)
         logger.info("Output database: %s", output_path)
 
     # Step 8: Generate report
@@ -175,9 +265,9 @@ def align(input_db, output, alpha, min_cluster_size, report, dry_run, log_level)
     logger.info("Report: %s", report_path)
 
     # Summary
-    aligned_count = sum(1 for v in aligned if v.aligned_axis != "none")
-    rate = aligned_count / len(aligned) * 100 if aligned else 0
-    max_disp = max((v.displacement_total for v in aligned), default=0)
+    aligned_count = aligned.aligned_count()
+    rate = aligned_count / len(aligned) * 100 if len(aligned) else 0
+    max_disp = float(aligned.displacement.max()) if len(aligned) else 0
 
     logger.info("Alignment complete in %.1fs", execution_time)
     logger.info("  %d/%d vertices aligned (%.1f%%)", aligned_count, len(aligned), rate)
@@ -250,9 +340,12 @@ def export_3dm(input_db, template_3dm, output, report, log_level):
               help="Simulation mode: produce report only, no aligned DB")
 @click.option("--export-3dm", "do_export_3dm", is_flag=True, default=False,
               help="Also export aligned .3dm file")
+@click.option("--sidecar", is_flag=True, default=False,
+              help="Keep PRD and aligned tables in sidecar DBs referencing --input-db (no full copies)")
 @click.option("--log-level", default="INFO",
               type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]))
-def pipeline(input_3dm, input_db, output, alpha, min_cluster_size, report, dry_run, do_export_3dm, log_level):
+def pipeline(input_3dm, input_db, output, alpha, min_cluster_size, report, dry_run, do_export_3dm, sidecar,
+             log_level):
     """Run ETL then alignment in one go."""
     setup_logging(log_level)
     logger = logging.getLogger(__name__)
@@ -268,7 +361,7 @@ def pipeline(input_3dm, input_db, output, alpha, min_cluster_size, report, dry_r
     # --- ETL ---
     ctx = click.Context(etl)
     ctx.invoke(etl, input_3dm=input_3dm, input_db=input_db,
-               output=str(etl_output), log_level=log_level)
+               output=str(etl_output), sidecar=sidecar, log_level=log_level)
 
     # --- ALIGN (reuse the ETL output as input) ---
     ctx = click.Context(align)
@@ -310,10 +403,17 @@ def pipeline(input_3dm, input_db, output, alpha, min_cluster_size, report, dry_r
               help="Outlier snap distance in meters (default: 4.0)")
 @click.option("--min-floors", type=int, default=3,
               help="Min floor levels for axis line candidacy (default: 3)")
+@click.option("--workers", type=click.IntRange(min=1), default=1,
+              help="Worker processes for per-element alignment (default: 1)")
+@click.option("--resume", is_flag=True, default=False,
+              help="Reuse valid step checkpoints from a previous run in the output directory")
+@click.option("--from-step", type=click.IntRange(1, 8), default=None,
+              help="Recompute from this step (1-8) on, reusing valid checkpoints of earlier steps")
 @click.option("--log-level", default="INFO",
               type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]))
 def pipeline_v2(input_3dm, input_db, output, reference_3dm,
-                max_snap_distance, outlier_snap_distance, min_floors, log_level):
+                max_snap_distance, outlier_snap_distance, min_floors, workers,
+                resume, from_step, log_level):
     """V2 Pipeline: axis-line discovery + per-element snap + object-level transforms."""
     setup_logging(log_level)
     logger = logging.getLogger(__name__)
@@ -339,7 +439,8 @@ def pipeline_v2(input_3dm, input_db, output, reference_3dm,
 
     report = run_pipeline_v2(
         input_3dm_path, input_db_path, output_dir,
-        config=config, reference_3dm=ref_path,
+        config=config, reference_3dm=ref_path, workers=workers,
+        resume=resume, from_step=from_step,
     )
 
     if report.errors:
@@ -359,5 +460,177 @@ def pipeline_v2(input_3dm, input_db, output, reference_3dm,
                      report.grid_lines_added)
 
 
+@cli.command("align-stream")
+@click.option("--input-db", required=True, type=click.Path(exists=True),
+              help="PRD database (output of etl)")
+@click.option("--output", type=click.Path(), default=None,
+              help="Output aligned database (default: <input>_aligned_<timestamp>.db)")
+@click.option("--max-snap-distance", type=float, default=0.75,
+              help="Max snap distance in meters (default: 0.75)")
+@click.option("--outlier-snap-distance", type=float, default=4.0,
+              help="Outlier snap distance in meters (default: 4.0)")
+@click.option("--min-floors", type=int, default=3,
+              help="Min floor levels for axis line candidacy (default: 3)")
+@click.option("--chunk-size", type=click.IntRange(min=1), default=100_000,
+              help="Vertex rows read per batch (default: 100000)")
+@click.option("--delta", is_flag=True, default=False,
+              help="Record only moved or snapped vertices in an alignment_delta table")
+@click.option("--log-level", default="INFO",
+              type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]))
+def align_stream(input_db, output, max_snap_distance, outlier_snap_distance, min_floors,
+                 chunk_size, delta, log_level):
+    """V2 axis discovery + per-element snap, streamed from database to database."""
+    from datetime import datetime
+
+    setup_logging(log_level)
+    logger = logging.getLogger(__name__)
+
+    from structure_aligner.config import PipelineConfig
+    from structure_aligner.streaming import align_db_streaming
+
+    input_path = Path(input_db)
+    if output:
+        output_path = Path(output)
+    else:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_path = input_path.with_name(f"{input_path.stem}_aligned_{timestamp}.db")
+    config = PipelineConfig(
+        max_snap_distance=max_snap_distance,
+        outlier_snap_distance=outlier_snap_distance,
+        min_floors=min_floors,
+    )
+
+    logger.info("=== ALIGN (STREAMING) ===")
+    logger.info("  Input DB:  %s", input_path)
+    logger.info("  Output:    %s", output_path)
+
+    try:
+        report = align_db_streaming(input_path, output_path, config, chunk_size=chunk_size, delta=delta)
+    except FileExistsError as e:
+        raise click.UsageError(str(e))
+
+    logger.info("=== ALIGN (STREAMING) COMPLETE ===")
+    logger.info("  Axis lines: %d X, %d Y", report.axis_lines_x_count, report.axis_lines_y_count)
+    logger.info("  Alignment:  %d/%d (%.1f%%), max displacement %.4fm",
+                report.aligned_vertices, report.total_vertices,
+                report.alignment_rate_pct, report.max_displacement_m)
+
+
+@cli.command()
+@click.option("--manifest", required=True, type=click.Path(exists=True),
+              help="CSV or JSON manifest of (input_3dm, input_db, output) jobs")
+@click.option("--mode", type=click.Choice(["etl", "pipeline-v2"]), default="etl",
+              help="What to run per job (default: etl)")
+@click.option("--workers", type=click.IntRange(min=1), default=1,
+              help="Worker processes (default: 1)")
+@click.option("--retries", type=click.IntRange(min=0), default=1,
+              help="Extra attempts for a failed job (default: 1)")
+@click.option("--summary", type=click.Path(), default=None,
+              help="Path for the JSON summary (default: batch_summary.json next to the manifest)")
+@click.option("--log-level", default="INFO",
+              type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]))
+def batch(manifest, mode, workers, retries, summary, log_level):
+    """Run ETL or pipeline-v2 over many buildings in a process pool."""
+    setup_logging(log_level)
+    logger = logging.getLogger(__name__)
+
+    from structure_aligner.batch import load_manifest, run_batch
+
+    manifest_path = Path(manifest)
+    summary_path = Path(summary) if summary else manifest_path.with_name("batch_summary.json")
+    try:
+        jobs = load_manifest(manifest_path)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+    logger.info("=== BATCH: %s ===", mode)
+    logger.info("  Manifest: %s (%d jobs)", manifest_path, len(jobs))
+    logger.info("  Workers:  %d, retries: %d", workers, retries)
+
+    result = run_batch(jobs, mode=mode, workers=workers, retries=retries,
+                       summary_path=summary_path, log_level=log_level)
+
+    for job in result.jobs:
+        if job.status == "ok":
+            logger.info("  %-30s ok      %6.1fs", job.name, job.elapsed_s)
+        else:
+            logger.error("  %-30s FAILED  (%d attempts) %s", job.name, job.attempts, job.error)
+    logger.info("  Summary: %s", summary_path)
+    if result.failed:
+        raise SystemExit(1)
+
+
+def _float_list(ctx, param, value):
+    try:
+        return [float(v) for v in value.split(",")]
+    except ValueError:
+        raise click.BadParameter(f"expected comma-separated numbers, got {value!r}")
+
+
+def _int_list(ctx, param, value):
+    try:
+        return [int(v) for v in value.split(",")]
+    except ValueError:
+        raise click.BadParameter(f"expected comma-separated integers, got {value!r}")
+
+
+@cli.command()
+@click.option("--input-db", required=True, type=click.Path(exists=True),
+              help="PRD database (output of etl)")
+@click.option("--min-floors", default="3", callback=_int_list,
+              help="Comma-separated min_floors values (default: 3)")
+@click.option("--cluster-radius", default="0.002", callback=_float_list,
+              help="Comma-separated cluster_radius values in meters (default: 0.002)")
+@click.option("--max-snap-distance", default="0.75", callback=_float_list,
+              help="Comma-separated max snap distances in meters (default: 0.75)")
+@click.option("--outlier-snap-distance", default="4.0", callback=_float_list,
+              help="Comma-separated outlier snap distances in meters (default: 4.0)")
+@click.option("--reference-3dm", type=click.Path(exists=True), default=None,
+              help="Optional reference .3dm for axis recall/precision")
+@click.option("--workers", type=click.IntRange(min=1), default=1,
+              help="Worker processes (default: 1)")
+@click.option("--output", type=click.Path(), default=None,
+              help="Results table (.csv or .json; default: <input>_sweep.csv)")
+@click.option("--log-level", default="INFO",
+              type=click.Choice(["DEBUG", "INFO", "WARNING", "ERROR"]))
+def sweep(input_db, min_floors, cluster_radius, max_snap_distance, outlier_snap_distance,
+          reference_3dm, workers, output, log_level):
+    """Evaluate a grid of V2 discovery/snap parameters on one loaded model."""
+    setup_logging(log_level)
+    logger = logging.getLogger(__name__)
+
+    from structure_aligner.sweep import build_grid, run_sweep, write_sweep_table
+
+    input_path = Path(input_db)
+    output_path = Path(output) if output else input_path.with_name(f"{input_path.stem}_sweep.csv")
+    if output_path.suffix.lower() not in (".csv", ".json"):
+        raise click.UsageError("--output must end in .csv or .json")
+
+    configs = build_grid(
+        min_floors=min_floors,
+        cluster_radius=cluster_radius,
+        max_snap_distance=max_snap_distance,
+        outlier_snap_distance=outlier_snap_distance,
+    )
+
+    logger.info("=== SWEEP ===")
+    logger.info("  Input DB:  %s", input_path)
+    logger.info("  Grid:      %d configurations, %d workers", len(configs), workers)
+
+    results = run_sweep(
+        input_path, configs, workers=workers,
+        reference_3dm=Path(reference_3dm) if reference_3dm else None,
+    )
+    write_sweep_table(results, output_path)
+
+    logger.info("  %-9s %-8s %-6s %-7s %6s %6s %7s %8s",
+                "min_flr", "radius", "snap", "outlier", "axes_x", "axes_y", "rate%", "max_disp")
+    for r in results:
+        logger.info("  %-9d %-8g %-6g %-7g %6d %6d %7.1f %8.4f",
+                    r.min_floors, r.cluster_radius, r.max_snap_distance, r.outlier_snap_distance,
+                    r.axis_lines_x, r.axis_lines_y, r.alignment_rate_pct, r.max_displacement_m)
+    logger.info("  Results: %s", output_path)
+
+
 if __name__ == "__main__":
     cli()
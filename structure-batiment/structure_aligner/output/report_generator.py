@@ -3,6 +3,9 @@ import logging
 from datetime import datetime, timezone
 from pathlib import Path
 
+import numpy as np
+
+from structure_aligner.alignment.aligned_table import as_aligned_table
 from structure_aligner.config import AlignmentResult
 from structure_aligner.output.validator import ValidationResult
 
@@ -31,12 +34,10 @@ def generate_report(
     Returns:
         Path to the generated report file.
     """
-    aligned = result.aligned_vertices
+    aligned = as_aligned_table(result.aligned_vertices)
     threads = result.threads
 
-    # Compute displacement statistics
-    displacements = [v.displacement_total for v in aligned]
-    aligned_count = sum(1 for v in aligned if v.aligned_axis != "none")
+    aligned_count = aligned.aligned_count()
     isolated_count = len(aligned) - aligned_count
 
     # Group threads by axis
@@ -49,19 +50,24 @@ def generate_report(
             "vertex_count": t.vertex_count,
         })
 
-    # Isolated vertices detail
-    isolated_details = []
-    for v in aligned:
-        if v.aligned_axis == "none":
-            isolated_details.append({
-                "vertex_id": v.id,
-                "element_id": v.element_id,
-                "coordinates": [v.x_original, v.y_original, v.z_original],
-                "reason": "no_nearby_cluster",
-            })
+    # Isolated vertices detail (first 100 for readability)
+    isolated_rows = np.flatnonzero(~aligned.aligned_mask)[:100]
+    isolated_details = [
+        {
+            "vertex_id": vid,
+            "element_id": eid,
+            "coordinates": [x, y, z],
+            "reason": "no_nearby_cluster",
+        }
+        for vid, eid, x, y, z in zip(
+            aligned.id[isolated_rows].tolist(), aligned.element_id[isolated_rows].tolist(),
+            aligned.x_original[isolated_rows].tolist(), aligned.y_original[isolated_rows].tolist(),
+            aligned.z_original[isolated_rows].tolist(),
+        )
+    ]
 
-    import numpy as np
-    disp_array = np.array(displacements) if displacements else np.array([0.0])
+    # Displacement statistics
+    disp_array = aligned.displacement if len(aligned) else np.array([0.0])
 
     report_data = {
         "metadata": {
@@ -75,6 +81,7 @@ def generate_report(
         "parameters": {
             "alpha": result.config.alpha,
             "clustering_method": "dbscan",
+            "cluster_engine": result.config.cluster_engine,
             "min_cluster_size": result.config.min_cluster_size,
             "rounding_precision": result.config.rounding_precision,
         },
@@ -84,7 +91,7 @@ def generate_report(
             "isolated_vertices": isolated_count,
             "alignment_rate_percent": round(
                 aligned_count / len(aligned) * 100, 1
-            ) if aligned else 0,
+            ) if len(aligned) else 0,
         },
         "axis_statistics": {
             stat.axis: {
@@ -108,8 +115,8 @@ def generate_report(
             "std_meters": round(float(np.std(disp_array)), 6),
             "note": "3D Euclidean displacement (for reporting). Per-axis constraint enforced separately.",
         },
-        "isolated_vertices": isolated_details[:100],  # Cap at 100 for readability
-        "isolated_vertices_total": len(isolated_details),
+        "isolated_vertices": isolated_details,
+        "isolated_vertices_total": isolated_count,
         "validation": {
             "passed": validation.passed,
             "checks": [
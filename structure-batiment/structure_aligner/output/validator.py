@@ -1,6 +1,9 @@
 import logging
 from dataclasses import dataclass, field
 
+import numpy as np
+
+from structure_aligner.alignment.aligned_table import AlignedVertexTable, as_aligned_table
 from structure_aligner.config import AlignmentConfig, AlignedVertex
 
 logger = logging.getLogger(__name__)
@@ -22,7 +25,7 @@ class ValidationResult:
 
 
 def validate_alignment(
-    aligned_vertices: list[AlignedVertex],
+    aligned_vertices: list[AlignedVertex] | AlignedVertexTable,
     original_count: int,
     config: AlignmentConfig,
 ) -> ValidationResult:
@@ -39,7 +42,8 @@ def validate_alignment(
     not here. This validator implements F-09's warning threshold of 80%.
 
     Args:
-        aligned_vertices: The aligned vertices to validate.
+        aligned_vertices: The aligned vertices to validate. Checks run on
+            the columns of an AlignedVertexTable (a list is converted).
         original_count: Number of vertices before alignment.
         config: Alignment configuration.
 
@@ -47,15 +51,23 @@ def validate_alignment(
         ValidationResult with pass/fail status and individual check results.
     """
     result = ValidationResult()
+    table = as_aligned_table(aligned_vertices)
+    total = len(table)
 
     # Check 1: Max per-axis displacement <= alpha (PRD CF-02)
-    if aligned_vertices:
+    if total:
+        # Only axes matched to a thread count
         max_per_axis_disp = 0.0
-        for v in aligned_vertices:
-            dx = abs(v.x - v.x_original) if v.fil_x_id else 0.0
-            dy = abs(v.y - v.y_original) if v.fil_y_id else 0.0
-            dz = abs(v.z - v.z_original) if v.fil_z_id else 0.0
-            max_per_axis_disp = max(max_per_axis_disp, dx, dy, dz)
+        for aligned, original, fil in (
+            (table.x, table.x_original, table.fil_x),
+            (table.y, table.y_original, table.fil_y),
+            (table.z, table.z_original, table.fil_z),
+        ):
+            matched = fil >= 0
+            if matched.any():
+                max_per_axis_disp = max(
+                    max_per_axis_disp, float(np.abs(aligned[matched] - original[matched]).max()),
+                )
 
         if max_per_axis_disp > config.alpha + 1e-9:  # Small epsilon for float comparison
             result.passed = False
@@ -73,8 +85,8 @@ def validate_alignment(
     else:
         result.checks.append(ValidationCheck("max_per_axis_displacement", "PASS", "No vertices to check"))
 
-    # Check 2: No NULL coordinates
-    null_count = sum(1 for v in aligned_vertices if v.x is None or v.y is None or v.z is None)
+    # Check 2: No NULL coordinates (None is stored as NaN in the table)
+    null_count = int(np.count_nonzero(np.isnan(table.x) | np.isnan(table.y) | np.isnan(table.z)))
     if null_count > 0:
         result.passed = False
         result.checks.append(ValidationCheck(
@@ -85,22 +97,22 @@ def validate_alignment(
         result.checks.append(ValidationCheck("no_null_coordinates", "PASS", "0 NULL coordinates"))
 
     # Check 3: Vertex count preserved
-    if len(aligned_vertices) != original_count:
+    if total != original_count:
         result.passed = False
         result.checks.append(ValidationCheck(
             "vertex_count_preserved", "FAIL",
-            f"Expected {original_count}, got {len(aligned_vertices)}"
+            f"Expected {original_count}, got {total}"
         ))
     else:
         result.checks.append(ValidationCheck(
             "vertex_count_preserved", "PASS",
-            f"Count preserved: {len(aligned_vertices)}"
+            f"Count preserved: {total}"
         ))
 
     # Check 4: Alignment rate >= 80% (PRD F-09 WARNING threshold)
-    if aligned_vertices:
-        aligned_count = sum(1 for v in aligned_vertices if v.aligned_axis != "none")
-        rate = aligned_count / len(aligned_vertices) * 100
+    if total:
+        aligned_count = table.aligned_count()
+        rate = aligned_count / total * 100
         if rate < 80:
             result.checks.append(ValidationCheck(
                 "alignment_rate", "WARNING",
@@ -20,9 +20,12 @@ from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 
+import numpy as np
 import rhino3dm
 
+from structure_aligner.alignment.aligned_table import AlignedVertexTable, as_aligned_table
 from structure_aligner.config import AlignedVertex, AxisLine, ElementInfo, PipelineConfig
+from structure_aligner.transform.model_index import ModelIndex, as_model_index
 
 logger = logging.getLogger(__name__)
 
@@ -63,6 +66,9 @@ class PipelineV2Report:
     # Final model
     final_object_count: int = 0
 
+    # Steps whose checkpoint was reused (see structure_aligner.checkpoint)
+    reused_checkpoints: list[str] = field(default_factory=list)
+
     errors: list[str] = field(default_factory=list)
 
 
@@ -72,6 +78,9 @@ def run_pipeline_v2(
     output_dir: Path,
     config: PipelineConfig | None = None,
     reference_3dm: Path | None = None,
+    workers: int = 1,
+    resume: bool = False,
+    from_step: int | None = None,
 ) -> PipelineV2Report:
     """Run the complete V2 pipeline.
 
@@ -81,6 +90,11 @@ def run_pipeline_v2(
         output_dir: Output directory for results.
         config: Pipeline configuration. Uses defaults if None.
         reference_3dm: Optional reference .3dm for comparison.
+        workers: Worker processes for per-element alignment (Step 3).
+        resume: Reuse valid checkpoints from a previous run in
+            output_dir/checkpoints instead of recomputing those steps.
+        from_step: Recompute this step (1-8) and every later one, reusing
+            valid checkpoints of the earlier steps. Implies resume.
 
     Returns:
         PipelineV2Report with all metrics.
@@ -105,6 +119,9 @@ def run_pipeline_v2(
         return report
 
     logger.info("  Model loaded: %d objects", len(model.Objects))
+    # Every step below looks objects up, adds and removes them through
+    # this index instead of walking model.Objects
+    index = ModelIndex(model)
 
     # Load PRD database (need vertices + elements for alignment)
     prd_db = _find_prd_db(input_db, input_3dm)
@@ -112,31 +129,41 @@ def run_pipeline_v2(
         report.errors.append("No PRD database found. Run ETL first.")
         return report
 
-    from structure_aligner.db.reader import load_vertices_with_elements
-    vertices, elements = load_vertices_with_elements(prd_db)
+    from structure_aligner.checkpoint import CheckpointStore
+    from structure_aligner.db.reader import load_vertex_arrays
+    from structure_aligner.etl.extraction_cache import file_digest
+    store = CheckpointStore(output_dir / "checkpoints", resume=resume, from_step=from_step)
+    load_key = store.key("load", config, file_digest(prd_db))
+    vertices, elements = store.cached("load", load_key, lambda: load_vertex_arrays(prd_db))
     report.total_vertices = len(vertices)
     logger.info("  Loaded %d vertices, %d elements", len(vertices), len(elements))
 
     # --- Step 2: Discover axis lines ---
     logger.info("Step 2/8: Discovering axis lines")
     from structure_aligner.analysis.axis_selector import discover_axis_lines
-    axis_x, axis_y = discover_axis_lines(vertices, config)
+    axes_key = store.key("axes", config, load_key)
+    axis_x, axis_y = store.cached("axes", axes_key, lambda: discover_axis_lines(vertices, config))
     report.axis_lines_x_count = len(axis_x)
     report.axis_lines_y_count = len(axis_y)
     logger.info("  Discovered %d X and %d Y axis lines", len(axis_x), len(axis_y))
 
     # --- Step 3: Per-element snap alignment ---
     logger.info("Step 3/8: Aligning elements")
-    from structure_aligner.alignment.element_aligner import align_elements
-    aligned = align_elements(vertices, elements, axis_x, axis_y, config)
+    from structure_aligner.alignment.element_aligner import align_elements_table
+    from structure_aligner.alignment.geometry import AxisLineIndex
+    index_x, index_y = AxisLineIndex(axis_x), AxisLineIndex(axis_y)
+    aligned = store.cached(
+        "align", store.key("align", config, axes_key),
+        lambda: align_elements_table(vertices, elements, index_x, index_y, config, workers=workers),
+    )
 
-    aligned_count = sum(1 for av in aligned if av.aligned_axis != "none")
+    aligned_count = aligned.aligned_count()
     report.aligned_vertices = aligned_count
     report.alignment_rate_pct = round(
         aligned_count / len(aligned) * 100, 1
-    ) if aligned else 0.0
+    ) if len(aligned) else 0.0
     report.max_displacement_m = round(
-        max((av.displacement_total for av in aligned), default=0.0), 4
+        float(aligned.displacement.max()) if len(aligned) else 0.0, 4
     )
     logger.info(
         "  Aligned %d/%d vertices (%.1f%%)",
@@ -145,17 +172,20 @@ def run_pipeline_v2(
 
     # --- Step 4: Extract info before removal ---
     logger.info("Step 4/8: Extracting info for object transformations")
-    dalle_names = _load_names_by_type(input_db, "DALLE")
-    voile_names_set = _load_names_by_type(input_db, "VOILE")
-
     from structure_aligner.transform.dalle_consolidator import extract_dalle_info
-    dalle_infos = extract_dalle_info(model, dalle_names)
-    non_roof_dalles = [d for d in dalle_infos if d.z < config.roof_z_threshold]
-
     from structure_aligner.transform.voile_simplifier import extract_voile_extents
-    # We'll identify multi-face voiles first
-    multiface_voile_names = _identify_multiface_voiles(model, voile_names_set)
-    voile_extents = extract_voile_extents(model, multiface_voile_names)
+
+    def extract():
+        dalle_names = _load_names_by_type(input_db, "DALLE")
+        voile_names_set = _load_names_by_type(input_db, "VOILE")
+        dalle_infos = extract_dalle_info(index, dalle_names)
+        # We'll identify multi-face voiles first
+        multiface_voile_names = _identify_multiface_voiles(index, voile_names_set)
+        return dalle_infos, extract_voile_extents(index, multiface_voile_names)
+
+    extract_key = store.key("extract", config, file_digest(input_3dm), file_digest(input_db))
+    dalle_infos, voile_extents = store.cached("extract", extract_key, extract)
+    non_roof_dalles = [d for d in dalle_infos if d.z < config.roof_z_threshold]
 
     logger.info(
         "  Extracted %d dalle infos, %d voile extents",
@@ -170,14 +200,14 @@ def run_pipeline_v2(
         remove_obsolete_supports,
     )
 
-    dalles_removed, dalles_kept = remove_dalles(model, input_db, config)
+    dalles_removed, dalles_kept = remove_dalles(index, input_db, config)
     report.dalles_removed = dalles_removed
     report.dalles_kept = dalles_kept
 
-    supports_removed = remove_obsolete_supports(model, input_db)
+    supports_removed = remove_obsolete_supports(index, input_db)
     report.supports_removed = supports_removed
 
-    removed_voiles = remove_multiface_voiles(model, input_db)
+    removed_voiles = remove_multiface_voiles(index, input_db)
     report.voiles_removed = len(removed_voiles)
 
     logger.info(
@@ -189,12 +219,12 @@ def run_pipeline_v2(
     logger.info("Step 6/8: Adding objects")
     from structure_aligner.transform.dalle_consolidator import consolidate_dalles
     dalles_consolidated = consolidate_dalles(
-        model, non_roof_dalles, config.floor_z_levels
+        index, non_roof_dalles, config.floor_z_levels
     )
     report.dalles_consolidated = dalles_consolidated
 
     from structure_aligner.transform.voile_simplifier import simplify_voiles
-    voiles_simplified = simplify_voiles(model, voile_extents, config.floor_z_levels)
+    voiles_simplified = simplify_voiles(index, voile_extents, config.floor_z_levels)
     report.voiles_simplified = voiles_simplified
 
     from structure_aligner.transform.support_placer import (
@@ -202,16 +232,19 @@ def run_pipeline_v2(
     )
     # Place supports at column center positions snapped to nearest axis
     # intersection, avoiding the O(X*Y) grid scan with over-discovered axes.
-    existing_columns = _build_column_positions(vertices, elements)
+    existing_columns = store.cached(
+        "columns", store.key("columns", config, load_key),
+        lambda: _build_column_positions(vertices, elements),
+    )
     logger.info("  Column centers: %d unique positions", len(existing_columns))
     supports_added, support_positions = place_support_points_at_columns(
-        model, existing_columns, axis_x, axis_y,
+        index, existing_columns, index_x, index_y,
         support_z_levels=(2.12, -4.44),
     )
     report.supports_added = supports_added
 
     from structure_aligner.transform.filaire_generator import generate_filaire
-    filaire_added = generate_filaire(model, support_positions, config.floor_z_levels)
+    filaire_added = generate_filaire(index, support_positions, config.floor_z_levels)
     report.filaire_added = filaire_added
 
     from structure_aligner.transform.grid_lines import generate_grid_lines
@@ -223,7 +256,7 @@ def run_pipeline_v2(
     else:
         x_min, x_max = -75.0, 5.0  # fallback
 
-    grid_added = generate_grid_lines(model, axis_y, x_extent=(x_min, x_max))
+    grid_added = generate_grid_lines(index, axis_y, x_extent=(x_min, x_max))
     report.grid_lines_added = grid_added
 
     logger.info(
@@ -235,9 +268,12 @@ def run_pipeline_v2(
     # --- Step 7: Apply vertex alignment to 3dm model ---
     # Safe ordering: Phase 4/5 only remove/add whole objects, never modify
     # surviving objects. So vertex indices from Phase 3 alignment remain valid.
+    # Only vertices that moved are written back; the rest already hold
+    # their aligned coordinates.
     logger.info("Step 7/8: Applying vertex alignment to 3dm model")
-    vertices_updated = _apply_alignment_to_model(model, aligned, elements)
-    logger.info("  Updated %d vertices in 3dm model", vertices_updated)
+    moved = aligned.take(aligned.moved_mask)
+    vertices_updated = _apply_alignment_to_model(index, moved, elements)
+    logger.info("  Updated %d moved vertices (of %d) in 3dm model", vertices_updated, len(aligned))
 
     # --- Step 8: Write output ---
     logger.info("Step 8/8: Writing output")
@@ -245,6 +281,7 @@ def run_pipeline_v2(
     model.Write(str(output_3dm), version=7)
     report.output_3dm = str(output_3dm)
     report.final_object_count = len(model.Objects)
+    report.reused_checkpoints = store.reused
 
     # Write report
     report.execution_time_s = round(time.time() - start_time, 2)
@@ -323,25 +360,23 @@ def _load_names_by_type(db_path: Path, element_type: str) -> set[str]:
 
 
 def _identify_multiface_voiles(
-    model: rhino3dm.File3dm,
+    model: rhino3dm.File3dm | ModelIndex,
     voile_names: set[str],
     min_faces: int = 2,
 ) -> list[str]:
     """Find multi-face voile names without removing them."""
+    index = as_model_index(model)
     result = []
-    for obj in model.Objects:
-        name = obj.Attributes.Name
-        if name not in voile_names:
-            continue
-        geom = obj.Geometry
-        if isinstance(geom, rhino3dm.Brep) and len(geom.Faces) >= min_faces:
-            result.append(name)
+    for obj in index.named(voile_names):
+        shape = index.shape(obj)
+        if shape.kind == "brep" and shape.face_count >= min_faces:
+            result.append(obj.name)
     return result
 
 
 def _apply_alignment_to_model(
-    model: rhino3dm.File3dm,
-    aligned_vertices: list[AlignedVertex],
+    model: rhino3dm.File3dm | ModelIndex,
+    aligned_vertices: list[AlignedVertex] | AlignedVertexTable,
     elements: dict[int, ElementInfo],
 ) -> int:
     """Apply aligned vertex coordinates back to the 3dm model objects.
@@ -354,53 +389,60 @@ def _apply_alignment_to_model(
     for the small displacements typical of structural alignment (<1m). For
     large displacements, Brep topology may become invalid.
     """
-    from collections import defaultdict
-    by_name: dict[str, list] = defaultdict(list)
-    for av in aligned_vertices:
-        elem = elements.get(av.element_id)
-        if elem:
-            by_name[elem.name].append(av)
-
+    table = as_aligned_table(aligned_vertices)
+
+    # Rows grouped by element name, then by vertex_index (stable, so rows
+    # sharing a name and index keep their output order)
+    names: dict[str, int] = {}
+    element_ids, element_of = np.unique(table.element_id, return_inverse=True)
+    element_name_code = np.array([
+        names.setdefault(elements[eid].name, len(names)) if eid in elements else -1
+        for eid in element_ids.tolist()
+    ], dtype=np.int64)
+    name_code = element_name_code[element_of]
+    order = np.lexsort((table.vertex_index, name_code))
+    order = order[name_code[order] >= 0]
+    starts = np.searchsorted(name_code[order], np.arange(len(names) + 1))
+    spans = {name: (starts[code], starts[code + 1]) for name, code in names.items()}
+
+    index = as_model_index(model)
     updated = 0
-    for obj in model.Objects:
-        name = obj.Attributes.Name
-        if not name or name not in by_name:
-            continue
-
-        verts = sorted(by_name[name], key=lambda v: v.vertex_index)
-        geom = obj.Geometry
+    for obj in index.named([name for name in spans if name]):
+        rows = order[slice(*spans[obj.name])]
+        verts = zip(
+            table.vertex_index[rows].tolist(), table.x[rows].tolist(),
+            table.y[rows].tolist(), table.z[rows].tolist(),
+        )
+        geom = index.geometry(obj)
+        index.invalidate(obj)
 
         if isinstance(geom, rhino3dm.Brep):
-            for av in verts:
-                if av.vertex_index < len(geom.Vertices):
-                    geom.Vertices[av.vertex_index].Location = rhino3dm.Point3d(
-                        av.x, av.y, av.z
-                    )
+            for vi, x, y, z in verts:
+                if vi < len(geom.Vertices):
+                    geom.Vertices[vi].Location = rhino3dm.Point3d(x, y, z)
                     updated += 1
         elif isinstance(geom, rhino3dm.LineCurve):
-            for av in verts:
-                if av.vertex_index == 0:
-                    geom.SetStartPoint(rhino3dm.Point3d(av.x, av.y, av.z))
+            for vi, x, y, z in verts:
+                if vi == 0:
+                    geom.SetStartPoint(rhino3dm.Point3d(x, y, z))
                     updated += 1
-                elif av.vertex_index == 1:
-                    geom.SetEndPoint(rhino3dm.Point3d(av.x, av.y, av.z))
+                elif vi == 1:
+                    geom.SetEndPoint(rhino3dm.Point3d(x, y, z))
                     updated += 1
         elif isinstance(geom, rhino3dm.PolylineCurve):
-            for av in verts:
-                if av.vertex_index < geom.PointCount:
-                    geom.SetPoint(av.vertex_index, rhino3dm.Point3d(av.x, av.y, av.z))
+            for vi, x, y, z in verts:
+                if vi < geom.PointCount:
+                    geom.SetPoint(vi, rhino3dm.Point3d(x, y, z))
                     updated += 1
         elif isinstance(geom, rhino3dm.NurbsCurve):
-            for av in verts:
-                if av.vertex_index < len(geom.Points):
-                    geom.Points[av.vertex_index] = rhino3dm.Point4d(
-                        av.x, av.y, av.z, 1.0
-                    )
+            for vi, x, y, z in verts:
+                if vi < len(geom.Points):
+                    geom.Points[vi] = rhino3dm.Point4d(x, y, z, 1.0)
                     updated += 1
         elif isinstance(geom, rhino3dm.Point):
-            for av in verts:
-                if av.vertex_index == 0:
-                    geom.Location = rhino3dm.Point3d(av.x, av.y, av.z)
+            for vi, x, y, z in verts:
+                if vi == 0:
+                    geom.Location = rhino3dm.Point3d(x, y, z)
                     updated += 1
 
     return updated
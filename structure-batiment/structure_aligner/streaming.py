@@ -0,0 +1,148 @@
+"""Streaming V2 alignment: PRD database in, aligned database out.
+
+pipeline-v2 loads every vertex before discovering axis lines and keeps
+the whole alignment result until it is written. For very large models
+align_db_streaming() runs the same discovery and snapping in two passes
+over a database cursor instead:
+
+1. Axis discovery. Vertices are read in id order, chunk by chunk, and
+   folded into the per-position counts and (position, floor) pairs of
+   axis_selector.AxisGroupAccumulator; the axis lines are computed from
+   those aggregates.
+2. Snapping. Vertices are read again in element_id order, in chunks that
+   never split an element, and each chunk is snapped and written to the
+   output database before the next one is read.
+
+Element metadata is loaded per chunk, for the chunk's element id range.
+Memory is bounded by the chunk size (or the largest element, when it is
+bigger) and the number of distinct rounded positions. The output
+database equals align_elements_table() + write_aligned_db() (or
+write_alignment_delta() with delta=True) on the fully loaded model.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+
+from structure_aligner.alignment.aligned_table import AlignedVertexTable
+from structure_aligner.config import PipelineConfig
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StreamingAlignReport:
+    """Metrics of one align_db_streaming() run."""
+    input_db: str
+    output_db: str
+    total_vertices: int = 0
+    aligned_vertices: int = 0
+    alignment_rate_pct: float = 0.0
+    max_displacement_m: float = 0.0
+    axis_lines_x_count: int = 0
+    axis_lines_y_count: int = 0
+    batches: int = 0
+    largest_batch: int = 0
+    duration_seconds: float = 0.0
+
+
+def align_db_streaming(
+    prd_db: Path,
+    output_db: Path,
+    config: PipelineConfig | None = None,
+    chunk_size: int = 100_000,
+    delta: bool = False,
+) -> StreamingAlignReport:
+    """
+    Discover axis lines and snap every element without loading the model.
+
+    Args:
+        prd_db: PRD database (output of the etl command).
+        output_db: Aligned database to create (same layout as the align
+            command's output).
+        config: Pipeline configuration. Uses defaults if None.
+        chunk_size: Vertex rows read per cursor fetch.
+        delta: Write the delta layout (db.writer.write_alignment_delta)
+            instead of the enriched vertices table.
+
+    Returns:
+        StreamingAlignReport.
+
+    Raises:
+        FileNotFoundError: If prd_db does not exist.
+        FileExistsError: If output_db already exists.
+        ValueError: If the database lacks required tables or chunk_size
+            is not positive.
+    """
+    from structure_aligner.alignment.geometry import AxisLineIndex
+    from structure_aligner.analysis.axis_selector import AxisGroupAccumulator
+    from structure_aligner.db.reader import iter_vertex_chunks
+    from structure_aligner.db.writer import write_aligned_db_batches, write_alignment_delta_batches
+
+    if config is None:
+        config = PipelineConfig()
+    if output_db.exists():
+        raise FileExistsError(f"Output already exists: {output_db}")
+    start_time = time.time()
+    report = StreamingAlignReport(input_db=str(prd_db), output_db=str(output_db))
+
+    # --- Pass 1: axis discovery over aggregated positions ---
+    accumulator = AxisGroupAccumulator(config)
+    for chunk in iter_vertex_chunks(prd_db, chunk_size):
+        accumulator.add(chunk)
+    groups_x, groups_y = accumulator.groups()
+    axis_x = groups_x.axis_lines(config.cluster_radius, config.min_floors)
+    axis_y = groups_y.axis_lines(config.cluster_radius, config.min_floors)
+    report.axis_lines_x_count = len(axis_x)
+    report.axis_lines_y_count = len(axis_y)
+    logger.info(
+        "Pass 1: %d vertices, %d X and %d Y axis lines",
+        accumulator.vertex_count, len(axis_x), len(axis_y),
+    )
+
+    # --- Pass 2: per-element snapping, written batch by batch ---
+    index_x, index_y = AxisLineIndex(axis_x), AxisLineIndex(axis_y)
+    batches = _aligned_batches(
+        prd_db, iter_vertex_chunks(prd_db, chunk_size, by_element=True),
+        index_x, index_y, config, report,
+    )
+    if delta:
+        write_alignment_delta_batches(prd_db, output_db, batches)
+    else:
+        write_aligned_db_batches(prd_db, output_db, batches)
+
+    report.alignment_rate_pct = round(
+        report.aligned_vertices / report.total_vertices * 100, 1
+    ) if report.total_vertices else 0.0
+    report.max_displacement_m = round(report.max_displacement_m, 4)
+    report.duration_seconds = round(time.time() - start_time, 2)
+    logger.info(
+        "Pass 2: aligned %d/%d vertices (%.1f%%) in %d batches, %.1fs",
+        report.aligned_vertices, report.total_vertices, report.alignment_rate_pct,
+        report.batches, report.duration_seconds,
+    )
+    return report
+
+
+def _aligned_batches(prd_db, chunks, index_x, index_y, config, report) -> Iterator[AlignedVertexTable]:
+    """Snap each whole-element chunk, recording totals in report as it goes."""
+    from structure_aligner.alignment.element_aligner import align_elements_arrays
+    from structure_aligner.db.reader import load_elements
+
+    for chunk in chunks:
+        # Chunks are in element_id order, so their elements form one id range
+        id_range = int(chunk.element_id[0]), int(chunk.element_id[-1])
+        elements = load_elements(prd_db, id_range)
+        table = align_elements_arrays(chunk, elements, index_x, index_y, config).to_table(chunk)
+        report.batches += 1
+        report.largest_batch = max(report.largest_batch, len(table))
+        report.total_vertices += len(table)
+        report.aligned_vertices += table.aligned_count()
+        report.max_displacement_m = max(report.max_displacement_m, float(np.max(table.displacement)))
+        yield table
@@ -0,0 +1,251 @@
+"""Parameter sweep: evaluate many PipelineConfig variants on one loaded model.
+
+Tuning min_floors, cluster_radius, max_snap_distance and
+outlier_snap_distance used to mean one pipeline-v2 run per combination,
+each reloading the model. A sweep loads the PRD vertices and elements
+once, runs the configuration-independent half of axis discovery (rounding
+and floor matching, see axis_selector.group_axis_positions) once, and
+extracts the reference axis positions once. Worker processes receive that
+shared state when they start and then evaluate one grid point per task:
+axis lines (cached per cluster_radius/min_floors, since the snap
+distances do not affect them) followed by per-element snapping.
+
+Only axis discovery and snapping are evaluated; object transforms and
+3dm output are left to pipeline-v2 with the chosen parameters.
+"""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields, replace
+from datetime import datetime, timezone
+from pathlib import Path
+
+from structure_aligner.alignment.geometry import AxisLineIndex
+from structure_aligner.config import ElementInfo, PipelineConfig
+
+logger = logging.getLogger(__name__)
+
+# PipelineConfig fields a sweep may vary
+SWEEP_PARAMETERS = ("min_floors", "cluster_radius", "max_snap_distance", "outlier_snap_distance")
+
+
+@dataclass
+class SweepResult:
+    """Metrics for one grid point."""
+    min_floors: int
+    cluster_radius: float
+    max_snap_distance: float
+    outlier_snap_distance: float
+    axis_lines_x: int = 0
+    axis_lines_y: int = 0
+    total_vertices: int = 0
+    aligned_vertices: int = 0
+    alignment_rate_pct: float = 0.0
+    max_displacement_m: float = 0.0
+    # Against the reference 3dm, when one is given
+    recall_x: float | None = None
+    precision_x: float | None = None
+    recall_y: float | None = None
+    precision_y: float | None = None
+    elapsed_s: float = 0.0
+
+
+def build_grid(base: PipelineConfig | None = None, **values: list) -> list[PipelineConfig]:
+    """
+    Cartesian product of parameter values applied to a base configuration.
+
+    Args:
+        base: Configuration supplying every field that is not swept.
+        **values: Lists of values keyed by a name from SWEEP_PARAMETERS.
+            Parameters not given keep the base value.
+
+    Returns:
+        One PipelineConfig per combination, the last parameter varying fastest.
+
+    Raises:
+        ValueError: If a parameter is not sweepable or has no values.
+    """
+    if base is None:
+        base = PipelineConfig()
+    for name, options in values.items():
+        if name not in SWEEP_PARAMETERS:
+            raise ValueError(f"Cannot sweep {name!r}; expected one of {SWEEP_PARAMETERS}")
+        if not options:
+            raise ValueError(f"No values given for {name}")
+
+    axes = [values.get(name, [getattr(base, name)]) for name in SWEEP_PARAMETERS]
+    return [
+        replace(base, **dict(zip(SWEEP_PARAMETERS, combo)))
+        for combo in itertools.product(*axes)
+    ]
+
+
+def run_sweep(
+    prd_db: Path,
+    configs: list[PipelineConfig],
+    workers: int = 1,
+    reference_3dm: Path | None = None,
+) -> list[SweepResult]:
+    """
+    Evaluate each configuration's axis discovery and snapping.
+
+    Args:
+        prd_db: PRD database (output of the etl command).
+        configs: Grid from build_grid(). All entries must agree on every
+            field outside SWEEP_PARAMETERS, since the shared discovery
+            state is built from the first one.
+        workers: Worker processes (1 evaluates in this process).
+        reference_3dm: Optional reference .3dm for recall/precision.
+
+    Returns:
+        One SweepResult per configuration, in grid order.
+
+    Raises:
+        FileNotFoundError: If the database does not exist.
+        ValueError: If configs is empty, mixes non-swept settings, or
+            workers is out of range.
+    """
+    if not configs:
+        raise ValueError("No configurations to evaluate")
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    base = configs[0]
+    for config in configs[1:]:
+        if replace(config, **{name: getattr(base, name) for name in SWEEP_PARAMETERS}) != base:
+            raise ValueError("Sweep configurations differ outside " + ", ".join(SWEEP_PARAMETERS))
+
+    from structure_aligner.analysis.axis_selector import group_axis_positions
+    from structure_aligner.db.reader import load_vertex_arrays
+
+    start_time = time.time()
+    arrays, elements = load_vertex_arrays(prd_db)
+    groups_x, groups_y = group_axis_positions(arrays, base)
+    reference = None
+    if reference_3dm is not None:
+        from structure_aligner.analysis.axis_validator import extract_axis_positions
+        reference = (
+            extract_axis_positions(reference_3dm, "X"),
+            extract_axis_positions(reference_3dm, "Y"),
+        )
+    context = _SweepContext(arrays, elements, groups_x, groups_y, reference)
+    logger.info(
+        "Sweep: %d vertices, %d elements loaded in %.1fs; evaluating %d configurations",
+        len(arrays), len(elements), time.time() - start_time, len(configs),
+    )
+
+    if workers == 1:
+        results = [context.evaluate(config) for config in configs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(configs)),
+            initializer=_init_worker,
+            initargs=(context,),
+        ) as pool:
+            results = list(pool.map(_evaluate_in_worker, configs))
+
+    logger.info("Sweep complete in %.1fs", time.time() - start_time)
+    return results
+
+
+def write_sweep_table(results: list[SweepResult], path: Path) -> None:
+    """
+    Write sweep results as CSV (one row per grid point) or JSON.
+
+    Raises:
+        ValueError: If the suffix is neither .csv nor .json.
+    """
+    suffix = path.suffix.lower()
+    if suffix not in (".csv", ".json"):
+        raise ValueError(f"Unsupported sweep output '{path.suffix}' (expected .csv or .json)")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if suffix == ".csv":
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=[fld.name for fld in fields(SweepResult)])
+            writer.writeheader()
+            writer.writerows(asdict(r) for r in results)
+    else:
+        data = {
+            "metadata": {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "pipeline": "sweep",
+            },
+            "results": [asdict(r) for r in results],
+        }
+        path.write_text(json.dumps(data, indent=2))
+    logger.info("Sweep table written to %s", path)
+
+
+# =========================================================================
+# Internal helpers
+# =========================================================================
+
+
+class _SweepContext:
+    """State shared by every grid point, built once per sweep."""
+
+    def __init__(self, vertices, elements: dict[int, ElementInfo], groups_x, groups_y, reference):
+        self.vertices = vertices
+        self.elements = elements
+        self.groups_x = groups_x
+        self.groups_y = groups_y
+        self.reference = reference
+        self._axis_cache: dict[tuple[float, int], tuple[AxisLineIndex, AxisLineIndex]] = {}
+
+    def axis_lines(self, config: PipelineConfig) -> tuple[AxisLineIndex, AxisLineIndex]:
+        key = (config.cluster_radius, config.min_floors)
+        if key not in self._axis_cache:
+            self._axis_cache[key] = (
+                AxisLineIndex(self.groups_x.axis_lines(config.cluster_radius, config.min_floors)),
+                AxisLineIndex(self.groups_y.axis_lines(config.cluster_radius, config.min_floors)),
+            )
+        return self._axis_cache[key]
+
+    def evaluate(self, config: PipelineConfig) -> SweepResult:
+        from structure_aligner.alignment.element_aligner import align_elements_arrays
+
+        start = time.time()
+        axis_x, axis_y = self.axis_lines(config)
+        aligned = align_elements_arrays(self.vertices, self.elements, axis_x, axis_y, config)
+        total = len(aligned)
+        aligned_count = int((aligned.snapped_x | aligned.snapped_y).sum())
+
+        result = SweepResult(
+            **{name: getattr(config, name) for name in SWEEP_PARAMETERS},
+            axis_lines_x=len(axis_x),
+            axis_lines_y=len(axis_y),
+            total_vertices=total,
+            aligned_vertices=aligned_count,
+            alignment_rate_pct=round(aligned_count / total * 100, 1) if total else 0.0,
+            max_displacement_m=round(float(aligned.displacement.max()) if total else 0.0, 4),
+        )
+        if self.reference is not None:
+            from structure_aligner.analysis.axis_validator import compare_axis_positions
+
+            ref_x, ref_y = self.reference
+            cmp_x = compare_axis_positions(axis_x, ref_x, "X")
+            cmp_y = compare_axis_positions(axis_y, ref_y, "Y")
+            result.recall_x = round(cmp_x["recall"], 4)
+            result.precision_x = round(cmp_x["precision"], 4)
+            result.recall_y = round(cmp_y["recall"], 4)
+            result.precision_y = round(cmp_y["precision"], 4)
+        result.elapsed_s = round(time.time() - start, 3)
+        return result
+
+
+_worker_context: _SweepContext | None = None
+
+
+def _init_worker(context: _SweepContext) -> None:
+    global _worker_context
+    _worker_context = context
+
+
+def _evaluate_in_worker(config: PipelineConfig) -> SweepResult:
+    return _worker_context.evaluate(config)
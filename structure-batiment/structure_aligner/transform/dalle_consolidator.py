@@ -12,6 +12,8 @@ from dataclasses import dataclass
 
 import rhino3dm
 
+from structure_aligner.transform.model_index import ModelIndex, as_model_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,27 +29,23 @@ class RemovedDalleInfo:
 
 
 def extract_dalle_info(
-    model: rhino3dm.File3dm,
+    model: rhino3dm.File3dm | ModelIndex,
     dalle_names: set[str],
 ) -> list[RemovedDalleInfo]:
     """Extract footprint info from dalle objects before removal.
 
     Call this BEFORE removing dalles to capture their extents.
     """
+    index = as_model_index(model)
     info: list[RemovedDalleInfo] = []
-    for obj in model.Objects:
-        name = obj.Attributes.Name
-        if name not in dalle_names:
-            continue
-        geom = obj.Geometry
-        if not isinstance(geom, rhino3dm.Brep) or len(geom.Vertices) == 0:
+    for obj in index.named(dalle_names):
+        shape = index.shape(obj)
+        if shape.kind != "brep" or len(shape.points) == 0:
             continue
-        xs = [geom.Vertices[i].Location.X for i in range(len(geom.Vertices))]
-        ys = [geom.Vertices[i].Location.Y for i in range(len(geom.Vertices))]
-        zs = [geom.Vertices[i].Location.Z for i in range(len(geom.Vertices))]
+        xs, ys, zs = (shape.points[:, k].tolist() for k in range(3))
         z_avg = sum(zs) / len(zs)
         info.append(RemovedDalleInfo(
-            name=name,
+            name=obj.name,
             x_min=min(xs), x_max=max(xs),
             y_min=min(ys), y_max=max(ys),
             z=round(z_avg, 2),
@@ -56,7 +54,7 @@ def extract_dalle_info(
 
 
 def consolidate_dalles(
-    model: rhino3dm.File3dm,
+    model: rhino3dm.File3dm | ModelIndex,
     removed_dalles: list[RemovedDalleInfo],
     floor_z_levels: tuple[float, ...],
     layer_index: int = 0,
@@ -68,7 +66,7 @@ def consolidate_dalles(
     Breps at each floor.
 
     Args:
-        model: The rhino3dm model to add objects to.
+        model: The rhino3dm model to add objects to, or its ModelIndex.
         removed_dalles: Footprint info from removed dalles.
         floor_z_levels: Known floor Z-levels.
         layer_index: Layer index for new objects.
@@ -85,8 +83,9 @@ def consolidate_dalles(
         matched_z = _match_z(info.z, floor_z_levels)
         by_z[matched_z].append(info)
 
+    index = as_model_index(model)
     added = 0
-    next_id = _get_max_coque_id(model) + 1
+    next_id = index.max_id("Coque_") + 1
 
     for z_level, dalles in sorted(by_z.items()):
         # Compute overall bounding box
@@ -111,7 +110,7 @@ def consolidate_dalles(
             attr = rhino3dm.ObjectAttributes()
             attr.Name = name
             attr.LayerIndex = layer_index
-            model.Objects.AddBrep(brep, attr)
+            index.add_brep(brep, attr)
             added += 1
 
     logger.info("Dalle consolidation: %d consolidated slabs added", added)
@@ -197,18 +196,3 @@ def _create_planar_brep(
         rhino3dm.Interval(y_min, y_max),
     )
     return rhino3dm.Brep.CreateFromSurface(srf)
-
-
-def _get_max_coque_id(model: rhino3dm.File3dm) -> int:
-    """Find the highest Coque_NNNN id in the model."""
-    max_id = 0
-    for obj in model.Objects:
-        name = obj.Attributes.Name
-        if name and name.startswith("Coque_"):
-            try:
-                num = int(name.split("_")[1])
-                if num > max_id:
-                    max_id = num
-            except (ValueError, IndexError):
-                pass
-    return max_id
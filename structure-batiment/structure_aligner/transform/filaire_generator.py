@@ -10,11 +10,13 @@ import logging
 
 import rhino3dm
 
+from structure_aligner.transform.model_index import ModelIndex, as_model_index
+
 logger = logging.getLogger(__name__)
 
 
 def generate_filaire(
-    model: rhino3dm.File3dm,
+    model: rhino3dm.File3dm | ModelIndex,
     support_positions: list[tuple[float, float, float]],
     floor_z_levels: tuple[float, ...],
     layer_index: int = 0,
@@ -31,7 +33,7 @@ def generate_filaire(
     - LineCurve for beams at Z=-4.44
 
     Args:
-        model: The rhino3dm model to add objects to.
+        model: The rhino3dm model to add objects to, or its ModelIndex.
         support_positions: List of (x, y, z) from support placement.
         floor_z_levels: Known floor Z-levels.
         layer_index: Layer index for new objects.
@@ -40,8 +42,9 @@ def generate_filaire(
     Returns:
         Number of Filaire objects added.
     """
+    index = as_model_index(model)
     if start_id is None:
-        start_id = _get_max_filaire_id(model) + 1
+        start_id = index.max_id("Filaire_") + 1
 
     sorted_z = sorted(floor_z_levels)
     next_id = start_id
@@ -62,11 +65,11 @@ def generate_filaire(
 
         geom = _create_vertical_geom(x, y, z, z_top)
         if isinstance(geom, rhino3dm.LineCurve):
-            model.Objects.AddCurve(geom, attr)
+            index.add_curve(geom, attr)
         elif isinstance(geom, rhino3dm.NurbsCurve):
-            model.Objects.AddCurve(geom, attr)
+            index.add_curve(geom, attr)
         elif isinstance(geom, rhino3dm.PolylineCurve):
-            model.Objects.AddCurve(geom, attr)
+            index.add_curve(geom, attr)
         else:
             continue
 
@@ -109,17 +112,3 @@ def _create_vertical_geom(
     # PolylineCurve for everything else
     return rhino3dm.PolylineCurve([p_bot, p_top])
 
-
-def _get_max_filaire_id(model: rhino3dm.File3dm) -> int:
-    """Find the highest Filaire_NNNN id in the model."""
-    max_id = 0
-    for obj in model.Objects:
-        name = obj.Attributes.Name
-        if name and name.startswith("Filaire_"):
-            try:
-                num = int(name.split("_")[1])
-                if num > max_id:
-                    max_id = num
-            except (ValueError, IndexError):
-                pass
-    return max_id
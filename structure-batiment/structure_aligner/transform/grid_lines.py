@@ -11,12 +11,13 @@ import logging
 import rhino3dm
 
 from structure_aligner.config import AxisLine
+from structure_aligner.transform.model_index import ModelIndex, as_model_index
 
 logger = logging.getLogger(__name__)
 
 
 def generate_grid_lines(
-    model: rhino3dm.File3dm,
+    model: rhino3dm.File3dm | ModelIndex,
     axis_lines_y: list[AxisLine],
     x_extent: tuple[float, float],
     z_level: float = 0.0,
@@ -30,7 +31,7 @@ def generate_grid_lines(
     the full X extent of the building.
 
     Args:
-        model: The rhino3dm model to add objects to.
+        model: The rhino3dm model to add objects to, or its ModelIndex.
         axis_lines_y: Y axis lines defining grid positions.
         x_extent: (x_min, x_max) building footprint extent.
         z_level: Z position for grid lines (typically 0).
@@ -42,6 +43,7 @@ def generate_grid_lines(
     Returns:
         Number of grid line curves added.
     """
+    index = as_model_index(model)
     x_min, x_max = x_extent
     added = 0
 
@@ -63,7 +65,7 @@ def generate_grid_lines(
         else:
             attr.LayerIndex = default_layer_index
 
-        model.Objects.AddCurve(curve, attr)
+        index.add_curve(curve, attr)
         added += 1
 
     logger.info("Grid line generation: %d unnamed curves added", added)
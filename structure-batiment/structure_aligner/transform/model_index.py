@@ -0,0 +1,211 @@
+"""Name index over a rhino3dm model for the V2 transform stages.
+
+The transform stages each looked objects up by walking model.Objects:
+removal rules by position (model.Objects[i], which rhino3dm resolves by
+walking the table, so those loops were quadratic), extraction and ID
+allocation by full iteration, each re-decoding Brep vertices. A
+ModelIndex reads every object's name, GUID and layer in one pass, then
+answers name lookups from that table and reaches objects by GUID
+(model.Objects.FindId). Geometry is decoded at most once per object, on
+first use, into an ObjectShape.
+
+Objects added or removed through the index keep it in sync with the
+model. Code that edits geometry in place calls invalidate() so the next
+shape() decodes it again.
+"""
+
+from __future__ import annotations
+
+import logging
+import uuid
+from dataclasses import dataclass, field
+from typing import Collection, Iterator
+
+import numpy as np
+import rhino3dm
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ObjectShape:
+    """What the transform stages read from one object's geometry.
+
+    kind is "brep", "point", "line_curve", "polyline_curve" or "other".
+    points holds Brep vertex locations, the point, the curve end points or
+    the polyline points, in geometry order ((0, 3) for other geometry).
+    """
+    kind: str
+    points: np.ndarray
+    face_count: int = 0
+
+    @property
+    def max_z(self) -> float | None:
+        """Highest Z over points, None when there are none."""
+        return float(self.points[:, 2].max()) if len(self.points) else None
+
+
+@dataclass(eq=False)
+class IndexedObject:
+    """One model object as recorded in a ModelIndex."""
+    id: uuid.UUID
+    name: str
+    layer_index: int
+    order: int                        # model order; increases with each addition
+    shape: ObjectShape | None = field(default=None, repr=False)
+
+
+class ModelIndex:
+    """Objects of a rhino3dm model by name, with cached geometry shapes.
+
+    The name table is built on first use, so wrapping a model only to add
+    objects costs nothing.
+
+    Args:
+        model: The rhino3dm model. Objects must be added and removed
+            through the index while it is in use.
+    """
+
+    def __init__(self, model: rhino3dm.File3dm):
+        self.model = model
+        self._by_name: dict[str, list[IndexedObject]] | None = None
+        # Numbered names ("Coque_12"): prefix "Coque_" -> {12: object count}
+        self._numbers: dict[str, dict[int, int]] = {}
+        self._next_order = 0
+
+    def __len__(self) -> int:
+        return len(self.model.Objects)
+
+    def named(self, names: Collection[str]) -> list[IndexedObject]:
+        """Objects whose name is in names, in model order."""
+        by_name = self._table()
+        found = [obj for name in set(names) for obj in by_name.get(name, ())]
+        found.sort(key=lambda obj: obj.order)
+        return found
+
+    def __iter__(self) -> Iterator[IndexedObject]:
+        """Every object, in model order."""
+        return iter(self.named(self._table().keys()))
+
+    def geometry(self, obj: IndexedObject) -> rhino3dm.GeometryBase:
+        """The live geometry of obj (in-place edits change the model)."""
+        return self.model.Objects.FindId(obj.id).Geometry
+
+    def shape(self, obj: IndexedObject) -> ObjectShape:
+        """obj's ObjectShape, decoded on first use."""
+        if obj.shape is None:
+            obj.shape = _decode_shape(self.geometry(obj))
+        return obj.shape
+
+    def invalidate(self, obj: IndexedObject) -> None:
+        """Forget obj's cached shape after its geometry was edited in place."""
+        obj.shape = None
+
+    def max_id(self, prefix: str) -> int:
+        """Highest N among objects named <prefix>N (e.g. "Coque_"), 0 if none."""
+        self._table()
+        return max(self._numbers.get(prefix, {}), default=0)
+
+    # ------------------------------------------------------------------
+    # Additions and removals
+    # ------------------------------------------------------------------
+
+    def add_brep(self, brep: rhino3dm.Brep, attributes: rhino3dm.ObjectAttributes) -> uuid.UUID:
+        return self._added(self.model.Objects.AddBrep(brep, attributes), attributes)
+
+    def add_curve(self, curve: rhino3dm.Curve, attributes: rhino3dm.ObjectAttributes) -> uuid.UUID:
+        return self._added(self.model.Objects.AddCurve(curve, attributes), attributes)
+
+    def add_point(self, point: rhino3dm.Point3d, attributes: rhino3dm.ObjectAttributes) -> uuid.UUID:
+        return self._added(self.model.Objects.AddPoint(point, attributes), attributes)
+
+    def remove(self, objects: list[IndexedObject]) -> int:
+        """Delete objects from the model and the index.
+
+        Returns:
+            Number of objects actually removed from the model.
+        """
+        if not objects:
+            return 0
+        by_name = self._table()
+        count_before = len(self.model.Objects)
+        for obj in objects:
+            self.model.Objects.Delete(obj.id)
+            by_name[obj.name].remove(obj)
+            if not by_name[obj.name]:
+                del by_name[obj.name]
+            self._count_number(obj.name, -1)
+
+        removed = count_before - len(self.model.Objects)
+        if removed != len(objects):
+            logger.warning(
+                "Expected to delete %d objects but removed %d",
+                len(objects), removed,
+            )
+        return removed
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _table(self) -> dict[str, list[IndexedObject]]:
+        if self._by_name is None:
+            self._by_name = {}
+            for obj in self.model.Objects:
+                attributes = obj.Attributes
+                self._record(attributes.Id, attributes.Name, attributes.LayerIndex)
+            logger.debug("Indexed %d model objects", self._next_order)
+        return self._by_name
+
+    def _added(self, object_id: uuid.UUID, attributes: rhino3dm.ObjectAttributes) -> uuid.UUID:
+        # Before the first lookup the table does not exist yet; building it
+        # later picks the new object up from the model
+        if self._by_name is not None:
+            self._record(object_id, attributes.Name, attributes.LayerIndex)
+        return object_id
+
+    def _record(self, object_id: uuid.UUID, name: str, layer_index: int) -> None:
+        obj = IndexedObject(id=object_id, name=name, layer_index=layer_index, order=self._next_order)
+        self._next_order += 1
+        self._by_name.setdefault(name, []).append(obj)
+        self._count_number(name, 1)
+
+    def _count_number(self, name: str, step: int) -> None:
+        if not name or "_" not in name:
+            return
+        parts = name.split("_")
+        try:
+            number = int(parts[1])
+        except ValueError:
+            return
+        counts = self._numbers.setdefault(parts[0] + "_", {})
+        counts[number] = counts.get(number, 0) + step
+        if not counts[number]:
+            del counts[number]
+
+
+def as_model_index(model: rhino3dm.File3dm | ModelIndex) -> ModelIndex:
+    """Return model as a ModelIndex, wrapping a bare model if needed."""
+    if isinstance(model, ModelIndex):
+        return model
+    return ModelIndex(model)
+
+
+def _decode_shape(geom: rhino3dm.GeometryBase) -> ObjectShape:
+    if isinstance(geom, rhino3dm.Brep):
+        locations = [geom.Vertices[i].Location for i in range(len(geom.Vertices))]
+        return ObjectShape("brep", _points([(p.X, p.Y, p.Z) for p in locations]), len(geom.Faces))
+    if isinstance(geom, rhino3dm.Point):
+        loc = geom.Location
+        return ObjectShape("point", _points([(loc.X, loc.Y, loc.Z)]))
+    if isinstance(geom, rhino3dm.LineCurve):
+        start, end = geom.PointAtStart, geom.PointAtEnd
+        return ObjectShape("line_curve", _points([(start.X, start.Y, start.Z), (end.X, end.Y, end.Z)]))
+    if isinstance(geom, rhino3dm.PolylineCurve):
+        points = [geom.Point(i) for i in range(geom.PointCount)]
+        return ObjectShape("polyline_curve", _points([(p.X, p.Y, p.Z) for p in points]))
+    return ObjectShape("other", _points([]))
+
+
+def _points(rows: list[tuple[float, float, float]]) -> np.ndarray:
+    return np.array(rows, dtype=np.float64).reshape(-1, 3)
@@ -16,6 +16,7 @@ from pathlib import Path
 import rhino3dm
 
 from structure_aligner.config import PipelineConfig
+from structure_aligner.transform.model_index import ModelIndex, as_model_index
 
 logger = logging.getLogger(__name__)
 
@@ -32,7 +33,7 @@ class ObjectTransformResult:
 
 
 def remove_dalles(
-    model: rhino3dm.File3dm,
+    model: rhino3dm.File3dm | ModelIndex,
     db_path: Path,
     config: PipelineConfig,
 ) -> tuple[int, int]:
@@ -43,7 +44,7 @@ def remove_dalles(
     coordinate exceeds the roof threshold.
 
     Args:
-        model: The rhino3dm model (modified in place).
+        model: The rhino3dm model (modified in place), or its ModelIndex.
         db_path: Path to the structural database (geometrie_2.db).
         config: Pipeline configuration with roof_z_threshold.
 
@@ -55,30 +56,23 @@ def remove_dalles(
         logger.warning("No DALLE entries found in database %s", db_path)
         return 0, 0
 
-    # Build index: name -> list of (object_index, max_z)
-    to_remove: list[int] = []
+    index = as_model_index(model)
+    to_remove = []
     kept = 0
 
-    for i in range(len(model.Objects)):
-        obj = model.Objects[i]
-        name = obj.Attributes.Name
-        if name not in dalle_names:
-            continue
-
-        geom = obj.Geometry
-        max_z = _get_max_z(geom)
+    for obj in index.named(dalle_names):
+        max_z = index.shape(obj).max_z
 
         if max_z is None:
-            logger.warning("Dalle %s has unrecognized geometry; removing", name)
-            to_remove.append(i)
+            logger.warning("Dalle %s has unrecognized geometry; removing", obj.name)
+            to_remove.append(obj)
         elif max_z > config.roof_z_threshold:
             kept += 1
-            logger.debug("Keeping roof dalle %s (max_z=%.2f)", name, max_z)
+            logger.debug("Keeping roof dalle %s (max_z=%.2f)", obj.name, max_z)
         else:
-            to_remove.append(i)
+            to_remove.append(obj)
 
-    # Remove in reverse order to preserve indices
-    removed = _remove_objects_by_indices(model, to_remove)
+    removed = index.remove(to_remove)
 
     logger.info(
         "Dalle removal: %d removed, %d kept (roof)",
@@ -88,7 +82,7 @@ def remove_dalles(
 
 
 def remove_obsolete_supports(
-    model: rhino3dm.File3dm,
+    model: rhino3dm.File3dm | ModelIndex,
     db_path: Path,
     removed_axis_x: list[float] | None = None,
     tolerance: float = 0.01,
@@ -100,7 +94,7 @@ def remove_obsolete_supports(
     a removed axis line position.
 
     Args:
-        model: The rhino3dm model (modified in place).
+        model: The rhino3dm model (modified in place), or its ModelIndex.
         db_path: Path to the structural database.
         removed_axis_x: List of removed X axis line positions. If None,
             defaults to [-10.830] based on research findings.
@@ -117,35 +111,31 @@ def remove_obsolete_supports(
         logger.warning("No support entries found in database %s", db_path)
         return 0
 
-    to_remove: list[int] = []
+    index = as_model_index(model)
+    to_remove = []
 
-    for i in range(len(model.Objects)):
-        obj = model.Objects[i]
-        name = obj.Attributes.Name
-        if name not in support_names:
+    for obj in index.named(support_names):
+        shape = index.shape(obj)
+        if shape.kind != "point":
             continue
 
-        geom = obj.Geometry
-        if not isinstance(geom, rhino3dm.Point):
-            continue
-
-        x = geom.Location.X
+        x = float(shape.points[0, 0])
         for removed_x in removed_axis_x:
             if abs(x - removed_x) <= tolerance:
-                to_remove.append(i)
+                to_remove.append(obj)
                 logger.debug(
                     "Removing obsolete support %s at X=%.3f",
-                    name, x,
+                    obj.name, x,
                 )
                 break
 
-    removed = _remove_objects_by_indices(model, to_remove)
+    removed = index.remove(to_remove)
     logger.info("Obsolete support removal: %d removed", removed)
     return removed
 
 
 def remove_multiface_voiles(
-    model: rhino3dm.File3dm,
+    model: rhino3dm.File3dm | ModelIndex,
     db_path: Path,
     min_faces: int = 2,
 ) -> list[str]:
@@ -156,7 +146,7 @@ def remove_multiface_voiles(
     (done in Phase 5).
 
     Args:
-        model: The rhino3dm model (modified in place).
+        model: The rhino3dm model (modified in place), or its ModelIndex.
         db_path: Path to the structural database.
         min_faces: Minimum face count to consider as multi-face (default 2).
 
@@ -168,29 +158,24 @@ def remove_multiface_voiles(
         logger.warning("No VOILE entries found in database %s", db_path)
         return []
 
-    to_remove: list[int] = []
+    index = as_model_index(model)
+    to_remove = []
     removed_names: list[str] = []
 
-    for i in range(len(model.Objects)):
-        obj = model.Objects[i]
-        name = obj.Attributes.Name
-        if name not in voile_names:
-            continue
-
-        geom = obj.Geometry
-        if not isinstance(geom, rhino3dm.Brep):
+    for obj in index.named(voile_names):
+        shape = index.shape(obj)
+        if shape.kind != "brep":
             continue
 
-        face_count = len(geom.Faces)
-        if face_count >= min_faces:
-            to_remove.append(i)
-            removed_names.append(name)
+        if shape.face_count >= min_faces:
+            to_remove.append(obj)
+            removed_names.append(obj.name)
             logger.debug(
                 "Removing multi-face voile %s (%d faces)",
-                name, face_count,
+                obj.name, shape.face_count,
             )
 
-    _remove_objects_by_indices(model, to_remove)
+    index.remove(to_remove)
     logger.info(
         "Multi-face voile removal: %d removed (min_faces=%d)",
         len(removed_names), min_faces,
@@ -232,51 +217,3 @@ def _load_support_names(db_path: Path) -> set[str]:
         return set()
     finally:
         conn.close()
-
-
-def _get_max_z(geom: rhino3dm.GeometryBase) -> float | None:
-    """Get the maximum Z coordinate from a geometry object."""
-    if isinstance(geom, rhino3dm.Brep):
-        if len(geom.Vertices) == 0:
-            return None
-        return max(geom.Vertices[i].Location.Z for i in range(len(geom.Vertices)))
-    elif isinstance(geom, rhino3dm.Point):
-        return geom.Location.Z
-    elif isinstance(geom, rhino3dm.LineCurve):
-        return max(geom.PointAtStart.Z, geom.PointAtEnd.Z)
-    elif isinstance(geom, rhino3dm.PolylineCurve):
-        if geom.PointCount == 0:
-            return None
-        return max(geom.Point(i).Z for i in range(geom.PointCount))
-    return None
-
-
-def _remove_objects_by_indices(model: rhino3dm.File3dm, indices: list[int]) -> int:
-    """Remove objects from model by their indices (handles reverse ordering).
-
-    The rhino3dm library uses GUID-based deletion, not index-based.
-
-    Returns:
-        Number of objects actually removed.
-    """
-    if not indices:
-        return 0
-
-    # Collect GUIDs for objects to remove
-    guids = []
-    for i in indices:
-        obj = model.Objects[i]
-        guids.append(obj.Attributes.Id)
-
-    count_before = len(model.Objects)
-    for guid in guids:
-        model.Objects.Delete(guid)
-
-    removed = count_before - len(model.Objects)
-    if removed != len(guids):
-        logger.warning(
-            "Expected to delete %d objects but removed %d",
-            len(guids), removed,
-        )
-
-    return removed
@@ -11,7 +11,9 @@ from collections import defaultdict
 
 import rhino3dm
 
+from structure_aligner.alignment.geometry import AxisLineIndex, as_axis_index
 from structure_aligner.config import AxisLine
+from structure_aligner.transform.model_index import ModelIndex, as_model_index
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +22,7 @@ SUPPORT_Z_LEVELS = (2.12, -4.44)
 
 
 def place_support_points(
-    model: rhino3dm.File3dm,
+    model: rhino3dm.File3dm | ModelIndex,
     axis_lines_x: list[AxisLine],
     axis_lines_y: list[AxisLine],
     support_z_levels: tuple[float, ...] = SUPPORT_Z_LEVELS,
@@ -32,7 +34,7 @@ def place_support_points(
     """Place Appuis at grid intersections where columns exist.
 
     Args:
-        model: The rhino3dm model to add objects to.
+        model: The rhino3dm model to add objects to, or its ModelIndex.
         axis_lines_x: Sorted X axis lines.
         axis_lines_y: Sorted Y axis lines.
         support_z_levels: Floor Z-levels where supports are placed.
@@ -46,8 +48,9 @@ def place_support_points(
         Tuple of (count_added, positions_list) where positions_list
         contains (x, y, z) for each support placed.
     """
+    index = as_model_index(model)
     if start_id is None:
-        start_id = _get_max_appui_id(model) + 1
+        start_id = index.max_id("Appuis_") + 1
 
     if existing_columns is None:
         logger.warning(
@@ -85,9 +88,7 @@ def place_support_points(
                 attr.Name = name
                 attr.LayerIndex = layer_index
 
-                model.Objects.AddPoint(
-                    rhino3dm.Point3d(x, y, z), attr
-                )
+                index.add_point(rhino3dm.Point3d(x, y, z), attr)
                 positions.append((x, y, z))
                 added += 1
 
@@ -99,10 +100,10 @@ def place_support_points(
 
 
 def place_support_points_at_columns(
-    model: rhino3dm.File3dm,
+    model: rhino3dm.File3dm | ModelIndex,
     column_positions: dict[tuple[float, float], bool],
-    axis_lines_x: list[AxisLine],
-    axis_lines_y: list[AxisLine],
+    axis_lines_x: list[AxisLine] | AxisLineIndex,
+    axis_lines_y: list[AxisLine] | AxisLineIndex,
     support_z_levels: tuple[float, ...] = SUPPORT_Z_LEVELS,
     snap_tolerance: float = 0.75,
     layer_index: int = 0,
@@ -115,10 +116,10 @@ def place_support_points_at_columns(
     snap_tolerance. This produces O(C) supports where C = number of columns.
 
     Args:
-        model: The rhino3dm model.
+        model: The rhino3dm model, or its ModelIndex.
         column_positions: Dict of (x, y) -> True for column centers.
-        axis_lines_x: X axis lines.
-        axis_lines_y: Y axis lines.
+        axis_lines_x: X axis lines, or their AxisLineIndex.
+        axis_lines_y: Y axis lines, or their AxisLineIndex.
         support_z_levels: Z-levels for support placement.
         snap_tolerance: Max distance to snap a column to an axis intersection.
         layer_index: Layer index for new objects.
@@ -127,13 +128,12 @@ def place_support_points_at_columns(
     Returns:
         Tuple of (count_added, positions_list).
     """
+    index = as_model_index(model)
     if start_id is None:
-        start_id = _get_max_appui_id(model) + 1
+        start_id = index.max_id("Appuis_") + 1
 
-    # Sort axis positions for binary search
-    import bisect
-    x_positions = sorted(al.position for al in axis_lines_x)
-    y_positions = sorted(al.position for al in axis_lines_y)
+    index_x = as_axis_index(axis_lines_x)
+    index_y = as_axis_index(axis_lines_y)
 
     next_id = start_id
     added = 0
@@ -141,11 +141,13 @@ def place_support_points_at_columns(
     seen: set[tuple[float, float]] = set()
 
     for (cx, cy) in column_positions:
-        # Find nearest X axis line
-        snap_x = _find_nearest_sorted(cx, x_positions, snap_tolerance)
-        snap_y = _find_nearest_sorted(cy, y_positions, snap_tolerance)
-        if snap_x is None or snap_y is None:
+        # Find nearest X and Y axis lines
+        hit_x = index_x.nearest(cx, snap_tolerance)
+        hit_y = index_y.nearest(cy, snap_tolerance)
+        if hit_x is None or hit_y is None:
             continue
+        snap_x = index_x.lines[hit_x[0]].position
+        snap_y = index_y.lines[hit_y[0]].position
 
         key = (round(snap_x, 4), round(snap_y, 4))
         if key in seen:
@@ -158,7 +160,7 @@ def place_support_points_at_columns(
             attr = rhino3dm.ObjectAttributes()
             attr.Name = name
             attr.LayerIndex = layer_index
-            model.Objects.AddPoint(rhino3dm.Point3d(snap_x, snap_y, z), attr)
+            index.add_point(rhino3dm.Point3d(snap_x, snap_y, z), attr)
             positions.append((snap_x, snap_y, z))
             added += 1
 
@@ -169,25 +171,8 @@ def place_support_points_at_columns(
     return added, positions
 
 
-def _find_nearest_sorted(
-    value: float, sorted_positions: list[float], tolerance: float,
-) -> float | None:
-    """Find nearest position in sorted list within tolerance using binary search."""
-    import bisect
-    idx = bisect.bisect_left(sorted_positions, value)
-    best = None
-    best_dist = tolerance + 1
-    for i in (idx - 1, idx):
-        if 0 <= i < len(sorted_positions):
-            d = abs(sorted_positions[i] - value)
-            if d < best_dist:
-                best_dist = d
-                best = sorted_positions[i]
-    return best if best_dist <= tolerance else None
-
-
 def place_line_supports(
-    model: rhino3dm.File3dm,
+    model: rhino3dm.File3dm | ModelIndex,
     axis_lines_x: list[AxisLine],
     edge_y_positions: list[float],
     z_level: float = -4.44,
@@ -198,7 +183,7 @@ def place_line_supports(
     """Place LineCurve supports along building edges.
 
     Args:
-        model: The rhino3dm model to add objects to.
+        model: The rhino3dm model to add objects to, or its ModelIndex.
         axis_lines_x: X axis lines for positioning.
         edge_y_positions: Y positions at building edges.
         z_level: Z position for line supports.
@@ -209,8 +194,9 @@ def place_line_supports(
     Returns:
         Number of line supports added.
     """
+    index = as_model_index(model)
     if start_id is None:
-        start_id = _get_max_appui_id(model) + 1
+        start_id = index.max_id("Appuis_") + 1
 
     next_id = start_id
     added = 0
@@ -227,7 +213,7 @@ def place_line_supports(
             attr = rhino3dm.ObjectAttributes()
             attr.Name = name
             attr.LayerIndex = layer_index
-            model.Objects.AddCurve(line, attr)
+            index.add_curve(line, attr)
             added += 1
 
     logger.info("Line support placement: %d LineCurve supports added", added)
@@ -262,17 +248,3 @@ def _has_nearby_column_indexed(
     by = int(y / bucket_size)
     return (bx, by) in column_index
 
-
-def _get_max_appui_id(model: rhino3dm.File3dm) -> int:
-    """Find the highest Appuis_NNNN id in the model."""
-    max_id = 0
-    for obj in model.Objects:
-        name = obj.Attributes.Name
-        if name and name.startswith("Appuis_"):
-            try:
-                num = int(name.split("_")[1])
-                if num > max_id:
-                    max_id = num
-            except (ValueError, IndexError):
-                pass
-    return max_id
@@ -11,6 +11,8 @@ from dataclasses import dataclass
 
 import rhino3dm
 
+from structure_aligner.transform.model_index import ModelIndex, as_model_index
+
 logger = logging.getLogger(__name__)
 
 
@@ -35,25 +37,21 @@ class VoileExtent:
 
 
 def extract_voile_extents(
-    model: rhino3dm.File3dm,
+    model: rhino3dm.File3dm | ModelIndex,
     voile_names: list[str],
 ) -> list[VoileExtent]:
     """Extract geometric extents from voile objects before removal.
 
     Call this BEFORE removing voiles to capture their geometry.
     """
+    index = as_model_index(model)
     extents: list[VoileExtent] = []
-    for obj in model.Objects:
-        name = obj.Attributes.Name
-        if name not in voile_names:
-            continue
-        geom = obj.Geometry
-        if not isinstance(geom, rhino3dm.Brep) or len(geom.Vertices) == 0:
+    for obj in index.named(voile_names):
+        shape = index.shape(obj)
+        if shape.kind != "brep" or len(shape.points) == 0:
             continue
 
-        xs = [geom.Vertices[i].Location.X for i in range(len(geom.Vertices))]
-        ys = [geom.Vertices[i].Location.Y for i in range(len(geom.Vertices))]
-        zs = [geom.Vertices[i].Location.Z for i in range(len(geom.Vertices))]
+        xs, ys, zs = (shape.points[:, k].tolist() for k in range(3))
 
         x_range = max(xs) - min(xs)
         y_range = max(ys) - min(ys)
@@ -73,7 +71,7 @@ def extract_voile_extents(
             thickness = x_range
 
         extents.append(VoileExtent(
-            name=name,
+            name=obj.name,
             orientation=orientation,
             coord_min=coord_min,
             coord_max=coord_max,
@@ -81,13 +79,13 @@ def extract_voile_extents(
             z_min=min(zs),
             z_max=max(zs),
             thickness=max(thickness, 0.15),  # minimum 15cm
-            layer_index=obj.Attributes.LayerIndex,
+            layer_index=obj.layer_index,
         ))
     return extents
 
 
 def simplify_voiles(
-    model: rhino3dm.File3dm,
+    model: rhino3dm.File3dm | ModelIndex,
     voile_extents: list[VoileExtent],
     floor_z_levels: tuple[float, ...],
     layer_index: int = 0,
@@ -98,7 +96,7 @@ def simplify_voiles(
     segments and creates a single-face planar Brep for each.
 
     Args:
-        model: The rhino3dm model to add objects to.
+        model: The rhino3dm model to add objects to, or its ModelIndex.
         voile_extents: Geometric extents from removed voiles.
         floor_z_levels: Known floor Z-levels for splitting.
         layer_index: Default layer index for new objects.
@@ -109,6 +107,7 @@ def simplify_voiles(
     if not voile_extents:
         return 0
 
+    index = as_model_index(model)
     sorted_z = sorted(floor_z_levels)
     added = 0
 
@@ -137,7 +136,7 @@ def simplify_voiles(
             attr = rhino3dm.ObjectAttributes()
             attr.Name = f"{extent.name}{suffix}"
             attr.LayerIndex = extent.layer_index if extent.layer_index > 0 else layer_index
-            model.Objects.AddBrep(brep, attr)
+            index.add_brep(brep, attr)
             added += 1
 
     logger.info("Voile simplification: %d segments added", added)
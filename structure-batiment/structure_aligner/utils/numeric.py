@@ -0,0 +1,107 @@
+"""Array helpers that reproduce Python's scalar float semantics exactly."""
+
+import numpy as np
+
+# Largest ndigits for which 10**ndigits is an exact double
+_MAX_EXACT_NDIGITS = 22
+
+
+def round_like_python(values: np.ndarray, ndigits: int) -> np.ndarray:
+    """Element-wise ``round(v, ndigits)`` with Python's exact results.
+
+    np.round scales, rounds and unscales, so it can disagree with Python's
+    correctly rounded ``round()`` when the scaled value lands within an ulp
+    of a half-integer. Those rows (and values too large to scale exactly)
+    are re-rounded with the builtin; everything else is provably identical.
+
+    Args:
+        values: float64 array.
+        ndigits: Decimal digits, as for round().
+
+    Returns:
+        New float64 array, bit-identical to [round(v, ndigits) for v in values].
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not 0 <= ndigits <= _MAX_EXACT_NDIGITS:
+        return np.array([round(v, ndigits) for v in values.tolist()], dtype=np.float64)
+
+    scale = float(10 ** ndigits)
+    with np.errstate(over="ignore", invalid="ignore"):
+        scaled = values * scale
+        result = np.rint(scaled) / scale
+        frac = scaled - np.floor(scaled)
+        ambiguous = ~(np.abs(frac - 0.5) > 2 * np.abs(np.spacing(scaled)))
+        ambiguous |= ~(np.abs(scaled) < 2.0 ** 52)
+    for i in np.flatnonzero(ambiguous).tolist():
+        result[i] = round(float(values[i]), ndigits)
+    return result
+
+
+# CPython 3.12+ sums floats with Neumaier compensation; earlier versions
+# add them one by one.
+_SUM_IS_COMPENSATED = sum([1.0, 1e100, 1.0, -1e100]) == 2.0
+
+# Segments longer than this are summed with the builtin directly
+_MAX_VECTOR_SEGMENT = 256
+
+
+def segment_sums_like_python(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Builtin ``sum()`` of each segment values[starts[i]:starts[i + 1]].
+
+    np.add.reduceat may add in a different order (or pairwise), which
+    changes the last bits. Here the additions run left to right within
+    each segment, vectorized across segments, and follow the builtin's
+    algorithm for the running interpreter.
+
+    Args:
+        values: float64 array.
+        starts: Increasing segment start offsets; segments are non-empty
+            and the last one runs to the end of values.
+
+    Returns:
+        float64 array with one sum per segment.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    starts = np.asarray(starts, dtype=np.int64)
+    lengths = np.diff(np.append(starts, len(values)))
+    out = np.empty(len(starts), dtype=np.float64)
+    if len(starts) == 0:
+        return out
+
+    # Longest first, so the segments still being added to form a prefix
+    by_length = np.argsort(-lengths, kind="stable")
+    seg_starts = starts[by_length]
+    seg_lengths = lengths[by_length]
+    neg_lengths = -seg_lengths
+
+    total = 0.0 + values[seg_starts]   # sum() starts from int 0
+    comp = np.zeros(len(seg_starts))
+    for k in range(1, min(int(seg_lengths[0]), _MAX_VECTOR_SEGMENT)):
+        m = int(np.searchsorted(neg_lengths, -k, side="left"))  # segments longer than k
+        x = values[seg_starts[:m] + k]
+        if _SUM_IS_COMPENSATED:
+            f = total[:m]
+            t = f + x
+            comp[:m] += np.where(np.abs(f) >= np.abs(x), (f - t) + x, (x - t) + f)
+            total[:m] = t
+        else:
+            total[:m] += x
+    if _SUM_IS_COMPENSATED:
+        total = np.where((comp != 0) & np.isfinite(comp), total + comp, total)
+
+    for i in np.flatnonzero(seg_lengths > _MAX_VECTOR_SEGMENT).tolist():
+        start = int(seg_starts[i])
+        total[i] = sum(values[start:start + int(seg_lengths[i])].tolist())
+
+    out[by_length] = total
+    return out
+
+
+def square_like_python(values: np.ndarray) -> np.ndarray:
+    """Element-wise ``v ** 2`` as Python computes it.
+
+    Python's float power goes through the C library's pow(), which is not
+    always the correctly rounded v * v that np.square returns;
+    np.float_power calls the same pow().
+    """
+    return np.float_power(np.asarray(values, dtype=np.float64), 2.0)
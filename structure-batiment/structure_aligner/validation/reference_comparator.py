@@ -12,7 +12,8 @@ from collections import defaultdict
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
 
-import rhino3dm
+from structure_aligner.etl.extraction_cache import load_vertex_table
+from structure_aligner.etl.extractor import UNNAMED_PREFIX, VertexTable
 
 logger = logging.getLogger(__name__)
 
@@ -93,20 +94,23 @@ def compare_with_reference(
         tolerance=tolerance,
     )
 
-    # Load models
-    out_model = rhino3dm.File3dm.Read(str(output_3dm))
-    if out_model is None:
+    # Load vertex tables. The output is usually a one-off file, so only the
+    # reference goes through the extraction cache.
+    try:
+        out_table = load_vertex_table(output_3dm, use_cache=False)
+    except (FileNotFoundError, RuntimeError):
         result.errors.append(f"Failed to read output 3dm: {output_3dm}")
         return result
 
-    ref_model = rhino3dm.File3dm.Read(str(reference_3dm))
-    if ref_model is None:
+    try:
+        ref_table = load_vertex_table(reference_3dm)
+    except (FileNotFoundError, RuntimeError):
         result.errors.append(f"Failed to read reference 3dm: {reference_3dm}")
         return result
 
     # Index objects by name
-    out_objects = _index_objects_by_name(out_model)
-    ref_objects = _index_objects_by_name(ref_model)
+    out_objects = _index_objects_by_name(out_table)
+    ref_objects = _index_objects_by_name(ref_table)
 
     result.output_object_count = len(out_objects)
     result.reference_object_count = len(ref_objects)
@@ -128,11 +132,8 @@ def compare_with_reference(
     )
 
     for name in sorted(common_names):
-        out_obj = out_objects[name]
-        ref_obj = ref_objects[name]
-
-        out_verts = _extract_vertices(out_obj.Geometry)
-        ref_verts = _extract_vertices(ref_obj.Geometry)
+        out_verts = _object_vertices(out_table, out_objects[name])
+        ref_verts = _object_vertices(ref_table, ref_objects[name])
 
         elem_type = _infer_element_type(name)
         type_stats[elem_type]["objects"] += 1
@@ -222,50 +223,50 @@ def compare_with_reference(
     return result
 
 
-def _index_objects_by_name(
-    model: rhino3dm.File3dm,
-) -> dict[str, rhino3dm.File3dmObject]:
-    """Index model objects by their Name attribute, skipping unnamed."""
-    objects: dict[str, rhino3dm.File3dmObject] = {}
-    for obj in model.Objects:
-        name = obj.Attributes.Name
-        if name:
-            if name in objects:
-                logger.warning("Duplicate object name '%s' — last instance used", name)
-            objects[name] = obj
+def _index_objects_by_name(table: VertexTable) -> dict[str, tuple[int, int]]:
+    """Index named objects by name as (start, stop) row ranges.
+
+    Objects are visited in file order, skipped ones included, so with
+    duplicate names the last instance is used. Named objects with
+    unsupported geometry have no vertices and map to an empty range.
+    """
+    objects: dict[str, tuple[int, int]] = {}
+
+    def add(name: str, span: tuple[int, int]) -> None:
+        if name in objects:
+            logger.warning("Duplicate object name '%s' — last instance used", name)
+        objects[name] = span
+
+    skipped = [
+        (position, name)
+        for name, position in zip(table.skipped_objects, table.skipped_positions.tolist())
+        if not name.startswith(UNNAMED_PREFIX)
+    ]
+    offsets = table.object_offsets.tolist()
+    j = 0
+    for i, code in enumerate(table.object_name_codes.tolist()):
+        while j < len(skipped) and skipped[j][0] <= i:
+            add(skipped[j][1], (0, 0))
+            j += 1
+        add(table.names[code], (offsets[i], offsets[i + 1]))
+    for _, name in skipped[j:]:
+        add(name, (0, 0))
     return objects
 
 
-def _extract_vertices(
-    geom: rhino3dm.GeometryBase,
+def _object_vertices(
+    table: VertexTable, span: tuple[int, int],
 ) -> list[tuple[float, float, float]]:
-    """Extract vertex positions from a geometry object."""
-    verts: list[tuple[float, float, float]] = []
-
-    if isinstance(geom, rhino3dm.Brep):
-        for i in range(len(geom.Vertices)):
-            v = geom.Vertices[i]
-            loc = v.Location
-            verts.append((loc.X, loc.Y, loc.Z))
-    elif isinstance(geom, rhino3dm.PolylineCurve):
-        for i in range(geom.PointCount):
-            p = geom.Point(i)
-            verts.append((p.X, p.Y, p.Z))
-    elif isinstance(geom, rhino3dm.LineCurve):
-        p1 = geom.PointAtStart
-        p2 = geom.PointAtEnd
-        verts.append((p1.X, p1.Y, p1.Z))
-        verts.append((p2.X, p2.Y, p2.Z))
-    elif isinstance(geom, rhino3dm.NurbsCurve):
-        for i in range(len(geom.Points)):
-            cp = geom.Points[i]
-            w = cp.W if cp.W != 0 else 1.0
-            verts.append((cp.X / w, cp.Y / w, cp.Z / w))
-    elif isinstance(geom, rhino3dm.Point):
-        loc = geom.Location
-        verts.append((loc.X, loc.Y, loc.Z))
-
-    return verts
+    """Vertex positions of one object, in vertex_index order.
+
+    Rational NURBS control points are divided by their weight.
+    """
+    start, stop = span
+    x, y, z = table.x[start:stop], table.y[start:stop], table.z[start:stop]
+    if table.w is not None:
+        w = table.w[start:stop]
+        x, y, z = x / w, y / w, z / w
+    return list(zip(x.tolist(), y.tolist(), z.tolist()))
 
 
 def _distance_3d(
@@ -1,2 +1,126 @@
 # Shared pytest fixtures for structure_aligner tests.
-# Currently empty — fixtures are defined per-test-module.
+# Most fixtures are defined per-test-module; the synthetic ETL inputs and the
+# PRD database loaded from them are shared because the real geometrie_2.3dm
+# is not always available.
+
+import sqlite3
+
+import pytest
+import rhino3dm
+
+
+def build_synthetic_3dm(path, extra_beams: int = 0):
+    """Write a small .3dm covering every supported geometry type and category.
+
+    Layout (object order matters for extraction order):
+        Filaire_1   Poteau  LineCurve
+        Filaire_2   Poutre  PolylineCurve     (on a child layer of Poutre)
+        Filaire_3   Poutre  NurbsCurve
+        Coque_1     Voile   Brep (box, 8 vertices)
+        Coque_2     Dalle   Brep (box, 8 vertices)
+        Appui_1     Appuis  Point
+        <unnamed>   Appuis  Point             (skipped)
+        Filaire_99  Poutre  LineCurve         (not in the database)
+        Filaire_100.. extra_beams more Poutre LineCurves
+    """
+    model = rhino3dm.File3dm()
+    layers = {}
+    for name in ("Poteau", "Poutre", "Voile", "Dalle", "Appuis"):
+        layers[name] = model.Layers.AddLayer(name, (0, 0, 0, 255))
+    child = rhino3dm.Layer()
+    child.Name = "Poutre_RDC"
+    child.ParentLayerId = model.Layers[layers["Poutre"]].Id
+    layers["Poutre_RDC"] = model.Layers.Add(child)
+
+    def attr(name, layer):
+        a = rhino3dm.ObjectAttributes()
+        if name:
+            a.Name = name
+        a.LayerIndex = layers[layer]
+        return a
+
+    def box(x0, y0, z0, x1, y1, z1):
+        bbox = rhino3dm.BoundingBox(rhino3dm.Point3d(x0, y0, z0), rhino3dm.Point3d(x1, y1, z1))
+        return rhino3dm.Brep.CreateFromBox(rhino3dm.Box(bbox))
+
+    P = rhino3dm.Point3d
+    model.Objects.AddCurve(rhino3dm.LineCurve(P(1.0, 2.0, 0.0), P(1.0, 2.0, 3.2)), attr("Filaire_1", "Poteau"))
+    model.Objects.AddCurve(
+        rhino3dm.PolylineCurve([P(0.0, 0.0, 3.2), P(2.5, 0.0, 3.2), P(5.001, 0.0, 3.2)]),
+        attr("Filaire_2", "Poutre_RDC"),
+    )
+    model.Objects.AddCurve(
+        rhino3dm.NurbsCurve.Create(False, 1, [P(0.0, 4.0, 6.4), P(5.0, 4.0, 6.4)]),
+        attr("Filaire_3", "Poutre"),
+    )
+    model.Objects.AddBrep(box(0.0, -0.1, 0.0, 5.0, 0.1, 3.2), attr("Coque_1", "Voile"))
+    model.Objects.AddBrep(box(0.0, 0.0, 3.0, 5.0, 4.0, 3.2), attr("Coque_2", "Dalle"))
+    model.Objects.AddPoint(P(1.0, 2.0, -0.5), attr("Appui_1", "Appuis"))
+    model.Objects.AddPoint(P(9.0, 9.0, 9.0), attr(None, "Appuis"))
+    model.Objects.AddCurve(rhino3dm.LineCurve(P(7.0, 0.0, 0.0), P(7.0, 5.0, 0.0)), attr("Filaire_99", "Poutre"))
+    for i in range(extra_beams):
+        x = 10.0 + 0.37 * i
+        model.Objects.AddCurve(
+            rhino3dm.LineCurve(P(x, 0.0, 3.2 * (i % 4)), P(x, 6.0, 3.2 * (i % 4))),
+            attr(f"Filaire_{100 + i}", "Poutre"),
+        )
+    model.Write(str(path), 7)
+    return path
+
+
+def build_synthetic_db(path, extra_beams: int = 0):
+    """Write the structural .db matching build_synthetic_3dm (plus one db-only support)."""
+    conn = sqlite3.connect(str(path))
+    conn.executescript("""
+        CREATE TABLE filaire (id INTEGER PRIMARY KEY, type TEXT, name TEXT);
+        CREATE TABLE shell (id INTEGER PRIMARY KEY, type TEXT, name TEXT);
+        CREATE TABLE support (id INTEGER PRIMARY KEY, name TEXT);
+    """)
+    conn.executemany(
+        "INSERT INTO filaire VALUES (?, ?, ?)",
+        [(1, "POTEAU", "Filaire_1"), (2, "POUTRE", "Filaire_2"), (3, "POUTRE", "Filaire_3")]
+        + [(100 + i, "POUTRE", f"Filaire_{100 + i}") for i in range(extra_beams)],
+    )
+    conn.executemany(
+        "INSERT INTO shell VALUES (?, ?, ?)",
+        [(10, "VOILE", "Coque_1"), (11, "DALLE", "Coque_2")],
+    )
+    conn.executemany(
+        "INSERT INTO support VALUES (?, ?)",
+        [(20, "Appui_1"), (21, "Appui_2")],
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+def build_synthetic_prd_db(path, input_3dm, input_db):
+    """Run the ETL (extract, transform, load) on the synthetic inputs into path."""
+    from structure_aligner.etl.extractor import extract_vertex_table
+    from structure_aligner.etl.loader import load
+    from structure_aligner.etl.transformer import transform
+
+    load(transform(extract_vertex_table(input_3dm), input_db), input_db, path)
+    return path
+
+
+@pytest.fixture
+def synthetic_3dm(tmp_path):
+    return build_synthetic_3dm(tmp_path / "synthetic.3dm")
+
+
+@pytest.fixture
+def synthetic_db(tmp_path):
+    return build_synthetic_db(tmp_path / "synthetic.db")
+
+
+@pytest.fixture
+def synthetic_prd_db(synthetic_3dm, synthetic_db, tmp_path):
+    # Named <db stem>_prd.db so pipeline-v2 finds it next to synthetic_db
+    return build_synthetic_prd_db(tmp_path / "synthetic_prd.db", synthetic_3dm, synthetic_db)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_extraction_cache(tmp_path_factory, monkeypatch):
+    """Keep the on-disk extraction cache out of the user's home directory."""
+    monkeypatch.setenv("STRUCTURE_ALIGNER_CACHE_DIR", str(tmp_path_factory.mktemp("cache")))
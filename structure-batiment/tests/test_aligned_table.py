@@ -0,0 +1,98 @@
+"""Tests for the columnar AlignedVertexTable."""
+
+import math
+import sqlite3
+
+import numpy as np
+import pytest
+
+from structure_aligner.alignment.aligned_table import AlignedVertexTable, as_aligned_table
+from structure_aligner.config import AlignedVertex, AlignmentConfig
+
+
+def _av(vid, axis="X", fil_x="X_001", fil_z=None, x=1.0, disp=0.01):
+    return AlignedVertex(
+        id=vid, element_id=10 + vid, x=x, y=2.0, z=3.0, vertex_index=vid % 4,
+        x_original=x + disp, y_original=2.0, z_original=3.0,
+        aligned_axis=axis, fil_x_id=fil_x, fil_y_id=None, fil_z_id=fil_z,
+        displacement_total=disp,
+    )
+
+
+VERTICES = [
+    _av(1), _av(2, axis="none", fil_x=None, disp=0.0),
+    _av(3, axis="XZ", fil_x="X_002", fil_z="Z_001"), _av(4, fil_x="X_001"),
+]
+
+
+class TestAlignedVertexTable:
+
+    def test_round_trip(self):
+        table = AlignedVertexTable.from_aligned_vertices(VERTICES)
+        assert list(table) == VERTICES
+        assert table.thread_ids == ("X_001", "X_002", "Z_001")
+        assert table.fil_x.tolist() == [0, -1, 1, 0]
+        assert table.axis_code.tolist() == [1, 0, 5, 1]
+        assert table.aligned_count() == 3
+        assert as_aligned_table(table) is table
+
+    def test_unknown_axis_label(self):
+        with pytest.raises(ValueError, match="aligned_axis"):
+            AlignedVertexTable.from_aligned_vertices([_av(1, axis="W")])
+
+    def test_concat_merges_thread_ids(self):
+        a = AlignedVertexTable.from_aligned_vertices(VERTICES[2:])
+        b = AlignedVertexTable.from_aligned_vertices(VERTICES[:2])
+        merged = AlignedVertexTable.concat([a, b])
+        assert list(merged) == VERTICES[2:] + VERTICES[:2]
+        assert len(AlignedVertexTable.concat([])) == 0
+
+    def test_moved_mask_and_take(self):
+        table = AlignedVertexTable.from_aligned_vertices(VERTICES)
+        assert table.moved_mask.tolist() == [True, False, True, True]
+        subset = table.take(np.array([2, 0]))
+        assert list(subset) == [VERTICES[2], VERTICES[0]]
+        assert subset.thread_ids == table.thread_ids
+
+    def test_sqlite_rows(self):
+        rows = list(AlignedVertexTable.from_aligned_vertices(VERTICES).sqlite_rows())
+        assert rows[2] == (1.0, 2.0, 3.0, 1.01, 2.0, 3.0, "XZ", "X_002", None, "Z_001", 0.01, 3)
+
+    def test_none_coordinate_stored_as_null(self):
+        vertex = _av(1, axis="none", fil_x=None)
+        vertex.x = None
+        table = AlignedVertexTable.from_aligned_vertices([vertex])
+        assert math.isnan(table.x[0])
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute("CREATE TABLE t (x REAL)")
+        conn.executemany("INSERT INTO t VALUES (?)", [row[:1] for row in table.sqlite_rows()])
+        assert conn.execute("SELECT x FROM t").fetchone() == (None,)
+
+    def test_validator_accepts_table(self):
+        from structure_aligner.output.validator import validate_alignment
+
+        config = AlignmentConfig(alpha=0.05)
+        from_list = validate_alignment(VERTICES, 4, config)
+        from_table = validate_alignment(AlignedVertexTable.from_aligned_vertices(VERTICES), 4, config)
+        assert from_table == from_list
+        assert from_table.passed
+
+    def test_element_aligner_table_matches_records(self):
+        from structure_aligner.alignment.element_aligner import align_elements, align_elements_table
+        from structure_aligner.config import AxisLine, ElementInfo, PipelineConfig
+        from structure_aligner.db.reader import InputVertex
+
+        rng = np.random.default_rng(0)
+        verts = [
+            InputVertex(id=i, element_id=int(rng.integers(1, 8)), x=float(rng.uniform(0, 5)),
+                        y=float(rng.uniform(0, 5)), z=0.0, vertex_index=i % 4)
+            for i in range(60)
+        ]
+        elements = {e: ElementInfo(id=e, name=f"V{e}", type="voile") for e in range(1, 8)}
+        axis_x = [AxisLine("X", float(p), 3, 10) for p in range(6)]
+        axis_y = [AxisLine("Y", float(p), 3, 10) for p in range(6)]
+        config = PipelineConfig()
+        for engine in ("numpy", "python"):
+            table = align_elements_table(verts, elements, axis_x, axis_y, config, engine=engine)
+            assert list(table) == align_elements(verts, elements, axis_x, axis_y, config, engine="python")
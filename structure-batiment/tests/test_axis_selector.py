@@ -4,7 +4,7 @@ import pytest
 from pathlib import Path
 
 from structure_aligner.config import PipelineConfig, AxisLine
-from structure_aligner.db.reader import InputVertex
+from structure_aligner.db.reader import InputVertex, VertexArrays
 from structure_aligner.analysis.axis_selector import discover_axis_lines
 
 
@@ -195,6 +195,141 @@ class TestSyntheticData:
         assert len(axis_x) == 2
 
 
+class TestVertexArraysInput:
+
+    def test_same_axis_lines_as_vertex_list(self):
+        import random
+
+        config = PipelineConfig(min_floors=3)
+        rng = random.Random(7)
+        vertices = [
+            _make_vertex(i, round(rng.choice([5.0, 10.0, 12.5]) + rng.uniform(-0.01, 0.01), 4),
+                         rng.uniform(0, 30), rng.choice(config.floor_z_levels), i)
+            for i in range(500)
+        ]
+        assert discover_axis_lines(VertexArrays.from_vertices(vertices), config) == \
+            discover_axis_lines(vertices, config)
+
+
+class TestNumpyEngine:
+    """The numpy engine must reproduce the python engine bit for bit."""
+
+    @staticmethod
+    def _both(vertices, config):
+        fast = discover_axis_lines(vertices, config, engine="numpy")
+        slow = discover_axis_lines(vertices, config, engine="python")
+        assert fast == slow
+        for a, b in zip(fast[0] + fast[1], slow[0] + slow[1]):
+            assert repr(a.position) == repr(b.position)
+        return fast
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_random_models(self, seed):
+        import random
+
+        rng = random.Random(seed)
+        config = PipelineConfig(min_floors=rng.choice([1, 2, 3]),
+                                cluster_radius=rng.choice([0.0015, 0.002, 0.01]))
+        grid = [round(rng.uniform(-20, 20), 3) for _ in range(30)]
+        vertices = [
+            _make_vertex(
+                i,
+                rng.choice(grid) + rng.choice([0.0, 0.0005, -0.0005, 0.001, 0.0015, 1e-9]),
+                rng.choice(grid) * rng.choice([1.0, -1e-5, 0.0]),
+                rng.choice(config.floor_z_levels) + rng.choice([0.0, 0.025, -0.05, 0.5]),
+                i,
+            )
+            for i in range(2000)
+        ]
+        self._both(vertices, config)
+
+    def test_no_floor_levels(self):
+        config = PipelineConfig(floor_z_levels=(), min_floors=2)
+        vertices = [_make_vertex(i, 1.0 + (i % 3) * 0.0004, 2.0, 0.04 * i, i) for i in range(20)]
+        self._both(vertices, config)
+
+    def test_equidistant_floor_levels(self):
+        config = PipelineConfig(floor_z_levels=(2.0, 1.0, 2.0, 3.0), min_floors=1)
+        vertices = [_make_vertex(i, 5.0, 5.0, z, i) for i, z in enumerate([1.5, 2.5, 0.5, 3.5])]
+        self._both(vertices, config)
+
+    def test_signed_zero_kept(self):
+        config = PipelineConfig(min_floors=1)
+        z = config.floor_z_levels[0]
+        vertices = [_make_vertex(1, -0.00001, 0.0, z, 0), _make_vertex(2, 0.0, -0.0, z, 1)]
+        axis_x, axis_y = self._both(vertices, config)
+        assert repr(axis_x[0].position) == "-0.0"
+        assert repr(axis_y[0].position) == "0.0"
+
+    def test_empty_input(self):
+        assert discover_axis_lines([], PipelineConfig(), engine="numpy") == ([], [])
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError, match="engine"):
+            discover_axis_lines([], PipelineConfig(), engine="cython")
+
+
+class TestAxisGroupAccumulator:
+    """Chunked accumulation must give the axis lines of one full pass."""
+
+    @pytest.mark.parametrize("floor_z_levels", [None, ()])
+    @pytest.mark.parametrize("chunk", [1, 7, 300])
+    def test_matches_full_pass(self, chunk, floor_z_levels):
+        import random
+
+        from structure_aligner.analysis.axis_selector import AxisGroupAccumulator
+
+        config = PipelineConfig(min_floors=2)
+        if floor_z_levels is not None:
+            config = PipelineConfig(min_floors=2, floor_z_levels=floor_z_levels)
+        rng = random.Random(chunk)
+        levels = PipelineConfig().floor_z_levels
+        grid = [round(rng.uniform(-20, 20), 3) for _ in range(25)]
+        vertices = [
+            _make_vertex(i, rng.choice(grid) + rng.choice([0.0, 0.0005, 0.001]),
+                         rng.choice(grid) * rng.choice([1.0, -1e-5, 0.0]),
+                         rng.choice(levels) + rng.choice([0.0, 0.5]), i)
+            for i in range(600)
+        ]
+        arrays = VertexArrays.from_vertices(vertices)
+        accumulator = AxisGroupAccumulator(config)
+        for start in range(0, len(arrays), chunk):
+            accumulator.add(arrays.take(slice(start, start + chunk)))
+        groups_x, groups_y = accumulator.groups()
+
+        expected = discover_axis_lines(arrays, config)
+        got = (groups_x.axis_lines(config.cluster_radius, config.min_floors),
+               groups_y.axis_lines(config.cluster_radius, config.min_floors))
+        assert got == expected
+        for a, b in zip(got[0] + got[1], expected[0] + expected[1]):
+            assert repr(a.position) == repr(b.position)
+        assert accumulator.vertex_count == 600
+
+    def test_empty(self):
+        from structure_aligner.analysis.axis_selector import AxisGroupAccumulator
+
+        groups_x, _ = AxisGroupAccumulator(PipelineConfig()).groups()
+        assert groups_x.axis_lines(0.002, 1) == []
+
+
+class TestRoundLikePython:
+
+    def test_matches_builtin_round(self):
+        import random
+
+        import numpy as np
+
+        from structure_aligner.utils.numeric import round_like_python
+
+        rng = random.Random(0)
+        values = [rng.uniform(-100, 100) for _ in range(5000)]
+        values += [0.0005, -0.0005, 2.675, -2.675, 0.125, 1e300, -0.0, float("nan")]
+        for ndigits in (0, 1, 3, 4):
+            got = round_like_python(np.array(values), ndigits).tolist()
+            expected = [round(v, ndigits) for v in values]
+            assert [repr(v) for v in got] == [repr(v) for v in expected]
+
+
 class TestRealData:
     """Tests against actual data files (skipped if files not present)."""
 
@@ -0,0 +1,184 @@
+"""Tests for the multi-building batch runner."""
+
+import json
+import os
+import signal
+import sqlite3
+
+import pytest
+
+from structure_aligner import batch
+from structure_aligner.batch import BatchJob, load_manifest, run_batch
+from tests.conftest import build_synthetic_3dm, build_synthetic_db
+
+
+@pytest.fixture
+def buildings(tmp_path):
+    """Two buildings laid out as a project directory."""
+    for i, extra in enumerate((0, 3)):
+        build_synthetic_3dm(tmp_path / f"b{i}.3dm", extra_beams=extra)
+        build_synthetic_db(tmp_path / f"b{i}.db", extra_beams=extra)
+    return tmp_path
+
+
+def _vertex_count(db_path):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute("SELECT COUNT(*) FROM vertices").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestLoadManifest:
+
+    def test_csv(self, buildings):
+        manifest = buildings / "jobs.csv"
+        manifest.write_text("input_3dm,input_db,output,name\nb0.3dm,b0.db,out/b0.db,first\nb1.3dm,b1.db,out/b1.db,\n")
+        jobs = load_manifest(manifest)
+        assert [j.name for j in jobs] == ["first", "b1.db"]
+        assert jobs[0].input_3dm == buildings / "b0.3dm"
+        assert jobs[1].output == buildings / "out" / "b1.db"
+
+    def test_json(self, buildings):
+        manifest = buildings / "jobs.json"
+        manifest.write_text(json.dumps({"jobs": [
+            {"input_3dm": "b0.3dm", "input_db": "b0.db", "output": "b0_prd.db"},
+        ]}))
+        jobs = load_manifest(manifest)
+        assert len(jobs) == 1
+        assert jobs[0].input_db == buildings / "b0.db"
+
+    def test_missing_column(self, buildings):
+        manifest = buildings / "jobs.json"
+        manifest.write_text(json.dumps([{"input_3dm": "b0.3dm", "output": "o.db"}]))
+        with pytest.raises(ValueError, match="input_db"):
+            load_manifest(manifest)
+
+    def test_duplicate_output(self, buildings):
+        manifest = buildings / "jobs.csv"
+        manifest.write_text("input_3dm,input_db,output\nb0.3dm,b0.db,o.db\nb1.3dm,b1.db,o.db\n")
+        with pytest.raises(ValueError):
+            load_manifest(manifest)
+
+    def test_unknown_format(self, buildings):
+        manifest = buildings / "jobs.txt"
+        manifest.write_text("")
+        with pytest.raises(ValueError):
+            load_manifest(manifest)
+
+
+class TestRunBatch:
+
+    def test_etl_jobs(self, buildings):
+        jobs = [
+            BatchJob(buildings / f"b{i}.3dm", buildings / f"b{i}.db", buildings / f"b{i}_prd.db")
+            for i in range(2)
+        ]
+        summary_path = buildings / "summary.json"
+        summary = run_batch(jobs, workers=2, summary_path=summary_path)
+
+        assert (summary.succeeded, summary.failed) == (2, 0)
+        assert [r.attempts for r in summary.jobs] == [1, 1]
+        assert summary.jobs[1].details["vertices"] == 30
+        assert _vertex_count(buildings / "b0_prd.db") == 24
+        assert (buildings / "b0_prd.batch.log").exists()
+
+        data = json.loads(summary_path.read_text())
+        assert data["total_jobs"] == 2
+        assert all(job["elapsed_s"] > 0 for job in data["jobs"])
+
+    def test_failure_is_isolated_and_retried(self, buildings):
+        jobs = [
+            BatchJob(buildings / "missing.3dm", buildings / "b0.db", buildings / "bad.db"),
+            BatchJob(buildings / "b0.3dm", buildings / "b0.db", buildings / "good.db"),
+        ]
+        summary = run_batch(jobs, workers=2, retries=2)
+
+        bad, good = summary.jobs
+        assert bad.status == "failed"
+        assert bad.attempts == 3
+        assert len(bad.attempt_times_s) == 3
+        assert "FileNotFoundError" in bad.error
+        assert good.status == "ok"
+        assert good.attempts == 1
+
+    def test_dead_worker_fails_only_its_job(self, buildings, monkeypatch):
+        # Workers are forked, so they inherit the patched job function
+        run_etl_job = batch._run_etl_job
+
+        def killing_etl_job(job):
+            if job.name == "killer":
+                os.kill(os.getpid(), signal.SIGKILL)
+            return run_etl_job(job)
+
+        monkeypatch.setattr(batch, "_run_etl_job", killing_etl_job)
+        jobs = [
+            BatchJob(buildings / "b0.3dm", buildings / "b0.db", buildings / f"o{i}.db", name=name)
+            for i, name in enumerate(("first", "killer", "third", "fourth"))
+        ]
+        summary = run_batch(jobs, workers=1, retries=0)
+
+        assert [r.status for r in summary.jobs] == ["ok", "failed", "ok", "ok"]
+        assert "worker process died" in summary.jobs[1].error
+        assert [r.attempts for r in summary.jobs] == [1, 1, 1, 1]
+        assert _vertex_count(buildings / "o3.db") == 24
+
+    def test_retry_removes_output_of_failed_attempt(self, buildings, monkeypatch):
+        from structure_aligner.etl import loader
+
+        marker = buildings / "failed_once"
+
+        def validate_fails_once(output_path, result):
+            # Runs after the source copy and the load transaction
+            if not marker.exists():
+                marker.touch()
+                raise RuntimeError("validation crashed")
+            return True
+
+        monkeypatch.setattr(loader, "_validate_output", validate_fails_once)
+        job = BatchJob(buildings / "b0.3dm", buildings / "b0.db", buildings / "out.db")
+        summary = run_batch([job], workers=1, retries=1)
+
+        result = summary.jobs[0]
+        assert result.status == "ok", result.error
+        assert result.attempts == 2
+        assert _vertex_count(buildings / "out.db") == 24
+
+    def test_preexisting_output_not_removed(self, buildings):
+        existing = buildings / "existing.db"
+        existing.write_bytes(b"keep")
+        job = BatchJob(buildings / "b0.3dm", buildings / "b0.db", existing)
+        summary = run_batch([job], workers=1, retries=1)
+
+        assert summary.jobs[0].status == "failed"
+        assert "FileExistsError" in summary.jobs[0].error
+        assert existing.read_bytes() == b"keep"
+
+    def test_invalid_arguments(self, buildings):
+        with pytest.raises(ValueError):
+            run_batch([], mode="align")
+        with pytest.raises(ValueError):
+            run_batch([], workers=0)
+
+
+class TestBatchCli:
+
+    def test_batch_command(self, buildings):
+        from click.testing import CliRunner
+        from structure_aligner.main import cli
+
+        manifest = buildings / "jobs.csv"
+        manifest.write_text("input_3dm,input_db,output\nb0.3dm,b0.db,b0_prd.db\nb1.3dm,b1.db,b1_prd.db\n")
+        result = CliRunner().invoke(cli, ["batch", "--manifest", str(manifest), "--workers", "2"])
+        assert result.exit_code == 0, result.output
+        data = json.loads((buildings / "batch_summary.json").read_text())
+        assert data["succeeded"] == 2
+
+    def test_batch_command_fails_on_failed_job(self, buildings):
+        from click.testing import CliRunner
+        from structure_aligner.main import cli
+
+        manifest = buildings / "jobs.csv"
+        manifest.write_text("input_3dm,input_db,output\nmissing.3dm,b0.db,b0_prd.db\n")
+        result = CliRunner().invoke(cli, ["batch", "--manifest", str(manifest), "--retries", "0"])
+        assert result.exit_code == 1
@@ -0,0 +1,98 @@
+"""Tests for pipeline-v2 step checkpoints."""
+
+import json
+from dataclasses import replace
+
+import numpy as np
+import pytest
+import rhino3dm
+
+from structure_aligner.checkpoint import CheckpointStore
+from structure_aligner.config import PipelineConfig
+from structure_aligner.pipeline_v2 import run_pipeline_v2
+
+CONFIG = PipelineConfig(min_floors=2, floor_z_levels=())
+
+
+def _columns(positions):
+    return lambda: dict.fromkeys(positions, True)
+
+
+class TestCheckpointStore:
+
+    def test_written_without_resume_reused_with_it(self, tmp_path):
+        key = CheckpointStore(tmp_path).key("columns", CONFIG, "digest")
+        first = CheckpointStore(tmp_path)
+        assert first.cached("columns", key, _columns([(1.5, 2.0)])) == {(1.5, 2.0): True}
+        assert first.path("columns").exists()
+        assert first.cached("columns", key, _columns([(9.0, 9.0)])) == {(9.0, 9.0): True}
+
+        resumed = CheckpointStore(tmp_path, resume=True)
+        assert resumed.cached("columns", key, _columns([(9.0, 9.0)])) == {(9.0, 9.0): True}
+        assert resumed.reused == ["columns"]
+
+    def test_stale_key_recomputes(self, tmp_path):
+        store = CheckpointStore(tmp_path, resume=True)
+        store.cached("columns", "old", _columns([(1.0, 1.0)]))
+        assert store.cached("columns", "new", _columns([(2.0, 2.0)])) == {(2.0, 2.0): True}
+        assert store.reused == []
+
+    def test_key_covers_only_fields_the_step_reads(self, tmp_path):
+        store = CheckpointStore(tmp_path)
+        tweaked = replace(CONFIG, roof_z_threshold=10.0)
+        assert store.key("align", CONFIG, "k") == store.key("align", tweaked, "k")
+        assert store.key("align", CONFIG, "k") != store.key("align", replace(CONFIG, max_snap_distance=0.3), "k")
+        assert store.key("axes", CONFIG, "k") != store.key("axes", replace(CONFIG, min_floors=3), "k")
+        assert store.key("axes", CONFIG, "k") != store.key("axes", CONFIG, "other")
+
+    def test_from_step_skips_later_steps(self, tmp_path):
+        CheckpointStore(tmp_path).cached("columns", "k", _columns([(1.0, 1.0)]))
+        store = CheckpointStore(tmp_path, from_step=6)
+        assert store.resume
+        assert store.cached("columns", "k", _columns([(2.0, 2.0)])) == {(2.0, 2.0): True}
+        assert CheckpointStore(tmp_path, from_step=7).cached("columns", "k", _columns([])) == {(2.0, 2.0): True}
+
+    def test_corrupt_entry_discarded(self, tmp_path):
+        store = CheckpointStore(tmp_path, resume=True)
+        store.path("columns").write_bytes(b"not an npz")
+        assert store.cached("columns", "k", _columns([(1.0, 1.0)])) == {(1.0, 1.0): True}
+        assert store.reused == []
+        with np.load(store.path("columns")) as data:
+            assert json.loads(str(data["meta"]))["key"] == "k"
+
+
+def _objects(path):
+    model = rhino3dm.File3dm.Read(str(path))
+    return [
+        (obj.Attributes.Name, str(obj.Geometry.GetBoundingBox().Min), str(obj.Geometry.GetBoundingBox().Max))
+        for obj in model.Objects
+    ]
+
+
+@pytest.mark.usefixtures("synthetic_prd_db")
+class TestPipelineResume:
+
+    def test_roof_threshold_tweak_reuses_every_checkpoint(self, synthetic_3dm, synthetic_db, tmp_path):
+        tweaked = replace(CONFIG, roof_z_threshold=1.0)
+        fresh = run_pipeline_v2(synthetic_3dm, synthetic_db, tmp_path / "fresh", config=tweaked)
+
+        first = run_pipeline_v2(synthetic_3dm, synthetic_db, tmp_path / "out", config=CONFIG)
+        resumed = run_pipeline_v2(synthetic_3dm, synthetic_db, tmp_path / "out", config=tweaked, resume=True)
+
+        assert first.reused_checkpoints == []
+        assert resumed.reused_checkpoints == ["load", "axes", "align", "extract", "columns"]
+        assert resumed.aligned_vertices == fresh.aligned_vertices > 0
+        assert resumed.dalles_removed == fresh.dalles_removed != first.dalles_removed
+        assert _objects(tmp_path / "out" / "aligned_v2.3dm") == _objects(tmp_path / "fresh" / "aligned_v2.3dm")
+
+    def test_snap_change_recomputes_alignment_only(self, synthetic_3dm, synthetic_db, tmp_path):
+        run_pipeline_v2(synthetic_3dm, synthetic_db, tmp_path / "out", config=CONFIG)
+        report = run_pipeline_v2(
+            synthetic_3dm, synthetic_db, tmp_path / "out", config=replace(CONFIG, max_snap_distance=0.3), resume=True,
+        )
+        assert report.reused_checkpoints == ["load", "axes", "extract", "columns"]
+
+    def test_from_step(self, synthetic_3dm, synthetic_db, tmp_path):
+        run_pipeline_v2(synthetic_3dm, synthetic_db, tmp_path / "out", config=CONFIG)
+        report = run_pipeline_v2(synthetic_3dm, synthetic_db, tmp_path / "out", config=CONFIG, from_step=3)
+        assert report.reused_checkpoints == ["load", "axes"]
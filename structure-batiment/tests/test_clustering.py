@@ -1,7 +1,7 @@
 import numpy as np
 import pytest
 from structure_aligner.config import AlignmentConfig
-from structure_aligner.analysis.clustering import cluster_axis
+from structure_aligner.analysis.clustering import cluster_axis, dbscan_labels
 
 
 class TestClusterAxis:
@@ -95,3 +95,58 @@ class TestClusterAxis:
         assert "std" in c
         assert isinstance(c["mean"], float)
         assert isinstance(c["std"], float)
+
+
+class TestSortedGapEngine:
+    """The native engine must reproduce scikit-learn's DBSCAN labels exactly."""
+
+    @pytest.mark.parametrize("seed", range(6))
+    def test_random_values_match_dbscan(self, seed):
+        rng = np.random.default_rng(seed)
+        grid = np.round(rng.uniform(-50, 50, 25), 2)
+        for n in (5, 11, 12, 40, 400):
+            # Offsets in whole centimeters put many pairs exactly eps apart
+            values = rng.choice(grid, n) + rng.choice([0.0, 0.01, 0.03, 0.05, 0.06, 0.1], n)
+            for eps in (0.01, 0.05):
+                for min_samples in (1, 3, 5):
+                    assert np.array_equal(
+                        dbscan_labels(values, eps, min_samples, "sorted_gap"),
+                        dbscan_labels(values, eps, min_samples, "dbscan"),
+                    )
+
+    def test_pairs_exactly_eps_apart_in_tiny_input(self):
+        values = np.array([0.0, 0.05, 0.10, 3.0, 3.05])
+        labels = dbscan_labels(values, 0.05, 2, "sorted_gap")
+        assert labels.tolist() == [0, 0, 0, -1, -1]
+        assert np.array_equal(labels, dbscan_labels(values, 0.05, 2, "dbscan"))
+
+    def test_border_point_joins_first_discovered_cluster(self):
+        # 0.43 is a border point of both clusters; the right-hand cluster has
+        # the lower core index, so DBSCAN discovers it (label 0) first. The
+        # noise values keep the input large enough for the native engine.
+        values = np.array([0.52, 0.54, 0.56, 0.58, 0.43, 0.28, 0.3, 0.32, 0.34, 5.0, 6.0, 7.0])
+        labels = dbscan_labels(values, 0.1, 4, "sorted_gap")
+        assert labels.tolist() == [0, 0, 0, 0, 0, 1, 1, 1, 1, -1, -1, -1]
+        assert np.array_equal(labels, dbscan_labels(values, 0.1, 4, "dbscan"))
+
+    def test_cluster_axis_same_for_both_engines(self):
+        rng = np.random.default_rng(0)
+        values = rng.choice(np.arange(0.0, 30.0, 0.6), 2000) + rng.normal(0, 0.02, 2000)
+        results = [
+            cluster_axis(values, AlignmentConfig(cluster_engine=engine)) for engine in ("sorted_gap", "dbscan")
+        ]
+        assert len(results[0]) == len(results[1]) > 0
+        for a, b in zip(*results):
+            assert np.array_equal(a["indices"], b["indices"])
+            assert (a["mean"], a["std"]) == (b["mean"], b["std"])
+
+    def test_empty_input(self):
+        assert cluster_axis(np.array([]), AlignmentConfig()) == []
+
+    def test_invalid_input(self):
+        with pytest.raises(ValueError, match="engine"):
+            cluster_axis(np.array([1.0]), AlignmentConfig(cluster_engine="hdbscan"))
+        with pytest.raises(ValueError, match="eps"):
+            dbscan_labels(np.array([1.0]), 0.0, 3)
+        with pytest.raises(ValueError, match="NaN"):
+            dbscan_labels(np.array([1.0, np.nan]), 0.05, 3)
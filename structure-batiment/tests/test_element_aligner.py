@@ -440,6 +440,125 @@ class TestAlignElementsMultipleElements:
         assert r2.y == 15.0
 
 
+class TestNumpyEngine:
+    """The numpy engine must reproduce the python engine exactly."""
+
+    @staticmethod
+    def _both(verts, elements, axis_x, axis_y, config):
+        fast = align_elements(verts, elements, axis_x, axis_y, config, engine="numpy")
+        slow = align_elements(verts, elements, axis_x, axis_y, config, engine="python")
+        assert fast == slow
+        for a, b in zip(fast, slow):
+            assert (repr(a.x), repr(a.y), repr(a.displacement_total)) == \
+                (repr(b.x), repr(b.y), repr(b.displacement_total))
+        return fast
+
+    @pytest.mark.parametrize("seed", range(6))
+    def test_random_models(self, seed):
+        import random
+
+        rng = random.Random(seed)
+        config = _make_config(
+            cluster_radius=rng.choice([0.002, 0.01]),
+            max_snap_distance=rng.choice([0.1, 0.75]),
+            outlier_snap_distance=rng.choice([0.5, 4.0]),
+        )
+        grid = sorted({round(rng.uniform(-10, 10), 3) for _ in range(25)})
+        axis_x = _make_axis_lines("X", grid)
+        axis_y = _make_axis_lines("Y", grid[::2])
+        types = ["poteau", "appui", "voile", "poutre", "dalle", "other"]
+        elements = {e: ElementInfo(id=e, name=f"E{e}", type=rng.choice(types)) for e in range(1, 40)}
+        verts = [
+            InputVertex(
+                id=i, element_id=rng.randint(1, 45),   # some elements unknown
+                x=rng.choice(grid) + rng.choice([0.0, 0.001, -0.002, 0.3, 1.5]),
+                y=rng.uniform(-10, 10), z=rng.uniform(-5, 30), vertex_index=i % 8,
+            )
+            for i in range(400)
+        ]
+        self._both(verts, elements, axis_x, axis_y, config)
+
+    def test_tie_goes_to_lower_axis_line(self):
+        verts = [InputVertex(id=1, element_id=1, x=10.5, y=0.0, z=0.0, vertex_index=0)]
+        elements = {1: ElementInfo(id=1, name="P", type="poteau")}
+        result = self._both(verts, elements, _make_axis_lines("X", [10.0, 11.0]), [], _make_config())
+        assert result[0].x == 10.0
+
+    def test_elements_keep_first_appearance_order(self):
+        verts = [
+            InputVertex(id=1, element_id=9, x=1.0, y=0.0, z=0.0, vertex_index=0),
+            InputVertex(id=2, element_id=3, x=2.0, y=0.0, z=0.0, vertex_index=0),
+            InputVertex(id=3, element_id=9, x=1.5, y=0.0, z=0.0, vertex_index=1),
+        ]
+        result = self._both(verts, {}, _make_axis_lines("X", [1.0]), [], _make_config())
+        assert [av.id for av in result] == [1, 3, 2]
+
+    def test_arrays_result(self):
+        from structure_aligner.alignment.element_aligner import align_elements_arrays
+        from structure_aligner.db.reader import VertexArrays
+
+        verts = [
+            InputVertex(id=1, element_id=100, x=10.03, y=5.02, z=2.12, vertex_index=0),
+            InputVertex(id=2, element_id=200, x=3.0, y=3.0, z=2.12, vertex_index=0),
+        ]
+        elements = {100: ElementInfo(id=100, name="Poteau_1", type="poteau"),
+                    200: ElementInfo(id=200, name="Dalle_1", type="dalle")}
+        result = align_elements_arrays(
+            VertexArrays.from_vertices(verts), elements,
+            _make_axis_lines("X", [10.0]), _make_axis_lines("Y", [5.0]), _make_config(),
+        )
+        assert result.x.tolist() == [10.0, 3.0]
+        assert result.aligned_axis() == ["XY", "none"]
+        assert result.displacement[1] == 0.0
+
+    def test_empty_and_unknown_engine(self):
+        assert align_elements([], {}, [], [], _make_config()) == []
+        with pytest.raises(ValueError, match="engine"):
+            align_elements([], {}, [], [], _make_config(), engine="rust")
+
+
+class TestParallelAlignment:
+    """Sharded multi-process alignment."""
+
+    def test_shards_are_whole_elements_in_order(self):
+        import numpy as np
+        from structure_aligner.alignment.element_aligner import shard_elements
+
+        element_ids = np.array([5, 5, 2, 2, 2, 9, 9, 9, 9, 5, 1, 1])
+        shards = shard_elements(element_ids, 2)
+        assert len(shards) == 2
+        assert np.concatenate(shards).tolist() == [0, 1, 9, 2, 3, 4, 5, 6, 7, 8, 10, 11]
+        assert [set(element_ids[s].tolist()) for s in shards] == [{5, 2}, {9, 1}]
+        # Never more shards than elements
+        assert len(shard_elements(np.array([3, 3, 3]), 4)) == 1
+        assert shard_elements(np.array([], dtype=np.int64), 4) == []
+
+    @pytest.mark.parametrize("engine", ["numpy", "python"])
+    def test_same_result_as_single_process(self, engine):
+        import random
+
+        rng = random.Random(7)
+        grid = sorted({round(rng.uniform(-10, 10), 3) for _ in range(20)})
+        types = ["poteau", "voile", "poutre", "dalle"]
+        elements = {e: ElementInfo(id=e, name=f"E{e}", type=rng.choice(types)) for e in range(1, 30)}
+        verts = [
+            InputVertex(
+                id=i, element_id=rng.randint(1, 32),
+                x=rng.choice(grid) + rng.choice([0.0, 0.002, 0.3]),
+                y=rng.choice(grid) + rng.choice([0.0, -0.004, 1.2]), z=rng.uniform(0, 20),
+                vertex_index=i % 8,
+            )
+            for i in range(300)
+        ]
+        args = (verts, elements, _make_axis_lines("X", grid), _make_axis_lines("Y", grid), _make_config())
+        single = align_elements(*args, engine=engine)
+        assert align_elements(*args, engine=engine, workers=3) == single
+
+    def test_invalid_worker_count(self):
+        with pytest.raises(ValueError, match="workers"):
+            align_elements([], {}, [], [], _make_config(), workers=0)
+
+
 # =========================================================================
 # Integration test with real data (if available)
 # =========================================================================
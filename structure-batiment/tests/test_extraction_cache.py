@@ -0,0 +1,146 @@
+"""Tests for the on-disk extraction cache."""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from structure_aligner.etl import extraction_cache
+from structure_aligner.etl.extraction_cache import (
+    clear_cache,
+    default_cache_dir,
+    file_digest,
+    load_vertex_table,
+)
+from structure_aligner.etl.extractor import EXTRACTOR_VERSION, extract_vertex_table
+from tests.conftest import build_synthetic_3dm
+
+
+def _entries(cache_dir: Path) -> list[Path]:
+    return sorted((cache_dir / "extraction").glob("*.npz"))
+
+
+def _assert_same_table(a, b):
+    assert a.names == b.names
+    assert a.total_objects == b.total_objects
+    assert a.skipped_objects == b.skipped_objects
+    assert a.object_offsets.tolist() == b.object_offsets.tolist()
+    assert a.object_name_codes.tolist() == b.object_name_codes.tolist()
+    assert list(a.iter_raw_vertices()) == list(b.iter_raw_vertices())
+
+
+class TestLoadVertexTable:
+
+    def test_miss_writes_entry(self, synthetic_3dm, tmp_path):
+        cache_dir = tmp_path / "cache"
+        table = load_vertex_table(synthetic_3dm, cache_dir=cache_dir)
+        _assert_same_table(table, extract_vertex_table(synthetic_3dm))
+        entries = _entries(cache_dir)
+        assert [e.name for e in entries] == [f"{file_digest(synthetic_3dm)}-v{EXTRACTOR_VERSION}.npz"]
+
+    def test_hit_skips_extraction(self, synthetic_3dm, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        first = load_vertex_table(synthetic_3dm, cache_dir=cache_dir)
+        monkeypatch.setattr(extraction_cache, "extract_vertex_table", None)
+        second = load_vertex_table(synthetic_3dm, cache_dir=cache_dir)
+        _assert_same_table(first, second)
+        assert second.x.dtype == first.x.dtype
+        assert second.category_codes.dtype == first.category_codes.dtype
+
+    def test_changed_content_invalidates(self, tmp_path):
+        cache_dir = tmp_path / "cache"
+        path = build_synthetic_3dm(tmp_path / "model.3dm")
+        before = load_vertex_table(path, cache_dir=cache_dir)
+        build_synthetic_3dm(path, extra_beams=3)
+        after = load_vertex_table(path, cache_dir=cache_dir)
+        assert len(after) == len(before) + 6
+        assert len(_entries(cache_dir)) == 2
+
+    def test_touched_file_reuses_entry(self, synthetic_3dm, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        load_vertex_table(synthetic_3dm, cache_dir=cache_dir)
+        stat = synthetic_3dm.stat()
+        os.utime(synthetic_3dm, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        monkeypatch.setattr(extraction_cache, "extract_vertex_table", None)
+        assert len(load_vertex_table(synthetic_3dm, cache_dir=cache_dir)) == 26
+        assert len(_entries(cache_dir)) == 1
+
+    def test_unchanged_file_not_rehashed(self, synthetic_3dm, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        load_vertex_table(synthetic_3dm, cache_dir=cache_dir)
+        monkeypatch.setattr(extraction_cache, "extract_vertex_table", None)
+        monkeypatch.setattr(extraction_cache, "file_digest", None)
+        assert len(load_vertex_table(synthetic_3dm, cache_dir=cache_dir)) == 26
+
+    def test_index_kept_per_path(self, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        first = build_synthetic_3dm(tmp_path / "a.3dm")
+        second = build_synthetic_3dm(tmp_path / "b.3dm", extra_beams=1)
+        load_vertex_table(first, cache_dir=cache_dir)
+        load_vertex_table(second, cache_dir=cache_dir)
+        monkeypatch.setattr(extraction_cache, "extract_vertex_table", None)
+        monkeypatch.setattr(extraction_cache, "file_digest", None)
+        assert len(load_vertex_table(first, cache_dir=cache_dir)) == 26
+        assert len(load_vertex_table(second, cache_dir=cache_dir)) == 28
+
+    def test_weights_round_trip(self, tmp_path):
+        import rhino3dm
+
+        model = rhino3dm.File3dm()
+        attr = rhino3dm.ObjectAttributes()
+        attr.Name = "Filaire_1"
+        model.Objects.AddCurve(rhino3dm.Circle(rhino3dm.Point3d(0, 0, 0), 2.0).ToNurbsCurve(), attr)
+        path = tmp_path / "rational.3dm"
+        model.Write(str(path), version=7)
+        cache_dir = tmp_path / "cache"
+        first = load_vertex_table(path, cache_dir=cache_dir)
+        second = load_vertex_table(path, cache_dir=cache_dir)
+        assert second.w.tolist() == first.w.tolist()
+
+    def test_extractor_version_invalidates(self, synthetic_3dm, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        load_vertex_table(synthetic_3dm, cache_dir=cache_dir)
+        monkeypatch.setattr(extraction_cache, "EXTRACTOR_VERSION", EXTRACTOR_VERSION + 1)
+        load_vertex_table(synthetic_3dm, cache_dir=cache_dir)
+        assert len(_entries(cache_dir)) == 2
+
+    def test_corrupt_entry_is_replaced(self, synthetic_3dm, tmp_path):
+        cache_dir = tmp_path / "cache"
+        load_vertex_table(synthetic_3dm, cache_dir=cache_dir)
+        entry = _entries(cache_dir)[0]
+        entry.write_bytes(b"not a zip file")
+        table = load_vertex_table(synthetic_3dm, cache_dir=cache_dir)
+        _assert_same_table(table, extract_vertex_table(synthetic_3dm))
+        assert entry.stat().st_size > 100
+
+    def test_use_cache_false(self, synthetic_3dm, tmp_path):
+        cache_dir = tmp_path / "cache"
+        load_vertex_table(synthetic_3dm, cache_dir=cache_dir, use_cache=False)
+        assert not (cache_dir / "extraction").exists()
+
+    def test_disabled_by_environment(self, synthetic_3dm, tmp_path, monkeypatch):
+        cache_dir = tmp_path / "cache"
+        monkeypatch.setenv("STRUCTURE_ALIGNER_NO_CACHE", "1")
+        load_vertex_table(synthetic_3dm, cache_dir=cache_dir)
+        assert not (cache_dir / "extraction").exists()
+
+    def test_file_not_found(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_vertex_table(tmp_path / "missing.3dm")
+
+
+class TestCacheDir:
+
+    def test_default_from_environment(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("STRUCTURE_ALIGNER_CACHE_DIR", str(tmp_path))
+        assert default_cache_dir() == tmp_path
+
+    def test_default_home(self, monkeypatch):
+        monkeypatch.delenv("STRUCTURE_ALIGNER_CACHE_DIR")
+        assert default_cache_dir() == Path.home() / ".cache" / "structure_aligner"
+
+    def test_clear_cache(self, synthetic_3dm, tmp_path):
+        cache_dir = tmp_path / "cache"
+        load_vertex_table(synthetic_3dm, cache_dir=cache_dir)
+        assert clear_cache(cache_dir) == 2  # entry + index
+        assert _entries(cache_dir) == []
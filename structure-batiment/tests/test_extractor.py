@@ -1,6 +1,17 @@
 from pathlib import Path
+import numpy as np
 import pytest
-from structure_aligner.etl.extractor import extract_vertices
+import rhino3dm
+from structure_aligner.etl.extractor import (
+    GEOMETRY_TYPES,
+    VertexTable,
+    _extract_shard,
+    extract_vertex_table,
+    extract_vertices,
+    iter_vertices,
+    merge_vertex_tables,
+)
+from tests.conftest import build_synthetic_3dm
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 DM_FILE = DATA_DIR / "geometrie_2.3dm"
@@ -68,3 +79,157 @@ class TestExtractor:
         assert types["polyline_curve"] > 0
         assert types["nurbs_curve"] > 0
         assert types["point"] > 0
+
+
+class TestVertexTable:
+
+    def test_matches_list_extraction(self, synthetic_3dm):
+        table = extract_vertex_table(synthetic_3dm)
+        listed = extract_vertices(synthetic_3dm)
+        assert list(table.iter_raw_vertices()) == listed.vertices
+        assert table.total_objects == listed.total_objects
+        assert table.total_vertices == listed.total_vertices
+        assert table.skipped_objects == listed.skipped_objects
+
+    def test_column_dtypes(self, synthetic_3dm):
+        table = extract_vertex_table(synthetic_3dm)
+        assert table.x.dtype == np.float64
+        assert table.vertex_index.dtype == np.int32
+        assert table.name_codes.dtype == np.int32
+        assert table.category_codes.dtype == np.int8
+        assert table.geometry_type_codes.dtype == np.int8
+
+    def test_names_are_dictionary_encoded(self, synthetic_3dm):
+        table = extract_vertex_table(synthetic_3dm)
+        assert table.names == [
+            "Filaire_1", "Filaire_2", "Filaire_3", "Coque_1", "Coque_2", "Appui_1", "Filaire_99",
+        ]
+        assert table.element_name_array()[:3].tolist() == ["Filaire_1", "Filaire_1", "Filaire_2"]
+
+    def test_object_offsets(self, synthetic_3dm):
+        table = extract_vertex_table(synthetic_3dm)
+        assert table.object_offsets.tolist() == [0, 2, 5, 7, 15, 23, 24, 26]
+        assert table.object_name_codes.tolist() == list(range(7))
+        counts = np.diff(table.object_offsets)
+        assert counts.sum() == len(table)
+
+    def test_decoded_categories(self, synthetic_3dm):
+        table = extract_vertex_table(synthetic_3dm)
+        assert set(table.category_array().tolist()) == {"poteau", "poutre", "voile", "dalle", "appui"}
+        assert set(table.geometry_type_array().tolist()) == set(GEOMETRY_TYPES)
+
+    def test_round_trip_through_extraction_result(self, synthetic_3dm):
+        listed = extract_vertices(synthetic_3dm)
+        table = VertexTable.from_extraction(listed)
+        assert table.to_extraction_result() == listed
+        assert table.object_offsets.tolist() == extract_vertex_table(synthetic_3dm).object_offsets.tolist()
+
+    def test_smaller_than_raw_vertices(self, synthetic_3dm):
+        table = extract_vertex_table(synthetic_3dm)
+        # 3 x float64 + int32 + int32 + 2 x int8 = 34 bytes per vertex,
+        # plus an int64 offset and an int32 name code per object and an
+        # int64 position per skipped object
+        assert table.nbytes <= (
+            34 * len(table) + 12 * len(table.object_offsets) + 8 * len(table.skipped_objects)
+        )
+
+    def test_rational_nurbs_weights(self, synthetic_3dm, tmp_path):
+        assert extract_vertex_table(synthetic_3dm).w is None
+
+        model = rhino3dm.File3dm()
+        attr = rhino3dm.ObjectAttributes()
+        attr.Name = "Filaire_1"
+        model.Objects.AddCurve(rhino3dm.Circle(rhino3dm.Point3d(0, 0, 0), 2.0).ToNurbsCurve(), attr)
+        model.Objects.AddPoint(rhino3dm.Point3d(5, 5, 5), attr)
+        path = tmp_path / "rational.3dm"
+        model.Write(str(path), version=7)
+
+        table = extract_vertex_table(path)
+        assert table.w is not None and len(table.w) == len(table) == 10
+        assert table.w[-1] == 1.0
+        # Coordinates stay homogeneous; x / w is the Euclidean position
+        assert table.x[1] == pytest.approx(2.0 ** 0.5)
+        assert table.x[1] / table.w[1] == pytest.approx(2.0)
+        assert extract_vertex_table(path, workers=2).w.tolist() == table.w.tolist()
+
+    def test_empty_table(self):
+        table = VertexTable.empty()
+        assert len(table) == 0
+        assert table.to_extraction_result().vertices == []
+
+    def test_file_not_found(self):
+        with pytest.raises(FileNotFoundError):
+            extract_vertex_table(Path("/nonexistent/file.3dm"))
+
+
+class TestShardedExtraction:
+
+    @pytest.fixture
+    def model_path(self, tmp_path):
+        return build_synthetic_3dm(tmp_path / "sharded.3dm", extra_beams=25)
+
+    @pytest.mark.parametrize("workers", [2, 3, 7])
+    def test_matches_serial_table(self, model_path, workers):
+        serial = extract_vertex_table(model_path)
+        sharded = extract_vertex_table(model_path, workers=workers)
+        assert sharded.names == serial.names
+        assert sharded.object_offsets.tolist() == serial.object_offsets.tolist()
+        assert list(sharded.iter_raw_vertices()) == list(serial.iter_raw_vertices())
+        assert sharded.total_objects == serial.total_objects
+        assert sharded.skipped_objects == serial.skipped_objects
+        assert sharded.skipped_positions.tolist() == serial.skipped_positions.tolist() == [6]
+
+    def test_matches_serial_extraction_result(self, model_path):
+        assert extract_vertices(model_path, workers=2) == extract_vertices(model_path)
+
+    def test_shards_partition_objects(self, model_path):
+        shards = [_extract_shard(model_path, k, 4) for k in range(4)]
+        assert sum(len(s.object_offsets) - 1 for s in shards) == 32
+        assert {s.total_objects for s in shards} == {33}
+        assert len(merge_vertex_tables(shards)) == len(extract_vertex_table(model_path))
+
+    def test_more_workers_than_objects(self, synthetic_3dm):
+        sharded = extract_vertex_table(synthetic_3dm, workers=12)
+        assert list(sharded.iter_raw_vertices()) == extract_vertices(synthetic_3dm).vertices
+
+    def test_merge_no_shards(self):
+        assert len(merge_vertex_tables([])) == 0
+
+    def test_file_not_found(self):
+        with pytest.raises(FileNotFoundError):
+            extract_vertex_table(Path("/nonexistent/file.3dm"), workers=2)
+
+
+class TestIterVertices:
+
+    @pytest.fixture
+    def model_path(self, tmp_path):
+        return build_synthetic_3dm(tmp_path / "streamed.3dm", extra_beams=25)
+
+    def test_batches_concatenate_to_full_table(self, model_path):
+        batches = list(iter_vertices(model_path, batch_size=10))
+        merged = merge_vertex_tables(batches)
+        full = extract_vertex_table(model_path)
+        assert list(merged.iter_raw_vertices()) == list(full.iter_raw_vertices())
+        assert merged.skipped_objects == full.skipped_objects
+        assert merged.skipped_positions.tolist() == full.skipped_positions.tolist()
+        assert merged.object_offsets.tolist() == full.object_offsets.tolist()
+        # Each batch reports only the objects skipped since the previous one
+        assert [b.skipped_objects for b in batches if b.skipped_objects] == [full.skipped_objects]
+
+    def test_batches_close_at_object_boundaries(self, model_path):
+        batches = list(iter_vertices(model_path, batch_size=10))
+        assert len(batches) > 3
+        for batch in batches[:-1]:
+            largest_object = int(np.diff(batch.object_offsets).max())
+            assert 10 <= len(batch) < 10 + largest_object
+        assert all(b.total_objects == 33 for b in batches)
+
+    def test_single_batch_when_large(self, synthetic_3dm):
+        batches = list(iter_vertices(synthetic_3dm, batch_size=10_000))
+        assert len(batches) == 1
+        assert len(batches[0]) == 26
+
+    def test_invalid_batch_size(self, synthetic_3dm):
+        with pytest.raises(ValueError):
+            next(iter_vertices(synthetic_3dm, batch_size=0))
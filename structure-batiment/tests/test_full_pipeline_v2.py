@@ -222,6 +222,83 @@ class TestCompareWithReferenceSynthetic:
         assert result.type_breakdown["dalle"]["objects"] == 2
         assert result.type_breakdown["voile"]["objects"] == 1
 
+    def test_rational_nurbs_compared_in_euclidean_space(self, tmp_path):
+        """Weighted NURBS control points are divided by their weight."""
+        import rhino3dm
+
+        circle = rhino3dm.Circle(rhino3dm.Point3d(0, 0, 0), 2.0).ToNurbsCurve()
+        points = [
+            rhino3dm.Point3d(p.X / p.W, p.Y / p.W, p.Z / p.W)
+            for p in (circle.Points[i] for i in range(len(circle.Points)))
+        ]
+        attr = rhino3dm.ObjectAttributes()
+        attr.Name = "Filaire_1"
+        out_model = rhino3dm.File3dm()
+        out_model.Objects.AddCurve(circle, attr)
+        ref_model = rhino3dm.File3dm()
+        ref_model.Objects.AddCurve(rhino3dm.PolylineCurve(points), attr)
+
+        out_path = tmp_path / "out.3dm"
+        ref_path = tmp_path / "ref.3dm"
+        out_model.Write(str(out_path), version=7)
+        ref_model.Write(str(ref_path), version=7)
+
+        result = compare_with_reference(out_path, ref_path)
+        assert result.total_vertices_compared == 9
+        assert result.overall_match_rate == 100.0
+
+    @pytest.mark.parametrize("mesh_last", [True, False])
+    def test_duplicate_name_last_instance_used(self, tmp_path, mesh_last):
+        """The last of duplicate names wins, also when it is unsupported geometry."""
+        import rhino3dm
+
+        mesh = rhino3dm.Mesh()
+        for x, y in ((0, 0), (1, 0), (0, 1)):
+            mesh.Vertices.Add(x, y, 0)
+        mesh.Faces.AddFace(0, 1, 2)
+        attr = rhino3dm.ObjectAttributes()
+        attr.Name = "TestPoint_1"
+
+        out_model = rhino3dm.File3dm()
+        if not mesh_last:
+            out_model.Objects.AddMesh(mesh, attr)
+        out_model.Objects.AddPoint(rhino3dm.Point3d(1.0, 2.0, 3.0), attr)
+        if mesh_last:
+            out_model.Objects.AddMesh(mesh, attr)
+        ref_model = rhino3dm.File3dm()
+        ref_model.Objects.AddPoint(rhino3dm.Point3d(1.0, 2.0, 3.0), attr)
+
+        out_path = tmp_path / "out.3dm"
+        ref_path = tmp_path / "ref.3dm"
+        out_model.Write(str(out_path), version=7)
+        ref_model.Write(str(ref_path), version=7)
+
+        result = compare_with_reference(out_path, ref_path)
+        assert result.common_objects == 1
+        assert result.total_vertices_compared == (0 if mesh_last else 1)
+
+    def test_output_not_cached(self, tmp_path):
+        """Only the reference goes through the extraction cache."""
+        import rhino3dm
+
+        from structure_aligner.etl.extraction_cache import default_cache_dir, file_digest
+
+        out_model = rhino3dm.File3dm()
+        ref_model = rhino3dm.File3dm()
+        attr = rhino3dm.ObjectAttributes()
+        attr.Name = "TestPoint_1"
+        out_model.Objects.AddPoint(rhino3dm.Point3d(1.0, 2.0, 3.0), attr)
+        ref_model.Objects.AddPoint(rhino3dm.Point3d(1.0, 2.0, 4.0), attr)
+
+        out_path = tmp_path / "out.3dm"
+        ref_path = tmp_path / "ref.3dm"
+        out_model.Write(str(out_path), version=7)
+        ref_model.Write(str(ref_path), version=7)
+
+        compare_with_reference(out_path, ref_path)
+        entries = [e.name.split("-")[0] for e in (default_cache_dir() / "extraction").glob("*.npz")]
+        assert entries == [file_digest(ref_path)]
+
     def test_include_object_details(self, tmp_path):
         """Object details should be included when requested."""
         import rhino3dm
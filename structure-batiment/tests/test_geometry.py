@@ -1,9 +1,11 @@
 """Tests for structure_aligner.alignment.geometry."""
 import math
+import random
 
+import numpy as np
 import pytest
 
-from structure_aligner.alignment.geometry import euclidean_displacement, find_matching_thread
+from structure_aligner.alignment.geometry import euclidean_displacement, find_matching_thread, match_threads
 from structure_aligner.config import Thread
 
 
@@ -94,3 +96,80 @@ class TestFindMatchingThread:
         thread = _make_thread(10.0, delta=0.001)
         result = find_matching_thread(10.04, [thread], alpha=0.05)
         assert result is thread
+
+
+class TestMatchThreads:
+
+    def test_matches_scalar_scan(self):
+        rng = random.Random(0)
+        for _ in range(50):
+            threads = [_make_thread(round(rng.uniform(0, 2), 2), fil_id=f"X_{i:03d}")
+                       for i in range(rng.randint(1, 12))]
+            coords = [round(rng.uniform(-0.2, 2.2), 3) for _ in range(40)]
+            alpha = rng.choice([0.01, 0.05, 0.1])
+            indexes = match_threads(np.array(coords), threads, alpha)
+            for coord, idx in zip(coords, indexes.tolist()):
+                expected = find_matching_thread(coord, threads, alpha)
+                assert (threads[idx] if idx >= 0 else None) is expected
+
+    def test_tie_goes_to_first_listed_thread(self):
+        threads = [_make_thread(11.0, fil_id="X_001"), _make_thread(10.0, fil_id="X_002")]
+        assert match_threads(np.array([10.5]), threads, alpha=0.5).tolist() == [0]
+        assert match_threads(np.array([10.5]), threads[::-1], alpha=0.5).tolist() == [0]
+
+    def test_duplicate_references_use_first(self):
+        threads = [_make_thread(10.0, fil_id="X_001"), _make_thread(10.0, fil_id="X_002")]
+        assert match_threads(np.array([10.01]), threads, alpha=0.05).tolist() == [0]
+
+    def test_no_threads_or_coords(self):
+        assert match_threads(np.array([1.0, 2.0]), [], alpha=0.05).tolist() == [-1, -1]
+        assert match_threads(np.array([]), [_make_thread(1.0)], alpha=0.05).tolist() == []
+
+
+class TestAxisLineIndex:
+
+    @staticmethod
+    def _index(positions):
+        from structure_aligner.alignment.geometry import AxisLineIndex
+        return AxisLineIndex.from_positions(positions, "X")
+
+    def test_sorted_on_build(self):
+        index = self._index([5.0, -1.0, 2.0])
+        assert index.positions.tolist() == [-1.0, 2.0, 5.0]
+        assert [al.position for al in index.lines] == [-1.0, 2.0, 5.0]
+        assert not index.positions.flags.writeable
+
+    def test_nearest_within_tolerance(self):
+        index = self._index([1.0, 2.0, 5.0])
+        assert index.nearest(1.9, 0.5) == (1, pytest.approx(0.1))
+        assert index.nearest(3.5, 0.5) is None
+        assert index.nearest(-10.0) == (0, 11.0)
+        # Ties go to the lower line
+        assert index.nearest(1.5, 1.0) == (0, 0.5)
+
+    def test_empty_index(self):
+        index = self._index([])
+        assert index.nearest(1.0) is None
+        idx, dist = index.nearest_many([1.0, 2.0])
+        assert idx.tolist() == [-1, -1]
+        assert dist.tolist() == [math.inf, math.inf]
+
+    def test_batched_matches_scalar(self):
+        import random
+
+        rng = random.Random(3)
+        index = self._index(sorted({round(rng.uniform(-5, 5), 2) for _ in range(40)}))
+        coords = [rng.uniform(-7, 7) for _ in range(500)] + [0.5 * (a + b) for a, b in
+                                                             zip(index.positions[:-1], index.positions[1:])]
+        idx, dist = index.nearest_many(coords, 0.05)
+        for coord, i, d in zip(coords, idx.tolist(), dist.tolist()):
+            hit = index.nearest(coord, 0.05)
+            assert (hit[0] if hit else -1) == i
+            assert d == index.nearest(coord)[1]
+
+    def test_find_nearest_axis_line_accepts_index(self):
+        from structure_aligner.alignment.geometry import find_nearest_axis_line
+
+        index = self._index([1.0, 2.0])
+        assert find_nearest_axis_line(1.8, index, 0.5) is index.lines[1]
+        assert find_nearest_axis_line(1.8, list(index.lines), 0.1) is None
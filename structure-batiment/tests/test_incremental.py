@@ -0,0 +1,224 @@
+"""Tests for incremental ETL updates."""
+
+import sqlite3
+
+import pytest
+
+from structure_aligner.etl.extractor import extract_vertex_table
+from structure_aligner.etl.incremental import (
+    fingerprints_from_columns,
+    fingerprints_from_db,
+    read_fingerprints,
+    update,
+)
+from structure_aligner.etl.loader import load
+from structure_aligner.etl.transformer import StreamedVertices, transform
+from tests.conftest import build_synthetic_3dm, build_synthetic_db, build_synthetic_prd_db
+
+VERTEX_QUERY = "SELECT id, element_id, x, y, z, vertex_index FROM vertices ORDER BY id"
+
+
+def _rows(db_path, query=VERTEX_QUERY):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute(query).fetchall()
+    finally:
+        conn.close()
+
+
+def _content(db_path):
+    """Vertex rows without ids, grouped per element in vertex order."""
+    return sorted(
+        _rows(db_path, "SELECT element_id, x, y, z, vertex_index FROM vertices ORDER BY element_id, id")
+    )
+
+
+@pytest.fixture
+def inputs(tmp_path):
+    model = build_synthetic_3dm(tmp_path / "model.3dm", extra_beams=3)
+    db = build_synthetic_db(tmp_path / "source.db", extra_beams=3)
+    return model, db
+
+
+@pytest.fixture
+def prd(inputs, tmp_path):
+    model, db = inputs
+    return build_synthetic_prd_db(tmp_path / "prd.db", model, db)
+
+
+class TestFingerprints:
+
+    def test_load_writes_fingerprints(self, prd):
+        conn = sqlite3.connect(str(prd))
+        fps = read_fingerprints(conn)
+        conn.close()
+        assert len(fps) == 9
+        assert fps[10].nom == "Coque_1"
+        assert fps[10].geometry_type == "brep"
+        assert fps[10].vertex_count == 8
+
+    def test_columns_and_db_agree(self, inputs, prd):
+        model, db = inputs
+        result = transform(extract_vertex_table(model), db)
+        from_columns = fingerprints_from_columns(
+            result.vertices,
+            {e.id: e.nom for e in result.elements},
+            {e.id: e.geometry_type for e in result.elements},
+        )
+        conn = sqlite3.connect(str(prd))
+        from_db = fingerprints_from_db(conn, chunk_size=5)
+        conn.close()
+        assert from_columns == from_db
+
+    def test_missing_table(self, tmp_path):
+        conn = sqlite3.connect(str(tmp_path / "empty.db"))
+        assert read_fingerprints(conn) is None
+        conn.close()
+
+
+class TestUpdate:
+
+    def test_no_changes_touches_nothing(self, inputs, prd):
+        model, db = inputs
+        before = _rows(prd)
+        report = update(transform(extract_vertex_table(model), db), prd)
+        assert report.touched_elements == 0
+        assert report.elements_unchanged == 9
+        assert report.vertices_deleted == report.vertices_inserted == 0
+        assert _rows(prd) == before
+
+    def test_changed_element_only_rewritten(self, inputs, prd):
+        model, db = inputs
+        before = _rows(prd)
+        table = extract_vertex_table(model)
+        coque_code = table.names.index("Coque_1")
+        table.x[table.name_codes == coque_code] += 0.01
+
+        report = update(transform(table, db), prd)
+        assert report.elements_changed == [10]
+        assert report.vertices_deleted == report.vertices_inserted == 8
+
+        after = _rows(prd)
+        untouched = [r for r in before if r[1] != 10]
+        assert [r for r in after if r[1] != 10] == untouched
+        assert sorted(r[2] for r in after if r[1] == 10) == pytest.approx(
+            sorted(r[2] + 0.01 for r in before if r[1] == 10)
+        )
+
+    def test_matches_fresh_load(self, inputs, prd, tmp_path):
+        _, db = inputs
+        # Drop one beam and add back Filaire_99 as a known element
+        new_model = build_synthetic_3dm(tmp_path / "new.3dm", extra_beams=2)
+        conn = sqlite3.connect(str(db))
+        conn.execute("INSERT INTO filaire VALUES (99, 'POUTRE', 'Filaire_99')")
+        conn.commit()
+        conn.close()
+
+        result = transform(extract_vertex_table(new_model), db)
+        report = update(result, prd)
+        assert report.elements_added == [99]
+        assert report.elements_removed == [102]
+        assert report.elements_changed == []
+
+        fresh = tmp_path / "fresh.db"
+        load(transform(extract_vertex_table(new_model), db), db, fresh)
+        assert _content(prd) == _content(fresh)
+        elements_query = "SELECT id, type, nom, geometry_type FROM elements ORDER BY id"
+        assert _rows(prd, elements_query) == _rows(fresh, elements_query)
+
+        conn = sqlite3.connect(str(prd))
+        stored = read_fingerprints(conn)
+        conn.close()
+        conn = sqlite3.connect(str(fresh))
+        assert stored == read_fingerprints(conn)
+        conn.close()
+
+    def test_rebuilds_missing_fingerprints(self, inputs, prd):
+        model, db = inputs
+        conn = sqlite3.connect(str(prd))
+        conn.execute("DROP TABLE element_fingerprints")
+        conn.commit()
+        conn.close()
+
+        report = update(transform(extract_vertex_table(model), db), prd)
+        assert report.fingerprints_rebuilt
+        assert report.touched_elements == 0
+        conn = sqlite3.connect(str(prd))
+        assert len(read_fingerprints(conn)) == 9
+        conn.close()
+
+    def test_writes_report(self, inputs, prd):
+        model, db = inputs
+        update(transform(extract_vertex_table(model), db), prd)
+        assert prd.with_suffix(".etl_update_report.json").exists()
+
+    def test_rejects_stream(self, inputs, prd):
+        from structure_aligner.etl.extractor import iter_vertices
+        model, db = inputs
+        result = transform(iter_vertices(model), db)
+        assert isinstance(result.vertices, StreamedVertices)
+        with pytest.raises(ValueError):
+            update(result, prd)
+
+    def test_missing_database(self, inputs, tmp_path):
+        model, db = inputs
+        with pytest.raises(FileNotFoundError):
+            update(transform(extract_vertex_table(model), db), tmp_path / "missing.db")
+
+
+class TestEtlUpdateCli:
+
+    def test_update_in_place(self, inputs, prd):
+        from click.testing import CliRunner
+        from structure_aligner.main import cli
+
+        model, db = inputs
+        before = _rows(prd)
+        result = CliRunner().invoke(cli, [
+            "etl", "--input-3dm", str(model), "--input-db", str(db), "--update", str(prd),
+        ])
+        assert result.exit_code == 0, result.output
+        assert _rows(prd) == before
+
+    def test_update_to_new_output(self, inputs, prd, tmp_path):
+        from click.testing import CliRunner
+        from structure_aligner.main import cli
+
+        model, db = inputs
+        out = tmp_path / "updated.db"
+        result = CliRunner().invoke(cli, [
+            "etl", "--input-3dm", str(model), "--input-db", str(db),
+            "--update", str(prd), "--output", str(out),
+        ])
+        assert result.exit_code == 0, result.output
+        assert _rows(out) == _rows(prd)
+
+    def test_failed_update_leaves_no_output(self, inputs, prd, tmp_path, monkeypatch):
+        from click.testing import CliRunner
+        from structure_aligner.etl import incremental
+        from structure_aligner.main import cli
+
+        real_update = incremental.update
+
+        def failing_update(result, prd_db):
+            raise RuntimeError("update failed")
+
+        monkeypatch.setattr(incremental, "update", failing_update)
+        model, db = inputs
+        out = tmp_path / "updated.db"
+        args = ["etl", "--input-3dm", str(model), "--input-db", str(db), "--update", str(prd), "--output", str(out)]
+        result = CliRunner().invoke(cli, args)
+        assert result.exit_code != 0
+        assert not out.exists()
+
+        monkeypatch.setattr(incremental, "update", real_update)
+        result = CliRunner().invoke(cli, args)
+        assert result.exit_code == 0, result.output
+
+    def test_output_required_without_update(self, inputs):
+        from click.testing import CliRunner
+        from structure_aligner.main import cli
+
+        model, db = inputs
+        result = CliRunner().invoke(cli, ["etl", "--input-3dm", str(model), "--input-db", str(db)])
+        assert result.exit_code != 0
@@ -0,0 +1,102 @@
+"""Tests for incremental re-alignment under axis-line edits."""
+
+import random
+
+import pytest
+
+from structure_aligner.alignment.element_aligner import align_elements, align_elements_table
+from structure_aligner.alignment.incremental_aligner import IncrementalAligner
+from structure_aligner.analysis.incremental_axes import AxisLineDelta
+from structure_aligner.config import AxisLine, ElementInfo, PipelineConfig
+from structure_aligner.db.reader import InputVertex
+
+
+def _line(axis, position):
+    return AxisLine(axis, position, 3, 10)
+
+
+def _poteau(eid, x, y):
+    return [InputVertex(id=eid * 10 + i, element_id=eid, x=x + dx, y=y, z=0.0, vertex_index=i)
+            for i, dx in enumerate((-0.1, 0.1))]
+
+
+CONFIG = PipelineConfig(max_snap_distance=0.3, outlier_snap_distance=0.5)
+ELEMENTS = {1: ElementInfo(1, "P1", "poteau"), 2: ElementInfo(2, "P2", "poteau"),
+            3: ElementInfo(3, "D3", "dalle")}
+VERTICES = _poteau(1, 1.1, 0.0) + _poteau(2, 6.0, 0.0) + _poteau(3, 1.0, 0.0)
+AXIS_X = [_line("X", 1.0), _line("X", 6.2)]
+
+
+class TestIncrementalAligner:
+
+    def _aligner(self):
+        aligned = align_elements_table(VERTICES, ELEMENTS, AXIS_X, [], CONFIG)
+        return IncrementalAligner(aligned, ELEMENTS, AXIS_X, [], CONFIG)
+
+    def test_moved_line_resnaps_nearby_elements_only(self):
+        inc = self._aligner()
+        result = inc.apply(AxisLineDelta("X", removed=[_line("X", 1.0)], added=[_line("X", 1.2)]))
+        # Element 2 is far from both positions; the dalle is never snapped
+        assert result.resnapped_elements == 1
+        assert result.changed_elements == [1]
+        assert list(result.aligned) == align_elements(
+            VERTICES, ELEMENTS, [_line("X", 1.2), _line("X", 6.2)], [], CONFIG,
+        )
+
+    def test_removed_line_unsnaps(self):
+        inc = self._aligner()
+        result = inc.apply(AxisLineDelta("X", removed=[_line("X", 6.2)]))
+        assert result.changed_elements == [2]
+        assert [av.aligned_axis for av in result.aligned if av.element_id == 2] == ["none", "none"]
+        inc.verify()
+
+    def test_unchanged_position_is_not_a_change(self):
+        inc = self._aligner()
+        line = _line("X", 1.0)
+        result = inc.apply(AxisLineDelta("X", removed=[line], added=[AxisLine("X", 1.0, 4, 12)]))
+        assert result.resnapped_elements == 0
+        assert inc.axis_lines[0][0].floor_count == 4
+
+    def test_invalid_delta_rejected(self):
+        inc = self._aligner()
+        with pytest.raises(ValueError, match="not part of"):
+            inc.apply(AxisLineDelta("X", removed=[_line("X", 3.0)]))
+        with pytest.raises(ValueError, match="axis-line delta"):
+            inc.apply(delta_x=AxisLineDelta("Y", added=[_line("Y", 3.0)]))
+        assert inc.axis_lines == (AXIS_X, [])
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_random_edit_sequence(self, seed):
+        rng = random.Random(seed)
+        config = PipelineConfig(cluster_radius=rng.choice([0.002, 0.05]),
+                                outlier_snap_distance=rng.choice([0.5, 4.0]))
+        grid = sorted({round(rng.uniform(-10, 10), 2) for _ in range(30)})
+        types = ["poteau", "voile", "poutre", "dalle"]
+        elements = {e: ElementInfo(e, f"E{e}", rng.choice(types)) for e in range(1, 40)}
+        vertices = [
+            InputVertex(id=i, element_id=rng.randint(1, 42),
+                        x=rng.choice(grid) + rng.choice([0.0, 0.001, 0.2, 1.1]),
+                        y=rng.uniform(-10, 10), z=0.0, vertex_index=i % 8)
+            for i in range(400)
+        ]
+        axis_x = [_line("X", p) for p in grid[::2]]
+        axis_y = [_line("Y", p) for p in grid[1::3]]
+        inc = IncrementalAligner(
+            align_elements_table(vertices, elements, axis_x, axis_y, config),
+            elements, axis_x, axis_y, config,
+        )
+        for _ in range(6):
+            deltas = []
+            for axis, current in zip("XY", inc.axis_lines):
+                delta = AxisLineDelta(axis)
+                if current and rng.random() < 0.6:
+                    moved = rng.choice(current)
+                    delta.removed.append(moved)
+                    delta.added.append(_line(axis, moved.position + rng.choice([0.001, -0.3])))
+                delta.added.append(_line(axis, round(rng.uniform(-10, 10), 3)))
+                deltas.append(delta)
+            before = inc.aligned.x.copy(), inc.aligned.y.copy()
+            result = inc.apply(*deltas)
+            inc.verify()
+            moved_rows = (result.aligned.x != before[0]) | (result.aligned.y != before[1])
+            assert set(result.aligned.element_id[moved_rows].tolist()) <= set(result.changed_elements)
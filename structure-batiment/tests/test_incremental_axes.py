@@ -0,0 +1,97 @@
+"""Tests for incremental axis-line maintenance."""
+
+import random
+
+import pytest
+
+from structure_aligner.analysis.axis_selector import discover_axis_lines
+from structure_aligner.analysis.incremental_axes import IncrementalAxisDiscovery
+from structure_aligner.config import AxisLine, PipelineConfig
+from structure_aligner.db.reader import InputVertex, VertexArrays
+
+Z = PipelineConfig().floor_z_levels
+
+
+def _v(vid: int, x: float, y: float, z: float) -> InputVertex:
+    return InputVertex(id=vid, element_id=vid, x=x, y=y, z=z, vertex_index=0)
+
+
+class TestIncrementalAxisDiscovery:
+
+    def test_initial_state_matches_full_discovery(self):
+        config = PipelineConfig(min_floors=2)
+        vertices = [_v(i, 1.0 + (i % 5) * 0.001, 2.0, Z[i % 4]) for i in range(40)]
+        inc = IncrementalAxisDiscovery(config, vertices)
+        assert inc.axis_lines == discover_axis_lines(vertices, config)
+        assert inc.axis_lines == IncrementalAxisDiscovery(config, VertexArrays.from_vertices(vertices)).axis_lines
+
+    def test_new_line_reported_in_delta(self):
+        config = PipelineConfig(min_floors=2)
+        inc = IncrementalAxisDiscovery(config, [_v(1, 5.0, 1.0, Z[0]), _v(2, 5.0, 1.0, Z[1])])
+        delta_x, delta_y = inc.apply(added=[_v(3, 8.0, 1.0, Z[0]), _v(4, 8.0, 1.0, Z[2])])
+
+        assert delta_x.removed == []
+        assert delta_x.added == [AxisLine("X", 8.0, 2, 2)]
+        assert delta_y.removed == [AxisLine("Y", 1.0, 2, 2)]
+        assert delta_y.added == [AxisLine("Y", 1.0, 3, 4)]
+        assert [a.position for a in inc.axis_lines[0]] == [5.0, 8.0]
+
+    def test_removing_an_element(self):
+        config = PipelineConfig(min_floors=2)
+        kept = [_v(1, 5.0, 1.0, Z[0]), _v(2, 5.0, 1.0, Z[1])]
+        edited = [_v(3, 8.0, 1.0, Z[0]), _v(4, 8.0, 1.0, Z[2])]
+        inc = IncrementalAxisDiscovery(config, kept + edited)
+        delta_x, _ = inc.apply(removed=edited)
+        assert delta_x.removed == [AxisLine("X", 8.0, 2, 2)]
+        assert inc.axis_lines == discover_axis_lines(kept, config)
+
+    def test_anchor_shift_propagates(self):
+        # Windows [1.0, 1.25] [1.5]; adding 0.75 re-anchors to [0.75, 1.0] [1.25, 1.5]
+        config = PipelineConfig(min_floors=1, cluster_radius=0.25)
+        vertices = [_v(1, 1.0, 0.0, Z[0]), _v(2, 1.25, 0.0, Z[0]), _v(3, 1.25, 0.0, Z[1]),
+                    _v(4, 1.5, 0.0, Z[0])]
+        inc = IncrementalAxisDiscovery(config, vertices, validate=True)
+        assert [(a.position, a.vertex_count) for a in inc.axis_lines[0]] == [(1.25, 3), (1.5, 1)]
+
+        added = [_v(5, 0.75, 0.0, Z[2])]
+        delta_x, _ = inc.apply(added=added)
+        assert [(a.position, a.vertex_count) for a in inc.axis_lines[0]] == [(0.75, 2), (1.25, 3)]
+        # 1.25 keeps the same counts, so only the outer lines change
+        assert [a.position for a in delta_x.removed] == [1.5]
+        assert [a.position for a in delta_x.added] == [0.75]
+        inc.verify(vertices + added)
+
+    @pytest.mark.parametrize("seed", range(4))
+    def test_random_edit_sequence(self, seed):
+        rng = random.Random(seed)
+        config = PipelineConfig(min_floors=rng.choice([1, 2, 3]), cluster_radius=rng.choice([0.002, 0.006]))
+        grid = [round(rng.uniform(0, 2), 3) for _ in range(30)]
+
+        def make(vid):
+            return _v(vid, rng.choice(grid) + rng.choice([0.0, 0.001, 0.002, 0.004]),
+                      rng.choice(grid), rng.choice(Z[:5]) + rng.choice([0.0, 0.03, 0.3]))
+
+        current = {i: make(i) for i in range(200)}
+        inc = IncrementalAxisDiscovery(config, list(current.values()), validate=True)
+        next_id = 1000
+        for _ in range(15):
+            removed = [current.pop(i) for i in rng.sample(sorted(current), rng.randint(0, 10))]
+            added = [make(next_id + k) for k in range(rng.randint(0, 10))]
+            next_id += len(added)
+            current.update((v.id, v) for v in added)
+            inc.apply(added=added, removed=removed)
+            inc.verify(list(current.values()))
+
+    def test_unknown_vertex_removal_rejected(self):
+        config = PipelineConfig(min_floors=1)
+        inc = IncrementalAxisDiscovery(config, [_v(1, 5.0, 1.0, Z[0])])
+        before = inc.axis_lines
+        with pytest.raises(ValueError):
+            inc.apply(removed=[_v(1, 5.0, 1.0, Z[3])])
+        assert inc.axis_lines == before
+
+    def test_verify_detects_divergence(self):
+        vertices = [_v(1, 5.0, 1.0, Z[0])]
+        inc = IncrementalAxisDiscovery(PipelineConfig(min_floors=1), vertices)
+        with pytest.raises(RuntimeError, match="diverged"):
+            inc.verify(vertices + [_v(2, 9.0, 1.0, Z[0])])
@@ -2,7 +2,7 @@ from pathlib import Path
 import json
 import sqlite3
 import pytest
-from structure_aligner.etl.extractor import extract_vertices
+from structure_aligner.etl.extractor import extract_vertex_table, extract_vertices, iter_vertices
 from structure_aligner.etl.transformer import transform
 from structure_aligner.etl.loader import load
 
@@ -130,3 +130,158 @@ class TestLoader:
         assert "idx_vertices_x" in indexes
         assert "idx_vertices_y" in indexes
         assert "idx_vertices_z" in indexes
+
+
+class TestLoadVertexColumns:
+
+    def test_columnar_load_matches_list_load(self, synthetic_3dm, synthetic_db, tmp_path):
+        listed = transform(extract_vertices(synthetic_3dm), synthetic_db)
+        columnar = transform(extract_vertex_table(synthetic_3dm), synthetic_db)
+        out_list = tmp_path / "list.db"
+        out_cols = tmp_path / "cols.db"
+        load(listed, synthetic_db, out_list)
+        report = load(columnar, synthetic_db, out_cols)
+
+        assert report.validation_passed
+        assert report.vertices_inserted == 24
+
+        query = "SELECT id, element_id, x, y, z, vertex_index FROM vertices ORDER BY id"
+        with sqlite3.connect(str(out_list)) as a, sqlite3.connect(str(out_cols)) as b:
+            assert a.execute(query).fetchall() == b.execute(query).fetchall()
+
+        ranges_list = json.loads(out_list.with_suffix(".etl_report.json").read_text())["coordinate_ranges"]
+        ranges_cols = json.loads(report.report_path.read_text())["coordinate_ranges"]
+        assert ranges_cols == ranges_list
+
+
+class TestBulkLoad:
+
+    def test_chunk_size_does_not_change_rows(self, synthetic_3dm, synthetic_db, tmp_path):
+        result = transform(extract_vertex_table(synthetic_3dm), synthetic_db)
+        out_one = tmp_path / "one.db"
+        out_chunked = tmp_path / "chunked.db"
+        load(result, synthetic_db, out_one)
+        report = load(result, synthetic_db, out_chunked, chunk_size=5)
+
+        assert report.validation_passed
+        query = "SELECT id, element_id, x, y, z, vertex_index FROM vertices ORDER BY id"
+        with sqlite3.connect(str(out_one)) as a, sqlite3.connect(str(out_chunked)) as b:
+            assert a.execute(query).fetchall() == b.execute(query).fetchall()
+
+    def test_reports_throughput(self, synthetic_3dm, synthetic_db, tmp_path):
+        result = transform(extract_vertex_table(synthetic_3dm), synthetic_db)
+        report = load(result, synthetic_db, tmp_path / "out.db")
+        assert report.vertices_per_second > 0
+        performance = json.loads(report.report_path.read_text())["performance"]
+        assert performance["vertices_per_second"] > 0
+        assert performance["load_time_s"] >= 0
+
+    def test_output_left_in_wal_mode_with_indexes(self, synthetic_3dm, synthetic_db, tmp_path):
+        result = transform(extract_vertex_table(synthetic_3dm), synthetic_db)
+        out = tmp_path / "out.db"
+        load(result, synthetic_db, out)
+        with sqlite3.connect(str(out)) as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            indexes = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+        assert {"idx_vertices_element_id", "idx_vertices_x", "idx_vertices_y", "idx_vertices_z"} <= indexes
+
+    def test_failure_rolls_back_and_removes_output(self, synthetic_3dm, synthetic_db, tmp_path):
+        result = transform(extract_vertex_table(synthetic_3dm), synthetic_db)
+        result.vertices.element_id[-1] = 999_999  # violates the elements FK
+        out = tmp_path / "out.db"
+        with pytest.raises(sqlite3.IntegrityError):
+            load(result, synthetic_db, out, chunk_size=4)
+        assert not out.exists()
+
+    def test_invalid_chunk_size(self, synthetic_3dm, synthetic_db, tmp_path):
+        result = transform(extract_vertex_table(synthetic_3dm), synthetic_db)
+        with pytest.raises(ValueError):
+            load(result, synthetic_db, tmp_path / "out.db", chunk_size=0)
+
+
+class TestLoadStreamed:
+
+    def test_streamed_load_matches_in_memory_load(self, synthetic_3dm, synthetic_db, tmp_path):
+        in_memory = transform(extract_vertex_table(synthetic_3dm), synthetic_db)
+        streamed = transform(iter_vertices(synthetic_3dm, batch_size=3), synthetic_db)
+        out_mem = tmp_path / "mem.db"
+        out_stream = tmp_path / "stream.db"
+        load(in_memory, synthetic_db, out_mem)
+        report = load(streamed, synthetic_db, out_stream)
+
+        assert report.validation_passed
+        assert report.vertices_inserted == 24
+        assert streamed.matched_count == 6
+
+        with sqlite3.connect(str(out_mem)) as a, sqlite3.connect(str(out_stream)) as b:
+            for query in (
+                "SELECT id, element_id, x, y, z, vertex_index FROM vertices ORDER BY id",
+                "SELECT id, type, nom, geometry_type FROM elements ORDER BY id",
+            ):
+                assert a.execute(query).fetchall() == b.execute(query).fetchall()
+            tables = {r[0] for r in b.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+            assert "vertex_stage" not in tables
+
+        report_mem = json.loads(out_mem.with_suffix(".etl_report.json").read_text())
+        report_stream = json.loads(report.report_path.read_text())
+        assert report_stream["coordinate_ranges"] == report_mem["coordinate_ranges"]
+        assert report_stream["statistics"] == report_mem["statistics"]
+        assert report_stream["template_fingerprint"] == report_mem["template_fingerprint"]
+
+
+class TestEtlCli:
+
+    def test_etl_with_workers(self, synthetic_3dm, synthetic_db, tmp_path):
+        from click.testing import CliRunner
+        from structure_aligner.main import cli
+
+        output = tmp_path / "prd.db"
+        result = CliRunner().invoke(cli, [
+            "etl", "--input-3dm", str(synthetic_3dm), "--input-db", str(synthetic_db),
+            "--output", str(output), "--workers", "2",
+        ])
+        assert result.exit_code == 0, result.output
+        conn = sqlite3.connect(str(output))
+        count = conn.execute("SELECT COUNT(*) FROM vertices").fetchone()[0]
+        conn.close()
+        assert count == 24
+
+    def test_etl_with_pandas_engine(self, synthetic_3dm, synthetic_db, tmp_path):
+        from click.testing import CliRunner
+        from structure_aligner.main import cli
+
+        output = tmp_path / "prd.db"
+        result = CliRunner().invoke(cli, [
+            "etl", "--input-3dm", str(synthetic_3dm), "--input-db", str(synthetic_db),
+            "--output", str(output), "--transform-engine", "pandas",
+        ])
+        assert result.exit_code == 0, result.output
+        conn = sqlite3.connect(str(output))
+        count = conn.execute("SELECT COUNT(*) FROM vertices").fetchone()[0]
+        conn.close()
+        assert count == 24
+
+    def test_etl_with_batch_size(self, synthetic_3dm, synthetic_db, tmp_path):
+        from click.testing import CliRunner
+        from structure_aligner.main import cli
+
+        output = tmp_path / "prd.db"
+        result = CliRunner().invoke(cli, [
+            "etl", "--input-3dm", str(synthetic_3dm), "--input-db", str(synthetic_db),
+            "--output", str(output), "--batch-size", "5",
+        ])
+        assert result.exit_code == 0, result.output
+        conn = sqlite3.connect(str(output))
+        count = conn.execute("SELECT COUNT(*) FROM vertices").fetchone()[0]
+        conn.close()
+        assert count == 24
+
+    def test_batch_size_rejects_workers(self, synthetic_3dm, synthetic_db, tmp_path):
+        from click.testing import CliRunner
+        from structure_aligner.main import cli
+
+        result = CliRunner().invoke(cli, [
+            "etl", "--input-3dm", str(synthetic_3dm), "--input-db", str(synthetic_db),
+            "--output", str(tmp_path / "prd.db"), "--batch-size", "5", "--workers", "2",
+        ])
+        assert result.exit_code != 0
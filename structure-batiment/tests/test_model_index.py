@@ -0,0 +1,98 @@
+"""Tests for the ModelIndex used by the V2 transform stages."""
+
+import rhino3dm
+
+from structure_aligner.transform.model_index import ModelIndex, as_model_index
+
+
+def _attr(name, layer=0):
+    attr = rhino3dm.ObjectAttributes()
+    attr.Name = name
+    attr.LayerIndex = layer
+    return attr
+
+
+def _box(z0, z1):
+    bbox = rhino3dm.BoundingBox(rhino3dm.Point3d(0, 0, z0), rhino3dm.Point3d(1, 2, z1))
+    return rhino3dm.Brep.CreateFromBox(rhino3dm.Box(bbox))
+
+
+def _model():
+    model = rhino3dm.File3dm()
+    for layer_name in ("Defaut", "Voile"):
+        layer = rhino3dm.Layer()
+        layer.Name = layer_name
+        model.Layers.Add(layer)
+    model.Objects.AddBrep(_box(0.0, 3.2), _attr("Coque_7", layer=1))
+    model.Objects.AddPoint(rhino3dm.Point3d(1, 2, -4.44), _attr("Appuis_3"))
+    model.Objects.AddCurve(
+        rhino3dm.LineCurve(rhino3dm.Point3d(0, 0, 0), rhino3dm.Point3d(0, 0, 3)), _attr("Filaire_12"),
+    )
+    model.Objects.AddPoint(rhino3dm.Point3d(5, 5, 5), _attr("Appuis_3"))
+    model.Objects.AddCurve(rhino3dm.PolylineCurve([rhino3dm.Point3d(0, 0, 0), rhino3dm.Point3d(9, 0, 0)]), _attr(""))
+    return model
+
+
+class TestModelIndex:
+
+    def test_named_in_model_order(self):
+        index = ModelIndex(_model())
+        found = index.named(["Filaire_12", "Appuis_3", "Coque_7", "Missing"])
+        assert [obj.name for obj in found] == ["Coque_7", "Appuis_3", "Filaire_12", "Appuis_3"]
+        assert found[0].layer_index == 1
+        assert len(list(index)) == len(index) == 5
+
+    def test_shapes(self):
+        index = ModelIndex(_model())
+        coque, appui, filaire, _ = index.named(["Coque_7", "Appuis_3", "Filaire_12"])
+        brep = index.shape(coque)
+        assert brep.kind == "brep"
+        assert brep.face_count == 6
+        assert brep.points.shape == (8, 3)
+        assert brep.max_z == 3.2
+        assert index.shape(appui).points.tolist() == [[1.0, 2.0, -4.44]]
+        assert index.shape(filaire).kind == "line_curve"
+        assert index.shape(filaire).max_z == 3.0
+        assert index.shape(coque) is brep
+
+    def test_invalidate_after_edit(self):
+        index = ModelIndex(_model())
+        appui = index.named(["Appuis_3"])[0]
+        assert index.shape(appui).max_z == -4.44
+        index.geometry(appui).Location = rhino3dm.Point3d(1, 2, 0.5)
+        index.invalidate(appui)
+        assert index.shape(appui).max_z == 0.5
+
+    def test_max_id_tracks_additions_and_removals(self):
+        index = ModelIndex(_model())
+        assert index.max_id("Appuis_") == 3
+        assert index.max_id("Filaire_") == 12
+        assert index.max_id("Coque_") == 7
+        assert index.max_id("Dalle_") == 0
+
+        index.add_point(rhino3dm.Point3d(0, 0, 0), _attr("Appuis_40"))
+        assert index.max_id("Appuis_") == 40
+        assert [obj.name for obj in index][-1] == "Appuis_40"
+
+        removed = index.remove(index.named(["Appuis_40"]))
+        assert removed == 1
+        assert index.max_id("Appuis_") == 3
+        assert index.named(["Appuis_40"]) == []
+        assert len(index) == 5
+
+    def test_duplicate_names_removed_one_at_a_time(self):
+        index = ModelIndex(_model())
+        first, second = index.named(["Appuis_3"])
+        index.remove([first])
+        assert index.named(["Appuis_3"]) == [second]
+        assert index.max_id("Appuis_") == 3
+        index.remove([second])
+        assert index.max_id("Appuis_") == 0
+
+    def test_additions_before_first_lookup(self):
+        model = _model()
+        index = as_model_index(model)
+        index.add_brep(_box(6.0, 6.2), _attr("Coque_8"))
+        assert index.max_id("Coque_") == 8
+        assert [obj.name for obj in index.named(["Coque_7", "Coque_8"])] == ["Coque_7", "Coque_8"]
+        assert as_model_index(index) is index
@@ -40,6 +40,9 @@ class TestCLIHelp:
         assert "--max-snap-distance" in result.output
         assert "--min-floors" in result.output
         assert "--reference-3dm" in result.output
+        assert "--workers" in result.output
+        assert "--resume" in result.output
+        assert "--from-step" in result.output
         assert "--log-level" in result.output
 
     def test_pipeline_v2_missing_required(self):
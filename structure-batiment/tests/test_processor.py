@@ -1,5 +1,6 @@
 """Tests for structure_aligner.alignment.processor."""
 import math
+import random
 
 import pytest
 
@@ -157,3 +158,26 @@ class TestAlignVertices:
         assert result[0].x_original == 10.03
         assert result[0].y_original == 20.02
         assert result[0].z_original == 30.01
+
+
+class TestAlignEngines:
+
+    def test_numpy_matches_python(self):
+        rng = random.Random(1)
+        config = AlignmentConfig(alpha=0.05)
+        threads = {
+            axis: [_make_thread(round(rng.uniform(0, 10), 2), axis, f"{axis}_{i:03d}") for i in range(15)]
+            for axis in "XYZ"
+        }
+        vertices = [
+            _make_vertex(i, *(round(rng.uniform(0, 10), 4) for _ in range(3)), element_id=i // 4)
+            for i in range(500)
+        ]
+        args = (vertices, threads["X"], threads["Y"], threads["Z"], config)
+        fast = align_vertices(*args, engine="numpy")
+        slow = align_vertices(*args, engine="python")
+        assert [repr(v) for v in fast] == [repr(v) for v in slow]
+
+    def test_unknown_engine_rejected(self):
+        with pytest.raises(ValueError, match="engine"):
+            align_vertices([], [], [], [], AlignmentConfig(), engine="cython")
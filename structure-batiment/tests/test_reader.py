@@ -2,9 +2,18 @@
 import sqlite3
 from pathlib import Path
 
+import numpy as np
 import pytest
 
-from structure_aligner.db.reader import InputVertex, load_vertices
+from structure_aligner.db.reader import (
+    InputVertex,
+    VertexArrays,
+    iter_vertex_chunks,
+    load_elements,
+    load_vertex_arrays,
+    load_vertices,
+    load_vertices_with_elements,
+)
 
 # Path to the real PRD database
 REAL_DB = Path(__file__).resolve().parent.parent / "data" / "geometrie_2_prd.db"
@@ -71,3 +80,109 @@ class TestLoadVerticesErrors:
 
         vertices = load_vertices(db_path)
         assert vertices == []
+
+
+class TestLoadVertexArrays:
+    """Tests for the columnar loader, on a PRD database built from synthetic inputs."""
+
+    @pytest.fixture
+    def prd_db(self, synthetic_3dm, synthetic_db, tmp_path):
+        from structure_aligner.etl.extractor import extract_vertex_table
+        from structure_aligner.etl.loader import load
+        from structure_aligner.etl.transformer import transform
+
+        out = tmp_path / "prd.db"
+        load(transform(extract_vertex_table(synthetic_3dm), synthetic_db), synthetic_db, out)
+        return out
+
+    def test_matches_load_vertices_with_elements(self, prd_db):
+        expected_vertices, expected_elements = load_vertices_with_elements(prd_db)
+        arrays, elements = load_vertex_arrays(prd_db, chunk_size=5)
+        assert list(arrays) == expected_vertices
+        assert elements == expected_elements
+
+    def test_contiguous_typed_arrays(self, prd_db):
+        arrays, _ = load_vertex_arrays(prd_db)
+        assert len(arrays) == 24
+        assert arrays.id.dtype == np.int64
+        assert arrays.vertex_index.dtype == np.int32
+        for name in ("id", "element_id", "x", "y", "z", "vertex_index"):
+            assert getattr(arrays, name).flags["C_CONTIGUOUS"]
+        assert np.all(np.diff(arrays.id) > 0)
+
+    def test_without_elements(self, tmp_path):
+        db_path = tmp_path / "vertices_only.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute(
+            "CREATE TABLE vertices (id INTEGER PRIMARY KEY, element_id INTEGER, "
+            "x REAL, y REAL, z REAL, vertex_index INTEGER)"
+        )
+        conn.execute("INSERT INTO vertices VALUES (2, 7, 1.5, 2.5, 3.5, 0)")
+        conn.commit()
+        conn.close()
+
+        arrays, elements = load_vertex_arrays(db_path, with_elements=False)
+        assert elements == {}
+        assert list(arrays) == [InputVertex(2, 7, 1.5, 2.5, 3.5, 0)]
+        with pytest.raises(ValueError, match="'elements'"):
+            load_vertex_arrays(db_path)
+
+    def test_from_vertices_round_trip(self):
+        vertices = [InputVertex(1, 3, 0.5, 1.0, 2.0, 0), InputVertex(4, 3, 0.25, 1.0, 2.0, 1)]
+        assert list(VertexArrays.from_vertices(vertices)) == vertices
+        assert len(VertexArrays.empty()) == 0
+
+    def test_missing_file(self, tmp_path):
+        with pytest.raises(FileNotFoundError):
+            load_vertex_arrays(tmp_path / "missing.db")
+
+
+class TestIterVertexChunks:
+    """Tests for the chunked cursor reader used by streaming alignment."""
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+        db_path = tmp_path / "chunks.db"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute(
+            "CREATE TABLE vertices (id INTEGER PRIMARY KEY, element_id INTEGER, "
+            "x REAL, y REAL, z REAL, vertex_index INTEGER)"
+        )
+        conn.execute("CREATE TABLE elements (id INTEGER PRIMARY KEY, type TEXT, nom TEXT, geometry_type TEXT)")
+        # Element 2 has 5 vertices, interleaved by id with elements 1 and 3
+        element_ids = [2, 1, 2, 3, 2, 1, 2, 3, 2, 4]
+        conn.executemany(
+            "INSERT INTO vertices VALUES (?, ?, ?, 0.0, 0.0, 0)",
+            [(i + 1, eid, float(i)) for i, eid in enumerate(element_ids)],
+        )
+        conn.executemany("INSERT INTO elements VALUES (?, 'poteau', ?, 'brep')",
+                         [(eid, f"P{eid}") for eid in (1, 2, 3, 4)])
+        conn.commit()
+        conn.close()
+        return db_path
+
+    def test_id_order_chunks(self, db_path):
+        chunks = list(iter_vertex_chunks(db_path, chunk_size=4))
+        assert [len(c) for c in chunks] == [4, 4, 2]
+        assert np.concatenate([c.id for c in chunks]).tolist() == list(range(1, 11))
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 3, 10, 50])
+    def test_by_element_never_splits_elements(self, db_path, chunk_size):
+        chunks = list(iter_vertex_chunks(db_path, chunk_size=chunk_size, by_element=True))
+        element_ids = [c.element_id.tolist() for c in chunks]
+        assert sum(element_ids, []) == sorted(sum(element_ids, []))
+        for earlier, later in zip(element_ids, element_ids[1:]):
+            assert earlier[-1] < later[0]
+        rows = np.concatenate([c.id for c in chunks])
+        assert sorted(rows.tolist()) == list(range(1, 11))
+        # Element 2 is whole in one chunk, in id order
+        (chunk,) = [c for c in chunks if 2 in c.element_id]
+        assert chunk.id[chunk.element_id == 2].tolist() == [1, 3, 5, 7, 9]
+
+    def test_load_elements_range(self, db_path):
+        assert sorted(load_elements(db_path)) == [1, 2, 3, 4]
+        assert sorted(load_elements(db_path, (2, 3))) == [2, 3]
+
+    def test_invalid_chunk_size(self, db_path):
+        with pytest.raises(ValueError, match="chunk_size"):
+            next(iter_vertex_chunks(db_path, chunk_size=0))
@@ -104,6 +104,23 @@ class TestReadAlignedElements:
         result = read_aligned_elements(db)
         assert len(result) == 0
 
+    def test_overlays_alignment_delta(self, tmp_path):
+        db = tmp_path / "test.db"
+        _create_test_db(
+            db,
+            elements=[(1, "poutre", "B1", "line_curve")],
+            vertices=[(1, 4.0, 5.0, 6.0, 0), (1, 7.0, 8.0, 9.0, 1)],
+        )
+        conn = sqlite3.connect(str(db))
+        conn.execute(
+            "CREATE TABLE alignment_delta (vertex_id INTEGER PRIMARY KEY, x REAL, y REAL, z REAL)"
+        )
+        conn.execute("INSERT INTO alignment_delta VALUES (2, 7.5, 8.0, 9.0)")
+        conn.commit()
+        conn.close()
+        result = read_aligned_elements(db)
+        assert [(v.x, v.y, v.z) for v in result["B1"].vertices] == [(4.0, 5.0, 6.0), (7.5, 8.0, 9.0)]
+
     def test_file_not_found(self):
         with pytest.raises(FileNotFoundError):
             read_aligned_elements(Path("/nonexistent/db.db"))
@@ -0,0 +1,150 @@
+"""Tests for sidecar PRD databases (source referenced through ATTACH)."""
+
+import logging
+import os
+import sqlite3
+
+import pytest
+
+from structure_aligner.config import AlignedVertex
+from structure_aligner.db.reader import load_vertices, load_vertices_with_elements
+from structure_aligner.db.sidecar import create_sidecar, open_prd_db, sidecar_source
+from structure_aligner.db.writer import write_aligned_db
+from structure_aligner.etl.extractor import extract_vertex_table
+from structure_aligner.etl.loader import load
+from structure_aligner.etl.reverse_reader import read_aligned_elements
+from structure_aligner.etl.transformer import transform
+
+
+def _tables(db_path):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def loaded(synthetic_3dm, synthetic_db, synthetic_prd_db, tmp_path):
+    side = tmp_path / "side.db"
+    report = load(transform(extract_vertex_table(synthetic_3dm), synthetic_db), synthetic_db, side, sidecar=True)
+    return synthetic_prd_db, side, report
+
+
+class TestLoadSidecar:
+
+    def test_only_prd_tables(self, loaded):
+        _, side, report = loaded
+        assert report.validation_passed
+        tables = _tables(side)
+        assert {"elements", "vertices", "prd_meta"} <= tables
+        assert not {"filaire", "shell", "support"} & tables
+
+    def test_readers_unchanged(self, loaded):
+        full, side, _ = loaded
+        assert load_vertices(side) == load_vertices(full)
+        assert load_vertices_with_elements(side) == load_vertices_with_elements(full)
+        assert read_aligned_elements(side) == read_aligned_elements(full)
+
+    def test_sidecar_source(self, loaded, synthetic_db):
+        full, side, _ = loaded
+        assert sidecar_source(side) == synthetic_db.resolve()
+        assert sidecar_source(full) is None
+
+
+class TestOpenPrdDb:
+
+    def test_source_tables_visible(self, loaded):
+        full, side, _ = loaded
+        query = "SELECT id, type, name FROM filaire ORDER BY id"
+        with sqlite3.connect(str(full)) as conn:
+            expected = conn.execute(query).fetchall()
+        conn = open_prd_db(side)
+        try:
+            assert conn.execute(query).fetchall() == expected
+            assert conn.execute("SELECT COUNT(*) FROM vertices").fetchone()[0] == 24
+        finally:
+            conn.close()
+
+    def test_source_is_read_only(self, loaded, synthetic_db):
+        _, side, _ = loaded
+        conn = open_prd_db(side)
+        try:
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO source.support VALUES (99, 'Appui_99')")
+        finally:
+            conn.close()
+        with sqlite3.connect(str(synthetic_db)) as conn:
+            assert conn.execute("SELECT COUNT(*) FROM support").fetchone()[0] == 2
+
+    def test_self_contained_database(self, loaded):
+        full, _, _ = loaded
+        conn = open_prd_db(full)
+        try:
+            assert [r[1] for r in conn.execute("PRAGMA database_list")] == ["main"]
+        finally:
+            conn.close()
+
+    def test_missing_source(self, synthetic_db, tmp_path):
+        source = tmp_path / "copy.db"
+        source.write_bytes(synthetic_db.read_bytes())
+        side = tmp_path / "side.db"
+        create_sidecar(source, side)
+        source.unlink()
+        with pytest.raises(FileNotFoundError):
+            open_prd_db(side)
+
+    def test_changed_source_warns(self, synthetic_db, tmp_path, caplog):
+        side = tmp_path / "side.db"
+        create_sidecar(synthetic_db, side)
+        stat = synthetic_db.stat()
+        os.utime(synthetic_db, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        with caplog.at_level(logging.WARNING):
+            open_prd_db(side).close()
+        assert "changed since sidecar" in caplog.text
+
+
+class TestWriterSidecar:
+
+    def test_aligned_output_stays_sidecar(self, loaded, tmp_path, synthetic_db):
+        _, side, _ = loaded
+        aligned = [
+            AlignedVertex(
+                id=v.id, element_id=v.element_id, x=v.x, y=v.y, z=v.z,
+                x_original=v.x, y_original=v.y, z_original=v.z, vertex_index=v.vertex_index,
+                aligned_axis="none", fil_x_id=None, fil_y_id=None, fil_z_id=None,
+                displacement_total=0.0,
+            )
+            for v in load_vertices(side)
+        ]
+        out = tmp_path / "aligned.db"
+        write_aligned_db(side, out, aligned)
+        assert sidecar_source(out) == synthetic_db.resolve()
+        assert "filaire" not in _tables(out)
+        assert read_aligned_elements(out) == read_aligned_elements(side)
+
+
+class TestEtlSidecarCli:
+
+    def test_etl_sidecar(self, synthetic_3dm, synthetic_db, tmp_path):
+        from click.testing import CliRunner
+        from structure_aligner.main import cli
+
+        out = tmp_path / "out.db"
+        result = CliRunner().invoke(cli, [
+            "etl", "--input-3dm", str(synthetic_3dm), "--input-db", str(synthetic_db),
+            "--output", str(out), "--sidecar",
+        ])
+        assert result.exit_code == 0, result.output
+        assert sidecar_source(out) == synthetic_db.resolve()
+
+    def test_sidecar_with_update_rejected(self, synthetic_3dm, synthetic_db, loaded):
+        from click.testing import CliRunner
+        from structure_aligner.main import cli
+
+        _, side, _ = loaded
+        result = CliRunner().invoke(cli, [
+            "etl", "--input-3dm", str(synthetic_3dm), "--input-db", str(synthetic_db),
+            "--update", str(side), "--sidecar",
+        ])
+        assert result.exit_code != 0
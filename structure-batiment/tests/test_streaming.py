@@ -0,0 +1,84 @@
+"""Tests for streaming database-to-database V2 alignment."""
+
+import sqlite3
+
+import numpy as np
+import pytest
+
+from structure_aligner.alignment.element_aligner import align_elements_table
+from structure_aligner.analysis.axis_selector import discover_axis_lines
+from structure_aligner.config import PipelineConfig
+from structure_aligner.db.reader import load_vertex_arrays
+from structure_aligner.db.writer import write_aligned_db, write_alignment_delta
+from structure_aligner.streaming import align_db_streaming
+
+
+def _rows(db_path):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute("SELECT * FROM vertices ORDER BY id").fetchall()
+    finally:
+        conn.close()
+
+
+class TestAlignDbStreaming:
+
+    @pytest.mark.parametrize("chunk_size", [1, 5, 100_000])
+    def test_matches_in_memory_alignment(self, synthetic_prd_db, tmp_path, chunk_size):
+        config = PipelineConfig(min_floors=2, floor_z_levels=())
+        vertices, elements = load_vertex_arrays(synthetic_prd_db)
+        axis_x, axis_y = discover_axis_lines(vertices, config)
+        aligned = align_elements_table(vertices, elements, axis_x, axis_y, config)
+        expected = write_aligned_db(synthetic_prd_db, tmp_path / "expected.db", aligned)
+
+        report = align_db_streaming(synthetic_prd_db, tmp_path / "streamed.db", config, chunk_size=chunk_size)
+        assert _rows(tmp_path / "streamed.db") == _rows(expected)
+        assert (report.axis_lines_x_count, report.axis_lines_y_count) == (len(axis_x), len(axis_y))
+        assert report.total_vertices == len(aligned) == 24
+        assert report.aligned_vertices == aligned.aligned_count()
+        assert report.max_displacement_m == round(float(aligned.displacement.max()), 4)
+        # A batch holds whole elements: at most one fetch plus the carried-over element
+        largest_element = int(np.bincount(vertices.element_id).max())
+        assert report.largest_batch <= chunk_size + largest_element - 1
+
+    def test_delta_output(self, synthetic_prd_db, tmp_path):
+        config = PipelineConfig(min_floors=2, floor_z_levels=())
+        vertices, elements = load_vertex_arrays(synthetic_prd_db)
+        axis_x, axis_y = discover_axis_lines(vertices, config)
+        aligned = align_elements_table(vertices, elements, axis_x, axis_y, config)
+        expected = write_alignment_delta(synthetic_prd_db, tmp_path / "expected.db", aligned)
+
+        align_db_streaming(synthetic_prd_db, tmp_path / "streamed.db", config, chunk_size=5, delta=True)
+        query = "SELECT * FROM alignment_delta ORDER BY vertex_id"
+        streamed = sqlite3.connect(str(tmp_path / "streamed.db")).execute(query).fetchall()
+        assert streamed == sqlite3.connect(str(expected)).execute(query).fetchall()
+        assert 0 < len(streamed) < len(aligned)
+
+    def test_existing_output_rejected(self, synthetic_prd_db, tmp_path):
+        out = tmp_path / "out.db"
+        out.write_bytes(b"")
+        with pytest.raises(FileExistsError):
+            align_db_streaming(synthetic_prd_db, out)
+
+    def test_failure_removes_output(self, synthetic_prd_db, tmp_path, monkeypatch):
+        import structure_aligner.alignment.element_aligner as element_aligner
+
+        def fail(*args, **kwargs):
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(element_aligner, "align_elements_arrays", fail)
+        out = tmp_path / "out.db"
+        with pytest.raises(RuntimeError, match="boom"):
+            align_db_streaming(synthetic_prd_db, out)
+        assert not out.exists()
+
+    def test_align_stream_command(self, synthetic_prd_db, tmp_path):
+        from click.testing import CliRunner
+        from structure_aligner.main import cli
+
+        out = tmp_path / "aligned.db"
+        args = ["align-stream", "--input-db", str(synthetic_prd_db), "--output", str(out), "--chunk-size", "7"]
+        result = CliRunner().invoke(cli, args)
+        assert result.exit_code == 0, result.output
+        assert len(_rows(out)) == 24
+        assert CliRunner().invoke(cli, args).exit_code != 0
@@ -0,0 +1,104 @@
+"""Tests for the parameter sweep."""
+
+import csv
+import json
+
+import pytest
+
+from structure_aligner.alignment.element_aligner import align_elements
+from structure_aligner.analysis.axis_selector import discover_axis_lines
+from structure_aligner.config import PipelineConfig
+from structure_aligner.db.reader import load_vertices_with_elements
+from structure_aligner.sweep import SweepResult, build_grid, run_sweep, write_sweep_table
+
+
+GRID = dict(min_floors=[1, 2], cluster_radius=[0.002, 0.5], max_snap_distance=[0.1, 0.75])
+
+
+class TestBuildGrid:
+
+    def test_product_in_order(self):
+        configs = build_grid(min_floors=[2, 3], max_snap_distance=[0.5, 1.0])
+        assert [(c.min_floors, c.max_snap_distance) for c in configs] == [
+            (2, 0.5), (2, 1.0), (3, 0.5), (3, 1.0),
+        ]
+        assert all(c.cluster_radius == PipelineConfig().cluster_radius for c in configs)
+
+    def test_base_config_kept(self):
+        base = PipelineConfig(roof_z_threshold=12.0)
+        assert build_grid(base, min_floors=[1])[0] == PipelineConfig(roof_z_threshold=12.0, min_floors=1)
+
+    def test_invalid_parameter(self):
+        with pytest.raises(ValueError):
+            build_grid(rounding_precision=[0.01])
+        with pytest.raises(ValueError):
+            build_grid(min_floors=[])
+
+
+class TestRunSweep:
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_matches_individual_runs(self, synthetic_prd_db, workers):
+        configs = build_grid(**GRID)
+        results = run_sweep(synthetic_prd_db, configs, workers=workers)
+        assert len(results) == 8
+
+        vertices, elements = load_vertices_with_elements(synthetic_prd_db)
+        for config, result in zip(configs, results):
+            axis_x, axis_y = discover_axis_lines(vertices, config)
+            aligned = align_elements(vertices, elements, axis_x, axis_y, config)
+            assert (result.min_floors, result.cluster_radius, result.max_snap_distance) == \
+                (config.min_floors, config.cluster_radius, config.max_snap_distance)
+            assert (result.axis_lines_x, result.axis_lines_y) == (len(axis_x), len(axis_y))
+            assert result.total_vertices == len(aligned) == 24
+            assert result.aligned_vertices == sum(1 for av in aligned if av.aligned_axis != "none")
+            assert result.max_displacement_m == round(max(av.displacement_total for av in aligned), 4)
+            assert result.recall_x is None
+
+    def test_reference_metrics(self, synthetic_prd_db, synthetic_3dm):
+        results = run_sweep(synthetic_prd_db, build_grid(min_floors=[1]), reference_3dm=synthetic_3dm)
+        assert 0.0 <= results[0].recall_x <= 1.0
+        assert 0.0 <= results[0].precision_y <= 1.0
+
+    def test_mixed_configs_rejected(self, synthetic_prd_db):
+        with pytest.raises(ValueError, match="differ"):
+            run_sweep(synthetic_prd_db, [PipelineConfig(), PipelineConfig(rounding_precision=0.01)])
+        with pytest.raises(ValueError):
+            run_sweep(synthetic_prd_db, [])
+
+
+class TestSweepOutput:
+
+    def test_csv_and_json(self, tmp_path):
+        results = [SweepResult(3, 0.002, 0.75, 4.0, axis_lines_x=5, alignment_rate_pct=92.5)]
+        write_sweep_table(results, tmp_path / "s.csv")
+        with open(tmp_path / "s.csv", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert rows[0]["axis_lines_x"] == "5"
+        assert rows[0]["recall_x"] == ""
+
+        write_sweep_table(results, tmp_path / "s.json")
+        data = json.loads((tmp_path / "s.json").read_text())
+        assert data["results"][0]["alignment_rate_pct"] == 92.5
+
+        with pytest.raises(ValueError):
+            write_sweep_table(results, tmp_path / "s.txt")
+
+    def test_sweep_command(self, synthetic_prd_db):
+        from click.testing import CliRunner
+        from structure_aligner.main import cli
+
+        result = CliRunner().invoke(cli, [
+            "sweep", "--input-db", str(synthetic_prd_db), "--min-floors", "1,2,3",
+            "--max-snap-distance", "0.1,0.75",
+        ])
+        assert result.exit_code == 0, result.output
+        with open(synthetic_prd_db.with_name("synthetic_prd_sweep.csv"), newline="") as f:
+            assert len(list(csv.DictReader(f))) == 6
+
+    def test_sweep_command_bad_list(self, synthetic_prd_db):
+        from click.testing import CliRunner
+        from structure_aligner.main import cli
+
+        result = CliRunner().invoke(cli, ["sweep", "--input-db", str(synthetic_prd_db), "--min-floors", "2,x"])
+        assert result.exit_code != 0
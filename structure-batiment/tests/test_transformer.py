@@ -1,7 +1,8 @@
 from pathlib import Path
+import numpy as np
 import pytest
-from structure_aligner.etl.extractor import extract_vertices
-from structure_aligner.etl.transformer import transform, _load_db_elements
+from structure_aligner.etl.extractor import extract_vertex_table, extract_vertices, iter_vertices
+from structure_aligner.etl.transformer import StreamedVertices, VertexColumns, transform, _load_db_elements
 
 DATA_DIR = Path(__file__).parent.parent / "data"
 DM_FILE = DATA_DIR / "geometrie_2.3dm"
@@ -85,3 +86,122 @@ class TestLoadDbElements:
         elements = _load_db_elements(DB_FILE)
         ids = [e.id for e in elements]
         assert len(ids) == len(set(ids)), "Duplicate element IDs found"
+
+
+class TestTransformVertexTable:
+
+    @pytest.fixture
+    def results(self, synthetic_3dm, synthetic_db):
+        listed = transform(extract_vertices(synthetic_3dm), synthetic_db)
+        columnar = transform(extract_vertex_table(synthetic_3dm), synthetic_db)
+        return listed, columnar
+
+    def test_returns_vertex_columns(self, results):
+        _, columnar = results
+        assert isinstance(columnar.vertices, VertexColumns)
+        assert columnar.vertices.element_id.dtype == np.int64
+
+    def test_same_vertices_and_order(self, results):
+        listed, columnar = results
+        assert list(columnar.vertices) == listed.vertices
+
+    def test_same_elements(self, results):
+        listed, columnar = results
+        assert columnar.elements == listed.elements
+        geometry = {e.nom: e.geometry_type for e in columnar.elements}
+        assert geometry["Coque_1"] == "brep"
+        assert geometry["Appui_2"] is None
+
+    def test_same_matching(self, results):
+        listed, columnar = results
+        assert columnar.matched_count == listed.matched_count == 6
+        assert columnar.total_count == listed.total_count == 8
+        assert columnar.unmatched == listed.unmatched == [
+            ("Filaire_99", "3dm_only"), ("Appui_2", "db_only"),
+        ]
+
+    def test_same_fingerprint(self, results):
+        listed, columnar = results
+        assert columnar.template_object_count == listed.template_object_count
+        assert columnar.template_names_hash == listed.template_names_hash
+
+    def test_nan_coordinates_rejected(self, synthetic_3dm, synthetic_db):
+        table = extract_vertex_table(synthetic_3dm)
+        table.z[0] = np.nan
+        result = transform(table, synthetic_db)
+        assert len(result.vertices) == 23
+        assert not np.isnan(result.vertices.z).any()
+
+
+class TestPandasEngine:
+
+    @pytest.fixture
+    def inputs(self, tmp_path):
+        from tests.conftest import build_synthetic_3dm, build_synthetic_db
+        model = build_synthetic_3dm(tmp_path / "model.3dm", extra_beams=25)
+        db = build_synthetic_db(tmp_path / "source.db", extra_beams=25)
+        return extract_vertex_table(model), db
+
+    def test_matches_numpy_engine(self, inputs):
+        table, db = inputs
+        a = transform(table, db)
+        b = transform(table, db, engine="pandas")
+        assert list(b.vertices) == list(a.vertices)
+        assert b.vertices.element_id.dtype == np.int64
+        assert b.elements == a.elements
+        assert b.unmatched == a.unmatched
+        assert (b.matched_count, b.total_count) == (a.matched_count, a.total_count)
+        assert b.template_names_hash == a.template_names_hash
+        assert b.template_object_count == a.template_object_count
+
+    def test_nan_coordinates_rejected(self, inputs):
+        table, db = inputs
+        table.x[3] = np.nan
+        result = transform(table, db, engine="pandas")
+        assert len(result.vertices) == len(transform(table, db).vertices)
+        assert not np.isnan(result.vertices.x).any()
+
+    def test_unknown_engine(self, inputs):
+        table, db = inputs
+        with pytest.raises(ValueError):
+            transform(table, db, engine="polars")
+
+
+class TestTransformStream:
+
+    def test_stream_is_lazy(self, synthetic_3dm, synthetic_db):
+        result = transform(iter_vertices(synthetic_3dm, batch_size=4), synthetic_db)
+        assert isinstance(result.vertices, StreamedVertices)
+        assert result.matched_count == 0
+        with pytest.raises(TypeError):
+            len(result.vertices)
+
+    def test_stream_matches_in_memory_transform(self, synthetic_3dm, synthetic_db):
+        expected = transform(extract_vertex_table(synthetic_3dm), synthetic_db)
+        result = transform(iter_vertices(synthetic_3dm, batch_size=4), synthetic_db)
+
+        chunks = list(result.vertices)
+        rank = np.concatenate([r for r, _ in chunks])
+        order = np.argsort(rank, kind="stable")
+        rows = [v for _, columns in chunks for v in columns]
+        assert [rows[i] for i in order] == list(expected.vertices)
+
+        assert len(result.vertices) == len(expected.vertices)
+        assert result.elements == expected.elements
+        assert result.unmatched == expected.unmatched
+        assert result.matched_count == expected.matched_count
+        assert result.total_count == expected.total_count
+        assert result.template_object_count == expected.template_object_count
+        assert result.template_names_hash == expected.template_names_hash
+
+    def test_stream_ranges(self, synthetic_3dm, synthetic_db):
+        result = transform(iter_vertices(synthetic_3dm, batch_size=4), synthetic_db)
+        list(result.vertices)
+        assert result.vertices.ranges["x"] == (0.0, 5.001)
+        assert result.vertices.ranges["z"] == (-0.5, 6.4)
+
+    def test_stream_consumed_once(self, synthetic_3dm, synthetic_db):
+        result = transform(iter_vertices(synthetic_3dm, batch_size=4), synthetic_db)
+        list(result.vertices)
+        with pytest.raises(RuntimeError):
+            list(result.vertices)
@@ -4,8 +4,9 @@ from pathlib import Path
 
 import pytest
 
+from structure_aligner.alignment.aligned_table import AlignedVertexTable
 from structure_aligner.config import AlignedVertex
-from structure_aligner.db.writer import write_aligned_db
+from structure_aligner.db.writer import write_aligned_db, write_aligned_db_batches, write_alignment_delta
 
 # Path to the real PRD database
 REAL_DB = Path(__file__).resolve().parent.parent / "data" / "geometrie_2_prd.db"
@@ -196,3 +197,115 @@ class TestWriteAlignedDB:
         assert row[3] == 10.03      # x_original
         assert row[4] == "XYZ"      # aligned_axis
         assert isinstance(row[5], float)  # displacement_total
+
+
+def _dump(db_path: Path) -> tuple[list, list, list]:
+    conn = sqlite3.connect(str(db_path))
+    rows = conn.execute("SELECT *, typeof(x), typeof(fil_x_id) FROM vertices ORDER BY id").fetchall()
+    schema = sorted(conn.execute("SELECT type, name, tbl_name, sql FROM sqlite_master").fetchall())
+    sequence = conn.execute("SELECT * FROM sqlite_sequence ORDER BY name").fetchall()
+    conn.close()
+    return rows, schema, sequence
+
+
+class TestWriteMethods:
+
+    def _batches(self):
+        return [
+            AlignedVertexTable.from_aligned_vertices([
+                _make_aligned_vertex(1, fil_y_id=None, aligned_axis="XZ"),
+                _make_aligned_vertex(3),
+            ]),
+            # Own thread_ids; the second row for id 1 replaces the first
+            AlignedVertexTable.from_aligned_vertices([
+                _make_aligned_vertex(1, x=11.0, fil_x_id="X_009", aligned_axis="X",
+                                     fil_y_id=None, fil_z_id=None),
+            ]),
+        ]
+
+    def test_rebuild_matches_update(self, setup_db):
+        db_path, tmp_path = setup_db
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("CREATE TRIGGER vertices_guard BEFORE DELETE ON vertices BEGIN SELECT 1; END")
+        conn.execute("INSERT INTO vertices (element_id, x, y, z, vertex_index) VALUES (6233, 1, 2, 3, 2)")
+        conn.execute("DELETE FROM vertices WHERE id = 3")
+        conn.commit()
+        conn.close()
+
+        outputs = {}
+        for method in ("rebuild", "update"):
+            outputs[method] = tmp_path / f"{method}.db"
+            write_aligned_db_batches(db_path, outputs[method], self._batches(), method=method)
+
+        rebuilt, updated = _dump(outputs["rebuild"]), _dump(outputs["update"])
+        assert rebuilt == updated
+        rows, schema, sequence = rebuilt
+        assert [row[:3] for row in rows] == [(1, 6233, 11.0), (2, 6233, 10.04)]
+        assert rows[0][9:13] == ("X", "X_009", None, None)
+        assert rows[1][9] == "none"
+        # The deleted id 3 is not handed out again
+        assert ("vertices", 3) in sequence
+        assert ("trigger", "vertices_guard", "vertices") in [entry[:3] for entry in schema]
+
+    def test_output_is_wal(self, setup_db):
+        db_path, tmp_path = setup_db
+        output = tmp_path / "output.db"
+        write_aligned_db(db_path, output, [_make_aligned_vertex(1)])
+        conn = sqlite3.connect(str(output))
+        assert conn.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+        conn.close()
+
+    def test_unknown_method_rejected(self, setup_db):
+        db_path, tmp_path = setup_db
+        with pytest.raises(ValueError, match="Unknown write method"):
+            write_aligned_db(db_path, tmp_path / "output.db", [], method="merge")
+        assert not (tmp_path / "output.db").exists()
+
+
+class TestWriteAlignmentDelta:
+
+    COLUMNS = ("id, element_id, x, y, z, vertex_index, x_original, y_original, z_original, "
+               "aligned_axis, fil_x_id, fil_y_id, fil_z_id, displacement_total")
+
+    def _aligned(self):
+        return [
+            _make_aligned_vertex(1),
+            # Untouched: same coordinates, not snapped
+            _make_aligned_vertex(2, x=10.04, y=20.01, z=30.02,
+                                 x_original=10.04, y_original=20.01, z_original=30.02,
+                                 aligned_axis="none", fil_x_id=None, fil_y_id=None,
+                                 fil_z_id=None, displacement_total=0.0),
+        ]
+
+    def test_records_only_touched_vertices(self, setup_db):
+        db_path, tmp_path = setup_db
+        output = write_alignment_delta(db_path, tmp_path / "delta.db", self._aligned())
+
+        conn = sqlite3.connect(str(output))
+        delta = conn.execute("SELECT * FROM alignment_delta").fetchall()
+        stored = conn.execute("SELECT x FROM vertices ORDER BY id").fetchall()
+        conn.close()
+        assert delta == [(1, 10.0, 20.0, 30.0, "XYZ", "X_001", "Y_001", "Z_001", 0.037417)]
+        # The vertices table keeps the original coordinates
+        assert stored == [(10.03,), (10.04,)]
+
+    def test_view_matches_full_layout(self, setup_db):
+        db_path, tmp_path = setup_db
+        full = write_aligned_db(db_path, tmp_path / "full.db", self._aligned())
+        delta = write_alignment_delta(db_path, tmp_path / "delta.db", self._aligned())
+
+        conn = sqlite3.connect(str(full))
+        expected = conn.execute(f"SELECT {self.COLUMNS} FROM vertices ORDER BY id").fetchall()
+        conn.close()
+        conn = sqlite3.connect(str(delta))
+        overlaid = conn.execute(f"SELECT {self.COLUMNS} FROM aligned_vertices ORDER BY id").fetchall()
+        conn.close()
+        assert overlaid == expected
+
+    def test_output_already_exists_raises(self, setup_db):
+        db_path, tmp_path = setup_db
+        output = tmp_path / "delta.db"
+        output.touch()
+        with pytest.raises(FileExistsError, match="Output already exists"):
+            write_alignment_delta(db_path, output, self._aligned())